@@ -0,0 +1,108 @@
+"""
+Benchmark de cifrado: MB/s de PDFEncryptor.encrypt con cada algoritmo.
+
+Mide la operación completa (leer, descifrar si hace falta, cifrar y escribir cada objeto)
+sobre archivos reales; la velocidad se calcula sobre el tamaño de entrada. Los algoritmos
+AES solo se miden si está instalado el paquete cryptography.
+
+    python benchmarks/bench_encrypt.py archivo.pdf carpeta/*.pdf -n 5
+    python benchmarks/bench_encrypt.py carpeta --algorithms AES-128 AES-256 --json resultados.jsonl
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.cli.batch import expand_inputs
+from src.core.pdf_encrypt import ENCRYPTION_ALGORITHMS, PDFEncryptor, available_algorithms
+
+MB = 1024 * 1024
+
+
+def measure(input_path: Path, algorithms: List[str], repeat: int, workdir: Path) -> List[Dict]:
+    results = []
+    for algorithm in algorithms:
+        output_path = workdir / f"{algorithm}.pdf"
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            success, error, _ = PDFEncryptor.encrypt(
+                input_path, output_path, user_password="benchmark", algorithm=algorithm,
+            )
+            if not success:
+                raise RuntimeError(error)
+            times.append(time.perf_counter() - started)
+        input_size = input_path.stat().st_size
+        results.append({
+            "file": str(input_path),
+            "algorithm": algorithm,
+            "input_size": input_size,
+            "output_size": output_path.stat().st_size,
+            "best_seconds": round(min(times), 4),
+            "mb_per_second": round(input_size / MB / min(times), 2),
+        })
+        output_path.unlink()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mide la velocidad de cifrado de PDFs por algoritmo.")
+    parser.add_argument("inputs", nargs="+", help="Archivos, carpetas o patrones glob")
+    parser.add_argument(
+        "-a", "--algorithms", nargs="+", choices=ENCRYPTION_ALGORITHMS, default=["AES-128", "AES-256"],
+        help="Algoritmos a medir (por defecto AES-128 y AES-256)",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Repeticiones por algoritmo (se toma la mejor)")
+    parser.add_argument("--json", type=Path, help="Guardar los resultados como JSON-lines")
+    args = parser.parse_args(argv)
+
+    algorithms = [alg for alg in args.algorithms if alg in available_algorithms()]
+    for missing in sorted(set(args.algorithms) - set(algorithms)):
+        print(f"{missing}: no disponible (instale cryptography)", file=sys.stderr)
+    if not algorithms:
+        return 2
+
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print("No se encontraron archivos de entrada", file=sys.stderr)
+        return 3
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for input_path in inputs:
+            try:
+                rows.extend(measure(input_path, algorithms, max(1, args.repeat), Path(workdir)))
+            except Exception as e:
+                print(f"{input_path.name}: {e}", file=sys.stderr)
+
+    print(f"{'archivo':30} {'algoritmo':9} {'entrada':>12} {'salida':>12} {'segundos':>9} {'MB/s':>8}")
+    for row in rows:
+        print(
+            f"{Path(row['file']).name[:30]:30} {row['algorithm']:9} {row['input_size']:>12} "
+            f"{row['output_size']:>12} {row['best_seconds']:>9.4f} {row['mb_per_second']:>8.2f}"
+        )
+    for algorithm in algorithms:
+        selected = [row for row in rows if row["algorithm"] == algorithm]
+        if selected:
+            size = sum(r["input_size"] for r in selected)
+            seconds = sum(r["best_seconds"] for r in selected)
+            print(
+                f"{'TOTAL':30} {algorithm:9} {size:>12} {sum(r['output_size'] for r in selected):>12} "
+                f"{seconds:>9.4f} {size / MB / seconds:>8.2f}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark de escritura de PDFs: tamaño de salida y tiempo de reescritura.
+
+Compara, para cada archivo, la reescritura con pypdf.PdfWriter (la que usaba la reparación,
+que solo copia las páginas), con pypdf clonando el documento entero (conserva lo mismo que
+StreamingPDFWriter: marcadores, estructura, formularios, metadatos) y con StreamingPDFWriter
+en modo clásico (tabla xref en texto) y compacto (streams de objetos, tabla xref en stream y
+streams sin filtro comprimidos). Ver benchmarks/README.md.
+
+    python benchmarks/bench_output.py archivo.pdf carpeta/*.pdf -n 5
+    python benchmarks/bench_output.py carpeta --json resultados.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pypdf import PdfWriter
+
+from src.cli.batch import expand_inputs
+from src.core.pdf_writer import PDFOutputFile, file_id_for, open_reader
+
+
+def write_pypdf(input_path: Path, output_path: Path) -> None:
+    reader = open_reader(input_path)
+    writer = PdfWriter()
+    for page in reader.pages:
+        writer.add_page(page)
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+def write_pypdf_clone(input_path: Path, output_path: Path) -> None:
+    writer = PdfWriter(clone_from=open_reader(input_path))
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+def write_streaming(compact: bool) -> Callable[[Path, Path], None]:
+    def write(input_path: Path, output_path: Path) -> None:
+        reader = open_reader(input_path)
+        output = PDFOutputFile(output_path, compact=compact)
+        output.writer.add_document(reader)
+        output.commit(file_id_for(input_path))
+    return write
+
+
+WRITERS: Dict[str, Callable[[Path, Path], None]] = {
+    "pypdf": write_pypdf,
+    "clone": write_pypdf_clone,
+    "classic": write_streaming(False),
+    "compact": write_streaming(True),
+}
+
+
+def measure(input_path: Path, repeat: int, workdir: Path) -> List[Dict]:
+    results = []
+    for name, write in WRITERS.items():
+        output_path = workdir / f"{name}.pdf"
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            write(input_path, output_path)
+            times.append(time.perf_counter() - started)
+        results.append({
+            "file": str(input_path),
+            "writer": name,
+            "input_size": input_path.stat().st_size,
+            "output_size": output_path.stat().st_size,
+            "best_seconds": round(min(times), 4),
+        })
+        os.remove(output_path)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mide tamaño y tiempo de escritura de los PDFs de salida.")
+    parser.add_argument("inputs", nargs="+", help="Archivos, carpetas o patrones glob")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Repeticiones por escritor (se toma la mejor)")
+    parser.add_argument("--json", type=Path, help="Guardar los resultados como JSON-lines")
+    args = parser.parse_args(argv)
+
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print("No se encontraron archivos de entrada", file=sys.stderr)
+        return 3
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for input_path in inputs:
+            try:
+                rows.extend(measure(input_path, max(1, args.repeat), Path(workdir)))
+            except Exception as e:
+                print(f"{input_path.name}: {e}", file=sys.stderr)
+
+    print(f"{'archivo':30} {'escritor':8} {'entrada':>12} {'salida':>12} {'%':>7} {'segundos':>9}")
+    for row in rows:
+        ratio = 100 * row["output_size"] / row["input_size"]
+        print(
+            f"{Path(row['file']).name[:30]:30} {row['writer']:8} {row['input_size']:>12} "
+            f"{row['output_size']:>12} {ratio:>6.1f}% {row['best_seconds']:>9.4f}"
+        )
+    for writer in WRITERS:
+        selected = [row for row in rows if row["writer"] == writer]
+        if selected:
+            print(
+                f"{'TOTAL':30} {writer:8} {sum(r['input_size'] for r in selected):>12} "
+                f"{sum(r['output_size'] for r in selected):>12} "
+                f"{100 * sum(r['output_size'] for r in selected) / sum(r['input_size'] for r in selected):>6.1f}% "
+                f"{sum(r['best_seconds'] for r in selected):>9.4f}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
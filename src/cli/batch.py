@@ -0,0 +1,514 @@
+"""
+Motor por lotes sin interfaz gráfica.
+Ejecuta reparar, validar, unir, dividir, extraer páginas, comprimir, cifrar y descifrar
+sobre listas de archivos, y convierte carpetas de imágenes a PDF, sin importar PyQt6,
+o los encola en el almacén persistente de trabajos compartido con la GUI.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.core.job_store import JobStore
+from src.core.pdf_compress import COMPRESS_PRESETS
+from src.core.pdf_encrypt import ALL_PERMISSIONS, DEFAULT_ALGORITHM, ENCRYPTION_ALGORITHMS
+from src.core.pdf_images import DEFAULT_IMAGE_DPI
+from src.core.pdf_split import SPLIT_MODES
+from src.orchestration.agents.logic_agent import LogicAgent
+from src.orchestration.job_queue import JobQueue
+from src.orchestration.messages import Action, AgentType, Message, MessageType
+from src.utils.logger import logger
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_NO_INPUT = 3
+EXIT_INTERRUPTED = 130
+
+OPERATION_ACTIONS = {
+    "repair": Action.LOGIC_REPAIR_PDF,
+    "validate": Action.LOGIC_VALIDATE_PDF,
+    "validate_deep": Action.LOGIC_DEEP_VALIDATE_PDF,
+    "merge": Action.LOGIC_MERGE_PDF,
+    "split": Action.LOGIC_SPLIT_PDF,
+    "compress": Action.LOGIC_COMPRESS_PDF,
+    "images": Action.LOGIC_IMAGES_TO_PDF,
+    "encrypt": Action.LOGIC_ENCRYPT_PDF,
+    "decrypt": Action.LOGIC_DECRYPT_PDF,
+    "extract": Action.LOGIC_EXTRACT_PAGES,
+}
+# La cola guarda los parámetros en disco: las operaciones con contraseña no se encolan
+SECRET_OPERATIONS = ("encrypt", "decrypt")
+
+_agent: Optional[LogicAgent] = None
+
+
+def _get_agent() -> LogicAgent:
+    global _agent
+    if _agent is None:
+        _agent = LogicAgent()
+    return _agent
+
+
+def run_job(operation: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Ejecuta una operación con LogicAgent y devuelve un registro serializable."""
+    started = time.perf_counter()
+    message = Message(
+        msg_type=MessageType.REQUEST,
+        sender=AgentType.ORCHESTRATOR,
+        receiver=AgentType.LOGIC,
+        action=OPERATION_ACTIONS[operation],
+        payload=payload,
+    )
+    try:
+        response = _get_agent().handle(message)
+        success, data, error = response.success, response.data, response.error
+    except Exception as e:
+        success, data, error = False, None, str(e)
+    return {
+        "operation": operation,
+        "input": (
+            payload.get("input_path") or payload.get("file_path")
+            or payload.get("input_paths") or payload.get("input_dir")
+        ),
+        "success": success,
+        "error": error,
+        "data": data,
+        "elapsed": round(time.perf_counter() - started, 4),
+    }
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[Path]:
+    """Expande rutas, carpetas y patrones glob a una lista ordenada de PDFs sin duplicados."""
+    seen = set()
+    result = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(str(p) for p in path.glob("*.pdf"))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            key = str(Path(match).resolve())
+            if key not in seen:
+                seen.add(key)
+                result.append(Path(match))
+    return result
+
+
+def expand_folders(patterns: Iterable[str]) -> List[Path]:
+    """Expande rutas y patrones glob a una lista ordenada de carpetas sin duplicados."""
+    seen = set()
+    result = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = Path(match)
+            key = str(path.resolve())
+            if path.is_dir() and key not in seen:
+                seen.add(key)
+                result.append(path)
+    return result
+
+
+def read_manifest(manifest: Path) -> List[str]:
+    """Lee un manifiesto: una ruta o patrón glob por línea, '#' para comentarios."""
+    patterns = []
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+def relative_outputs(inputs: List[Path]) -> Dict[Path, Path]:
+    """
+    Ruta de cada entrada relativa a la carpeta común de todas: en --output-dir se reproduce
+    la estructura, así que 'a/informe.pdf' y 'b/informe.pdf' de un glob recursivo no se pisan.
+    """
+    resolved = [path.resolve() for path in inputs]
+    try:
+        root = Path(os.path.commonpath([path.parent for path in resolved]))
+    except ValueError:
+        # Unidades distintas en Windows: no hay carpeta común, se usa solo el nombre
+        return {path: Path(path.name) for path in inputs}
+    return {path: full.relative_to(root) for path, full in zip(inputs, resolved)}
+
+
+def _check_collisions(jobs: List[Dict[str, Any]]) -> None:
+    seen: Dict[str, str] = {}
+    for payload in jobs:
+        target = payload.get("output_path") or payload.get("output_dir")
+        if not target:
+            continue
+        key = os.path.normcase(str(Path(target).resolve()))
+        source = payload.get("input_path") or payload.get("input_dir")
+        if key in seen:
+            raise ValueError(f"{seen[key]} y {source} se escribirían en {target}")
+        seen[key] = source
+
+
+def build_jobs(args: argparse.Namespace, inputs: List[Path]) -> List[Dict[str, Any]]:
+    """Un payload por entrada; ValueError si dos entradas acabarían en la misma salida."""
+    output_dir = Path(args.output_dir) if getattr(args, "output_dir", None) else None
+    relative = relative_outputs(inputs) if output_dir else {}
+    linearize = getattr(args, "linearize", False)
+    if args.operation == "merge":
+        job = {"input_paths": [str(p) for p in inputs], "output_path": args.output}
+        if linearize:
+            job["linearize"] = True
+        return [job]
+    jobs = []
+    for path in inputs:
+        if args.operation == "repair":
+            payload = {"input_path": str(path)}
+            if output_dir:
+                payload["output_path"] = str(output_dir / relative[path])
+        elif args.operation == "validate":
+            payload = {"file_path": str(path)}
+        elif args.operation == "compress":
+            target_dpi, quality = COMPRESS_PRESETS[args.preset]
+            payload = {
+                "input_path": str(path),
+                "target_dpi": args.dpi or target_dpi,
+                "quality": args.quality or quality,
+            }
+            if output_dir:
+                payload["output_path"] = str(output_dir / relative[path])
+            if args.jobs > 1:
+                payload["workers"] = 1
+        elif args.operation == "images":
+            # Un PDF por carpeta, junto a ella o en la carpeta de salida
+            payload = {"input_dir": str(path), "default_dpi": args.dpi}
+            if args.jpeg_quality:
+                payload["jpeg_quality"] = args.jpeg_quality
+            if output_dir:
+                payload["output_path"] = str(output_dir / relative[path].with_name(f"{relative[path].name}.pdf"))
+            if args.jobs > 1:
+                payload["workers"] = 1
+        elif args.operation == "extract":
+            payload = {"input_path": str(path), "pages": args.pages}
+            if args.no_prune:
+                payload["prune"] = False
+            if output_dir:
+                payload["output_path"] = str(output_dir / relative[path])
+        elif args.operation in SECRET_OPERATIONS:
+            payload = {"input_path": str(path), "password": args.password}
+            if args.operation == "encrypt":
+                payload.update({
+                    "user_password": args.user_password,
+                    "owner_password": args.owner_password,
+                    "permissions": args.allow,
+                    "algorithm": args.algorithm,
+                })
+            if output_dir:
+                payload["output_path"] = str(output_dir / relative[path])
+        elif args.operation == "validate_deep":
+            payload = {"file_path": str(path)}
+            if args.jobs > 1:
+                # Ya hay un proceso por archivo: las páginas se revisan dentro de él
+                payload["workers"] = 1
+        else:
+            payload = {"input_path": str(path), "ranges": args.ranges, "mode": args.mode}
+            if args.every:
+                payload["mode"], payload["every"] = "every", args.every
+            if args.max_size:
+                payload["mode"], payload["max_size_mb"] = "size", args.max_size
+            if output_dir:
+                payload["output_dir"] = str(output_dir / relative[path].with_suffix(""))
+        if linearize:
+            payload["linearize"] = True
+        jobs.append(payload)
+    _check_collisions(jobs)
+    return jobs
+
+
+def run_jobs(
+    operation: str,
+    jobs: List[Dict[str, Any]],
+    workers: int,
+    out: TextIO,
+) -> int:
+    failures = 0
+
+    def emit(record: Dict[str, Any]) -> None:
+        out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        out.flush()
+        if record["success"]:
+            logger.file("%s %s (%.2f s)", operation, record["input"], record["elapsed"])
+        else:
+            logger.error("%s %s: %s", operation, record["input"], record["error"])
+
+    if workers <= 1 or len(jobs) <= 1:
+        for payload in jobs:
+            record = run_job(operation, payload)
+            failures += 0 if record["success"] else 1
+            emit(record)
+        return failures
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_job, operation, payload) for payload in jobs]
+        for future in as_completed(futures):
+            record = future.result()
+            failures += 0 if record["success"] else 1
+            emit(record)
+    return failures
+
+
+def _absolute_paths(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """El servicio de cola puede ejecutarse desde otro directorio: las rutas se guardan absolutas."""
+    result = {}
+    for key, value in payload.items():
+        if key.endswith(("_path", "_dir")) and value:
+            value = str(Path(value).resolve())
+        elif key.endswith("_paths") and value:
+            value = [str(Path(v).resolve()) for v in value]
+        result[key] = value
+    return result
+
+
+def submit_jobs(operation: str, jobs: List[Dict[str, Any]], store: JobStore, out: TextIO) -> None:
+    queue = JobQueue(store=store)
+    for payload in jobs:
+        job = queue.submit(operation, _absolute_paths(payload))
+        out.write(json.dumps({"job_id": job.id, "operation": operation, "status": job.status}) + "\n")
+    out.flush()
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Atiende la cola persistente hasta Ctrl+C, o hasta vaciarla con --once."""
+
+    def print_event(action: str, payload: Dict[str, Any]) -> None:
+        record = {"event": action, "job_id": payload["id"], "kind": payload["kind"],
+                  "status": payload["status"], "progress": payload["progress"], "error": payload["error"]}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        if action != Action.JOB_PROGRESS:
+            logger.file("Trabajo %s (%s): %s", payload["id"], payload["kind"], payload["status"])
+
+    queue = JobQueue(store=JobStore(args.store), workers=max(1, args.workers), on_event=print_event)
+    if args.once:
+        queue.run_until_empty()
+        return EXIT_OK
+    queue.start()
+    try:
+        while queue.running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        queue.stop()
+        return EXIT_INTERRUPTED
+    return EXIT_OK
+
+
+def list_jobs(args: argparse.Namespace) -> int:
+    store = JobStore(args.store)
+    for job in store.list(status=args.status, limit=args.limit):
+        print(json.dumps(job.to_dict(), ensure_ascii=False, default=str))
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    log_parent = argparse.ArgumentParser(add_help=False)
+    log_parent.add_argument("--log-dir", type=Path, help="Carpeta para el log rotativo (por defecto no se escribe)")
+    log_parent.add_argument("--log-json", action="store_true", help="Escribir el log como JSON-lines")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[log_parent])
+    common.add_argument("inputs", nargs="*", help="Archivos, carpetas o patrones glob")
+    common.add_argument("-m", "--manifest", type=Path, help="Archivo con una ruta o patrón por línea")
+    common.add_argument("-j", "--jobs", type=int, default=1, help="Trabajos en paralelo (por defecto 1)")
+    common.add_argument("-r", "--results", type=Path, help="Archivo JSON-lines de resultados (por defecto stdout)")
+    common.add_argument("-q", "--queue", action="store_true", help="Encolar en el almacén persistente en vez de ejecutar")
+    common.add_argument("--store", type=Path, help="Base de datos de trabajos (por defecto ~/.xebec-pdf-fixer/jobs.db)")
+
+    parser = argparse.ArgumentParser(
+        prog="xebec-pdf-batch",
+        description="Procesa PDFs por lotes sin interfaz gráfica.",
+    )
+    # Opciones de las operaciones que escriben PDFs
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument(
+        "--linearize", action="store_true",
+        help="Escribir la salida linealizada (vista web rápida)",
+    )
+
+    sub = parser.add_subparsers(dest="operation", required=True)
+
+    repair = sub.add_parser("repair", parents=[common, output], help="Reparar PDFs")
+    repair.add_argument("-o", "--output-dir", help="Carpeta de salida")
+
+    validate = sub.add_parser("validate", parents=[common], help="Validar PDFs")
+    validate.add_argument(
+        "--deep", action="store_true",
+        help="Validación estructural completa: xref, streams, referencias, fuentes e imágenes",
+    )
+
+    merge = sub.add_parser("merge", parents=[common, output], help="Unir PDFs en un solo archivo")
+    merge.add_argument("-o", "--output", required=True, help="PDF de salida")
+
+    split = sub.add_parser("split", parents=[common, output], help="Dividir PDFs")
+    split.add_argument("--ranges", help="Rangos de páginas, ej: 1-3, 5, 7-10 (por defecto una página por archivo)")
+    split.add_argument("--mode", choices=SPLIT_MODES, default="ranges", help="Modo de división (por defecto ranges)")
+    split.add_argument("--every", type=int, help="Páginas por archivo (implica --mode every)")
+    split.add_argument("--max-size", type=float, help="Tamaño máximo por archivo en MB (implica --mode size)")
+    split.add_argument("-o", "--output-dir", help="Carpeta de salida")
+
+    extract = sub.add_parser("extract", parents=[common, output], help="Extraer páginas a un PDF nuevo")
+    extract.add_argument("--pages", required=True, help="Páginas a extraer, ej: 1-3, 5 (en ese orden)")
+    extract.add_argument(
+        "--no-prune", action="store_true",
+        help="Copiar los recursos de cada página enteros, aunque el contenido no los use",
+    )
+    extract.add_argument("-o", "--output-dir", help="Carpeta de salida (por defecto <nombre>.extracted.pdf)")
+
+    compress = sub.add_parser("compress", parents=[common, output], help="Comprimir las imágenes de PDFs")
+    compress.add_argument(
+        "--preset", choices=list(COMPRESS_PRESETS), default="balanced",
+        help="Calidad de salida: high, balanced o max (por defecto balanced)",
+    )
+    compress.add_argument("--dpi", type=int, help="Resolución máxima de las imágenes (sustituye a la del preset)")
+    compress.add_argument("--quality", type=int, help="Calidad JPEG de 1 a 95 (sustituye a la del preset)")
+    compress.add_argument("-o", "--output-dir", help="Carpeta de salida")
+
+    images = sub.add_parser("images", parents=[common, output], help="Convertir carpetas de imágenes a PDF")
+    images.add_argument(
+        "--dpi", type=float, default=DEFAULT_IMAGE_DPI,
+        help=f"Resolución de las imágenes que no la indican (por defecto {DEFAULT_IMAGE_DPI})",
+    )
+    images.add_argument(
+        "--jpeg-quality", type=int,
+        help="Guardar como JPEG de esta calidad las imágenes que no lo son (por defecto sin pérdida)",
+    )
+    images.add_argument("-o", "--output-dir", help="Carpeta de salida (por defecto junto a cada carpeta)")
+
+    # Las contraseñas pueden venir del entorno para que no aparezcan en la lista de procesos
+    secret = argparse.ArgumentParser(add_help=False)
+    secret.add_argument(
+        "--password", default=os.environ.get("XEBEC_PDF_PASSWORD", ""),
+        help="Contraseña de los archivos ya cifrados (o XEBEC_PDF_PASSWORD)",
+    )
+    secret.add_argument("-o", "--output-dir", help="Carpeta de salida")
+
+    encrypt = sub.add_parser("encrypt", parents=[common, secret], help="Cifrar PDFs o cambiar sus permisos")
+    encrypt.add_argument(
+        "--user-password", default=os.environ.get("XEBEC_PDF_USER_PASSWORD", ""),
+        help="Contraseña para abrir (o XEBEC_PDF_USER_PASSWORD; vacía: se abre sin contraseña)",
+    )
+    encrypt.add_argument(
+        "--owner-password", default=os.environ.get("XEBEC_PDF_OWNER_PASSWORD"),
+        help="Contraseña de propietario, sin restricciones (o XEBEC_PDF_OWNER_PASSWORD)",
+    )
+    encrypt.add_argument(
+        "--algorithm", choices=ENCRYPTION_ALGORITHMS, default=DEFAULT_ALGORITHM,
+        help=f"Algoritmo (por defecto {DEFAULT_ALGORITHM})",
+    )
+    encrypt.add_argument(
+        "--allow", nargs="*", choices=ALL_PERMISSIONS, default=list(ALL_PERMISSIONS),
+        help="Permisos concedidos con la contraseña de usuario (por defecto todos)",
+    )
+
+    sub.add_parser("decrypt", parents=[common, secret], help="Quitar la protección de PDFs")
+
+    store_parent = argparse.ArgumentParser(add_help=False)
+    store_parent.add_argument("--store", type=Path, help="Base de datos de trabajos (por defecto ~/.xebec-pdf-fixer/jobs.db)")
+
+    serve_parser = sub.add_parser("serve", parents=[store_parent, log_parent], help="Atender la cola persistente de trabajos")
+    serve_parser.add_argument("-w", "--workers", type=int, default=2, help="Trabajos simultáneos (por defecto 2)")
+    serve_parser.add_argument("--once", action="store_true", help="Salir cuando la cola quede vacía")
+
+    jobs_parser = sub.add_parser("jobs", parents=[store_parent], help="Listar trabajos encolados")
+    jobs_parser.add_argument("--status", help="Filtrar por estado (queued, running, completed, failed, cancelled)")
+    jobs_parser.add_argument("--limit", type=int, default=100)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # stdout lleva los resultados: el log (y las trazas de XEBEC_TRACE) solo van al archivo, y solo si se pide
+    logger.setup(
+        name="XebecPDF-batch",
+        log_dir=getattr(args, "log_dir", None),
+        structured=getattr(args, "log_json", False) or None,
+        console=False,
+    )
+
+    if args.operation == "serve":
+        return serve(args)
+    if args.operation == "jobs":
+        return list_jobs(args)
+
+    if args.operation == "split":
+        if args.mode == "every" and not args.every:
+            parser.error("--mode every requiere --every N")
+        if args.mode == "size" and not args.max_size:
+            parser.error("--mode size requiere --max-size MB")
+
+    if args.operation == "compress":
+        if args.quality is not None and not 1 <= args.quality <= 95:
+            parser.error("--quality debe estar entre 1 y 95")
+        if args.dpi is not None and args.dpi < 36:
+            parser.error("--dpi debe ser al menos 36")
+
+    if args.operation == "images":
+        if args.jpeg_quality is not None and not 1 <= args.jpeg_quality <= 95:
+            parser.error("--jpeg-quality debe estar entre 1 y 95")
+        if args.dpi <= 0:
+            parser.error("--dpi debe ser positivo")
+
+    if args.operation in SECRET_OPERATIONS and args.queue:
+        parser.error("las operaciones con contraseña no se pueden encolar")
+    if args.operation == "encrypt" and not (args.user_password or args.owner_password):
+        parser.error("encrypt requiere --user-password u --owner-password")
+
+    if args.operation == "validate" and args.deep:
+        args.operation = "validate_deep"
+
+    patterns = list(args.inputs)
+    if args.manifest:
+        try:
+            patterns.extend(read_manifest(args.manifest))
+        except OSError as e:
+            parser.error(f"No se pudo leer el manifiesto: {e}")
+
+    inputs = expand_folders(patterns) if args.operation == "images" else expand_inputs(patterns)
+    if not inputs:
+        print("No se encontraron archivos de entrada", file=sys.stderr)
+        return EXIT_NO_INPUT
+    if args.operation == "merge" and len(inputs) < 2:
+        print("Se requieren al menos dos archivos para unir", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        jobs = build_jobs(args, inputs)
+    except ValueError as e:
+        print(f"Salidas en conflicto: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    out = open(args.results, "w", encoding="utf-8") if args.results else sys.stdout
+    try:
+        if args.queue:
+            submit_jobs(args.operation, jobs, JobStore(args.store), out)
+            return EXIT_OK
+        failures = run_jobs(args.operation, jobs, max(1, args.jobs), out)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return EXIT_FAILURES if failures else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
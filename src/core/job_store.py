@@ -0,0 +1,334 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED)
+
+HEARTBEAT_INTERVAL = 15.0
+HEARTBEAT_STALE = 4 * HEARTBEAT_INTERVAL
+
+
+def default_store_path() -> Path:
+    return Path.home() / ".xebec-pdf-fixer" / "jobs.db"
+
+
+def process_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":
+        return _process_alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _process_alive_windows(pid: int) -> bool:
+    # os.kill en Windows termina el proceso: se consulta su código de salida
+    import ctypes
+
+    process_query_limited_information = 0x1000
+    still_active = 259
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(process_query_limited_information, False, pid)
+    if not handle:
+        return False
+    try:
+        exit_code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return False
+        return exit_code.value == still_active
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str = STATUS_QUEUED
+    progress: float = 0.0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    cancel_requested: bool = False
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    owner_pid: Optional[int] = None
+    heartbeat_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "owner_pid": self.owner_pid,
+            "heartbeat_at": self.heartbeat_at,
+        }
+
+
+class JobStore:
+    """Almacén persistente de trabajos en SQLite, compartido por la GUI y la CLI."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress REAL NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            owner_pid INTEGER,
+            heartbeat_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+    """
+    # Columnas añadidas después de la primera versión del esquema
+    _MIGRATIONS = {
+        "owner_pid": "ALTER TABLE jobs ADD COLUMN owner_pid INTEGER",
+        "heartbeat_at": "ALTER TABLE jobs ADD COLUMN heartbeat_at TEXT",
+    }
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(self._SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        with self._transaction() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, statement in self._MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            progress=row["progress"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            attempts=row["attempts"],
+            cancel_requested=bool(row["cancel_requested"]),
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            owner_pid=row["owner_pid"],
+            heartbeat_at=row["heartbeat_at"],
+        )
+
+    def add(self, kind: str, payload: Dict[str, Any]) -> Job:
+        job = Job(id=uuid4().hex, kind=kind, payload=payload)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.kind, json.dumps(job.payload), job.status, job.created_at),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        if status:
+            rows = self._connection().execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status, limit),
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connection().execute(
+            "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def claim_next(self) -> Optional[Job]:
+        """Toma el trabajo en cola más antiguo a nombre de este proceso."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (STATUS_QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+            started_at = datetime.now().isoformat()
+            owner_pid = os.getpid()
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, "
+                "owner_pid = ?, heartbeat_at = ? WHERE id = ?",
+                (STATUS_RUNNING, started_at, owner_pid, started_at, row["id"]),
+            )
+        job = self._row_to_job(row)
+        job.status = STATUS_RUNNING
+        job.attempts += 1
+        job.started_at = started_at
+        job.owner_pid = owner_pid
+        job.heartbeat_at = started_at
+        return job
+
+    def update_progress(self, job_id: str, progress: float) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, heartbeat_at = ? WHERE id = ?",
+                (progress, datetime.now().isoformat(), job_id),
+            )
+
+    def heartbeat(self, owner_pid: Optional[int] = None) -> int:
+        """Renueva el latido de los trabajos en ejecución de este proceso."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND owner_pid = ?",
+                (datetime.now().isoformat(), STATUS_RUNNING, owner_pid or os.getpid()),
+            )
+            return cursor.rowcount
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = MAX(progress, ?), result = ?, error = ?, "
+                "finished_at = ? WHERE id = ?",
+                (
+                    status,
+                    1.0 if status == STATUS_COMPLETED else 0.0,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    datetime.now().isoformat(),
+                    job_id,
+                ),
+            )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancela un trabajo en cola; si ya está en ejecución solo marca la petición."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row["status"] == STATUS_QUEUED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+                    (STATUS_CANCELLED, datetime.now().isoformat(), job_id),
+                )
+                return STATUS_CANCELLED
+            if row["status"] == STATUS_RUNNING:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return row["status"]
+
+    @staticmethod
+    def _orphaned(row: sqlite3.Row, stale_before: str) -> bool:
+        """Un trabajo en ejecución queda huérfano si su proceso murió o dejó de latir."""
+        if row["owner_pid"] is None or row["heartbeat_at"] is None:
+            return True
+        if row["owner_pid"] != os.getpid() and not process_alive(row["owner_pid"]):
+            return True
+        # El PID puede haberse reutilizado tras un reinicio: el latido lo desmiente
+        return row["heartbeat_at"] < stale_before
+
+    def requeue_interrupted(self, max_attempts: int = 3, stale_after: float = HEARTBEAT_STALE) -> int:
+        """
+        Devuelve a la cola los trabajos que quedaron en ejecución tras un cierre. Los que
+        sigue atendiendo otro proceso vivo (otra ventana, un lote) no se tocan.
+        """
+        stale_before = datetime.fromtimestamp(datetime.now().timestamp() - stale_after).isoformat()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, attempts, owner_pid, heartbeat_at FROM jobs WHERE status = ?",
+                (STATUS_RUNNING,),
+            ).fetchall()
+            orphaned = [row for row in rows if self._orphaned(row, stale_before)]
+            exhausted = [row["id"] for row in orphaned if row["attempts"] >= max_attempts]
+            requeued = [row["id"] for row in orphaned if row["attempts"] < max_attempts]
+            conn.executemany(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, owner_pid = NULL WHERE id = ?",
+                [
+                    (STATUS_FAILED, "Interrupted too many times", datetime.now().isoformat(), job_id)
+                    for job_id in exhausted
+                ],
+            )
+            conn.executemany(
+                "UPDATE jobs SET status = ?, progress = 0, started_at = NULL, owner_pid = NULL, "
+                "heartbeat_at = NULL WHERE id = ?",
+                [(STATUS_QUEUED, job_id) for job_id in requeued],
+            )
+            return len(requeued)
+
+    def purge_finished(self) -> int:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({','.join('?' * len(FINISHED_STATUSES))})",
+                FINISHED_STATUSES,
+            )
+            return cursor.rowcount
@@ -0,0 +1,274 @@
+"""
+Historial de deshacer/rehacer de las ediciones de página.
+
+Cada operación (girar, eliminar, mover, insertar) se guarda como un delta que solo
+contiene las posiciones y entradas que toca, nunca una copia del documento ni de la lista
+de páginas: la memoria del historial no depende del tamaño del archivo. Las operaciones se
+aplican sobre la lista de trabajo y se deshacen aplicando su inversa; al guardar, la lista
+resultante se escribe de una vez con PDFPageEditor.save.
+"""
+
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from src.core.pdf_edit import PageSpec, identity_pages
+
+DEFAULT_HISTORY_MB = 4
+
+_OPERATION_BYTES = 160          # objeto, tupla y entrada en la pila
+_POSITION_BYTES = sys.getsizeof(2 ** 20) + 8
+_ENTRY_BYTES = sys.getsizeof((0, 0)) + 2 * _POSITION_BYTES
+
+
+def _pages_label(count: int) -> str:
+    return "1 página" if count == 1 else f"{count} páginas"
+
+
+class PageOperation(ABC):
+    """Delta invertible sobre la lista de páginas."""
+
+    @abstractmethod
+    def apply(self, pages: List[PageSpec]) -> None:
+        pass
+
+    @abstractmethod
+    def revert(self, pages: List[PageSpec]) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def size_bytes(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def description(self) -> str:
+        pass
+
+
+@dataclass(frozen=True)
+class RotatePages(PageOperation):
+    positions: Tuple[int, ...]
+    degrees: int
+
+    def apply(self, pages: List[PageSpec]) -> None:
+        self._rotate(pages, self.degrees)
+
+    def revert(self, pages: List[PageSpec]) -> None:
+        self._rotate(pages, -self.degrees)
+
+    def _rotate(self, pages: List[PageSpec], degrees: int) -> None:
+        for position in self.positions:
+            source, rotation = pages[position]
+            pages[position] = (source, (rotation + degrees) % 360)
+
+    @property
+    def size_bytes(self) -> int:
+        return _OPERATION_BYTES + _POSITION_BYTES * len(self.positions)
+
+    @property
+    def description(self) -> str:
+        return f"girar {_pages_label(len(self.positions))} {self.degrees}°"
+
+
+@dataclass(frozen=True)
+class DeletePages(PageOperation):
+    positions: Tuple[int, ...]          # ascendentes
+    removed: Tuple[PageSpec, ...]       # para poder deshacer
+
+    def apply(self, pages: List[PageSpec]) -> None:
+        for position in reversed(self.positions):
+            del pages[position]
+
+    def revert(self, pages: List[PageSpec]) -> None:
+        for position, entry in zip(self.positions, self.removed):
+            pages.insert(position, entry)
+
+    @property
+    def size_bytes(self) -> int:
+        return _OPERATION_BYTES + (_POSITION_BYTES + _ENTRY_BYTES) * len(self.positions)
+
+    @property
+    def description(self) -> str:
+        return f"eliminar {_pages_label(len(self.positions))}"
+
+
+@dataclass(frozen=True)
+class MovePages(PageOperation):
+    positions: Tuple[int, ...]          # ascendentes, antes de mover
+    target: int                         # posición del bloque una vez quitadas las páginas
+
+    def apply(self, pages: List[PageSpec]) -> None:
+        block = [pages[position] for position in self.positions]
+        for position in reversed(self.positions):
+            del pages[position]
+        pages[self.target:self.target] = block
+
+    def revert(self, pages: List[PageSpec]) -> None:
+        block = pages[self.target:self.target + len(self.positions)]
+        del pages[self.target:self.target + len(self.positions)]
+        for position, entry in zip(self.positions, block):
+            pages.insert(position, entry)
+
+    @property
+    def size_bytes(self) -> int:
+        return _OPERATION_BYTES + _POSITION_BYTES * (len(self.positions) + 1)
+
+    @property
+    def description(self) -> str:
+        return f"mover {_pages_label(len(self.positions))}"
+
+
+@dataclass(frozen=True)
+class InsertPages(PageOperation):
+    position: int
+    entries: Tuple[PageSpec, ...]
+
+    def apply(self, pages: List[PageSpec]) -> None:
+        pages[self.position:self.position] = self.entries
+
+    def revert(self, pages: List[PageSpec]) -> None:
+        del pages[self.position:self.position + len(self.entries)]
+
+    @property
+    def size_bytes(self) -> int:
+        return _OPERATION_BYTES + _POSITION_BYTES + _ENTRY_BYTES * len(self.entries)
+
+    @property
+    def description(self) -> str:
+        return f"insertar {_pages_label(len(self.entries))}"
+
+
+class PageHistory:
+    """
+    Lista de páginas de trabajo con su historial. La lista de partida (el documento
+    guardado) es inmutable; las operaciones más antiguas se descartan cuando el historial
+    supera budget_mb, y a partir de ahí ya no se pueden deshacer.
+    """
+
+    def __init__(self, page_count: int, budget_mb: float = DEFAULT_HISTORY_MB):
+        self.base: Tuple[PageSpec, ...] = tuple(identity_pages(page_count))
+        self._pages: List[PageSpec] = list(self.base)
+        self._budget = int(budget_mb * 1024 * 1024)
+        self._undo: List[PageOperation] = []
+        self._redo: List[PageOperation] = []
+        self._undo_bytes = 0
+        self._redo_bytes = 0
+        self.dropped = 0
+
+    @property
+    def pages(self) -> Tuple[PageSpec, ...]:
+        return tuple(self._pages)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __getitem__(self, position: int) -> PageSpec:
+        return self._pages[position]
+
+    @property
+    def modified(self) -> bool:
+        return self._pages != list(self.base)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._undo_bytes + self._redo_bytes
+
+    def position_of(self, source: int) -> Optional[int]:
+        """Primera posición en la que aparece la página source del documento guardado."""
+        for position, (page_source, _) in enumerate(self._pages):
+            if page_source == source:
+                return position
+        return None
+
+    # ===== Operaciones =====
+
+    def rotate(self, positions: Sequence[int], degrees: int) -> RotatePages:
+        if degrees % 90:
+            raise ValueError("El giro debe ser múltiplo de 90°")
+        return self._do(RotatePages(self._positions(positions), degrees))
+
+    def delete(self, positions: Sequence[int]) -> DeletePages:
+        positions = self._positions(positions)
+        if len(positions) >= len(self._pages):
+            raise ValueError("El documento debe conservar al menos una página")
+        return self._do(DeletePages(positions, tuple(self._pages[p] for p in positions)))
+
+    def move(self, positions: Sequence[int], target: int) -> MovePages:
+        """Mueve las páginas a target, contado sobre la lista sin ellas."""
+        positions = self._positions(positions)
+        if not 0 <= target <= len(self._pages) - len(positions):
+            raise ValueError("Posición de destino fuera del documento")
+        return self._do(MovePages(positions, target))
+
+    def insert(self, position: int, entries: Sequence[PageSpec]) -> InsertPages:
+        if not 0 <= position <= len(self._pages):
+            raise ValueError("Posición fuera del documento")
+        if any(not 0 <= source < len(self.base) for source, _ in entries):
+            raise ValueError("Hay páginas fuera del documento")
+        return self._do(InsertPages(position, tuple(entries)))
+
+    def duplicate(self, positions: Sequence[int]) -> InsertPages:
+        """Inserta una copia de las páginas a continuación de la última."""
+        positions = self._positions(positions)
+        return self.insert(positions[-1] + 1, [self._pages[p] for p in positions])
+
+    def _positions(self, positions: Sequence[int]) -> Tuple[int, ...]:
+        positions = tuple(sorted(set(positions)))
+        if not positions:
+            raise ValueError("No hay páginas seleccionadas")
+        if positions[0] < 0 or positions[-1] >= len(self._pages):
+            raise ValueError("Hay páginas fuera del documento")
+        return positions
+
+    def _do(self, operation: PageOperation) -> PageOperation:
+        operation.apply(self._pages)
+        self._undo.append(operation)
+        self._undo_bytes += operation.size_bytes
+        self._redo.clear()
+        self._redo_bytes = 0
+        self._trim()
+        return operation
+
+    def undo(self) -> Optional[PageOperation]:
+        if not self._undo:
+            return None
+        operation = self._undo.pop()
+        self._undo_bytes -= operation.size_bytes
+        operation.revert(self._pages)
+        self._redo.append(operation)
+        self._redo_bytes += operation.size_bytes
+        return operation
+
+    def redo(self) -> Optional[PageOperation]:
+        if not self._redo:
+            return None
+        operation = self._redo.pop()
+        self._redo_bytes -= operation.size_bytes
+        operation.apply(self._pages)
+        self._undo.append(operation)
+        self._undo_bytes += operation.size_bytes
+        return operation
+
+    def _trim(self) -> None:
+        # Se conserva siempre la última operación, aunque por sí sola supere el presupuesto
+        excess = self._undo_bytes - self._budget
+        if excess <= 0:
+            return
+        drop = 0
+        while drop < len(self._undo) - 1 and excess > 0:
+            excess -= self._undo[drop].size_bytes
+            self._undo_bytes -= self._undo[drop].size_bytes
+            drop += 1
+        del self._undo[:drop]
+        self.dropped += drop
@@ -0,0 +1,338 @@
+import hashlib
+import math
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image
+from pypdf import PdfReader
+from pypdf.generic import DictionaryObject, IndirectObject, NameObject, NumberObject
+
+from src.core.pdf_io import open_worker_reader, worker_reader
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    file_id_for,
+    opened_reader,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+DEFAULT_DPI = 150
+DEFAULT_QUALITY = 75
+
+# Ajustes que ofrecen la interfaz y la línea de órdenes: (ppp objetivo, calidad JPEG)
+COMPRESS_PRESETS = {
+    "high": (200, 85),
+    "balanced": (DEFAULT_DPI, DEFAULT_QUALITY),
+    "max": (96, 60),
+}
+
+MIN_IMAGE_BYTES = 16 * 1024     # las imágenes más pequeñas no compensan el trabajo
+MIN_SCALE_GAIN = 0.9            # no se reduce una imagen si solo perdería menos de un 10 %
+MIN_SIZE_GAIN = 0.95            # ni se sustituye si el resultado no ahorra al menos un 5 %
+PARALLEL_MIN_IMAGES = 4
+
+# Entradas que cambian cómo se decodifican los mismos bytes: dos imágenes solo son
+# duplicadas si coinciden también en ellas
+_DIGEST_KEYS = (
+    "/Width", "/Height", "/BitsPerComponent", "/ColorSpace", "/Filter", "/DecodeParms",
+    "/Decode", "/ImageMask", "/Mask", "/Intent",
+)
+
+_MODES = {"/DeviceGray": "L", "/CalGray": "L", "/DeviceRGB": "RGB", "/CalRGB": "RGB"}
+_ICC_MODES = {1: "L", 3: "RGB"}
+
+ImageKey = Tuple[int, int]
+# (datos, filtro, ancho, alto) o None si la imagen se deja como está
+Recompressed = Optional[Tuple[bytes, str, int, int]]
+
+
+@dataclass
+class CompressionReport:
+    input_size: int = 0
+    output_size: int = 0
+    images: int = 0
+    recompressed: int = 0
+    downsampled: int = 0
+    duplicates: int = 0
+    deduplicated_objects: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.input_size - self.output_size
+
+    @property
+    def ratio(self) -> float:
+        return self.output_size / self.input_size if self.input_size else 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+            "bytes_saved": self.bytes_saved,
+            "ratio": round(self.ratio, 4),
+            "images": self.images,
+            "recompressed": self.recompressed,
+            "downsampled": self.downsampled,
+            "duplicates": self.duplicates,
+            "deduplicated_objects": self.deduplicated_objects,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+def _image_mode(color_space: Any) -> Optional[str]:
+    color_space = color_space.get_object() if color_space is not None else None
+    if isinstance(color_space, list) and len(color_space) == 2 and color_space[0] == "/ICCBased":
+        return _ICC_MODES.get(color_space[1].get_object().get("/N"))
+    return _MODES.get(color_space)
+
+
+def _page_images(resources: Any, seen: set) -> Iterator[IndirectObject]:
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    for ref in xobjects.values():
+        if not isinstance(ref, IndirectObject) or (ref.idnum, ref.generation) in seen:
+            continue
+        seen.add((ref.idnum, ref.generation))
+        xobject = ref.get_object()
+        if not isinstance(xobject, DictionaryObject):
+            continue
+        if xobject.get("/Subtype") == "/Image":
+            yield ref
+        elif xobject.get("/Subtype") == "/Form":
+            yield from _page_images(xobject.get("/Resources"), seen)
+
+
+def _collect_images(reader: PdfReader) -> Dict[ImageKey, float]:
+    """
+    Imágenes de todas las páginas con el lado mayor, en puntos, de la página más grande
+    en que aparecen. Una imagen nunca se muestra más grande que su página, así que medir
+    la resolución contra la página no reduce nunca por debajo de los ppp pedidos.
+    """
+    images: Dict[ImageKey, float] = {}
+    for page in reader.pages:
+        box = page.mediabox
+        extent = float(max(box.width, box.height))
+        for ref in _page_images(page.get("/Resources"), set()):
+            key = (ref.idnum, ref.generation)
+            images[key] = max(images.get(key, 0.0), extent)
+    return images
+
+
+def _image_digest(image: DictionaryObject) -> bytes:
+    digest = hashlib.blake2b(image._data, digest_size=20)
+    for key in _DIGEST_KEYS:
+        value = image.get(key)
+        if value is None:
+            continue
+        # Serializado como en el archivo: las referencias quedan como "n g R"
+        entry = BytesIO()
+        value.write_to_stream(entry)
+        digest.update(key.encode("latin-1") + b"\0" + entry.getvalue() + b"\0")
+    return digest.digest()
+
+
+def _recompress(reader: PdfReader, num: int, gen: int, max_pixels: int, quality: int) -> Recompressed:
+    try:
+        return _encode_image(reader.get_object(IndirectObject(num, gen, reader)), max_pixels, quality)
+    except Exception:
+        # Una imagen que no se puede decodificar se copia tal cual; validate_deep la señala
+        return None
+
+
+def _encode_image(image: DictionaryObject, max_pixels: int, quality: int) -> Recompressed:
+    """
+    Decodifica la imagen, la reduce para que su lado mayor no pase de max_pixels y la
+    vuelve a codificar: JPEG para fotografías y Flate para gráficos de pocos colores,
+    que el JPEG emborronaría. Las imágenes que no se pueden tratar sin perder
+    información (máscaras, CMYK, paletas, profundidades distintas de 8 bits) se dejan igual.
+    """
+    if (
+        image.get("/ImageMask") or "/Mask" in image or "/Decode" in image
+        or image.get("/BitsPerComponent", 8) != 8
+    ):
+        return None
+    mode = _image_mode(image.get("/ColorSpace"))
+    if mode is None:
+        return None
+    width, height = image["/Width"], image["/Height"]
+    scale = min(1.0, max_pixels / max(width, height))
+    if scale > MIN_SCALE_GAIN:
+        scale = 1.0
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    filters = image.get("/Filter")
+    filters = [filters] if not isinstance(filters, list) else list(filters)
+    lossy = bool(filters) and filters[-1] == "/DCTDecode"
+    if lossy:
+        picture = Image.open(BytesIO(image.get_data()))
+        # Para JPEG, Pillow puede decodificar directamente a 1/2, 1/4 o 1/8 del tamaño
+        picture.draft(mode, size)
+        if picture.mode != mode:
+            return None
+    elif filters and filters[-1] != "/FlateDecode" and filters[-1] != "/LZWDecode":
+        return None
+    else:
+        data = image.get_data()
+        expected = width * height * len(mode)
+        if len(data) < expected:
+            return None
+        picture = Image.frombytes(mode, (width, height), data[:expected])
+
+    if picture.size != size:
+        picture = picture.resize(size, Image.Resampling.LANCZOS)
+
+    if not lossy and picture.getcolors(256) is not None:
+        encoded, codec = zlib.compress(picture.tobytes(), 9), "/FlateDecode"
+    else:
+        buffer = BytesIO()
+        picture.save(buffer, "JPEG", quality=quality, optimize=True)
+        encoded, codec = buffer.getvalue(), "/DCTDecode"
+
+    if scale == 1.0 and len(encoded) >= len(image._data) * MIN_SIZE_GAIN:
+        return None
+    return encoded, codec, picture.width, picture.height
+
+
+def _recompress_in_worker(num: int, gen: int, max_pixels: int, quality: int) -> Recompressed:
+    return _recompress(worker_reader(), num, gen, max_pixels, quality)
+
+
+def _replace_image(image: DictionaryObject, result: Tuple[bytes, str, int, int]) -> None:
+    data, codec, width, height = result
+    image._data = data
+    image[NameObject("/Filter")] = NameObject(codec)
+    image[NameObject("/Width")] = NumberObject(width)
+    image[NameObject("/Height")] = NumberObject(height)
+    image[NameObject("/BitsPerComponent")] = NumberObject(8)
+    image.pop("/DecodeParms", None)
+
+
+class PDFCompressor:
+    @staticmethod
+    def compress(
+        input_path: Path,
+        output_path: Path,
+        target_dpi: int = DEFAULT_DPI,
+        quality: int = DEFAULT_QUALITY,
+        workers: Optional[int] = None,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[CompressionReport]]:
+        """
+        Reduce el tamaño del PDF recomprimiendo sus imágenes: las que superan target_dpi
+        se reducen a esa resolución y todas se vuelven a codificar si así ocupan menos.
+        Las imágenes repetidas se procesan una vez y se escriben una sola vez.
+        Con linearize, la salida se escribe linealizada (vista web rápida).
+        """
+        started = time.perf_counter()
+        input_path = Path(input_path)
+        output = None
+        try:
+            report = CompressionReport(input_size=input_path.stat().st_size)
+            with opened_reader(input_path) as reader:
+                images = _collect_images(reader)
+                report.images = len(images)
+
+                # Imágenes idénticas: se recomprime una y el resultado se aplica a todas
+                groups: Dict[bytes, List[ImageKey]] = {}
+                extents: Dict[bytes, float] = {}
+                for key, extent in images.items():
+                    image = reader.get_object(IndirectObject(key[0], key[1], reader))
+                    if len(image._data) < MIN_IMAGE_BYTES:
+                        continue
+                    digest = _image_digest(image)
+                    groups.setdefault(digest, []).append(key)
+                    extents[digest] = max(extents.get(digest, 0.0), extent)
+                report.duplicates = sum(len(keys) - 1 for keys in groups.values())
+
+                tasks = [
+                    (digest, keys[0][0], keys[0][1], math.ceil(target_dpi * extents[digest] / 72))
+                    for digest, keys in groups.items()
+                ]
+                results = PDFCompressor._run(
+                    input_path, reader, tasks, quality, workers, progress_callback, cancel_event,
+                )
+                for digest, result in results.items():
+                    if result is None:
+                        continue
+                    first = reader.get_object(IndirectObject(*groups[digest][0], reader))
+                    downsampled = result[2] < first["/Width"]
+                    for key in groups[digest]:
+                        _replace_image(reader.get_object(IndirectObject(key[0], key[1], reader)), result)
+                        report.recompressed += 1
+                        report.downsampled += downsampled
+
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                output = PDFOutputFile(output_path, linearize=linearize)
+                output.writer.add_document(reader)
+                report.deduplicated_objects = output.writer.deduplicated
+            output.commit(file_id_for(input_path, target_dpi, quality))
+            report.output_size = Path(output_path).stat().st_size
+            report.elapsed = time.perf_counter() - started
+            return True, None, report
+        except OperationCancelled:
+            if output is not None:
+                output.discard()
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            if output is not None:
+                output.discard()
+            return False, str(e), None
+
+    @staticmethod
+    def _run(
+        input_path: Path,
+        reader: PdfReader,
+        tasks: List[Tuple[bytes, int, int, int]],
+        quality: int,
+        workers: Optional[int],
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> Dict[bytes, Recompressed]:
+        total = len(tasks)
+        results: Dict[bytes, Recompressed] = {}
+        workers = workers or min(os.cpu_count() or 1, 8)
+        if workers <= 1 or total < PARALLEL_MIN_IMAGES:
+            for done, (digest, num, gen, max_pixels) in enumerate(tasks, start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                results[digest] = _recompress(reader, num, gen, max_pixels, quality)
+                if progress_callback:
+                    progress_callback(done, total)
+            return results
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=open_worker_reader, initargs=(str(input_path),),
+        ) as executor:
+            pending = {
+                executor.submit(_recompress_in_worker, num, gen, max_pixels, quality): digest
+                for digest, num, gen, max_pixels in tasks
+            }
+            try:
+                while pending:
+                    finished, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    for future in finished:
+                        results[pending.pop(future)] = future.result()
+                        if progress_callback:
+                            progress_callback(len(results), total)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        return results
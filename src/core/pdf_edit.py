@@ -0,0 +1,376 @@
+"""
+Guardado de las ediciones de página (girar, eliminar, reordenar).
+
+El guardado normal es una actualización incremental: se añaden al final del archivo solo
+los objetos que cambian (las páginas giradas y los nodos del árbol de páginas cuyos /Kids
+o /Count cambian) y una nueva sección de la tabla de referencias que apunta a la anterior
+con /Prev. El resto del archivo no se lee ni se escribe, así que el coste del guardado
+depende de la edición y no del tamaño del documento.
+
+El guardado optimizado reescribe el documento completo (como la reparación) y elimina
+las versiones anteriores de los objetos que han ido acumulando las actualizaciones.
+"""
+
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject
+
+from src.core.pdf_io import map_file, mapped_reader
+from src.core.pdf_probe import StructureError, XrefReader
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    file_id_for,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+ObjectKey = Tuple[int, int]
+# Página del resultado: (índice de la página en el archivo guardado, giro añadido en grados).
+# Una página puede aparecer varias veces; las repeticiones se escriben como copias.
+PageSpec = Tuple[int, int]
+
+SAVE_INCREMENTAL = "incremental"
+SAVE_OPTIMIZED = "optimized"
+
+
+@dataclass
+class SaveReport:
+    mode: str
+    file_size: int = 0
+    bytes_written: int = 0
+    objects_written: int = 0
+    page_count: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "file_size": self.file_size,
+            "bytes_written": self.bytes_written,
+            "objects_written": self.objects_written,
+            "page_count": self.page_count,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+def identity_pages(page_count: int) -> List[PageSpec]:
+    return [(index, 0) for index in range(page_count)]
+
+
+def _check_pages(pages: Sequence[PageSpec], page_count: int) -> None:
+    if not pages:
+        raise ValueError("El documento debe conservar al menos una página")
+    sources = [source for source, _ in pages]
+    if any(not 0 <= source < page_count for source in sources):
+        raise ValueError("Hay páginas fuera del documento")
+    if any(rotation % 90 for _, rotation in pages):
+        raise ValueError("El giro debe ser múltiplo de 90°")
+
+
+def _occurrences(source_pages: List[DictionaryObject], pages: Sequence[PageSpec]) -> List[Tuple[DictionaryObject, bool]]:
+    """
+    Diccionario de página para cada entrada de pages y si es una copia. La primera
+    aparición de cada página usa el objeto original; las siguientes, una copia sin
+    anotaciones (cada anotación pertenece a una sola página).
+    """
+    result, seen = [], set()
+    for source, _ in pages:
+        if source in seen:
+            original = source_pages[source]
+            result.append((DictionaryObject({k: v for k, v in original.items() if k != "/Annots"}), True))
+        else:
+            seen.add(source)
+            result.append((source_pages[source], False))
+    return result
+
+
+def _rotate(page: DictionaryObject, rotation: int) -> None:
+    page[NameObject("/Rotate")] = NumberObject((int(page.get("/Rotate", 0)) + rotation) % 360)
+
+
+def _key(ref: IndirectObject) -> ObjectKey:
+    return ref.idnum, ref.generation
+
+
+def _serialize(obj: Any) -> bytes:
+    buffer = BytesIO()
+    obj.write_to_stream(buffer)
+    return buffer.getvalue()
+
+
+# ===== Actualización incremental =====
+
+class _PageTree:
+    """Nodos del árbol de páginas con sus hijos, recorrido desde la raíz."""
+
+    def __init__(self, reader: PdfReader):
+        root_ref = reader.trailer["/Root"].get_object().raw_get("/Pages")
+        self.root = _key(root_ref)
+        self.nodes: Dict[ObjectKey, DictionaryObject] = {}
+        self.parent: Dict[ObjectKey, ObjectKey] = {}
+        stack = [root_ref]
+        while stack:
+            ref = stack.pop()
+            node = ref.get_object()
+            if node.get("/Type") == "/Pages" or "/Kids" in node:
+                self.nodes[_key(ref)] = node
+                for kid in node.get("/Kids", []):
+                    if isinstance(kid, IndirectObject) and _key(kid) not in self.nodes:
+                        self.parent[_key(kid)] = _key(ref)
+                        stack.append(kid)
+
+    def remove(self, page: ObjectKey, changed: Dict[ObjectKey, DictionaryObject]) -> None:
+        """Quita la página de los /Kids de su nodo y descuenta /Count en todos sus antecesores."""
+        node_key = self.parent[page]
+        node = self.nodes[node_key]
+        node[NameObject("/Kids")] = ArrayObject(kid for kid in node["/Kids"] if _key(kid) != page)
+        while node_key is not None:
+            node = self.nodes[node_key]
+            node[NameObject("/Count")] = NumberObject(node.get("/Count", 1) - 1)
+            changed[node_key] = node
+            node_key = self.parent.get(node_key)
+
+
+def _changed_objects(
+    reader: PdfReader, pages: Sequence[PageSpec], allocate: Callable[[], int],
+) -> Dict[ObjectKey, DictionaryObject]:
+    """Objetos que hay que volver a escribir para pasar del documento actual a pages."""
+    source_pages = list(reader.pages)
+    refs = [page.indirect_reference for page in source_pages]
+    tree = _PageTree(reader)
+    root_ref = reader.trailer["/Root"].get_object().raw_get("/Pages")
+    changed: Dict[ObjectKey, DictionaryObject] = {}
+
+    # Pares (referencia, página) en el orden final; las copias reciben número nuevo
+    entries = []
+    for (source, _), (page, is_copy) in zip(pages, _occurrences(source_pages, pages)):
+        if is_copy:
+            ref = IndirectObject(allocate(), 0, reader)
+            page[NameObject("/Parent")] = root_ref
+            changed[_key(ref)] = page
+            entries.append((ref, page))
+        else:
+            entries.append((refs[source], page))
+
+    sources = [source for source, _ in pages]
+    if all(a < b for a, b in zip(sources, sources[1:])):
+        # Solo se eliminan páginas: se actualizan sus nodos y los antecesores
+        for index in sorted(set(range(len(refs))) - set(sources)):
+            tree.remove(_key(refs[index]), changed)
+    else:
+        # El orden cambia: la raíz pasa a tener todas las páginas como hijos directos.
+        # Las que colgaban de otro nodo se reescriben con los atributos que heredaban
+        # (pypdf ya los copia en la página al leer el árbol).
+        root = tree.nodes[tree.root]
+        root[NameObject("/Kids")] = ArrayObject(ref for ref, _ in entries)
+        root[NameObject("/Count")] = NumberObject(len(entries))
+        changed[tree.root] = root
+        for ref, page in entries:
+            if _key(ref) not in changed and tree.parent.get(_key(ref)) != tree.root:
+                page[NameObject("/Parent")] = root_ref
+                changed[_key(ref)] = page
+
+    for (ref, page), (_, rotation) in zip(entries, pages):
+        if rotation % 360:
+            _rotate(page, rotation)
+            changed[_key(ref)] = page
+    return changed
+
+
+class IncrementalUpdate:
+    """
+    Añade al final de un PDF una actualización con los objetos indicados. La sección de
+    referencias nueva es del mismo tipo que la última del archivo (tabla clásica o stream)
+    y enlaza con ella por /Prev.
+    """
+
+    def __init__(self, path: Path, reader: PdfReader, xref: XrefReader):
+        self.path = Path(path)
+        self.reader = reader
+        self.prev = xref.startxref
+        self.size = int(xref.trailer.get("/Size", 0))
+        self.xref_stream = xref.sections[0].rows is not None
+
+    def allocate(self) -> int:
+        """Número para un objeto nuevo."""
+        self.size += 1
+        return self.size - 1
+
+    def _trailer_entries(self, file_id: bytes) -> bytes:
+        trailer = self.reader.trailer
+        parts = [b"/Root " + _serialize(trailer.raw_get("/Root"))]
+        if "/Info" in trailer:
+            parts.append(b"/Info " + _serialize(trailer.raw_get("/Info")))
+        original_id = trailer.get("/ID")
+        first = bytes(original_id[0].original_bytes).hex().encode("ascii") if original_id else file_id
+        parts.append(b"/ID [<%s> <%s>]" % (first, file_id))
+        parts.append(b"/Prev %d" % self.prev)
+        return b" ".join(parts)
+
+    def write(self, objects: Dict[ObjectKey, DictionaryObject], file_id: bytes) -> int:
+        """Escribe la actualización y devuelve los bytes añadidos; si falla, el archivo queda como estaba."""
+        with open(self.path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            original_size = f.tell()
+            try:
+                f.seek(original_size - 1)
+                if f.read(1) not in (b"\n", b"\r"):
+                    f.write(b"\n")
+                offsets: Dict[int, Tuple[int, int]] = {}
+                for (num, gen), obj in sorted(objects.items()):
+                    offsets[num] = (f.tell(), gen)
+                    f.write(b"%d %d obj\n" % (num, gen) + _serialize(obj) + b"\nendobj\n")
+                if self.xref_stream:
+                    self._write_xref_stream(f, offsets, file_id)
+                else:
+                    self._write_xref_table(f, offsets, file_id)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.truncate(original_size)
+                raise
+            return f.tell() - original_size
+
+    def _write_xref_table(self, f, offsets: Dict[int, Tuple[int, int]], file_id: bytes) -> None:
+        xref_offset = f.tell()
+        f.write(b"xref\n")
+        for first, nums in _runs(sorted(offsets)):
+            f.write(b"%d %d\n" % (first, len(nums)))
+            for num in nums:
+                f.write(b"%010d %05d n \n" % offsets[num])
+        size = max([self.size] + [num + 1 for num in offsets])
+        f.write(b"trailer\n<</Size %d %s>>\n" % (size, self._trailer_entries(file_id)))
+        f.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+
+    def _write_xref_stream(self, f, offsets: Dict[int, Tuple[int, int]], file_id: bytes) -> None:
+        num = max([self.size] + [n + 1 for n in offsets])
+        xref_offset = f.tell()
+        offsets = {**offsets, num: (xref_offset, 0)}
+        width = max(1, (xref_offset.bit_length() + 7) // 8)
+        index, rows = [], []
+        for first, nums in _runs(sorted(offsets)):
+            index.append(b"%d %d" % (first, len(nums)))
+            for obj_num in nums:
+                offset, gen = offsets[obj_num]
+                rows.append(b"\x01" + offset.to_bytes(width, "big") + gen.to_bytes(2, "big"))
+        content = zlib.compress(b"".join(rows))
+        f.write(b"%d 0 obj\n" % num)
+        f.write(
+            b"<</Type /XRef /Size %d /W [1 %d 2] /Index [%s] %s /Filter /FlateDecode /Length %d>>\n"
+            % (num + 1, width, b" ".join(index), self._trailer_entries(file_id), len(content))
+        )
+        f.write(b"stream\n" + content + b"\nendstream\nendobj\n")
+        f.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+
+
+def _runs(nums: List[int]) -> List[Tuple[int, List[int]]]:
+    """Agrupa números ordenados en tramos consecutivos (subsecciones de la tabla)."""
+    runs: List[Tuple[int, List[int]]] = []
+    for num in nums:
+        if runs and runs[-1][1][-1] == num - 1:
+            runs[-1][1].append(num)
+        else:
+            runs.append((num, [num]))
+    return runs
+
+
+class PDFPageEditor:
+    @staticmethod
+    def save(
+        path: Path,
+        pages: Sequence[PageSpec],
+        optimize: bool = False,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[SaveReport]]:
+        """
+        Guarda sobre path el documento formado por pages. Sin optimize se añade una
+        actualización incremental con los objetos que cambian; con optimize (o si el
+        archivo no admite actualizaciones) se reescribe entero, linealizado si se pide.
+        """
+        started = time.perf_counter()
+        path = Path(path)
+        try:
+            if optimize:
+                report = PDFPageEditor._rewrite(path, pages, linearize, progress_callback, cancel_event)
+            else:
+                report = PDFPageEditor._append(path, pages)
+            report.file_size = path.stat().st_size
+            report.elapsed = time.perf_counter() - started
+            return True, None, report
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            return False, str(e), None
+
+    @staticmethod
+    def _append(path: Path, pages: Sequence[PageSpec]) -> SaveReport:
+        data = map_file(path)
+        try:
+            xref = XrefReader(data)
+        except StructureError as e:
+            raise ValueError(
+                f"La tabla de referencias está dañada ({e}); use el guardado optimizado"
+            )
+        finally:
+            data.close()
+        if xref.is_encrypted:
+            raise ValueError("Los archivos cifrados no admiten guardado incremental; use el guardado optimizado")
+
+        with mapped_reader(path) as reader:
+            _check_pages(pages, len(reader.pages))
+            update = IncrementalUpdate(path, reader, xref)
+            changed = _changed_objects(reader, pages, update.allocate)
+            report = SaveReport(SAVE_INCREMENTAL, objects_written=len(changed), page_count=len(pages))
+            if changed:
+                report.bytes_written = update.write(changed, file_id_for(path, xref.startxref, *pages))
+        return report
+
+    @staticmethod
+    def _rewrite(
+        path: Path,
+        pages: Sequence[PageSpec],
+        linearize: bool,
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> SaveReport:
+        output = PDFOutputFile(path, linearize=linearize)
+        try:
+            with mapped_reader(path) as reader:
+                if reader.is_encrypted and not reader.decrypt(""):
+                    raise ValueError(f"El archivo {path.name} está protegido con contraseña")
+                _check_pages(pages, len(reader.pages))
+                selected = _occurrences(list(reader.pages), pages)
+                output.writer.begin_document(reader, [page for page, is_copy in selected if not is_copy])
+                for done, ((_, rotation), (page, _)) in enumerate(zip(pages, selected), start=1):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    if rotation % 360:
+                        _rotate(page, rotation)
+                    output.writer.add_page(page)
+                    if progress_callback:
+                        progress_callback(done, len(pages))
+                # Las etiquetas de página y la estructura solo siguen valiendo si no se movió ni quitó ninguna
+                in_order = [source for source, _ in pages] == list(range(len(reader.pages)))
+                output.writer.copy_document_data(reader, whole_document=in_order)
+                file_id = file_id_for(path, *pages)
+            # El archivo de origen ya no está proyectado cuando se sustituye
+            output.commit(file_id)
+        except BaseException:
+            output.discard()
+            raise
+        report = SaveReport(SAVE_OPTIMIZED, page_count=len(pages))
+        report.objects_written = len(output.writer.offsets) - 1
+        report.bytes_written = path.stat().st_size
+        return report
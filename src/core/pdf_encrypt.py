@@ -0,0 +1,521 @@
+"""
+Cifrado, descifrado y cambio de permisos (gestor de seguridad estándar de PDF).
+
+El archivo se reescribe objeto a objeto conservando su numeración: cada objeto se lee (y se
+descifra, si el original estaba cifrado), se cifra con la clave que le corresponde y se
+escribe al disco antes de pasar al siguiente. En memoria solo hay un objeto a la vez, así
+que un archivo enorme no necesita un buffer de su tamaño.
+
+AES usa el proveedor criptográfico de pypdf (el paquete cryptography); sin él solo está
+disponible RC4. Los lotes se reparten entre procesos, un archivo por tarea.
+"""
+
+import itertools
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pypdf
+from pypdf import PasswordType, PdfReader
+from pypdf.constants import UserAccessPermissions
+from pypdf.generic import IndirectObject, NameObject, NumberObject, StreamObject
+
+from src.core.pdf_io import mapped_reader
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    FLATE_LEVEL,
+    OBJECTS_PER_STREAM,
+    OperationCancelled,
+    file_id_for,
+)
+
+try:
+    from pypdf._encryption import EncryptAlgorithm, Encryption
+except ImportError:
+    EncryptAlgorithm = Encryption = None
+
+ProgressCallback = Callable[[int, int], None]
+
+# Este módulo usa internos de pypdf (_encryption, _crypt_providers, xref_objStm,
+# resolved_objects) que cambian entre versiones mayores; probado con pypdf 6.20.1
+PYPDF_MIN_VERSION = (6, 0)
+
+ENCRYPTION_ALGORITHMS = ("AES-256", "AES-128", "RC4-128", "RC4-40")
+DEFAULT_ALGORITHM = "AES-256"
+
+# Permisos que se conceden a quien abre con la contraseña de usuario
+PERMISSIONS: Dict[str, int] = {
+    "print": UserAccessPermissions.PRINT | UserAccessPermissions.PRINT_TO_REPRESENTATION,
+    "modify": UserAccessPermissions.MODIFY,
+    "copy": UserAccessPermissions.EXTRACT | UserAccessPermissions.EXTRACT_TEXT_AND_GRAPHICS,
+    "annotate": UserAccessPermissions.ADD_OR_MODIFY,
+    "forms": UserAccessPermissions.FILL_FORM_FIELDS,
+    "assemble": UserAccessPermissions.ASSEMBLE_DOC,
+}
+ALL_PERMISSIONS = tuple(PERMISSIONS)
+
+OPERATION_ENCRYPT = "encrypt"
+OPERATION_DECRYPT = "decrypt"
+
+_PROGRESS_EVERY = 64        # objetos entre avisos de progreso y comprobaciones de cancelación
+_SKIPPED_TYPES = ("/XRef", "/ObjStm")
+
+
+@dataclass
+class EncryptionReport:
+    input_path: str
+    output_path: str
+    operation: str
+    algorithm: Optional[str] = None
+    permissions: List[str] = field(default_factory=list)
+    objects: int = 0
+    input_size: int = 0
+    output_size: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input_path": self.input_path,
+            "output_path": self.output_path,
+            "operation": self.operation,
+            "algorithm": self.algorithm,
+            "permissions": self.permissions,
+            "objects": self.objects,
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+def _version(text: str) -> Tuple[int, ...]:
+    parts = []
+    for part in text.split(".")[:2]:
+        digits = "".join(itertools.takewhile(str.isdigit, part))
+        parts.append(int(digits or 0))
+    return tuple(parts)
+
+
+def unsupported_pypdf() -> Optional[str]:
+    """Mensaje de error si la versión instalada de pypdf no es compatible con este módulo."""
+    if Encryption is not None and _version(pypdf.__version__) >= PYPDF_MIN_VERSION:
+        return None
+    required = ".".join(str(part) for part in PYPDF_MIN_VERSION)
+    return (
+        f"El cifrado requiere pypdf>={required} (instalada: {pypdf.__version__}); "
+        f"actualice con: pip install -U \"pypdf>={required}\""
+    )
+
+
+def aes_available() -> bool:
+    try:
+        from pypdf._crypt_providers import crypt_provider
+    except ImportError:
+        return False
+    return crypt_provider[0] != "local_crypt_fallback"
+
+
+def available_algorithms() -> List[str]:
+    if unsupported_pypdf():
+        return []
+    return [alg for alg in ENCRYPTION_ALGORITHMS if aes_available() or not alg.startswith("AES")]
+
+
+def permission_flags(allowed: Iterable[str]) -> int:
+    """Valor de /P que concede solo los permisos indicados (nombres de PERMISSIONS)."""
+    flags = UserAccessPermissions.all()
+    for name, bits in PERMISSIONS.items():
+        if name not in allowed:
+            flags &= ~bits
+    return int(flags)
+
+
+def permissions_of(flags: int) -> List[str]:
+    return [name for name, bits in PERMISSIONS.items() if flags & bits == bits]
+
+
+def default_output_path(input_path: Path, operation: str) -> Path:
+    suffix = ".protected.pdf" if operation == OPERATION_ENCRYPT else ".unlocked.pdf"
+    return Path(input_path).with_suffix(suffix)
+
+
+@contextmanager
+def _opened(input_path: Path, password: str, need_owner: bool) -> Iterator[PdfReader]:
+    """
+    Abre el original durante el bloque; si está cifrado, password debe abrirlo. Con
+    need_owner, y si el archivo restringe algún permiso, solo vale la contraseña de
+    propietario. La salida se confirma fuera del bloque, porque puede sustituir al original.
+    """
+    with mapped_reader(input_path) as reader:
+        _unlock(reader, Path(input_path).name, password, need_owner)
+        yield reader
+
+
+def _unlock(reader: PdfReader, name: str, password: str, need_owner: bool) -> None:
+    if not reader.is_encrypted:
+        return
+    result = reader.decrypt(password or "")
+    if not result:
+        if password:
+            raise ValueError(f"La contraseña no abre el archivo {name}")
+        raise ValueError(f"El archivo {name} está protegido con contraseña")
+    restricted = permissions_of(int(reader.trailer["/Encrypt"].get("/P", -1))) != list(ALL_PERMISSIONS)
+    if need_owner and restricted and result != PasswordType.OWNER_PASSWORD:
+        raise ValueError(f"Cambiar la protección de {name} requiere la contraseña de propietario")
+
+
+def _object_keys(reader: PdfReader) -> List[Tuple[int, int]]:
+    keys = {(num, gen) for gen, entries in reader.xref.items() for num in entries}
+    keys.update((num, 0) for num in reader.xref_objStm)
+    return sorted(keys)
+
+
+class _SecureWriter:
+    """
+    Salida de _write. Si el original usaba streams de objetos (PDF 1.5), los objetos que no
+    son streams se vuelven a agrupar y la tabla de referencias se escribe como stream: la
+    salida no crece al cifrar archivos compactos. Dentro de un stream de objetos las cadenas
+    no se cifran una a una, se cifra el stream entero.
+    """
+
+    def __init__(self, f: BinaryIO, encryption: Optional[Encryption], next_num: int, compact: bool):
+        self.f = f
+        self.encryption = encryption
+        self.next_num = next_num
+        self.compact = compact
+        self.locations: Dict[int, Tuple[int, int, int]] = {}   # num -> (tipo, campo 2, campo 3) de la xref
+        self._packed: List[Tuple[int, bytes]] = []
+
+    def allocate(self) -> int:
+        self.next_num += 1
+        return self.next_num - 1
+
+    def add(self, num: int, gen: int, obj: Any) -> None:
+        if self.compact and gen == 0 and not isinstance(obj, StreamObject):
+            buffer = BytesIO()
+            obj.write_to_stream(buffer)
+            self._packed.append((num, buffer.getvalue()))
+            if len(self._packed) >= OBJECTS_PER_STREAM:
+                self.flush_packed()
+            return
+        self.write(num, gen, self.encryption.encrypt_object(obj, num, gen) if self.encryption else obj)
+
+    def write(self, num: int, gen: int, obj: Any) -> None:
+        self.locations[num] = (1, self.f.tell(), gen)
+        self.f.write(b"%d %d obj\n" % (num, gen))
+        obj.write_to_stream(self.f)
+        self.f.write(b"\nendobj\n")
+
+    def flush_packed(self) -> None:
+        if not self._packed:
+            return
+        num = self.allocate()
+        index, position = [], 0
+        for obj_num, data in self._packed:
+            index.append(b"%d %d" % (obj_num, position))
+            position += len(data) + 1
+        header = b" ".join(index) + b"\n"
+        stream = StreamObject()
+        stream.set_data(zlib.compress(header + b"\n".join(data for _, data in self._packed), FLATE_LEVEL))
+        stream.update({
+            NameObject("/Type"): NameObject("/ObjStm"),
+            NameObject("/N"): NumberObject(len(self._packed)),
+            NameObject("/First"): NumberObject(len(header)),
+            NameObject("/Filter"): NameObject("/FlateDecode"),
+        })
+        self.write(num, 0, self.encryption.encrypt_object(stream, num, 0) if self.encryption else stream)
+        for position, (obj_num, _) in enumerate(self._packed):
+            self.locations[obj_num] = (2, num, position)
+        self._packed = []
+
+    def finish(self, trailer: bytes) -> None:
+        self.flush_packed()
+        size = max(self.locations, default=0) + 1
+        if not self.compact:
+            xref_offset = self.f.tell()
+            self.f.write(b"xref\n0 %d\n" % size)
+            for num in range(size):
+                kind, offset, gen = self.locations.get(num, (0, 0, 65535))
+                self.f.write(b"%010d %05d %s \n" % (offset, gen, b"n" if kind else b"f"))
+            self.f.write(b"trailer\n<</Size %d %s>>\nstartxref\n%d\n%%%%EOF\n" % (size, trailer, xref_offset))
+            return
+
+        # El stream de referencias no se cifra nunca
+        num = size
+        xref_offset = self.f.tell()
+        self.locations[num] = (1, xref_offset, 0)
+        width = max(1, (xref_offset.bit_length() + 7) // 8)
+        rows = []
+        for obj_num in range(num + 1):
+            kind, second, third = self.locations.get(obj_num, (0, 0, 65535 if obj_num == 0 else 0))
+            rows.append(bytes([kind]) + second.to_bytes(width, "big") + third.to_bytes(2, "big"))
+        content = zlib.compress(b"".join(rows), FLATE_LEVEL)
+        self.f.write(b"%d 0 obj\n" % num)
+        self.f.write(
+            b"<</Type /XRef /Size %d /W [1 %d 2] %s /Filter /FlateDecode /Length %d>>\n"
+            % (num + 1, width, trailer, len(content))
+        )
+        self.f.write(b"stream\n" + content + b"\nendstream\nendobj\n")
+        self.f.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+
+
+def _write(
+    reader: PdfReader,
+    output_path: Path,
+    encryption: Optional[Encryption],
+    encrypt_entry: Any,
+    file_id: bytes,
+    progress_callback: Optional[ProgressCallback],
+    cancel_event: Optional[threading.Event],
+) -> int:
+    """
+    Reescribe el documento (cifrado con encryption o en claro) en el temporal de output_path
+    y devuelve los objetos copiados; _commit lo renombra una vez cerrado el original.
+    """
+    keys = _object_keys(reader)
+    old_entry = reader.trailer.raw_get("/Encrypt") if "/Encrypt" in reader.trailer else None
+    skip = {(old_entry.idnum, old_entry.generation)} if isinstance(old_entry, IndirectObject) else set()
+    header = (getattr(reader, "pdf_header", "") or "%PDF-1.7").encode("ascii", "replace")
+    # AES-128 es de PDF 1.6 y AES-256 de 1.7 (extensión de Adobe, nivel 3)
+    minimum = {4: b"%PDF-1.6", 5: b"%PDF-1.7"}.get(encryption.V if encryption is not None else 0)
+    compact = bool(reader.xref_objStm)
+    if compact:
+        minimum = max(minimum or b"", b"%PDF-1.5")
+    if minimum and header < minimum:
+        header = minimum
+
+    temp_path = _part_path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(header + b"\n%\xe2\xe3\xcf\xd3\n")
+            writer = _SecureWriter(f, encryption, max((num for num, _ in keys), default=0) + 1, compact)
+            for index, (num, gen) in enumerate(keys, start=1):
+                if index % _PROGRESS_EVERY == 0:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    if progress_callback:
+                        progress_callback(index, len(keys))
+                if (num, gen) in skip or num == 0:
+                    continue
+                try:
+                    obj = reader.get_object(IndirectObject(num, gen, reader))
+                except Exception:
+                    obj = None
+                if obj is None or (isinstance(obj, StreamObject) and obj.get("/Type") in _SKIPPED_TYPES):
+                    continue
+                writer.add(num, gen, obj)
+                copied += 1
+                # El lector guarda lo que resuelve: se suelta para no acumular el archivo entero
+                reader.resolved_objects.pop((gen, num), None)
+
+            root = reader.trailer.raw_get("/Root")
+            trailer = [b"/Root %d %d R" % (root.idnum, root.generation)]
+            info = reader.trailer.raw_get("/Info") if "/Info" in reader.trailer else None
+            if isinstance(info, IndirectObject):
+                trailer.append(b"/Info %d %d R" % (info.idnum, info.generation))
+            if encrypt_entry is not None:
+                # El diccionario /Encrypt nunca se cifra ni va en un stream de objetos
+                num = writer.allocate()
+                writer.write(num, 0, encrypt_entry)
+                trailer.append(b"/Encrypt %d 0 R" % num)
+            trailer.append(b"/ID [<%s> <%s>]" % (file_id, file_id))
+            writer.finish(b" ".join(trailer))
+        if progress_callback:
+            progress_callback(len(keys), len(keys))
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return copied
+
+
+def _part_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".part")
+
+
+def _commit(output_path: Path) -> None:
+    temp_path = _part_path(output_path)
+    try:
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _file_id(reader: PdfReader, input_path: Path) -> bytes:
+    # Se conserva el identificador original: de él depende la clave de RC4 y AES-128
+    original_id = reader.trailer.get("/ID")
+    if original_id:
+        return bytes(original_id[0].original_bytes).hex().encode("ascii")
+    stat = Path(input_path).stat()
+    return file_id_for(input_path, stat.st_size, stat.st_mtime)
+
+
+def _run_one(operation: str, input_path: str, output_path: str, options: Dict[str, Any]):
+    # Tarea de los procesos del lote: sin progreso ni cancelación por archivo
+    method = PDFEncryptor.encrypt if operation == OPERATION_ENCRYPT else PDFEncryptor.decrypt
+    return method(Path(input_path), Path(output_path), **options)
+
+
+class PDFEncryptor:
+    @staticmethod
+    def encrypt(
+        input_path: Path,
+        output_path: Path,
+        user_password: str = "",
+        owner_password: Optional[str] = None,
+        permissions: Iterable[str] = ALL_PERMISSIONS,
+        algorithm: str = DEFAULT_ALGORITHM,
+        password: str = "",
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[EncryptionReport]]:
+        """
+        Cifra el PDF. user_password abre el documento con los permisos indicados (vacía:
+        se abre sin pedir contraseña, pero con las restricciones); owner_password lo abre
+        sin restricciones y por defecto es igual a user_password.
+
+        Si el original ya está cifrado, password debe ser su contraseña de propietario
+        (o cualquiera que lo abra, si no restringe nada): así se cambian contraseñas,
+        permisos o algoritmo.
+        """
+        started = time.perf_counter()
+        unsupported = unsupported_pypdf()
+        if unsupported:
+            return False, unsupported, None
+        permissions = [name for name in ALL_PERMISSIONS if name in set(permissions)]
+        if algorithm not in ENCRYPTION_ALGORITHMS:
+            return False, f"Algoritmo de cifrado no soportado: {algorithm}", None
+        if algorithm.startswith("AES") and not aes_available():
+            return False, "El cifrado AES requiere el paquete 'cryptography' (pip install cryptography)", None
+        if not user_password and not owner_password:
+            return False, "Indique al menos una contraseña", None
+        try:
+            input_path, output_path = Path(input_path), Path(output_path)
+            with _opened(input_path, password, need_owner=True) as reader:
+                file_id = _file_id(reader, input_path)
+                encryption = Encryption.make(
+                    getattr(EncryptAlgorithm, algorithm.replace("-", "_")),
+                    permission_flags(permissions),
+                    bytes.fromhex(file_id.decode("ascii")),
+                )
+                entry = encryption.write_entry(user_password, owner_password or user_password)
+                objects = _write(reader, output_path, encryption, entry, file_id, progress_callback, cancel_event)
+            _commit(output_path)
+            return True, None, EncryptionReport(
+                input_path=str(input_path),
+                output_path=str(output_path),
+                operation=OPERATION_ENCRYPT,
+                algorithm=algorithm,
+                permissions=permissions,
+                objects=objects,
+                input_size=input_path.stat().st_size,
+                output_size=output_path.stat().st_size,
+                elapsed=time.perf_counter() - started,
+            )
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            return False, str(e), None
+
+    @staticmethod
+    def decrypt(
+        input_path: Path,
+        output_path: Path,
+        password: str = "",
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[EncryptionReport]]:
+        """Quita la protección. Si el archivo restringe permisos, hace falta la contraseña de propietario."""
+        started = time.perf_counter()
+        unsupported = unsupported_pypdf()
+        if unsupported:
+            return False, unsupported, None
+        try:
+            input_path, output_path = Path(input_path), Path(output_path)
+            with _opened(input_path, password, need_owner=True) as reader:
+                if not reader.is_encrypted:
+                    return False, f"El archivo {input_path.name} no está cifrado", None
+                file_id = _file_id(reader, input_path)
+                objects = _write(reader, output_path, None, None, file_id, progress_callback, cancel_event)
+            _commit(output_path)
+            return True, None, EncryptionReport(
+                input_path=str(input_path),
+                output_path=str(output_path),
+                operation=OPERATION_DECRYPT,
+                permissions=list(ALL_PERMISSIONS),
+                objects=objects,
+                input_size=input_path.stat().st_size,
+                output_size=output_path.stat().st_size,
+                elapsed=time.perf_counter() - started,
+            )
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            return False, str(e), None
+
+    @staticmethod
+    def run_batch(
+        operation: str,
+        input_paths: Sequence[Path],
+        output_dir: Optional[Path] = None,
+        workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+        **options,
+    ) -> Tuple[bool, Optional[str], List[Tuple[str, bool, Optional[str], Optional[EncryptionReport]]]]:
+        """
+        Aplica encrypt o decrypt (según operation, con las mismas opciones) a cada archivo,
+        repartidos entre procesos. Las salidas van a output_dir con el mismo nombre, o junto
+        a cada original (ver default_output_path). Devuelve (ruta, éxito, error, informe)
+        por archivo, en el orden de entrada; el lote solo falla entero si se cancela.
+        """
+        if operation not in (OPERATION_ENCRYPT, OPERATION_DECRYPT):
+            return False, f"Operación desconocida: {operation}", []
+        jobs = []
+        for path in map(Path, input_paths):
+            output_path = Path(output_dir) / path.name if output_dir else default_output_path(path, operation)
+            jobs.append((str(path), str(output_path)))
+        results: Dict[int, Tuple[str, bool, Optional[str], Optional[EncryptionReport]]] = {}
+
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            for index, (input_path, output_path) in enumerate(jobs):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False, CANCELLED_MESSAGE, []
+                results[index] = (input_path, *_run_one(operation, input_path, output_path, options))
+                if progress_callback:
+                    progress_callback(index + 1, len(jobs))
+            return True, None, [results[index] for index in range(len(jobs))]
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(_run_one, operation, input_path, output_path, options): index
+                for index, (input_path, output_path) in enumerate(jobs)
+            }
+            pending = set(futures)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    results[index] = (jobs[index][0], *future.result())
+                if done and progress_callback:
+                    progress_callback(len(results), len(jobs))
+            executor.shutdown()
+            return True, None, [results[index] for index in range(len(jobs))]
+        except OperationCancelled:
+            executor.shutdown(wait=True, cancel_futures=True)
+            return False, CANCELLED_MESSAGE, []
+        except Exception as e:
+            executor.shutdown(wait=True, cancel_futures=True)
+            return False, str(e), []
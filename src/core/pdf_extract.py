@@ -0,0 +1,205 @@
+"""
+Extracción de páginas: un PDF nuevo con solo las páginas elegidas.
+
+StreamingPDFWriter ya copia únicamente los objetos que alcanzan las páginas, pero muchos
+generadores (catálogos, informes) comparten un único diccionario /Resources con todas las
+fuentes e imágenes del documento: copiarlo tal cual arrastraría el documento entero. Antes
+de copiar cada página se recortan sus recursos a los nombres que aparecen en su contenido
+(y en el de los formularios que usan los recursos de la página). Las páginas se localizan
+bajando por el árbol, sin recorrerlo entero, así que el tamaño de la salida y el tiempo
+dependen de la selección y no del documento.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pypdf import PageObject
+from pypdf.generic import ArrayObject, DictionaryObject, NameObject, StreamObject
+
+from src.core.pdf_io import page_at, page_count
+from src.core.pdf_split import parse_page_ranges
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    file_id_for,
+    opened_reader,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+# Categorías de /Resources cuyas entradas se nombran desde el contenido
+_NAMED_RESOURCES = ("/Font", "/XObject", "/ExtGState", "/ColorSpace", "/Pattern", "/Shading", "/Properties")
+# Cualquier nombre del contenido cuenta como uso: un falso positivo (un nombre dentro de una
+# cadena o de una imagen en línea) solo conserva un recurso de más
+_NAME_TOKEN = re.compile(rb"/([^\s/<>\[\](){}%]*)")
+_NAME_ESCAPE = re.compile(rb"#([0-9A-Fa-f]{2})")
+
+
+@dataclass
+class ExtractionReport:
+    pages: int = 0
+    objects: int = 0
+    resources_dropped: int = 0
+    deduplicated: int = 0
+    input_size: int = 0
+    output_size: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "objects": self.objects,
+            "resources_dropped": self.resources_dropped,
+            "deduplicated": self.deduplicated,
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+def _content(value: Any) -> bytes:
+    """Contenido decodificado de /Contents (un stream o un array de streams)."""
+    value = value.get_object() if value is not None else None
+    if isinstance(value, ArrayObject):
+        return b"\n".join(_content(item) for item in value)
+    if isinstance(value, StreamObject):
+        return value.get_data()
+    return b""
+
+
+def _names(content: bytes) -> Set[str]:
+    names = set()
+    for match in _NAME_TOKEN.finditer(content):
+        raw = _NAME_ESCAPE.sub(lambda m: bytes([int(m.group(1), 16)]), match.group(1))
+        names.add("/" + raw.decode("utf-8", "replace"))
+    return names
+
+
+def _used_names(page: DictionaryObject, resources: DictionaryObject) -> Set[str]:
+    """
+    Nombres que usa el contenido de la página. Los formularios sin /Resources propios
+    (PDF 1.1) toman los de la página, así que su contenido cuenta también.
+    """
+    names = _names(_content(page.get("/Contents")))
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else None
+    if not isinstance(xobjects, DictionaryObject):
+        return names
+    visited = set()
+    pending = [name for name in names if name in xobjects]
+    while pending:
+        name = pending.pop()
+        if name in visited:
+            continue
+        visited.add(name)
+        form = xobjects[name].get_object() if xobjects.get(name) is not None else None
+        if isinstance(form, StreamObject) and form.get("/Subtype") == "/Form" and "/Resources" not in form:
+            found = _names(form.get_data())
+            names |= found
+            pending.extend(n for n in found if n in xobjects and n not in visited)
+    return names
+
+
+def prune_resources(page: PageObject) -> Tuple[PageObject, int]:
+    """
+    Copia de la página cuyas categorías de recursos con nombre solo tienen las entradas
+    que usa su contenido, y cuántas entradas se quitaron. Las entradas siguen apuntando a
+    los objetos originales; si el contenido no se puede leer, la página se devuelve intacta.
+    """
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return page, 0
+    try:
+        used = _used_names(page, resources)
+    except Exception:
+        return page, 0
+
+    pruned = DictionaryObject()
+    dropped = 0
+    for key, value in resources.items():
+        category = value.get_object() if key in _NAMED_RESOURCES else None
+        if isinstance(category, DictionaryObject):
+            kept = DictionaryObject({name: entry for name, entry in category.items() if name in used})
+            dropped += len(category) - len(kept)
+            if kept:
+                pruned[NameObject(key)] = kept
+        else:
+            pruned[NameObject(key)] = value
+    if not dropped:
+        return page, 0
+    copy = PageObject(page.pdf, page.indirect_reference)
+    copy.update(page)
+    copy[NameObject("/Resources")] = pruned
+    return copy, dropped
+
+
+def _selection(pages: str, count: int) -> List[int]:
+    """Índices 0-based en el orden indicado, sin repetir páginas."""
+    seen = set()
+    indices = []
+    for start, end in parse_page_ranges(pages, count):
+        for index in range(start, end + 1):
+            if index not in seen:
+                seen.add(index)
+                indices.append(index)
+    return indices
+
+
+class PDFPageExtractor:
+    @staticmethod
+    def extract(
+        input_path: Path,
+        output_path: Path,
+        pages: str,
+        prune: bool = True,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[ExtractionReport]]:
+        """
+        Escribe en output_path las páginas indicadas ("1-3, 7", en ese orden) con solo los
+        objetos que necesitan. Con prune=False los recursos de cada página se copian enteros.
+        """
+        started = time.perf_counter()
+        output = None
+        try:
+            input_path = Path(input_path)
+            with opened_reader(input_path) as reader:
+                indices = _selection(pages, page_count(reader))
+                selected = [page_at(reader, index) for index in indices]
+
+                report = ExtractionReport(pages=len(selected))
+                output = PDFOutputFile(output_path, linearize=linearize)
+                output.writer.begin_document(reader, selected, index_pages=False)
+                for done, page in enumerate(selected, start=1):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    if prune:
+                        page, dropped = prune_resources(page)
+                        report.resources_dropped += dropped
+                    output.writer.add_page(page)
+                    if progress_callback:
+                        progress_callback(done, len(selected))
+
+                output.writer.copy_document_data(reader, whole_document=False)
+            report.objects = len(output.writer.offsets) - 1
+            report.deduplicated = output.writer.deduplicated
+            output.commit(file_id_for(input_path, *indices))
+            report.input_size = input_path.stat().st_size
+            report.output_size = Path(output_path).stat().st_size
+            report.elapsed = time.perf_counter() - started
+            return True, None, report
+        except OperationCancelled:
+            if output is not None:
+                output.discard()
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            if output is not None:
+                output.discard()
+            return False, str(e), None
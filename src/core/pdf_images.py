@@ -0,0 +1,358 @@
+"""
+Conversión de imágenes (escaneos, fotos) a PDF, una página por imagen.
+
+Los JPEG se incrustan tal cual, sin decodificarlos: solo se lee su cabecera y la orientación
+EXIF se traduce a /Rotate de la página. El resto de formatos se decodifica en procesos aparte
+y se guarda sin pérdida (Flate), salvo que se pida JPEG. Los TIFF de varias páginas se tratan
+fotograma a fotograma y las páginas se escriben en orden según llegan, con un número limitado
+de imágenes en vuelo: la memoria no depende de cuántas imágenes haya ni de su tamaño total.
+"""
+
+import os
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    StreamingPDFWriter,
+    file_id_for,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "bmp", "gif", "tiff")
+DEFAULT_IMAGE_DPI = 150         # para imágenes que no indican su resolución
+PARALLEL_MIN_IMAGES = 4
+
+_EXTENSION_ALIASES = {"tiff": ("tif",), "jpeg": ("jpe",)}
+_JPEG_COLOR_SPACES = {"L": b"/DeviceGray", "RGB": b"/DeviceRGB", "CMYK": b"/DeviceCMYK"}
+# Orientación EXIF que se resuelve girando la página; las reflejadas obligan a decodificar
+_EXIF_ROTATIONS = {1: 0, 3: 180, 6: 90, 8: 270}
+_EXIF_ORIENTATION = 0x0112
+_MIN_DPI, _MAX_DPI = 10, 10000
+
+
+@dataclass
+class ImageConversionReport:
+    images: int = 0
+    pages: int = 0
+    embedded: int = 0           # JPEG incrustados sin recodificar
+    encoded: int = 0
+    skipped: List[str] = field(default_factory=list)
+    output_size: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "images": self.images,
+            "pages": self.pages,
+            "embedded": self.embedded,
+            "encoded": self.encoded,
+            "skipped": self.skipped,
+            "output_size": self.output_size,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+@dataclass(frozen=True)
+class _Task:
+    path: Path
+    frame: int
+    passthrough: bool
+
+
+@dataclass
+class _EncodedImage:
+    entries: bytes              # diccionario del XObject sin /Length
+    data: bytes
+    width: int
+    height: int
+    dpi: Tuple[float, float]
+    rotate: int = 0
+
+
+def _natural_key(path: Path) -> List[Any]:
+    # escaneo_2 antes que escaneo_10
+    return [int(part) if part.isdigit() else part.casefold() for part in re.split(r"(\d+)", path.name)]
+
+
+def list_images(folder: Path, extensions: Iterable[str] = IMAGE_EXTENSIONS) -> List[Path]:
+    """Imágenes de la carpeta (sin subcarpetas) en orden natural de nombre."""
+    suffixes = set()
+    for extension in extensions:
+        extension = extension.lower().lstrip(".")
+        suffixes.add("." + extension)
+        suffixes.update("." + alias for alias in _EXTENSION_ALIASES.get(extension, ()))
+    return sorted(
+        (path for path in Path(folder).iterdir() if path.is_file() and path.suffix.lower() in suffixes),
+        key=_natural_key,
+    )
+
+
+def _resolution(image: Image.Image, default_dpi: float) -> Tuple[float, float]:
+    dpi = image.info.get("dpi")
+    try:
+        x, y = float(dpi[0]), float(dpi[1])
+    except (TypeError, ValueError, IndexError):
+        return default_dpi, default_dpi
+    if not (_MIN_DPI <= x <= _MAX_DPI and _MIN_DPI <= y <= _MAX_DPI):
+        return default_dpi, default_dpi
+    return x, y
+
+
+def _plan(path: Path) -> List[_Task]:
+    """Páginas que aporta el archivo; solo lee la cabecera."""
+    with Image.open(path) as image:
+        if image.format == "JPEG":
+            orientation = image.getexif().get(_EXIF_ORIENTATION, 1)
+            passthrough = image.mode in _JPEG_COLOR_SPACES and orientation in _EXIF_ROTATIONS
+            return [_Task(path, 0, passthrough)]
+        frames = getattr(image, "n_frames", 1) if image.format == "TIFF" else 1
+        return [_Task(path, frame, False) for frame in range(frames)]
+
+
+def _embed_jpeg(path: Path, default_dpi: float) -> _EncodedImage:
+    with Image.open(path) as image:
+        width, height = image.size
+        mode = image.mode
+        dpi = _resolution(image, default_dpi)
+        rotate = _EXIF_ROTATIONS[image.getexif().get(_EXIF_ORIENTATION, 1)]
+        adobe = "adobe" in image.info
+    entries = b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s /BitsPerComponent 8" % (
+        width, height, _JPEG_COLOR_SPACES[mode],
+    )
+    if mode == "CMYK" and adobe:
+        # Photoshop guarda los JPEG CMYK invertidos
+        entries += b" /Decode [1 0 1 0 1 0 1 0]"
+    return _EncodedImage(entries + b" /Filter /DCTDecode", path.read_bytes(), width, height, dpi, rotate)
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Imagen en un modo que PDF admite directamente; la transparencia se compone sobre blanco."""
+    if image.mode == "P" and "transparency" in image.info:
+        image = image.convert("RGBA")
+    if image.mode in ("RGBA", "LA", "PA", "RGBa", "La"):
+        gray = image.mode in ("LA", "La")
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+        background.alpha_composite(image)
+        return background.convert("L" if gray else "RGB")
+    if image.mode in ("1", "L", "RGB", "CMYK", "P"):
+        return image
+    if image.mode.startswith("I"):
+        # 16 o 32 bits por muestra: se reescala a 8
+        return image.convert("I").point(lambda value: value / 256).convert("L")
+    if image.mode == "F":
+        return image.convert("L")
+    return image.convert("RGB")
+
+
+def _encode_frame(path: Path, frame: int, default_dpi: float, jpeg_quality: Optional[int]) -> _EncodedImage:
+    with Image.open(path) as source:
+        if frame:
+            source.seek(frame)
+        dpi = _resolution(source, default_dpi)
+        image = _flatten(ImageOps.exif_transpose(source) if frame == 0 else source)
+        width, height = image.size
+        header = b"/Type /XObject /Subtype /Image /Width %d /Height %d" % (width, height)
+
+        if image.mode == "1":
+            # En PDF, como en Pillow, un 1 es blanco en DeviceGray
+            return _EncodedImage(
+                header + b" /ColorSpace /DeviceGray /BitsPerComponent 1 /Filter /FlateDecode",
+                zlib.compress(image.tobytes()), width, height, dpi,
+            )
+        if image.mode == "P":
+            palette = image.getpalette() or []
+            colors = max(1, min(256, len(palette) // 3))
+            lookup = bytes(palette[:colors * 3]).hex().encode("ascii")
+            return _EncodedImage(
+                header + b" /ColorSpace [/Indexed /DeviceRGB %d <%s>] /BitsPerComponent 8 /Filter /FlateDecode"
+                % (colors - 1, lookup),
+                zlib.compress(image.tobytes()), width, height, dpi,
+            )
+
+        color_space = _JPEG_COLOR_SPACES[image.mode]
+        if jpeg_quality:
+            buffer = BytesIO()
+            image.save(buffer, "JPEG", quality=jpeg_quality, dpi=dpi)
+            data, codec = buffer.getvalue(), b"/DCTDecode"
+            if image.mode == "CMYK":
+                # Pillow escribe los JPEG CMYK con la marca de Adobe, invertidos
+                color_space += b" /Decode [1 0 1 0 1 0 1 0]"
+        else:
+            data, codec = zlib.compress(image.tobytes()), b"/FlateDecode"
+        return _EncodedImage(
+            header + b" /ColorSpace %s /BitsPerComponent 8 /Filter %s" % (color_space, codec),
+            data, width, height, dpi,
+        )
+
+
+def _load(task: _Task, default_dpi: float, jpeg_quality: Optional[int]) -> Tuple[Optional[_EncodedImage], Optional[str]]:
+    # Una imagen dañada se omite; no debe impedir convertir las demás
+    try:
+        if task.passthrough:
+            return _embed_jpeg(task.path, default_dpi), None
+        return _encode_frame(task.path, task.frame, default_dpi, jpeg_quality), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+def _number(value: float) -> bytes:
+    return (b"%.4f" % value).rstrip(b"0").rstrip(b".")
+
+
+def _write_page(writer: StreamingPDFWriter, image: _EncodedImage) -> None:
+    width = image.width * 72 / image.dpi[0]
+    height = image.height * 72 / image.dpi[1]
+    image_num = writer.add_stream(image.entries, image.data)
+    content_num = writer.add_stream(b"", b"q %s 0 0 %s 0 0 cm /Im0 Do Q" % (_number(width), _number(height)))
+    entries = b"/MediaBox [0 0 %s %s] /Resources <</XObject <</Im0 %d 0 R>>>> /Contents %d 0 R" % (
+        _number(width), _number(height), image_num, content_num,
+    )
+    if image.rotate:
+        entries += b" /Rotate %d" % image.rotate
+    writer.add_raw_page(entries)
+
+
+class ImageToPDFConverter:
+    @staticmethod
+    def convert(
+        input_paths: Sequence[Path],
+        output_path: Path,
+        default_dpi: float = DEFAULT_IMAGE_DPI,
+        jpeg_quality: Optional[int] = None,
+        workers: Optional[int] = None,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[ImageConversionReport]]:
+        """
+        Crea output_path con una página por imagen (y por fotograma de los TIFF), en el orden
+        de input_paths y al tamaño que indica la resolución de cada imagen. Las imágenes que
+        no se pueden leer se omiten y se anotan en el informe. Con jpeg_quality, las imágenes
+        que no son JPEG se guardan como JPEG en vez de sin pérdida.
+        """
+        started = time.perf_counter()
+        output = None
+        try:
+            report = ImageConversionReport()
+            tasks: List[_Task] = []
+            for path in map(Path, input_paths):
+                try:
+                    tasks.extend(_plan(path))
+                except Exception as e:
+                    report.skipped.append(f"{path.name}: {e}")
+            if not tasks:
+                return False, "No hay imágenes que se puedan convertir", report
+
+            output = PDFOutputFile(output_path, linearize=linearize)
+            converted = set()
+            for done, (task, image, error) in enumerate(
+                ImageToPDFConverter._images(tasks, default_dpi, jpeg_quality, workers, cancel_event), start=1,
+            ):
+                if image is None:
+                    report.skipped.append(f"{task.path.name}" + (f" (página {task.frame + 1})" if task.frame else "") + f": {error}")
+                else:
+                    _write_page(output.writer, image)
+                    converted.add(task.path)
+                    report.pages += 1
+                    if task.passthrough:
+                        report.embedded += 1
+                    else:
+                        report.encoded += 1
+                if progress_callback:
+                    progress_callback(done, len(tasks))
+
+            if not report.pages:
+                output.discard()
+                return False, "Ninguna imagen se pudo convertir", report
+            report.images = len(converted)
+            output.commit(file_id_for(output_path, *[str(task.path) for task in tasks[:16]], len(tasks)))
+            report.output_size = Path(output_path).stat().st_size
+            report.elapsed = time.perf_counter() - started
+            return True, None, report
+        except OperationCancelled:
+            if output is not None:
+                output.discard()
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            if output is not None:
+                output.discard()
+            return False, str(e), None
+
+    @staticmethod
+    def convert_folder(
+        folder: Path,
+        output_path: Optional[Path] = None,
+        extensions: Iterable[str] = IMAGE_EXTENSIONS,
+        **kwargs,
+    ) -> Tuple[bool, Optional[str], Optional[ImageConversionReport]]:
+        """Convierte las imágenes de la carpeta; por defecto a '<carpeta>.pdf' junto a ella."""
+        folder = Path(folder)
+        if not folder.is_dir():
+            return False, f"La carpeta {folder} no existe", None
+        images = list_images(folder, extensions)
+        if not images:
+            return False, f"La carpeta {folder.name} no contiene imágenes", None
+        output_path = Path(output_path) if output_path else folder.parent / f"{folder.name}.pdf"
+        return ImageToPDFConverter.convert(images, output_path, **kwargs)
+
+    @staticmethod
+    def _images(
+        tasks: List[_Task],
+        default_dpi: float,
+        jpeg_quality: Optional[int],
+        workers: Optional[int],
+        cancel_event: Optional[threading.Event],
+    ) -> Iterator[Tuple[_Task, Optional[_EncodedImage], Optional[str]]]:
+        """Imágenes preparadas en el orden de tasks; las que hay que decodificar van a otros procesos."""
+        decoded = [index for index, task in enumerate(tasks) if not task.passthrough]
+        workers = workers or min(os.cpu_count() or 1, 8)
+        if workers <= 1 or len(decoded) < PARALLEL_MIN_IMAGES:
+            for task in tasks:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                yield (task, *_load(task, default_dpi, jpeg_quality))
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Ventana de imágenes en vuelo: acota la memoria y mantiene el orden de escritura
+            window = workers * 2
+            upcoming = iter(decoded)
+            futures = {}
+            try:
+                for index, task in enumerate(tasks):
+                    while len(futures) < window:
+                        next_index = next(upcoming, None)
+                        if next_index is None:
+                            break
+                        futures[next_index] = executor.submit(_load, tasks[next_index], default_dpi, jpeg_quality)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    if task.passthrough:
+                        yield (task, *_load(task, default_dpi, jpeg_quality))
+                        continue
+                    future = futures.pop(index)
+                    while True:
+                        try:
+                            result = future.result(timeout=0.25)
+                            break
+                        except TimeoutError:
+                            if cancel_event is not None and cancel_event.is_set():
+                                raise OperationCancelled()
+                    yield (task, *result)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
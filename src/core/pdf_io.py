@@ -0,0 +1,117 @@
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from pypdf import PageObject, PdfReader
+from pypdf.generic import NameObject
+
+_INHERITABLE_PAGE_KEYS = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+def map_file(path: Path) -> mmap.mmap:
+    """
+    Proyecta el archivo en memoria de solo lectura. El mmap se usa como un archivo binario
+    (read/seek/tell), así que pypdf lo lee sin copiarlo al heap: las páginas del archivo se
+    cargan bajo demanda desde la caché del sistema, compartida con el visor y con cualquier
+    otra operación sobre el mismo archivo.
+
+    Las salidas se escriben en un temporal que se renombra (ver PDFOutputFile). En POSIX el
+    renombrado no afecta a las proyecciones que sigan abiertas sobre el archivo anterior;
+    Windows, en cambio, no deja reemplazar un archivo proyectado. Por eso las operaciones
+    cuya salida puede sustituir a su entrada la leen con mapped_reader y confirman la salida
+    después de cerrar el bloque.
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"El archivo {Path(path).name} está vacío")
+
+
+def read_pdf(path: Path) -> PdfReader:
+    """
+    PdfReader sobre el archivo proyectado; la proyección se libera cuando se recolecta el
+    lector. Si la salida puede reemplazar al archivo, mejor mapped_reader.
+    """
+    return PdfReader(map_file(path))
+
+
+@contextmanager
+def mapped_reader(path: Path) -> Iterator[PdfReader]:
+    """Como read_pdf, pero libera la proyección al salir del bloque."""
+    buffer = map_file(path)
+    try:
+        yield PdfReader(buffer)
+    finally:
+        try:
+            buffer.close()
+        except BufferError:
+            # Aún hay vistas exportadas del buffer: se cerrará al liberarse
+            pass
+
+
+def page_at(reader: PdfReader, index: int) -> PageObject:
+    """
+    Página index bajando por el árbol según /Count. reader.pages recorre el árbol entero
+    la primera vez, que en documentos de miles de páginas cuesta más que la propia extracción.
+    """
+    try:
+        node = reader.trailer["/Root"].get_object()["/Pages"].get_object()
+        inherited = {}
+        remaining = index
+        while "/Kids" in node:
+            for key in _INHERITABLE_PAGE_KEYS:
+                if key in node:
+                    inherited[key] = node.raw_get(key)
+            kids = node["/Kids"]
+            if int(node.get("/Count", -1)) == len(kids) and remaining < len(kids):
+                # Nodo de hojas (el caso habitual, y el de los árboles planos): sin resolver las demás
+                kid = kids[remaining].get_object()
+                if "/Kids" not in kid:
+                    node = kid
+                    continue
+            for kid_ref in kids:
+                kid = kid_ref.get_object()
+                count = int(kid.get("/Count", 0)) if "/Kids" in kid else 1
+                if remaining < count:
+                    node = kid
+                    break
+                remaining -= count
+            else:
+                raise IndexError(index)
+        page = PageObject(reader, node.indirect_reference)
+        page.update(node)
+        for key, value in inherited.items():
+            if key not in page:
+                page[NameObject(key)] = value
+        return page
+    except Exception:
+        # Árbol con /Count incoherente: pypdf lo reconstruye al aplanarlo
+        return reader.pages[index]
+
+
+def page_count(reader: PdfReader) -> int:
+    """Número de páginas según la raíz del árbol, sin recorrerlo."""
+    try:
+        return int(reader.trailer["/Root"].get_object()["/Pages"].get_object()["/Count"])
+    except Exception:
+        return len(reader.pages)
+
+
+_worker_reader: Optional[PdfReader] = None
+
+
+def open_worker_reader(path: str) -> None:
+    """
+    Inicializador para los procesos de un ProcessPoolExecutor que trabajan sobre un mismo
+    archivo: cada proceso abre un solo lector y lo reutiliza en todas sus tareas.
+    """
+    global _worker_reader
+    _worker_reader = read_pdf(Path(path))
+    if _worker_reader.is_encrypted:
+        _worker_reader.decrypt("")
+
+
+def worker_reader() -> PdfReader:
+    return _worker_reader
@@ -0,0 +1,610 @@
+"""
+Linealización («vista web rápida», PDF 1.7 anexo F).
+
+Un PDF linealizado empieza por todo lo que necesita la primera página, con su propia
+tabla de referencias, y lleva una tabla de pistas (hint stream) con la posición de cada
+página y de los objetos compartidos; así un visor que lee el archivo desde la red puede
+mostrar la primera página tras descargar solo ese prefijo y saltar a cualquier otra sin
+leer el resto.
+
+Orden de la salida:
+    cabecera, diccionario de linealización, xref y trailer de la primera página,
+    catálogo, hint stream, primera página y sus objetos, resto de páginas con sus objetos
+    propios, objetos compartidos, otros objetos (árbol de páginas...), xref principal.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+
+from src.core.pdf_io import map_file, mapped_reader
+from src.core.pdf_probe import ObjectParser, Reference, StructureError, XrefReader
+
+ObjectKey = Tuple[int, int]
+
+_LINEARIZATION = object()   # marcadores de los dos objetos que se generan aquí
+_HINTS = object()
+
+_LIN_DICT = b"<</Linearized 1 /L %d /H [%d %d] /O %d /E %d /N %d /T %d>>"
+_LIN_WIDTH = len(_LIN_DICT % ((10 ** 10,) * 7))   # ancho fijo: se escribe antes de conocer los valores
+_PAGE_HEADER_BYTES = 36
+_SHARED_HEADER_BYTES = 24
+_LIN_HEADER = re.compile(rb"%PDF-\d\.\d[^\n\r]*[\r\n]+(?:%[^\n\r]*[\r\n]+)*\s*(\d+)\s+0\s+obj")
+
+
+# ===== Tablas de pistas =====
+
+class _BitWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self._value = 0
+        self._bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        if bits == 0:
+            return
+        self._value = (self._value << bits) | value
+        self._bits += bits
+        while self._bits >= 8:
+            self._bits -= 8
+            self.data.append((self._value >> self._bits) & 0xFF)
+        self._value &= (1 << self._bits) - 1
+
+    def flush(self) -> None:
+        """Cada grupo de elementos de una tabla de pistas empieza en un byte nuevo."""
+        if self._bits:
+            self.data.append((self._value << (8 - self._bits)) & 0xFF)
+        self._value = 0
+        self._bits = 0
+
+
+class _BitReader:
+    def __init__(self, data: bytes, position: int = 0):
+        self.data = data
+        self.position = position * 8
+
+    def read(self, bits: int) -> int:
+        value = 0
+        for _ in range(bits):
+            byte = self.position >> 3
+            if byte >= len(self.data):
+                raise StructureError("tabla de pistas truncada")
+            value = (value << 1) | ((self.data[byte] >> (7 - (self.position & 7))) & 1)
+            self.position += 1
+        return value
+
+    def flush(self) -> None:
+        self.position = (self.position + 7) & ~7
+
+
+def _bits(values: List[int]) -> int:
+    return max(values, default=0).bit_length()
+
+
+@dataclass
+class PageHint:
+    objects: int
+    length: int
+    shared: List[int] = field(default_factory=list)
+    content_offset: int = 0
+    content_length: int = 0
+
+
+@dataclass
+class HintTables:
+    """Contenido del hint stream primario; los desplazamientos no cuentan el propio hint stream."""
+
+    first_page_offset: int
+    pages: List[PageHint]
+    first_shared_num: int
+    first_shared_offset: int
+    shared_first_page: int
+    shared_lengths: List[int]
+
+    def encode(self) -> Tuple[bytes, int]:
+        """Bytes del stream y posición de la tabla de objetos compartidos (/S)."""
+        pages = self.pages
+        least_objects = min(page.objects for page in pages)
+        least_length = min(page.length for page in pages)
+        least_offset = min(page.content_offset for page in pages)
+        least_content = min(page.content_length for page in pages)
+        shared_counts = [len(page.shared) for page in pages]
+        shared_ids = [ident for page in pages for ident in page.shared]
+
+        writer = _BitWriter()
+        object_bits = _bits([page.objects - least_objects for page in pages])
+        length_bits = _bits([page.length - least_length for page in pages])
+        offset_bits = _bits([page.content_offset - least_offset for page in pages])
+        content_bits = _bits([page.content_length - least_content for page in pages])
+        count_bits = _bits(shared_counts)
+        id_bits = _bits(shared_ids)
+        for value, bits in (
+            (least_objects, 32), (self.first_page_offset, 32), (object_bits, 16),
+            (least_length, 32), (length_bits, 16), (least_offset, 32), (offset_bits, 16),
+            (least_content, 32), (content_bits, 16), (count_bits, 16), (id_bits, 16),
+            (0, 16), (1, 16),   # posición fraccionaria de las referencias compartidas: sin usar
+        ):
+            writer.write(value, bits)
+        for values, bits in (
+            ([page.objects - least_objects for page in pages], object_bits),
+            ([page.length - least_length for page in pages], length_bits),
+            (shared_counts, count_bits),
+            (shared_ids, id_bits),
+        ):
+            for value in values:
+                writer.write(value, bits)
+            writer.flush()
+        writer.flush()  # numeradores de las posiciones fraccionarias, de 0 bits
+        for values, bits in (
+            ([page.content_offset - least_offset for page in pages], offset_bits),
+            ([page.content_length - least_content for page in pages], content_bits),
+        ):
+            for value in values:
+                writer.write(value, bits)
+            writer.flush()
+
+        shared_offset = len(writer.data)
+        least_group = min(self.shared_lengths, default=0)
+        group_bits = _bits([length - least_group for length in self.shared_lengths])
+        for value, bits in (
+            (self.first_shared_num, 32), (self.first_shared_offset, 32),
+            (self.shared_first_page, 32), (len(self.shared_lengths), 32),
+            (0, 16),   # cada grupo compartido es un solo objeto
+            (least_group, 32), (group_bits, 16),
+        ):
+            writer.write(value, bits)
+        for length in self.shared_lengths:
+            writer.write(length - least_group, group_bits)
+        writer.flush()
+        for _ in self.shared_lengths:
+            writer.write(0, 1)   # sin firma MD5
+        writer.flush()
+        return bytes(writer.data), shared_offset
+
+    @classmethod
+    def decode(cls, data: bytes, shared_offset: int, page_count: int) -> "HintTables":
+        reader = _BitReader(data)
+        (least_objects, first_page_offset, object_bits, least_length, length_bits,
+         least_offset, offset_bits, least_content, content_bits, count_bits, id_bits,
+         numerator_bits, _) = [reader.read(bits) for bits in (32, 32, 16, 32, 16, 32, 16, 32, 16, 16, 16, 16, 16)]
+
+        def column(bits: int, count: int = page_count) -> List[int]:
+            values = [reader.read(bits) for _ in range(count)]
+            reader.flush()
+            return values
+
+        objects = [least_objects + value for value in column(object_bits)]
+        lengths = [least_length + value for value in column(length_bits)]
+        counts = column(count_bits)
+        ids = column(id_bits, sum(counts))
+        column(numerator_bits, sum(counts))
+        offsets = [least_offset + value for value in column(offset_bits)]
+        contents = [least_content + value for value in column(content_bits)]
+        pages, cursor = [], 0
+        for index in range(page_count):
+            pages.append(PageHint(
+                objects[index], lengths[index], ids[cursor:cursor + counts[index]],
+                offsets[index], contents[index],
+            ))
+            cursor += counts[index]
+
+        reader = _BitReader(data, shared_offset)
+        (first_shared_num, first_shared_offset, shared_first_page, shared_total,
+         group_object_bits, least_group, group_bits) = [reader.read(bits) for bits in (32, 32, 32, 32, 16, 32, 16)]
+        shared_lengths = [least_group + reader.read(group_bits) for _ in range(shared_total)]
+        reader.flush()
+        signed = [reader.read(1) for _ in range(shared_total)]
+        reader.flush()
+        if any(signed) or group_object_bits:
+            raise StructureError("grupos compartidos con firma o de varios objetos no soportados")
+        return cls(first_page_offset, pages, first_shared_num, first_shared_offset,
+                   shared_first_page, shared_lengths)
+
+
+# ===== Escritura =====
+
+def _children(value: Any, skip_parent: bool = False) -> Iterator[IndirectObject]:
+    """Referencias directas que contiene value, en el orden en que aparecen."""
+    if isinstance(value, IndirectObject):
+        yield value
+    elif isinstance(value, DictionaryObject):
+        for key, item in value.items():
+            # La longitud de un stream se escribe directa al serializarlo
+            if not (skip_parent and key == "/Parent") and not (key == "/Length" and isinstance(value, StreamObject)):
+                yield from _children(item)
+    elif isinstance(value, ArrayObject):
+        for item in value:
+            yield from _children(item)
+
+
+class _Linearizer:
+    def __init__(self, reader: PdfReader):
+        self.reader = reader
+        self.page_refs = [page.indirect_reference for page in reader.pages]
+        if any(ref is None for ref in self.page_refs):
+            raise ValueError("Hay páginas que no son objetos indirectos")
+        self.page_keys = {(ref.idnum, ref.generation) for ref in self.page_refs}
+        self.objects: Dict[ObjectKey, Any] = {}
+
+    def _resolve(self, ref: IndirectObject) -> Any:
+        key = (ref.idnum, ref.generation)
+        if key not in self.objects:
+            try:
+                self.objects[key] = ref.get_object()
+            except Exception:
+                self.objects[key] = None
+        return self.objects[key]
+
+    def _reachable(self, root: Any, skip_parent: bool, exclude: set) -> List[ObjectKey]:
+        """Objetos alcanzables desde root sin pasar por páginas, en orden de aparición."""
+        order, seen = [], set(exclude)
+        stack = [iter(list(_children(root, skip_parent)))]
+        while stack:
+            ref = next(stack[-1], None)
+            if ref is None:
+                stack.pop()
+                continue
+            key = (ref.idnum, ref.generation)
+            if key in seen or key in self.page_keys:
+                continue
+            seen.add(key)
+            obj = self._resolve(ref)
+            if obj is None:
+                continue
+            order.append(key)
+            stack.append(iter(list(_children(obj))))
+        return order
+
+    def plan(self) -> None:
+        reader = self.reader
+        self.page_objects = page_objects = [
+            self._reachable(self._resolve(ref), skip_parent=True, exclude=set()) for ref in self.page_refs
+        ]
+        users: Dict[ObjectKey, set] = {}
+        for index, keys in enumerate(page_objects):
+            for key in keys:
+                users.setdefault(key, set()).add(index)
+
+        first_key = (self.page_refs[0].idnum, self.page_refs[0].generation)
+        self.first_page = [first_key] + page_objects[0]
+        self.other_pages: List[List[ObjectKey]] = []
+        for index, keys in enumerate(page_objects[1:], start=1):
+            ref = self.page_refs[index]
+            own = [key for key in keys if users[key] == {index}]
+            self.other_pages.append([(ref.idnum, ref.generation)] + own)
+        self.shared = [
+            key for key in dict.fromkeys(key for keys in page_objects[1:] for key in keys)
+            if len(users[key]) > 1 and 0 not in users[key]
+        ]
+
+        root = reader.trailer.raw_get("/Root")
+        self.catalog = (root.idnum, root.generation)
+        self._resolve(root)
+        assigned = set(users) | self.page_keys | {self.catalog}
+        self.others = self._reachable(self.objects[self.catalog], skip_parent=False, exclude=assigned)
+        info = reader.trailer.raw_get("/Info") if "/Info" in reader.trailer else None
+        self.info = None
+        if isinstance(info, IndirectObject):
+            self.info = (info.idnum, info.generation)
+            if self.info not in assigned and self.info not in self.others:
+                self._resolve(info)
+                self.others.append(self.info)
+                self.others.extend(self._reachable(self.objects[self.info], False, assigned | set(self.others)))
+
+        # Numeración: primero la sección principal y después la de la primera página, cada
+        # una en el orden en que se escribe; las tablas de pistas cuentan con ello
+        main = [key for keys in self.other_pages for key in keys] + self.shared + self.others
+        self.numbers: Dict[Any, int] = {key: num for num, key in enumerate(main, start=1)}
+        self.main_count = len(main) + 1
+        first = [_LINEARIZATION, self.catalog, _HINTS] + self.first_page
+        for num, key in enumerate(first, start=self.main_count):
+            self.numbers[key] = num
+        self.size = self.main_count + len(first)
+
+    def serialize(self, key: ObjectKey) -> List[bytes]:
+        """Objeto renumerado, como lista de fragmentos (los datos de los streams no se copian)."""
+        obj = self.objects[key]
+        head = b"%d 0 obj\n" % self.numbers[key]
+        if isinstance(obj, StreamObject):
+            raw = obj._data
+            body = self._dictionary(obj, skip=("/Length",), extra=b"/Length %d" % len(raw))
+            return [head, body, b"\nstream\n", raw, b"\nendstream\nendobj\n"]
+        return [head, self._value(obj), b"\nendobj\n"]
+
+    def _dictionary(self, value: DictionaryObject, skip: Tuple[str, ...] = (), extra: bytes = b"") -> bytes:
+        parts = [b"<<"]
+        for key, item in value.items():
+            if key not in skip:
+                parts.append(self._value(NameObject(key)) + b" " + self._value(item))
+        if extra:
+            parts.append(extra)
+        parts.append(b">>")
+        return b" ".join(parts)
+
+    def _value(self, value: Any) -> bytes:
+        if isinstance(value, IndirectObject):
+            num = self.numbers.get((value.idnum, value.generation))
+            return b"null" if num is None else b"%d 0 R" % num
+        if isinstance(value, DictionaryObject):
+            return self._dictionary(value)
+        if isinstance(value, ArrayObject):
+            return b"[" + b" ".join(self._value(item) for item in value) + b"]"
+        if value is None:
+            return b"null"
+        buffer = BytesIO()
+        value.write_to_stream(buffer)
+        return buffer.getvalue()
+
+    def _content_hint(self, page_key: ObjectKey, section: List[ObjectKey], offsets: Dict[ObjectKey, int],
+                      lengths: Dict[ObjectKey, int]) -> Tuple[int, int]:
+        contents = self.objects[page_key].raw_get("/Contents") if "/Contents" in self.objects[page_key] else None
+        if isinstance(contents, ArrayObject) and contents:
+            contents = contents[0]
+        if not isinstance(contents, IndirectObject):
+            return 0, 0
+        key = (contents.idnum, contents.generation)
+        if key not in section:
+            return 0, 0
+        return offsets[key] - offsets[page_key], lengths[key]
+
+    def write(self, output: Path, file_id: bytes, version: str) -> None:
+        self.plan()
+        chunks = {key: self.serialize(key) for key in self.objects if key in self.numbers}
+        lengths = {key: sum(len(chunk) for chunk in parts) for key, parts in chunks.items()}
+
+        header = b"%PDF-" + version.encode("ascii") + b"\n%\xe2\xe3\xcf\xd3\n"
+        lin_num = self.numbers[_LINEARIZATION]
+        hint_num = self.numbers[_HINTS]
+        lin_length = len(b"%d 0 obj\n" % lin_num) + _LIN_WIDTH + len(b"\nendobj\n")
+        first_xref_count = self.size - self.main_count
+        first_xref_length = len(b"xref\n%d %d\n" % (self.main_count, first_xref_count)) + 20 * first_xref_count
+        info = b" /Info %d 0 R" % self.numbers[self.info] if self.info in self.numbers else b""
+        first_trailer = b"trailer\n<</Size %d /Root %d 0 R%s /ID [<%s> <%s>] /Prev %%0%dd>>\nstartxref\n0\n%%%%EOF\n" % (
+            self.size, self.numbers[self.catalog], info, file_id, file_id, 10,
+        )
+        first_trailer_length = len(first_trailer % 0)
+
+        # Posiciones sin el hint stream: así las usan las tablas de pistas
+        position = len(header) + lin_length + first_xref_length + first_trailer_length
+        offsets: Dict[ObjectKey, int] = {self.catalog: position}
+        position += lengths[self.catalog]
+        hint_position = position
+        for key in self.first_page + [k for keys in self.other_pages for k in keys] + self.shared + self.others:
+            offsets[key] = position
+            position += lengths[key]
+        end_of_objects = position
+
+        pages = [PageHint(len(self.first_page), sum(lengths[key] for key in self.first_page))]
+        pages[0].content_offset, pages[0].content_length = self._content_hint(
+            self.first_page[0], self.first_page, offsets, lengths)
+        shared_index = {key: index for index, key in enumerate(self.first_page + self.shared)}
+        for section, used in zip(self.other_pages, self.page_objects[1:]):
+            own = set(section)
+            # Compartidos: los que la página usa pero no van en su propia sección
+            hint = PageHint(len(section), sum(lengths[key] for key in section),
+                            [shared_index[key] for key in used if key not in own and key in shared_index])
+            hint.content_offset, hint.content_length = self._content_hint(section[0], section, offsets, lengths)
+            pages.append(hint)
+        tables = HintTables(
+            first_page_offset=offsets[self.first_page[0]],
+            pages=pages,
+            first_shared_num=self.numbers[self.shared[0]] if self.shared else 0,
+            first_shared_offset=offsets[self.shared[0]] if self.shared else 0,
+            shared_first_page=len(self.first_page),
+            shared_lengths=[lengths[key] for key in self.first_page + self.shared],
+        )
+        hint_data, shared_offset = tables.encode()
+        hint_object = (
+            b"%d 0 obj\n<</S %d /Length %d>>\nstream\n" % (hint_num, shared_offset, len(hint_data))
+            + hint_data + b"\nendstream\nendobj\n"
+        )
+        shift = len(hint_object)
+
+        def real(key: ObjectKey) -> int:
+            return offsets[key] + (shift if offsets[key] >= hint_position else 0)
+
+        end_of_first_page = real(self.first_page[-1]) + lengths[self.first_page[-1]]
+        main_xref = end_of_objects + shift
+        main_header = b"xref\n0 %d\n" % self.main_count
+        main_trailer = b"trailer\n<</Size %d>>\nstartxref\n%d\n%%%%EOF\n" % (
+            self.main_count, len(header) + lin_length,
+        )
+        file_length = main_xref + len(main_header) + 20 * self.main_count + len(main_trailer)
+        lin_dict = _LIN_DICT % (
+            file_length, hint_position, shift, self.numbers[self.first_page[0]],
+            end_of_first_page, len(self.page_refs), main_xref + len(main_header) - 1,
+        )
+
+        by_number = {num: key for key, num in self.numbers.items()}
+        with open(output, "wb") as f:
+            f.write(header)
+            f.write(b"%d 0 obj\n" % lin_num + lin_dict.ljust(_LIN_WIDTH) + b"\nendobj\n")
+            f.write(b"xref\n%d %d\n" % (self.main_count, first_xref_count))
+            for num in range(self.main_count, self.size):
+                key = by_number[num]
+                offset = len(header) if key is _LINEARIZATION else hint_position if key is _HINTS else real(key)
+                f.write(b"%010d 00000 n \n" % offset)
+            f.write(first_trailer % main_xref)
+            f.writelines(chunks[self.catalog])
+            f.write(hint_object)
+            for key in self.first_page + [k for keys in self.other_pages for k in keys] + self.shared + self.others:
+                f.writelines(chunks[key])
+            f.write(main_header)
+            f.write(b"0000000000 65535 f \n")
+            for num in range(1, self.main_count):
+                f.write(b"%010d 00000 n \n" % real(by_number[num]))
+            f.write(main_trailer)
+
+
+def linearize_pdf(input_path: Path, output_path: Path) -> None:
+    """Reescribe input_path linealizado en output_path (que no debe ser el mismo archivo)."""
+    with mapped_reader(Path(input_path)) as reader:
+        if not reader.pages:
+            raise ValueError("No se puede linealizar un PDF sin páginas")
+        trailer_id = reader.trailer.get("/ID")
+        if trailer_id:
+            file_id = bytes(trailer_id[0].original_bytes).hex().encode("ascii")
+        else:
+            file_id = os.urandom(16).hex().encode("ascii")
+        header = getattr(reader, "pdf_header", "") or ""
+        version = header[5:] if header.startswith("%PDF-") else "1.7"
+        _Linearizer(reader).write(Path(output_path), file_id, version)
+
+
+# ===== Verificación =====
+
+@dataclass
+class LinearizationCheck:
+    linearized: bool
+    errors: List[str] = field(default_factory=list)
+    file_size: int = 0
+    first_page_end: int = 0     # bytes que hay que leer para mostrar la primera página
+
+    @property
+    def valid(self) -> bool:
+        return self.linearized and not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "linearized": self.linearized,
+            "valid": self.valid,
+            "errors": self.errors,
+            "file_size": self.file_size,
+            "first_page_end": self.first_page_end,
+        }
+
+
+def verify_linearized(path: Path) -> LinearizationCheck:
+    """
+    Comprueba que el archivo está linealizado y que sus tablas de pistas son coherentes:
+    el diccionario de linealización, que cada página empieza donde dicen las pistas y
+    abarca los objetos y bytes indicados, que los objetos compartidos están donde se
+    anuncian y que todo lo que usa la primera página está antes de /E.
+    """
+    data = map_file(Path(path))
+    try:
+        check = LinearizationCheck(False, file_size=len(data))
+        match = _LIN_HEADER.match(data)
+        if match is None:
+            return check
+        parser = ObjectParser(data)
+        try:
+            lin, _ = parser.indirect(match.start(1), int(match.group(1)))
+        except StructureError:
+            # Un primer objeto ilegible no es un diccionario de linealización; el daño lo
+            # informa la validación estructural
+            return check
+        if not isinstance(lin, dict) or "/Linearized" not in lin:
+            return check
+        if lin.get("/L") != len(data):
+            # Con una actualización incremental añadida el diccionario deja de valer y los
+            # visores tratan el archivo como no linealizado (PDF 1.7, F.2)
+            return check
+        check.linearized = True
+        check.first_page_end = lin.get("/E", 0)
+        try:
+            _verify(data, parser, lin, check)
+        except (StructureError, ValueError, KeyError, IndexError, TypeError) as e:
+            check.errors.append(f"Estructura no válida: {e}")
+        return check
+    finally:
+        data.close()
+
+
+def _verify(data, parser: ObjectParser, lin: Dict[str, Any], check: LinearizationCheck) -> None:
+    errors = check.errors
+    xref = XrefReader(data)
+    entries = xref.entries()
+    hint_offset, hint_length = lin["/H"][:2]
+
+    def offset_of(num: int) -> int:
+        kind, offset, _ = entries.get(num, (0, 0, 0))
+        if kind != 1:
+            raise StructureError(f"el objeto {num} no está en la tabla de referencias")
+        return offset
+
+    def adjusted(num: int) -> int:
+        # Las tablas de pistas cuentan las posiciones como si no existiera el hint stream
+        offset = offset_of(num)
+        return offset - hint_length if offset >= hint_offset else offset
+
+    hint_dict, end = parser.indirect(hint_offset)
+    hint_data = parser.stream(hint_dict, end)
+    if data.find(b"endobj", end) + len(b"endobj") - hint_offset > hint_length:
+        errors.append("/H no abarca el hint stream")
+
+    page_nums = _page_numbers(xref)
+    if lin.get("/N") != len(page_nums):
+        errors.append(f"/N ({lin.get('/N')}) no coincide con el número de páginas ({len(page_nums)})")
+    if lin.get("/O") != page_nums[0]:
+        errors.append(f"/O ({lin.get('/O')}) no es la primera página ({page_nums[0]})")
+    if len(xref.sections) < 2 or lin.get("/T") != xref.sections[-1].subsections[0][2] - 1:
+        errors.append("/T no apunta a la primera entrada de la tabla de referencias principal")
+
+    tables = HintTables.decode(hint_data, hint_dict.get("/S", 0), len(page_nums))
+    position = tables.first_page_offset
+    for index, (page, num) in enumerate(zip(tables.pages, page_nums), start=1):
+        if adjusted(num) != position:
+            errors.append(f"Página {index}: las pistas la sitúan en {position}, está en {adjusted(num)}")
+            break
+        # Los objetos de cada página se numeran seguidos a partir del de la página
+        if not position <= adjusted(num + page.objects - 1) < position + page.length:
+            errors.append(f"Página {index}: sus {page.objects} objetos no caben en {page.length} bytes")
+        if any(ident >= len(tables.shared_lengths) for ident in page.shared):
+            errors.append(f"Página {index}: referencia a un objeto compartido inexistente")
+        position += page.length
+
+    if tables.shared_first_page != tables.pages[0].objects:
+        errors.append("La tabla de compartidos no cubre la sección de la primera página")
+    position = tables.first_shared_offset
+    for index, length in enumerate(tables.shared_lengths[tables.shared_first_page:]):
+        num = tables.first_shared_num + index
+        if adjusted(num) != position:
+            errors.append(f"Objeto compartido {num}: las pistas lo sitúan en {position}, está en {adjusted(num)}")
+            break
+        position += length
+
+    first_page_end = lin.get("/E", 0)
+    for num in _page_objects(xref, page_nums[0], set(page_nums)):
+        if offset_of(num) >= first_page_end:
+            errors.append(f"El objeto {num}, que usa la primera página, está después de /E")
+            break
+
+
+def _page_numbers(xref: XrefReader) -> List[int]:
+    """Números de objeto de las páginas en orden, recorriendo el árbol de páginas."""
+    root = xref.resolve(xref.trailer["/Root"])
+    pages, stack = [], [root["/Pages"]]
+    while stack:
+        ref = stack.pop()
+        node = xref.resolve(ref)
+        if node.get("/Type") == "/Pages":
+            stack.extend(reversed(node.get("/Kids", [])))
+        elif isinstance(ref, Reference):
+            pages.append(ref.num)
+    if not pages:
+        raise StructureError("el árbol de páginas está vacío")
+    return pages
+
+
+def _page_objects(xref: XrefReader, page_num: int, page_nums: set) -> List[int]:
+    """Objetos que usa una página, sin seguir /Parent ni las referencias a otras páginas."""
+    found, stack = [page_num], [{k: v for k, v in xref.resolve(Reference(page_num, 0)).items() if k != "/Parent"}]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Reference):
+            if value.num in page_nums or value.num in found:
+                continue
+            found.append(value.num)
+            stack.append(xref.resolve(value))
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return found
@@ -0,0 +1,52 @@
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    file_id_for,
+    opened_reader,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class PDFMerger:
+    @staticmethod
+    def merge(
+        input_paths: List[Path],
+        output_path: Path,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Une los PDFs en orden abriendo un solo archivo de entrada a la vez.
+        La salida se escribe en un archivo temporal que se renombra al terminar y, con
+        linearize, linealizada (vista web rápida).
+        """
+        if len(input_paths) < 2:
+            return False, "Se requieren al menos dos archivos PDF"
+
+        total = len(input_paths)
+        output = None
+        try:
+            output = PDFOutputFile(output_path, linearize=linearize)
+            for index, input_path in enumerate(input_paths, start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                with opened_reader(input_path) as reader:
+                    output.writer.add_document(reader)
+                if progress_callback:
+                    progress_callback(index, total)
+            output.commit(file_id_for(*input_paths))
+            return True, None
+        except OperationCancelled:
+            output.discard()
+            return False, CANCELLED_MESSAGE
+        except Exception as e:
+            if output is not None:
+                output.discard()
+            return False, str(e)
@@ -0,0 +1,500 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core.pdf_io import map_file, mapped_reader
+
+CACHE_SIZE = 4096
+
+_TAIL = 4096
+_MAX_SECTIONS = 64
+_MAX_KIDS = 1024        # hijos de la raíz que se contrastan antes de recurrir al análisis completo
+_MAX_DEPTH = 32
+
+_WHITESPACE = b" \t\r\n\f\x00"
+_HEADER = re.compile(rb"%PDF-(\d\.\d)")
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_OBJ_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+_SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)\s*?(?:\r\n|\r|\n| \r?\n)")
+_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_TOKEN = re.compile(
+    rb"<<|>>|\[|\]"
+    rb"|(\d+)\s+(\d+)\s+R\b"
+    rb"|/[^\s/<>\[\]()%{}]*"
+    rb"|[+-]?(?:\d+\.?\d*|\.\d+)"
+    rb"|<[0-9A-Fa-f\s]*>"
+    rb"|true\b|false\b|null\b"
+)
+
+
+@dataclass(frozen=True)
+class PDFInfo:
+    page_count: int
+    is_encrypted: bool
+    version: str
+    file_size: int
+    probed: bool = True  # False si hubo que recurrir al análisis completo
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "page_count": self.page_count,
+            "is_encrypted": self.is_encrypted,
+            "version": self.version,
+            "file_size": self.file_size,
+            "probed": self.probed,
+        }
+
+
+class StructureError(ValueError):
+    """La estructura no es la esperada (la sonda recurre entonces al análisis completo con pypdf)."""
+
+
+class ObjectSyntaxError(StructureError):
+    """El objeto está donde dice la tabla de referencias, pero su contenido no se puede leer."""
+
+
+@dataclass(frozen=True)
+class Reference:
+    num: int
+    gen: int
+
+
+class ObjectParser:
+    """Lector mínimo de objetos PDF: lo justo para el trailer, el catálogo y el árbol de páginas."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def skip(self, pos: int) -> int:
+        data = self.data
+        while pos < len(data):
+            char = data[pos:pos + 1]
+            if char in _WHITESPACE and char:
+                pos += 1
+            elif char == b"%":
+                end = data.find(b"\n", pos)
+                pos = len(data) if end < 0 else end + 1
+            else:
+                break
+        return pos
+
+    def string_end(self, pos: int) -> int:
+        """Fin de la cadena literal que empieza en pos; admite paréntesis anidados equilibrados."""
+        data = self.data
+        depth = 0
+        while pos < len(data):
+            char = data[pos:pos + 1]
+            if char == b"\\":
+                pos += 2
+                continue
+            if char == b"(":
+                depth += 1
+            elif char == b")":
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            pos += 1
+        raise ObjectSyntaxError("cadena sin cerrar")
+
+    def value(self, pos: int) -> Tuple[Any, int]:
+        pos = self.skip(pos)
+        if self.data[pos:pos + 1] == b"(":
+            end = self.string_end(pos)
+            return bytes(self.data[pos:end]), end
+        match = _TOKEN.match(self.data, pos)
+        if match is None:
+            raise ObjectSyntaxError(f"token inesperado en {pos}")
+        token = match.group(0)
+        end = match.end()
+        if token == b"<<":
+            result = {}
+            while True:
+                pos = self.skip(end)
+                if self.data[pos:pos + 2] == b">>":
+                    return result, pos + 2
+                key, pos = self.value(pos)
+                if not isinstance(key, str) or not key.startswith("/"):
+                    raise ObjectSyntaxError("clave de diccionario no válida")
+                result[key], end = self.value(pos)
+        if token == b"[":
+            result = []
+            while True:
+                pos = self.skip(end)
+                if self.data[pos:pos + 1] == b"]":
+                    return result, pos + 1
+                item, end = self.value(pos)
+                result.append(item)
+        if token in (b">>", b"]"):
+            raise ObjectSyntaxError("delimitador inesperado")
+        if match.group(1) is not None:
+            return Reference(int(match.group(1)), int(match.group(2))), end
+        if token.startswith(b"/"):
+            return token.decode("latin-1"), end
+        if token[:1] in b"+-.0123456789":
+            return (float(token) if b"." in token else int(token)), end
+        if token in (b"true", b"false"):
+            return token == b"true", end
+        if token == b"null":
+            return None, end
+        return token, end
+
+    def indirect(self, offset: int, num: Optional[int] = None) -> Tuple[Any, int]:
+        """Objeto indirecto en offset: (valor, posición tras el valor)."""
+        match = _OBJ_HEADER.match(self.data, offset)
+        if match is None or (num is not None and int(match.group(1)) != num):
+            raise StructureError(f"no hay objeto {num} en {offset}")
+        return self.value(match.end())
+
+    def stream(self, dictionary: Dict[str, Any], pos: int) -> bytes:
+        pos = self.skip(pos)
+        if self.data[pos:pos + 6] != b"stream":
+            raise StructureError("falta stream")
+        pos += 6
+        if self.data[pos:pos + 2] == b"\r\n":
+            pos += 2
+        elif self.data[pos:pos + 1] in (b"\n", b"\r"):
+            pos += 1
+        length = dictionary.get("/Length")
+        if not isinstance(length, int):
+            length = self.data.find(b"endstream", pos) - pos
+            if length < 0:
+                raise StructureError("falta endstream")
+        raw = bytes(self.data[pos:pos + length])
+        return _decode(raw, dictionary)
+
+
+def _decode(raw: bytes, dictionary: Dict[str, Any]) -> bytes:
+    filters = dictionary.get("/Filter")
+    if filters is None:
+        return raw
+    if isinstance(filters, list):
+        if len(filters) != 1:
+            raise StructureError("cadena de filtros no soportada")
+        filters = filters[0]
+    if filters != "/FlateDecode":
+        raise StructureError(f"filtro no soportado: {filters}")
+    try:
+        data = zlib.decompressobj().decompress(raw)
+    except zlib.error as e:
+        raise StructureError(str(e))
+
+    params = dictionary.get("/DecodeParms") or {}
+    if isinstance(params, list):
+        params = params[0] or {}
+    predictor = params.get("/Predictor", 1)
+    if predictor < 10:
+        if predictor != 1:
+            raise StructureError("predictor TIFF no soportado")
+        return data
+    return _png_unpredict(data, params.get("/Columns", 1))
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise StructureError("datos con predictor PNG incompletos")
+    previous = bytearray(columns)
+    output = bytearray()
+    for start in range(0, len(data), row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                upper_left = previous[i - 1] if i else 0
+                estimate = left + up - upper_left
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else upper_left)) & 0xFF
+            elif kind != 0:
+                raise StructureError("filtro PNG desconocido")
+        output += row
+        previous = row
+    return bytes(output)
+
+
+class _XrefSection:
+    """Una sección de la tabla de referencias (clásica o en stream) con su trailer."""
+
+    def __init__(self, parser: ObjectParser, offset: int):
+        self.parser = parser
+        self.subsections: List[Tuple[int, int, int]] = []  # primer objeto, cantidad, posición
+        self.rows: Optional[bytes] = None
+        self.widths: Tuple[int, int, int] = (0, 0, 0)
+        data = parser.data
+        pos = parser.skip(offset)
+        if data[pos:pos + 4] == b"xref":
+            pos += 4
+            while True:
+                match = _SUBSECTION.match(data, pos)
+                if match is None:
+                    break
+                first, count = int(match.group(1)), int(match.group(2))
+                self.subsections.append((first, count, match.end()))
+                pos = match.end() + 20 * count
+            pos = parser.skip(pos)
+            if data[pos:pos + 7] != b"trailer":
+                raise StructureError("falta trailer")
+            self.trailer, _ = parser.value(pos + 7)
+        else:
+            self.trailer, end = parser.indirect(offset)
+            if not isinstance(self.trailer, dict) or self.trailer.get("/Type") != "/XRef":
+                raise StructureError("startxref no apunta a una tabla de referencias")
+            widths = self.trailer.get("/W")
+            if not isinstance(widths, list) or len(widths) != 3:
+                raise StructureError("/W no válido")
+            self.widths = tuple(widths)
+            self.rows = parser.stream(self.trailer, end)
+            index = self.trailer.get("/Index") or [0, self.trailer.get("/Size", 0)]
+            row = 0
+            for first, count in zip(index[::2], index[1::2]):
+                self.subsections.append((first, count, row))
+                row += count
+
+    def entries(self) -> Iterator[Tuple[int, Tuple[int, int, int]]]:
+        for first, count, _ in self.subsections:
+            for num in range(first, first + count):
+                yield num, self.lookup(num)
+
+    def lookup(self, num: int) -> Optional[Tuple[int, int, int]]:
+        """(tipo, a, b): 1 = desplazamiento a; 2 = índice b dentro del stream de objetos a; 0 = libre."""
+        for first, count, position in self.subsections:
+            if not first <= num < first + count:
+                continue
+            if self.rows is None:
+                entry = _ENTRY.match(self.parser.data, position + 20 * (num - first))
+                if entry is None:
+                    raise StructureError("entrada de xref mal formada")
+                return (1 if entry.group(3) == b"n" else 0), int(entry.group(1)), int(entry.group(2))
+            size = sum(self.widths)
+            start = (position + num - first) * size
+            row = self.rows[start:start + size]
+            if len(row) < size:
+                raise StructureError("stream de xref truncado")
+            fields, cursor = [], 0
+            for width in self.widths:
+                fields.append(int.from_bytes(row[cursor:cursor + width], "big"))
+                cursor += width
+            kind = fields[0] if self.widths[0] else 1
+            return kind, fields[1], fields[2]
+        return None
+
+
+class XrefReader:
+    """
+    Tablas de referencias de un PDF (la última sección y las anteriores por /Prev), con
+    acceso a los objetos por número sin analizar el resto del archivo.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.parser = ObjectParser(data)
+        self.sections: List[_XrefSection] = []
+        self._object_streams: Dict[int, Tuple[bytes, Dict[int, int], int]] = {}
+
+        header = _HEADER.match(self.data, 0)
+        if header is None:
+            raise StructureError("falta la cabecera %PDF")
+        self.version = header.group(1).decode("ascii")
+
+        tail_start = max(0, len(self.data) - _TAIL)
+        matches = list(_STARTXREF.finditer(self.data, tail_start))
+        if not matches:
+            raise StructureError("falta startxref")
+        self.startxref = int(matches[-1].group(1))
+        self._load_sections(self.startxref)
+
+    @property
+    def trailer(self) -> Dict[str, Any]:
+        return self.sections[0].trailer
+
+    @property
+    def is_encrypted(self) -> bool:
+        return "/Encrypt" in self.trailer
+
+    def info(self, file_size: int) -> PDFInfo:
+        version = self.version
+        root = self.resolve(self.trailer.get("/Root"))
+        if not isinstance(root, dict):
+            raise StructureError("catálogo no válido")
+        catalog_version = root.get("/Version")
+        if isinstance(catalog_version, str) and catalog_version[1:] > version:
+            version = catalog_version[1:]
+
+        pages = self.resolve(root.get("/Pages"))
+        if not isinstance(pages, dict) or pages.get("/Type", "/Pages") != "/Pages":
+            raise StructureError("árbol de páginas no válido")
+        count = self.resolve(pages.get("/Count"))
+        kids = self.resolve(pages.get("/Kids"))
+        if not isinstance(count, int) or count < 0 or not isinstance(kids, list):
+            raise StructureError("/Count no válido")
+        self._check_page_tree(kids, count)
+        return PDFInfo(count, self.is_encrypted, version, file_size)
+
+    def _node(self, ref: Any) -> Dict[str, Any]:
+        node = self.resolve(ref)
+        if not isinstance(node, dict) or node.get("/Type") not in ("/Page", "/Pages"):
+            raise StructureError("nodo del árbol de páginas no válido")
+        return node
+
+    def _check_page_tree(self, kids: List[Any], count: int) -> None:
+        """
+        /Count de la raíz contrastado con la suma de sus hijos (uno por hoja, su /Count si es
+        un nodo intermedio) y comprobación de que la última página existe: un /Count que no
+        cuadra con el árbol haría que la sonda diera un número de páginas falso.
+        """
+        if not kids:
+            if count:
+                raise StructureError("/Count sin páginas")
+            return
+        if len(kids) > _MAX_KIDS:
+            raise StructureError("árbol de páginas demasiado ancho para contrastarlo")
+        total = 0
+        for kid in kids:
+            node = self._node(kid)
+            if node["/Type"] == "/Page":
+                total += 1
+                continue
+            kid_count = self.resolve(node.get("/Count"))
+            if not isinstance(kid_count, int) or kid_count < 0:
+                raise StructureError("/Count no válido")
+            total += kid_count
+        if total != count:
+            raise StructureError(f"/Count ({count}) no coincide con el árbol ({total})")
+
+        # Hasta la última hoja, siguiendo siempre el último hijo
+        for _ in range(_MAX_DEPTH):
+            if node["/Type"] == "/Page":
+                return
+            children = self.resolve(node.get("/Kids"))
+            if not isinstance(children, list) or not children:
+                raise StructureError("nodo de páginas sin hijos")
+            node = self._node(children[-1])
+        raise StructureError("árbol de páginas demasiado profundo")
+
+    def entries(self) -> Dict[int, Tuple[int, int, int]]:
+        """Tabla completa número -> (tipo, a, b); las secciones más recientes prevalecen."""
+        table: Dict[int, Tuple[int, int, int]] = {}
+        for section in reversed(self.sections):
+            table.update(section.entries())
+        return table
+
+    def _load_sections(self, offset: int) -> None:
+        seen = set()
+        pending = [offset]
+        while pending and len(self.sections) < _MAX_SECTIONS:
+            offset = pending.pop(0)
+            if offset in seen or not 0 <= offset < len(self.data):
+                continue
+            seen.add(offset)
+            section = _XrefSection(self.parser, offset)
+            self.sections.append(section)
+            # Archivos híbridos: el stream de xref complementa la tabla clásica de la misma sección
+            for key in ("/XRefStm", "/Prev"):
+                if isinstance(section.trailer.get(key), int):
+                    pending.append(section.trailer[key])
+
+    def _locate(self, num: int) -> Tuple[int, int, int]:
+        for section in self.sections:
+            entry = section.lookup(num)
+            if entry is not None:
+                return entry
+        raise StructureError(f"objeto {num} ausente de la xref")
+
+    def resolve(self, value: Any) -> Any:
+        if not isinstance(value, Reference):
+            return value
+        kind, first, second = self._locate(value.num)
+        if kind == 1:
+            return self.parser.indirect(first, value.num)[0]
+        if kind == 2:
+            return self._from_object_stream(first, value.num)
+        raise StructureError(f"objeto {value.num} libre")
+
+    def object_stream(self, stream_num: int) -> Tuple[bytes, Dict[int, int], int]:
+        """Contenido descomprimido de un stream de objetos, sus desplazamientos y /First."""
+        if stream_num not in self._object_streams:
+            if self.is_encrypted:
+                raise StructureError("stream de objetos cifrado")
+            kind, offset, _ = self._locate(stream_num)
+            if kind != 1:
+                raise StructureError("stream de objetos no localizable")
+            dictionary, end = self.parser.indirect(offset, stream_num)
+            content = self.parser.stream(dictionary, end)
+            pairs = ObjectParser(content)
+            offsets, pos = {}, 0
+            for _ in range(dictionary.get("/N", 0)):
+                obj_num, pos = pairs.value(pos)
+                obj_offset, pos = pairs.value(pos)
+                offsets[obj_num] = obj_offset
+            self._object_streams[stream_num] = (content, offsets, dictionary.get("/First", 0))
+        return self._object_streams[stream_num]
+
+    def _from_object_stream(self, stream_num: int, num: int) -> Any:
+        content, offsets, first = self.object_stream(stream_num)
+        if num not in offsets:
+            raise StructureError(f"objeto {num} ausente del stream {stream_num}")
+        return ObjectParser(content).value(first + offsets[num])[0]
+
+
+def _full_parse(path: Path, file_size: int, version: str) -> PDFInfo:
+    with mapped_reader(path) as reader:
+        is_encrypted = reader.is_encrypted
+        if is_encrypted:
+            reader.decrypt("")
+        return PDFInfo(len(reader.pages), is_encrypted, version, file_size, probed=False)
+
+
+_cache: "OrderedDict[Tuple[str, int, int], PDFInfo]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def probe_pdf(path: Path) -> PDFInfo:
+    """
+    Número de páginas, cifrado, versión y tamaño de un PDF leyendo solo la cabecera, la
+    tabla de referencias, el trailer, el catálogo y la raíz del árbol de páginas.
+    Si algo no cuadra se analiza el archivo completo. Los resultados se guardan por
+    ruta, fecha de modificación y tamaño.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        info = _cache.get(key)
+        if info is not None:
+            _cache.move_to_end(key)
+            return info
+
+    data = map_file(path)
+    try:
+        info = XrefReader(data).info(stat.st_size)
+    except (ValueError, TypeError, IndexError, AttributeError, RecursionError):
+        info = None
+        # Los lectores toleran basura antes de la cabecera: se busca en el primer KB
+        header = _HEADER.search(data, 0, 1024)
+        version = header.group(1).decode("ascii") if header else ""
+    finally:
+        data.close()
+    if info is None:
+        info = _full_parse(path, stat.st_size, version)
+
+    with _cache_lock:
+        _cache[key] = info
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
+
+
+def clear_probe_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
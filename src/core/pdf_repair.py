@@ -1,24 +1,59 @@
+import threading
 from pathlib import Path
-from typing import Tuple, Optional
-from pypdf import PdfReader, PdfWriter
+from typing import Callable, Tuple, Optional
+
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    file_id_for,
+    opened_reader,
+)
+
+ProgressCallback = Callable[[int, int], None]
 
 
 class PDFRepairer:
     @staticmethod
-    def repair(input_path: Path, output_path: Path) -> Tuple[bool, Optional[str]]:
+    def repair(
+        input_path: Path,
+        output_path: Path,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Reescribe el PDF desde cero: pypdf reconstruye al leer la tabla xref y las longitudes
+        dañadas, y la salida se escribe compacta, con tabla nueva y solo los objetos que usan
+        las páginas. Los objetos que no se pueden leer se escriben como null.
+        Con linearize, la salida se escribe linealizada (vista web rápida).
+        """
+        output = None
         try:
-            reader = PdfReader(str(input_path))
-            writer = PdfWriter()
-
-            for page in reader.pages:
-                writer.add_page(page)
+            with opened_reader(input_path) as reader:
+                pages = list(reader.pages)
+                output = PDFOutputFile(output_path, linearize=linearize)
+                output.writer.begin_document(reader, pages)
 
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "wb") as f:
-                writer.write(f)
+                total = len(pages)
+                for index, page in enumerate(pages, start=1):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    output.writer.add_page(page)
+                    if progress_callback:
+                        progress_callback(index, total)
 
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                output.writer.copy_document_data(reader)
+            output.commit(file_id_for(input_path))
             return True, None
+        except OperationCancelled:
+            output.discard()
+            return False, CANCELLED_MESSAGE
         except Exception as e:
+            if output is not None:
+                output.discard()
             return False, str(e)
 
     @staticmethod
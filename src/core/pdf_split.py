@@ -0,0 +1,289 @@
+import re
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pypdf import PdfReader
+
+from src.core.pdf_writer import (
+    CANCELLED_MESSAGE,
+    OperationCancelled,
+    PDFOutputFile,
+    file_id_for,
+    open_reader,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+SPLIT_MODES = ("ranges", "every", "bookmarks", "size")
+
+
+def parse_page_ranges(text: str, page_count: int) -> List[Tuple[int, int]]:
+    """Convierte "1-3, 5, 7-10" en rangos 0-based inclusivos."""
+    ranges = []
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start = int(start_text) if start_text.strip() else 1
+            end = int(end_text) if end_text.strip() else page_count
+        else:
+            start = end = int(part)
+        if start < 1 or end > page_count or start > end:
+            raise ValueError(f"Rango inválido: {part} (el documento tiene {page_count} páginas)")
+        ranges.append((start - 1, end - 1))
+    if not ranges:
+        raise ValueError("No se indicaron páginas")
+    return ranges
+
+
+class PageRangeSet:
+    """Conjunto de páginas guardado como intervalos ordenados y disjuntos."""
+
+    def __init__(self, ranges: Sequence[Tuple[int, int]] = ()):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for start, end in sorted(ranges):
+            if self._ends and start <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    @classmethod
+    def from_text(cls, text: str, page_count: int) -> "PageRangeSet":
+        return cls(parse_page_ranges(text, page_count))
+
+    def __contains__(self, page: int) -> bool:
+        index = bisect_right(self._starts, page) - 1
+        return index >= 0 and page <= self._ends[index]
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end + 1)
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    @property
+    def intervals(self) -> List[Tuple[int, int]]:
+        return list(zip(self._starts, self._ends))
+
+
+def every_n_ranges(page_count: int, every: int) -> List[Tuple[int, int]]:
+    if every < 1:
+        raise ValueError("El número de páginas por archivo debe ser al menos 1")
+    return [(start, min(start + every, page_count) - 1) for start in range(0, page_count, every)]
+
+
+def bookmark_ranges(reader: PdfReader) -> List[Tuple[int, int, str]]:
+    """Un rango por marcador de primer nivel; las páginas previas al primero se suman a él."""
+    starts: Dict[int, str] = {}
+    for item in reader.outline:
+        if isinstance(item, list):
+            continue
+        try:
+            page = reader.get_destination_page_number(item)
+        except Exception:
+            continue
+        if page is not None and page >= 0 and page not in starts:
+            starts[page] = str(item.title or "")
+    if not starts:
+        raise ValueError("El documento no tiene marcadores")
+
+    page_count = len(reader.pages)
+    ordered = sorted(starts.items())
+    result = []
+    for index, (start, title) in enumerate(ordered):
+        end = ordered[index + 1][0] - 1 if index + 1 < len(ordered) else page_count - 1
+        result.append((0 if index == 0 else start, end, title))
+    return result
+
+
+def _safe_name(title: str) -> str:
+    name = re.sub(r'[\\/:*?"<>|\s]+', "_", title).strip("._")
+    return name[:60] or "marcador"
+
+
+def _range_suffix(start: int, end: int) -> str:
+    return f"{start + 1}" if start == end else f"{start + 1}-{end + 1}"
+
+
+class PDFSplitter:
+    @staticmethod
+    def split(
+        input_path: Path,
+        output_dir: Path,
+        ranges: Optional[str] = None,
+        mode: str = "ranges",
+        every: int = 1,
+        max_size_mb: Optional[float] = None,
+        linearize: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], List[Path]]:
+        """
+        Divide el PDF recorriendo el origen una sola vez: cada página se lee una vez y se
+        copia a todas las salidas abiertas que la contienen. Los recursos compartidos
+        (fuentes, imágenes) se escriben una vez por archivo de salida.
+
+        Modos: "ranges" (texto tipo "1-3, 5"; sin texto, una página por archivo),
+        "every" (cada N páginas), "bookmarks" (marcadores de primer nivel) y
+        "size" (nuevo archivo al superar max_size_mb).
+        Con linearize, cada archivo se escribe linealizado (vista web rápida).
+        """
+        if mode not in SPLIT_MODES:
+            return False, f"Modo de división desconocido: {mode}", []
+        input_path = Path(input_path)
+        output_dir = Path(output_dir)
+        outputs: List[Path] = []
+        try:
+            reader = open_reader(input_path)
+            page_count = len(reader.pages)
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            if mode == "size":
+                if not max_size_mb or max_size_mb <= 0:
+                    raise ValueError("Indica un tamaño máximo por archivo")
+                outputs = PDFSplitter._split_by_size(
+                    reader, input_path, output_dir, int(max_size_mb * 1024 * 1024),
+                    linearize, progress_callback, cancel_event,
+                )
+                return True, None, outputs
+
+            if mode == "bookmarks":
+                targets = [
+                    (start, end, output_dir / f"{input_path.stem}_{index:02d}_{_safe_name(title)}.pdf")
+                    for index, (start, end, title) in enumerate(bookmark_ranges(reader), start=1)
+                ]
+            else:
+                if mode == "every":
+                    page_ranges = every_n_ranges(page_count, every)
+                elif ranges:
+                    page_ranges = parse_page_ranges(ranges, page_count)
+                else:
+                    page_ranges = every_n_ranges(page_count, 1)
+                targets = [
+                    (start, end, output_dir / f"{input_path.stem}_{_range_suffix(start, end)}.pdf")
+                    for start, end in page_ranges
+                ]
+
+            outputs = PDFSplitter._split_targets(
+                reader, input_path, targets, linearize, progress_callback, cancel_event,
+            )
+            return True, None, outputs
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, []
+        except Exception as e:
+            return False, str(e), []
+
+    @staticmethod
+    def _split_targets(
+        reader: PdfReader,
+        input_path: Path,
+        targets: List[Tuple[int, int, Path]],
+        linearize: bool,
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> List[Path]:
+        # Las salidas se abren al llegar a su primera página y se cierran tras la última,
+        # así solo hay abiertas a la vez las que se solapan.
+        order = sorted(range(len(targets)), key=lambda i: targets[i][0])
+        pages_needed = PageRangeSet([(start, end) for start, end, _ in targets])
+        total = len(pages_needed)
+        open_outputs: Dict[int, PDFOutputFile] = {}
+        results: Dict[int, Path] = {}
+        next_target = 0
+        try:
+            for done, page_index in enumerate(pages_needed, start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                while next_target < len(order) and targets[order[next_target]][0] <= page_index:
+                    target_index = order[next_target]
+                    start, end, path = targets[target_index]
+                    output = PDFOutputFile(path, linearize=linearize)
+                    output.writer.begin_document(reader, (reader.pages[i] for i in range(start, end + 1)))
+                    open_outputs[target_index] = output
+                    next_target += 1
+
+                page = reader.pages[page_index]
+                for target_index, output in list(open_outputs.items()):
+                    start, end, path = targets[target_index]
+                    if start <= page_index <= end:
+                        output.writer.add_page(page)
+                    if page_index >= end:
+                        output.writer.copy_document_data(reader, whole_document=(start, end) == (0, len(reader.pages) - 1))
+                        results[target_index] = output.commit(file_id_for(input_path, start, end))
+                        del open_outputs[target_index]
+
+                if progress_callback:
+                    progress_callback(done, total)
+        except BaseException:
+            for output in open_outputs.values():
+                output.discard()
+            for path in results.values():
+                path.unlink(missing_ok=True)
+            raise
+        return [results[i] for i in range(len(targets))]
+
+    @staticmethod
+    def _split_by_size(
+        reader: PdfReader,
+        input_path: Path,
+        output_dir: Path,
+        max_bytes: int,
+        linearize: bool,
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> List[Path]:
+        # Margen para el árbol de páginas, el catálogo y la tabla xref que se escriben al cerrar
+        def projected(writer) -> int:
+            return writer.size + 20 * (len(writer.offsets) + 2) + 12 * writer.page_count + 256
+
+        page_count = len(reader.pages)
+        results: List[Path] = []
+        output: Optional[PDFOutputFile] = None
+        first_page = 0
+
+        def close(last_page: int) -> None:
+            name = f"{input_path.stem}_{_range_suffix(first_page, last_page)}.pdf"
+            output.writer.copy_document_data(reader, whole_document=(first_page, last_page) == (0, page_count - 1))
+            results.append(output.commit(file_id_for(input_path, first_page, last_page), output_dir / name))
+
+        try:
+            for page_index in range(page_count):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                page = reader.pages[page_index]
+                if output is None:
+                    output = PDFOutputFile(output_dir / f"{input_path.stem}_{page_index + 1}.pdf", linearize=linearize)
+                    output.writer.begin_document(reader)
+                    first_page = page_index
+
+                checkpoint = output.writer.checkpoint()
+                output.writer.add_page(page)
+                if projected(output.writer) > max_bytes and output.writer.page_count > 1:
+                    # La página no cabe: se retira, se cierra el archivo y se empieza otro con ella
+                    output.writer.rollback(checkpoint)
+                    close(page_index - 1)
+                    output = PDFOutputFile(output_dir / f"{input_path.stem}_{page_index + 1}.pdf", linearize=linearize)
+                    output.writer.begin_document(reader)
+                    first_page = page_index
+                    output.writer.add_page(page)
+
+                if progress_callback:
+                    progress_callback(page_index + 1, page_count)
+
+            if output is not None:
+                close(page_count - 1)
+                output = None
+        except BaseException:
+            if output is not None:
+                output.discard()
+            for path in results:
+                path.unlink(missing_ok=True)
+            raise
+        return results
@@ -0,0 +1,338 @@
+"""
+Extracción de texto por página con caché en disco.
+
+El texto de cada página se guarda en una base SQLite indexada por el hash del contenido
+del archivo y el número de página, así que un documento ya leído no se vuelve a extraer
+aunque se abra desde otra ruta, y cualquier cambio en el archivo (incluida una
+actualización incremental) invalida su entrada. Las páginas que faltan se extraen en
+procesos aparte y se devuelven según terminan, en el orden pedido: quien solo necesita
+una página no espera a las demás.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pypdf import PdfReader
+
+from src.core.pdf_io import map_file, mapped_reader, open_worker_reader, page_at, worker_reader
+from src.core.pdf_probe import probe_pdf
+from src.core.pdf_writer import CANCELLED_MESSAGE, OperationCancelled
+
+ProgressCallback = Callable[[int, int], None]
+PageCallback = Callable[[int, str], None]
+
+DEFAULT_CACHE_MB = 256
+PARALLEL_MIN_PAGES = 8
+CHUNK_PAGES = 4              # páginas por tarea: granularidad con la que llegan los resultados
+_HASH_BLOCK = 8 * 1024 * 1024
+_SQL_BATCH = 500             # por debajo del límite de parámetros de SQLite
+
+
+def default_cache_path() -> Path:
+    return Path.home() / ".xebec-pdf-fixer" / "text_cache.db"
+
+
+_hashes: Dict[Tuple[str, int, int], str] = {}
+_hashes_lock = threading.Lock()
+
+
+def document_hash(path: Path) -> str:
+    """Hash del contenido del archivo; se memoriza por ruta, fecha y tamaño para no releerlo."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _hashes_lock:
+        cached = _hashes.get(key)
+    if cached is not None:
+        return cached
+    digest = hashlib.blake2b(digest_size=20)
+    if stat.st_size:
+        data = map_file(path)
+        try:
+            for start in range(0, len(data), _HASH_BLOCK):
+                digest.update(data[start:start + _HASH_BLOCK])
+        finally:
+            data.close()
+    result = digest.hexdigest()
+    with _hashes_lock:
+        _hashes[key] = result
+    return result
+
+
+class TextCache:
+    """
+    Texto extraído por documento y página, con un presupuesto en MB. Al superarlo se
+    descartan los documentos usados hace más tiempo.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            doc TEXT PRIMARY KEY,
+            size INTEGER NOT NULL DEFAULT 0,
+            accessed REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pages (
+            doc TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            PRIMARY KEY (doc, page)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: Optional[Path] = None, budget_mb: float = DEFAULT_CACHE_MB):
+        self.path = Path(path) if path else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.budget = int(budget_mb * 1024 * 1024)
+        self._local = threading.local()
+        self._connection().executescript(self._SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, doc: str, pages: Sequence[int]) -> Dict[int, str]:
+        conn = self._connection()
+        found: Dict[int, str] = {}
+        for start in range(0, len(pages), _SQL_BATCH):
+            batch = list(pages[start:start + _SQL_BATCH])
+            marks = ",".join("?" * len(batch))
+            found.update(conn.execute(
+                f"SELECT page, text FROM pages WHERE doc = ? AND page IN ({marks})", (doc, *batch),
+            ).fetchall())
+        if found:
+            conn.execute("UPDATE documents SET accessed = ? WHERE doc = ?", (time.time(), doc))
+        return found
+
+    def put(self, doc: str, texts: Dict[int, str]) -> None:
+        if not texts:
+            return
+        size = sum(len(text.encode("utf-8")) for text in texts.values())
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages (doc, page, text) VALUES (?, ?, ?)",
+                [(doc, page, text) for page, text in texts.items()],
+            )
+            conn.execute(
+                "INSERT INTO documents (doc, size, accessed) VALUES (?, ?, ?) "
+                "ON CONFLICT(doc) DO UPDATE SET size = size + excluded.size, accessed = excluded.accessed",
+                (doc, size, time.time()),
+            )
+            self._evict(conn, keep=doc)
+
+    def _evict(self, conn: sqlite3.Connection, keep: str) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        if total <= self.budget:
+            return
+        for doc, size in conn.execute(
+            "SELECT doc, size FROM documents WHERE doc != ? ORDER BY accessed", (keep,),
+        ).fetchall():
+            conn.execute("DELETE FROM pages WHERE doc = ?", (doc,))
+            conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+            total -= size
+            if total <= self.budget:
+                break
+
+    @property
+    def size_bytes(self) -> int:
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM pages")
+            conn.execute("DELETE FROM documents")
+
+
+_cache: Optional[TextCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> TextCache:
+    """Caché compartida por todas las extracciones del proceso; se abre al primer uso."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TextCache()
+        return _cache
+
+
+def _extract_page(reader: PdfReader, index: int) -> str:
+    # Una página dañada no debe impedir leer las demás
+    try:
+        return page_at(reader, index).extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract_chunk(pages: Sequence[int]) -> List[Tuple[int, str]]:
+    reader = worker_reader()
+    return [(index, _extract_page(reader, index)) for index in pages]
+
+
+def _open_for_text(reader: PdfReader) -> None:
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise ValueError("El archivo está protegido con contraseña")
+
+
+class PDFTextExtractor:
+    @staticmethod
+    def iter_pages(
+        input_path: Path,
+        pages: Optional[Iterable[int]] = None,
+        workers: Optional[int] = None,
+        cache: Optional[TextCache] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Devuelve (índice, texto) de cada página pedida según va estando disponible: primero
+        las que ya están en caché y después las extraídas, que se reparten entre procesos en
+        el orden de pages. Las páginas fuera del documento se ignoran.
+        """
+        input_path = Path(input_path)
+        page_count = probe_pdf(input_path).page_count
+        order = list(dict.fromkeys(range(page_count) if pages is None else pages))
+        order = [index for index in order if 0 <= index < page_count]
+
+        # Lo que ya está en caché se sirve sin abrir el documento
+        doc = document_hash(input_path) if cache is not None else None
+        cached = cache.get(doc, order) if cache is not None else {}
+        for index in order:
+            if index in cached:
+                yield index, cached[index]
+        missing = [index for index in order if index not in cached]
+        if not missing:
+            return
+
+        with mapped_reader(input_path) as reader:
+            _open_for_text(reader)
+            workers = workers or min(os.cpu_count() or 1, 8)
+            if workers <= 1 or len(missing) < PARALLEL_MIN_PAGES:
+                for index in missing:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    text = _extract_page(reader, index)
+                    if cache is not None:
+                        cache.put(doc, {index: text})
+                    yield index, text
+                return
+
+        chunks = [missing[start:start + CHUNK_PAGES] for start in range(0, len(missing), CHUNK_PAGES)]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=open_worker_reader, initargs=(str(input_path),),
+        ) as executor:
+            # Pocas tareas en vuelo: las primeras páginas pedidas salen antes y cancelar es inmediato
+            queue = iter(chunks)
+            pending = set()
+            try:
+                while True:
+                    while len(pending) < workers * 2:
+                        chunk = next(queue, None)
+                        if chunk is None:
+                            break
+                        pending.add(executor.submit(_extract_chunk, chunk))
+                    if not pending:
+                        break
+                    finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    for future in finished:
+                        results = future.result()
+                        if cache is not None:
+                            cache.put(doc, dict(results))
+                        yield from results
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    @staticmethod
+    def extract(
+        input_path: Path,
+        pages: Optional[Sequence[int]] = None,
+        workers: Optional[int] = None,
+        use_cache: bool = True,
+        page_callback: Optional[PageCallback] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[Dict[int, str]]]:
+        """
+        Texto de las páginas indicadas (todas si pages es None), por índice. page_callback
+        recibe cada página en cuanto está lista.
+        """
+        try:
+            texts: Dict[int, str] = {}
+            cache = get_text_cache() if use_cache else None
+            total = len(pages) if pages is not None else None
+            for index, text in PDFTextExtractor.iter_pages(input_path, pages, workers, cache, cancel_event):
+                texts[index] = text
+                if page_callback:
+                    page_callback(index, text)
+                if progress_callback and total:
+                    progress_callback(len(texts), total)
+            return True, None, texts
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            return False, str(e), None
+
+    @staticmethod
+    def find_text(
+        input_path: Path,
+        query: str,
+        start_page: int = 0,
+        workers: Optional[int] = None,
+        match_callback: Optional[Callable[[Tuple[int, int]], None]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[List[Tuple[int, int]]]]:
+        """
+        Busca query (sin distinguir mayúsculas) desde start_page hasta el final y luego desde
+        el principio. Devuelve (página, coincidencias) de cada página con resultados, en
+        orden de documento; match_callback los recibe según aparecen.
+        """
+        query = query.casefold()
+        if not query:
+            return False, "No hay texto que buscar", None
+        try:
+            page_count = probe_pdf(Path(input_path)).page_count
+            start_page = min(max(start_page, 0), max(page_count - 1, 0))
+            order = list(range(start_page, page_count)) + list(range(start_page))
+            matches: List[Tuple[int, int]] = []
+            done = 0
+            for index, text in PDFTextExtractor.iter_pages(
+                input_path, order, workers, get_text_cache(), cancel_event,
+            ):
+                done += 1
+                count = text.casefold().count(query)
+                if count:
+                    matches.append((index, count))
+                    if match_callback:
+                        match_callback((index, count))
+                if progress_callback:
+                    progress_callback(done, page_count)
+            return True, None, sorted(matches)
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            return False, str(e), None
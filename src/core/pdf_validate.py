@@ -0,0 +1,531 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from PIL import Image
+from pypdf import PdfReader
+from pypdf.generic import DictionaryObject, IndirectObject
+
+from src.core.pdf_io import map_file, mapped_reader, open_worker_reader, worker_reader
+from src.core.pdf_linearize import verify_linearized
+from src.core.pdf_probe import ObjectParser, ObjectSyntaxError, Reference, StructureError, XrefReader, probe_pdf
+from src.core.pdf_writer import CANCELLED_MESSAGE, OperationCancelled
+
+ProgressCallback = Callable[[int, int], None]
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+# Nivel de reparación que corrige cada defecto, de menos a más invasivo
+TIER_NONE = 0        # informativo
+TIER_REWRITE = 1     # reescribir el archivo: tabla xref y longitudes nuevas
+TIER_PRUNE = 2       # eliminar o anular objetos y referencias rotas
+TIER_RECODE = 3      # incrustar fuentes o recodificar imágenes
+TIER_RASTERIZE = 4   # sustituir la página por una imagen
+
+PARALLEL_MIN_PAGES = 16
+MAX_DEFECTS_PER_CODE = 200
+
+_STANDARD_FONTS = {
+    "Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic",
+    "Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique",
+    "Courier", "Courier-Bold", "Courier-Oblique", "Courier-BoldOblique",
+    "Symbol", "ZapfDingbats",
+}
+_FONT_FILES = ("/FontFile", "/FontFile2", "/FontFile3")
+_COMPONENTS = {"/DeviceGray": 1, "/DeviceRGB": 3, "/DeviceCMYK": 4, "/CalGray": 1, "/CalRGB": 3, "/Lab": 3}
+_IMAGE_CODECS = ("/DCTDecode", "/JPXDecode")
+_PASSTHROUGH_CODECS = ("/CCITTFaxDecode", "/JBIG2Decode")
+
+
+@dataclass
+class Defect:
+    code: str
+    severity: str
+    message: str
+    tier: int
+    obj: Optional[str] = None           # "12 0"
+    pages: List[int] = field(default_factory=list)  # 1-based
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "code": self.code,
+            "severity": self.severity,
+            "message": self.message,
+            "tier": self.tier,
+            "obj": self.obj,
+            "pages": self.pages,
+        }
+
+
+@dataclass
+class ValidationReport:
+    file_path: str
+    file_size: int
+    page_count: int
+    version: str
+    is_encrypted: bool
+    linearized: bool = False
+    defects: List[Defect] = field(default_factory=list)
+    checked_objects: int = 0
+    checked_pages: int = 0
+    omitted_defects: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return not any(defect.severity == SEVERITY_ERROR for defect in self.defects)
+
+    @property
+    def repair_tier(self) -> int:
+        """Nivel mínimo de reparación que corrige todos los defectos."""
+        return max((defect.tier for defect in self.defects), default=TIER_NONE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_path": self.file_path,
+            "file_size": self.file_size,
+            "page_count": self.page_count,
+            "version": self.version,
+            "is_encrypted": self.is_encrypted,
+            "linearized": self.linearized,
+            "valid": self.valid,
+            "repair_tier": self.repair_tier,
+            "errors": sum(1 for d in self.defects if d.severity == SEVERITY_ERROR),
+            "warnings": sum(1 for d in self.defects if d.severity == SEVERITY_WARNING),
+            "defects": [defect.to_dict() for defect in self.defects],
+            "checked_objects": self.checked_objects,
+            "checked_pages": self.checked_pages,
+            "omitted_defects": self.omitted_defects,
+            "elapsed": round(self.elapsed, 4),
+        }
+
+
+def _obj_id(num: int, gen: int = 0) -> str:
+    return f"{num} {gen}"
+
+
+def _references(value: Any) -> Iterator[Reference]:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Reference):
+            yield item
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+# ===== Comprobaciones de estructura (todo el archivo) =====
+
+def _check_structure(data, xref: XrefReader) -> Tuple[List[Defect], int]:
+    defects: List[Defect] = []
+    entries = xref.entries()
+    live = {num for num, (kind, _, _) in entries.items() if kind in (1, 2)}
+    parser = xref.parser
+    checked = 0
+
+    def check_references(value: Any, owner: str) -> None:
+        for ref in _references(value):
+            if ref.num not in live:
+                # La especificación trata la referencia como null; el objeto que apuntaba se pierde
+                defects.append(Defect(
+                    "broken_reference", SEVERITY_WARNING,
+                    f"El objeto {owner} apunta al objeto {ref.num} {ref.gen}, que no existe",
+                    TIER_PRUNE, obj=owner,
+                ))
+
+    object_streams = set()
+    for num, (kind, offset, gen) in sorted(entries.items()):
+        if kind == 2:
+            object_streams.add(offset)
+            continue
+        if kind != 1:
+            continue
+        checked += 1
+        owner = _obj_id(num, gen)
+        try:
+            value, end = parser.indirect(offset, num)
+        except ObjectSyntaxError as e:
+            # El objeto está en su sitio: lo que falla es su contenido, no la tabla de referencias
+            defects.append(Defect(
+                "object_syntax", SEVERITY_ERROR,
+                f"El objeto {owner} no se puede leer ({e})",
+                TIER_REWRITE, obj=owner,
+            ))
+            continue
+        except StructureError:
+            defects.append(Defect(
+                "xref_offset", SEVERITY_ERROR,
+                f"La tabla de referencias sitúa el objeto {owner} en el byte {offset}, pero no está ahí",
+                TIER_REWRITE, obj=owner,
+            ))
+            continue
+        check_references(value, owner)
+        if isinstance(value, dict):
+            defect = _check_stream_length(data, parser, xref, value, end, owner)
+            if defect is not None:
+                defects.append(defect)
+
+    for stream_num in sorted(object_streams):
+        try:
+            content, offsets, first = xref.object_stream(stream_num)
+        except StructureError as e:
+            if not xref.is_encrypted:
+                defects.append(Defect(
+                    "object_stream", SEVERITY_ERROR,
+                    f"No se puede leer el stream de objetos {stream_num}: {e}",
+                    TIER_REWRITE, obj=_obj_id(stream_num),
+                ))
+            continue
+        inner = ObjectParser(content)
+        for num, offset in offsets.items():
+            checked += 1
+            try:
+                value, _ = inner.value(first + offset)
+            except StructureError:
+                defects.append(Defect(
+                    "object_stream", SEVERITY_ERROR,
+                    f"El objeto {num} del stream {stream_num} está dañado",
+                    TIER_PRUNE, obj=_obj_id(num),
+                ))
+                continue
+            check_references(value, _obj_id(num))
+    return defects, checked
+
+
+def _check_stream_length(data, parser: ObjectParser, xref: XrefReader, dictionary: Dict[str, Any],
+                         end: int, owner: str) -> Optional[Defect]:
+    pos = parser.skip(end)
+    if data[pos:pos + 6] != b"stream":
+        return None
+    pos += 6
+    if data[pos:pos + 2] == b"\r\n":
+        pos += 2
+    elif data[pos:pos + 1] in (b"\n", b"\r"):
+        pos += 1
+    try:
+        length = xref.resolve(dictionary.get("/Length"))
+    except StructureError:
+        length = None
+    if not isinstance(length, int) or length < 0:
+        return Defect(
+            "stream_length", SEVERITY_ERROR,
+            f"El stream {owner} no tiene una /Length válida",
+            TIER_REWRITE, obj=owner,
+        )
+    after = pos + length
+    if after > len(data) or not data[parser.skip(after):parser.skip(after) + 9] == b"endstream":
+        return Defect(
+            "stream_length", SEVERITY_ERROR,
+            f"La /Length del stream {owner} ({length}) no coincide con sus datos",
+            TIER_REWRITE, obj=owner,
+        )
+    return None
+
+
+# ===== Comprobaciones por página =====
+
+def _ref_id(obj: Any) -> Optional[str]:
+    ref = obj if isinstance(obj, IndirectObject) else getattr(obj, "indirect_reference", None)
+    return _obj_id(ref.idnum, ref.generation) if ref is not None else None
+
+
+def _check_font(font: DictionaryObject, name: str) -> Optional[Defect]:
+    subtype = font.get("/Subtype")
+    if subtype == "/Type3":
+        return None
+    descriptor_owner = font
+    if subtype == "/Type0":
+        descendants = font.get("/DescendantFonts")
+        if not descendants:
+            return Defect("font_broken", SEVERITY_ERROR, f"La fuente {name} no tiene /DescendantFonts", TIER_RECODE)
+        descriptor_owner = descendants[0].get_object()
+    base = str(font.get("/BaseFont", name)).lstrip("/")
+    base = base.split("+", 1)[1] if len(base) > 7 and base[6] == "+" else base
+    descriptor = descriptor_owner.get("/FontDescriptor")
+    descriptor = descriptor.get_object() if descriptor is not None else None
+    font_file = None
+    if isinstance(descriptor, DictionaryObject):
+        font_file = next((descriptor[key] for key in _FONT_FILES if key in descriptor), None)
+    if font_file is None:
+        if base in _STANDARD_FONTS:
+            return None
+        return Defect(
+            "font_not_embedded", SEVERITY_WARNING,
+            f"La fuente {base} no está incrustada; el aspecto dependerá del visor",
+            TIER_RECODE,
+        )
+    try:
+        font_file.get_object().get_data()
+    except Exception as e:
+        return Defect("font_undecodable", SEVERITY_ERROR, f"La fuente {base} está dañada: {e}", TIER_RECODE)
+    return None
+
+
+def _image_components(color_space: Any) -> Optional[int]:
+    color_space = color_space.get_object() if color_space is not None else None
+    if isinstance(color_space, list) and color_space:
+        family = color_space[0]
+        if family == "/ICCBased":
+            return color_space[1].get_object().get("/N")
+        return 1 if family == "/Indexed" else None
+    return _COMPONENTS.get(color_space)
+
+
+def _check_image(image: DictionaryObject, name: str) -> Optional[Defect]:
+    """
+    Decodifica la imagen sin convertirla (decode_as_image la recodifica a PNG, varias
+    veces más lento): JPEG y JPEG 2000 se abren con Pillow, el resto se descomprime y
+    se comprueba que trae todos los píxeles que declara.
+    """
+    filters = image.get("/Filter")
+    filters = [filters] if not isinstance(filters, list) else list(filters)
+    try:
+        data = image.get_data()
+        if filters and filters[-1] in _IMAGE_CODECS:
+            with Image.open(BytesIO(data)) as decoded:
+                decoded.load()
+            return None
+        if filters and filters[-1] in _PASSTHROUGH_CODECS:
+            return None
+        components = 1 if image.get("/ImageMask") else _image_components(image.get("/ColorSpace"))
+        if components is None:
+            return None
+        bits = 1 if image.get("/ImageMask") else image.get("/BitsPerComponent", 8)
+        expected = (image["/Width"] * components * bits + 7) // 8 * image["/Height"]
+        if len(data) < expected:
+            raise ValueError(f"faltan datos ({len(data)} de {expected} bytes)")
+    except Exception as e:
+        return Defect("image_undecodable", SEVERITY_ERROR, f"La imagen {name} no se puede decodificar: {e}", TIER_RECODE)
+    return None
+
+
+def _check_resources(resources: Any, seen: set) -> Iterator[Defect]:
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return
+    fonts = resources.get("/Font")
+    fonts = fonts.get_object() if fonts is not None else {}
+    for name, ref in fonts.items():
+        key = _ref_id(ref) or f"{id(fonts)}{name}"
+        if key in seen:
+            continue
+        seen.add(key)
+        font = ref.get_object()
+        if isinstance(font, DictionaryObject):
+            defect = _check_font(font, name)
+            if defect is not None:
+                defect.obj = _ref_id(ref)
+                yield defect
+
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    for name, ref in xobjects.items():
+        key = _ref_id(ref) or f"{id(xobjects)}{name}"
+        if key in seen:
+            continue
+        seen.add(key)
+        xobject = ref.get_object()
+        if not isinstance(xobject, DictionaryObject):
+            continue
+        if xobject.get("/Subtype") == "/Image":
+            defect = _check_image(xobject, name)
+            if defect is not None:
+                defect.obj = _ref_id(ref)
+                yield defect
+        elif xobject.get("/Subtype") == "/Form":
+            yield from _check_resources(xobject.get("/Resources"), seen)
+
+
+def _check_page(reader: PdfReader, index: int) -> List[Defect]:
+    try:
+        page = reader.pages[index]
+    except Exception as e:
+        return [Defect(
+            "page_unreadable", SEVERITY_ERROR, f"No se puede leer la página: {e}", TIER_PRUNE, pages=[index + 1],
+        )]
+
+    defects = []
+    try:
+        box = page.mediabox
+        if box.width <= 0 or box.height <= 0:
+            raise ValueError(f"{box.width} x {box.height}")
+    except Exception as e:
+        defects.append(Defect("page_mediabox", SEVERITY_ERROR, f"MediaBox no válido: {e}", TIER_REWRITE))
+
+    try:
+        contents = page.get_contents()
+        if contents is not None:
+            contents.get_data()
+    except Exception as e:
+        defects.append(Defect(
+            "content_stream", SEVERITY_ERROR, f"El contenido de la página no se puede decodificar: {e}", TIER_RASTERIZE,
+        ))
+
+    try:
+        defects.extend(_check_resources(page.get("/Resources"), set()))
+    except Exception as e:
+        defects.append(Defect("page_resources", SEVERITY_ERROR, f"Recursos de la página dañados: {e}", TIER_PRUNE))
+
+    for defect in defects:
+        defect.pages = [index + 1]
+    return defects
+
+
+def _check_pages(pages: Sequence[int]) -> List[Defect]:
+    reader = worker_reader()
+    return [defect for index in pages for defect in _check_page(reader, index)]
+
+
+def _opens_without_password(path: Path) -> bool:
+    with mapped_reader(path) as reader:
+        return bool(reader.decrypt(""))
+
+
+def _chunks(page_count: int, parts: int) -> List[range]:
+    size = max(1, -(-page_count // parts))
+    return [range(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _merge(defects: List[Defect]) -> Tuple[List[Defect], int]:
+    """Une los defectos del mismo objeto compartido entre páginas y limita los repetidos."""
+    merged: Dict[Tuple[str, str], Defect] = {}
+    result: List[Defect] = []
+    per_code: Dict[str, int] = {}
+    omitted = 0
+    for defect in defects:
+        if defect.obj is not None:
+            key = (defect.code, defect.obj)
+            if key in merged:
+                merged[key].pages = sorted(set(merged[key].pages) | set(defect.pages))
+                continue
+            merged[key] = defect
+        per_code[defect.code] = per_code.get(defect.code, 0) + 1
+        if per_code[defect.code] > MAX_DEFECTS_PER_CODE:
+            omitted += 1
+            continue
+        result.append(defect)
+    return result, omitted
+
+
+class PDFValidator:
+    @staticmethod
+    def validate_deep(
+        input_path: Path,
+        workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[bool, Optional[str], Optional[ValidationReport]]:
+        """
+        Validación estructural completa: desplazamientos de la tabla xref, longitudes de los
+        streams, referencias rotas, incrustación de fuentes y decodificación de imágenes.
+        Las comprobaciones por página se reparten entre procesos. Devuelve un informe con
+        los defectos y el nivel de reparación que necesita cada uno.
+        """
+        started = time.perf_counter()
+        input_path = Path(input_path)
+        try:
+            info = probe_pdf(input_path)
+            report = ValidationReport(
+                str(input_path), info.file_size, info.page_count, info.version, info.is_encrypted,
+            )
+            defects: List[Defect] = []
+
+            data = map_file(input_path)
+            try:
+                xref = XrefReader(data)
+                structure, report.checked_objects = _check_structure(data, xref)
+                defects.extend(structure)
+            except StructureError as e:
+                defects.append(Defect(
+                    "xref_unreadable", SEVERITY_ERROR,
+                    f"La tabla de referencias no se puede leer ({e}); los visores tendrán que reconstruirla",
+                    TIER_REWRITE,
+                ))
+            finally:
+                data.close()
+
+            linearization = verify_linearized(input_path)
+            report.linearized = linearization.linearized
+            if linearization.errors:
+                # El archivo se abre igual, pero los visores no pueden mostrarlo antes de leerlo entero
+                defects.append(Defect(
+                    "linearization", SEVERITY_WARNING,
+                    f"La linealización no es coherente: {linearization.errors[0]}",
+                    TIER_REWRITE,
+                ))
+
+            if info.is_encrypted and not _opens_without_password(input_path):
+                # Sin la contraseña el contenido de las páginas no se puede descifrar
+                defects.append(Defect(
+                    "password_required", SEVERITY_WARNING,
+                    "El archivo está protegido con contraseña; no se han revisado las páginas",
+                    TIER_NONE,
+                ))
+            else:
+                defects.extend(PDFValidator._check_all_pages(
+                    input_path, info.page_count, workers, progress_callback, cancel_event,
+                ))
+                report.checked_pages = info.page_count
+            report.defects, report.omitted_defects = _merge(defects)
+            report.elapsed = time.perf_counter() - started
+            return True, None, report
+        except OperationCancelled:
+            return False, CANCELLED_MESSAGE, None
+        except Exception as e:
+            return False, str(e), None
+
+    @staticmethod
+    def _check_all_pages(
+        input_path: Path,
+        page_count: int,
+        workers: Optional[int],
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> List[Defect]:
+        workers = workers or min(os.cpu_count() or 1, 8)
+        if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+            defects: List[Defect] = []
+            with mapped_reader(input_path) as reader:
+                if reader.is_encrypted:
+                    reader.decrypt("")
+                for index in range(page_count):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    defects.extend(_check_page(reader, index))
+                    if progress_callback:
+                        progress_callback(index + 1, page_count)
+            return defects
+
+        # Trozos pequeños para repartir bien la carga y poder informar del progreso
+        defects = []
+        done = 0
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=open_worker_reader, initargs=(str(input_path),),
+        ) as executor:
+            pending = {
+                executor.submit(_check_pages, chunk): len(chunk)
+                for chunk in _chunks(page_count, workers * 4)
+            }
+            try:
+                while pending:
+                    finished, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    for future in finished:
+                        done += pending.pop(future)
+                        defects.extend(future.result())
+                        if progress_callback:
+                            progress_callback(done, page_count)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        defects.sort(key=lambda defect: defect.pages[:1])
+        return defects
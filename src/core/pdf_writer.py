@@ -0,0 +1,553 @@
+import hashlib
+import os
+import zlib
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    StreamObject,
+)
+
+from src.core.pdf_io import mapped_reader, read_pdf
+from src.core.pdf_linearize import linearize_pdf
+from src.utils import trace
+
+CANCELLED_MESSAGE = "Operación cancelada"
+
+# Objetos cuya identidad importa: nunca se comparten entre páginas aunque su contenido coincida.
+# Las anotaciones se reconocen también por /Rect, ya que /Type es opcional en ellas.
+_UNIQUE_TYPES = ("/Page", "/Annot")
+
+_CATALOG_NUM = 1
+_PAGES_NUM = 2
+
+OBJECTS_PER_STREAM = 100    # objetos por stream de objetos: más grande comprime mejor pero retrasa la escritura
+FLATE_MIN_BYTES = 64        # los streams sin filtro más cortos no ganan nada al comprimirse
+FLATE_LEVEL = 6
+
+# Entradas del catálogo que se rehacen al escribir o que solo valen para el documento entero:
+# las etiquetas de página numeran por posición y el árbol de estructura cubre todas las páginas
+_CATALOG_REBUILT = ("/Type", "/Pages", "/Version", "/Outlines")
+_CATALOG_WHOLE_DOCUMENT = ("/PageLabels", "/StructTreeRoot", "/MarkInfo")
+_OUTLINE_LINKS = ("/Parent", "/Prev", "/Next", "/First", "/Last", "/Count")
+
+ObjectKey = Tuple[int, int]
+# Posición de un objeto en la salida: desplazamiento en el archivo o (stream de objetos, índice)
+Location = Union[int, Tuple[int, int]]
+
+
+class OperationCancelled(Exception):
+    pass
+
+
+def _unlock(reader: PdfReader, input_path: Path) -> PdfReader:
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise ValueError(f"El archivo {Path(input_path).name} está protegido con contraseña")
+    return reader
+
+
+def open_reader(input_path: Path) -> PdfReader:
+    return _unlock(read_pdf(input_path), input_path)
+
+
+@contextmanager
+def opened_reader(input_path: Path) -> Iterator[PdfReader]:
+    """
+    Como open_reader, pero la proyección se libera al salir del bloque. Las operaciones cuya
+    salida puede sustituir a la entrada confirman la salida fuera del bloque (ver map_file).
+    """
+    with mapped_reader(input_path) as reader:
+        yield _unlock(reader, input_path)
+
+
+class StreamingPDFWriter:
+    """
+    Escribe un PDF de forma incremental: cada objeto se serializa al disco en cuanto
+    se copia, y solo se conserva su desplazamiento y la huella de su contenido.
+    Los objetos idénticos (fuentes, imágenes, perfiles ICC...) se escriben una sola vez.
+    Solo se copia lo que alcanzan las páginas, así que los objetos huérfanos no llegan a la salida.
+
+    En modo compact (PDF 1.5) los streams sin filtro se comprimen, los demás objetos se
+    agrupan de OBJECTS_PER_STREAM en OBJECTS_PER_STREAM en streams de objetos comprimidos
+    y la tabla xref se escribe como stream: la salida ocupa menos y hay menos que escribir.
+    Con object_streams=False se comprimen los streams pero los objetos se escriben sueltos.
+    """
+
+    def __init__(self, stream: BinaryIO, compact: bool = True, object_streams: bool = True):
+        self.stream = stream
+        self.compact = compact
+        self.object_streams = compact and object_streams
+        self.offsets: List[Location] = [0, 0, 0]
+        self.kids: List[int] = []
+        self.version = "1.4"
+        self.deduplicated = 0
+        self._by_digest: Dict[bytes, int] = {}
+        self._copied: Dict[ObjectKey, Optional[int]] = {}
+        self._pending: Dict[ObjectKey, Optional[int]] = {}
+        self._pages: Dict[ObjectKey, int] = {}
+        self._names: Dict[str, bytes] = {}
+        self._source_pages: set = set()
+        self._catalog_entries: Optional[bytes] = None
+        self._info: Optional[int] = None
+        # Objetos a la espera de completar un stream de objetos
+        self._packed: List[Tuple[int, bytes]] = []
+        self._packed_bytes = 0
+        self.stream.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self) -> int:
+        return len(self.kids)
+
+    @property
+    def size(self) -> int:
+        # Los objetos pendientes se cuentan sin comprimir: la estimación nunca se queda corta
+        return self.stream.tell() + self._packed_bytes
+
+    def _allocate(self) -> int:
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def _write_object(self, num: int, data: bytes, packable: bool = False) -> None:
+        """Escribe el objeto; los que no son streams se agrupan en streams de objetos en modo compact."""
+        if packable and self.object_streams:
+            self._packed.append((num, data))
+            self._packed_bytes += len(data) + 1
+            if len(self._packed) >= OBJECTS_PER_STREAM:
+                self._flush_packed()
+            return
+        self.offsets[num] = self.stream.tell()
+        self.stream.write(b"%d 0 obj\n" % num)
+        self.stream.write(data)
+        self.stream.write(b"\nendobj\n")
+
+    def _flush_packed(self) -> None:
+        if not self._packed:
+            return
+        num = self._allocate()
+        index, body, position = [], [], 0
+        for obj_num, data in self._packed:
+            index.append(b"%d %d" % (obj_num, position))
+            body.append(data)
+            position += len(data) + 1
+        header = b" ".join(index) + b"\n"
+        content = zlib.compress(header + b"\n".join(body), FLATE_LEVEL)
+        dictionary = b"<</Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d>>" % (
+            len(self._packed), len(header), len(content),
+        )
+        self._write_object(num, dictionary + b"\nstream\n" + content + b"\nendstream")
+        for position, (obj_num, _) in enumerate(self._packed):
+            self.offsets[obj_num] = (num, position)
+        self._packed = []
+        self._packed_bytes = 0
+
+    def begin_document(
+        self,
+        reader: PdfReader,
+        pages: Optional[Iterable[DictionaryObject]] = None,
+        index_pages: bool = True,
+    ) -> None:
+        """
+        Prepara la copia desde un nuevo documento de origen. Las páginas indicadas reciben
+        número de inmediato, de modo que los enlaces entre ellas se conservan; los enlaces
+        a páginas del origen que no acaban en esta salida se escriben como null.
+
+        Con index_pages=False no se recorre el árbol de páginas del origen: los enlaces a
+        otras páginas se reconocen al resolverlos (/Type /Page). Conviene cuando se copian
+        pocas páginas de un documento muy grande.
+        """
+        self._copied = {}
+        self._pending = {}
+        self._pages = {}
+        self._source_pages = {
+            (page.indirect_reference.idnum, page.indirect_reference.generation)
+            for page in reader.pages
+            if page.indirect_reference is not None
+        } if index_pages else set()
+        for page in pages or ():
+            self._reserve_page(page)
+
+        header = getattr(reader, "pdf_header", "") or ""
+        if header.startswith("%PDF-") and header[5:] > self.version:
+            self.version = header[5:]
+
+    def _reserve_page(self, page: DictionaryObject) -> int:
+        ref = getattr(page, "indirect_reference", None)
+        key = (ref.idnum, ref.generation) if ref is not None else None
+        if key is not None and key in self._pages:
+            return self._pages[key]
+        num = self._allocate()
+        if key is not None:
+            self._pages[key] = num
+        return num
+
+    def add_page(self, page: DictionaryObject) -> None:
+        num = self._reserve_page(page)
+        self._write_object(num, self._serialize_page(page), packable=True)
+        self.kids.append(num)
+
+    def add_document(self, reader: PdfReader) -> None:
+        pages = list(reader.pages)
+        self.begin_document(reader, pages)
+        for page in pages:
+            self.add_page(page)
+        self.copy_document_data(reader)
+
+    def copy_document_data(self, reader: PdfReader, whole_document: bool = True) -> None:
+        """
+        Lleva a la salida el resto del catálogo del origen (marcadores, formularios, /Names,
+        metadatos XMP, preferencias de vista...) y su diccionario /Info. Se llama después de
+        añadir sus páginas: los destinos apuntan a las páginas ya copiadas y los marcadores
+        de páginas que no están en la salida se quitan. Con whole_document=False (una parte
+        del documento) se omiten las entradas que solo valen para el documento entero.
+        Si se copian varios documentos, cuenta el primero que lo llame.
+        """
+        if self._catalog_entries is not None:
+            return
+        root = reader.trailer["/Root"].get_object()
+        entries = []
+        for key, value in root.items():
+            if key in _CATALOG_REBUILT or (not whole_document and key in _CATALOG_WHOLE_DOCUMENT):
+                continue
+            entries.append(self._serialize(NameObject(key)) + b" " + self._serialize(value))
+        outlines = self._copy_outlines(reader, root.get("/Outlines"))
+        if outlines is not None:
+            entries.append(b"/Outlines %d 0 R" % outlines)
+        self._catalog_entries = b" ".join(entries)
+
+        info = reader.trailer.raw_get("/Info") if "/Info" in reader.trailer else None
+        if isinstance(info, IndirectObject):
+            self._info = self._copy(info)
+        elif isinstance(info, DictionaryObject):
+            self._info = self._allocate()
+            self._write_object(self._info, self._serialize(info), packable=True)
+
+    def _copy_outlines(self, reader: PdfReader, outlines: Any) -> Optional[int]:
+        """Reconstruye el árbol de marcadores con los que llevan a páginas de la salida."""
+        root = outlines.get_object() if outlines is not None else None
+        if not isinstance(root, DictionaryObject):
+            return None
+        named: Optional[Dict[str, Any]] = None
+        visited: set = set()
+
+        def target_kept(item: DictionaryObject) -> bool:
+            nonlocal named
+            dest = item.get("/Dest")
+            if dest is None:
+                action = item.get("/A")
+                action = action.get_object() if action is not None else None
+                if not isinstance(action, DictionaryObject) or action.get("/S") != "/GoTo":
+                    # Sin destino o con otra acción (URI, JavaScript): no depende de las páginas
+                    return True
+                dest = action.get("/D")
+            dest = dest.get_object() if dest is not None else None
+            if isinstance(dest, (str, bytes)):
+                if named is None:
+                    try:
+                        named = reader.named_destinations
+                    except Exception:
+                        named = {}
+                target = named.get(str(dest))
+                page = target.get("/Page") if target is not None else None
+            elif isinstance(dest, ArrayObject) and dest:
+                page = dest[0]
+            else:
+                return False
+            return isinstance(page, IndirectObject) and (page.idnum, page.generation) in self._pages
+
+        def collect(first: Any) -> List[Tuple[DictionaryObject, list]]:
+            nodes = []
+            while isinstance(first, IndirectObject) and (first.idnum, first.generation) not in visited:
+                visited.add((first.idnum, first.generation))
+                item = first.get_object()
+                if not isinstance(item, DictionaryObject):
+                    break
+                children = collect(item.get("/First"))
+                if children or target_kept(item):
+                    nodes.append((item, children))
+                first = item.get("/Next")
+            return nodes
+
+        def write(nodes: List[Tuple[DictionaryObject, list]], parent: int) -> Tuple[List[int], int]:
+            """Escribe una cadena de hermanos; devuelve sus números y cuántos marcadores se ven abiertos."""
+            nums = [self._allocate() for _ in nodes]
+            visible = 0
+            for index, (item, children) in enumerate(nodes):
+                parts = [b"<<"]
+                for key, value in item.items():
+                    if key not in _OUTLINE_LINKS:
+                        parts.append(self._serialize(NameObject(key)) + b" " + self._serialize(value))
+                parts.append(b"/Parent %d 0 R" % parent)
+                if index > 0:
+                    parts.append(b"/Prev %d 0 R" % nums[index - 1])
+                if index + 1 < len(nums):
+                    parts.append(b"/Next %d 0 R" % nums[index + 1])
+                is_open = int(item.get("/Count", 0)) >= 0
+                if children:
+                    child_nums, child_visible = write(children, nums[index])
+                    parts.append(b"/First %d 0 R /Last %d 0 R /Count %d" % (
+                        child_nums[0], child_nums[-1], child_visible if is_open else -child_visible,
+                    ))
+                    visible += child_visible if is_open else 0
+                parts.append(b">>")
+                self._write_object(nums[index], b" ".join(parts), packable=True)
+            return nums, visible + len(nodes)
+
+        nodes = collect(root.get("/First"))
+        if not nodes:
+            return None
+        num = self._allocate()
+        nums, visible = write(nodes, num)
+        self._write_object(
+            num, b"<</Type /Outlines /First %d 0 R /Last %d 0 R /Count %d>>" % (nums[0], nums[-1], visible),
+            packable=True,
+        )
+        return num
+
+    def add_stream(self, entries: bytes, data: bytes) -> int:
+        """
+        Escribe un stream ya codificado y devuelve su número. entries son las claves de su
+        diccionario sin /Length (p. ej. b"/Type /XObject /Subtype /Image ... /Filter /DCTDecode").
+        """
+        num = self._allocate()
+        self._write_object(num, b"<<%s /Length %d>>\nstream\n" % (entries, len(data)) + data + b"\nendstream")
+        return num
+
+    def add_raw_page(self, entries: bytes) -> None:
+        """Añade una página que no viene de un documento de origen; entries, su diccionario sin /Type ni /Parent."""
+        num = self._allocate()
+        self._write_object(num, b"<</Type /Page %s /Parent %d 0 R>>" % (entries, _PAGES_NUM), packable=True)
+        self.kids.append(num)
+
+    def checkpoint(self) -> Tuple[int, int, int, List[Tuple[int, bytes]]]:
+        return self.stream.tell(), len(self.offsets), len(self.kids), list(self._packed)
+
+    def rollback(self, checkpoint: Tuple[int, int, int, List[Tuple[int, bytes]]]) -> None:
+        """Descarta todo lo escrito desde el punto de control (p. ej. una página que no cabe)."""
+        position, object_count, page_count, packed = checkpoint
+        self.stream.seek(position)
+        self.stream.truncate()
+        del self.offsets[object_count:]
+        del self.kids[page_count:]
+        # Los objetos pendientes entonces pueden haber ido a un stream de objetos ya descartado
+        self._packed = packed
+        self._packed_bytes = sum(len(data) + 1 for _, data in packed)
+        self._by_digest = {d: n for d, n in self._by_digest.items() if n < object_count}
+        self._copied = {k: n for k, n in self._copied.items() if n is None or n < object_count}
+        self._pages = {k: n for k, n in self._pages.items() if n < object_count}
+
+    def _serialize_page(self, page: DictionaryObject) -> bytes:
+        parts = [b"<<"]
+        for key, value in page.items():
+            if key in ("/Parent", "/B"):
+                continue
+            parts.append(self._serialize(NameObject(key)) + b" " + self._serialize(value))
+        parts.append(b"/Parent %d 0 R>>" % _PAGES_NUM)
+        return b" ".join(parts)
+
+    def _copy(self, ref: IndirectObject) -> Optional[int]:
+        key = (ref.idnum, ref.generation)
+        if key in self._pages:
+            return self._pages[key]
+        if key in self._source_pages:
+            return None
+        if key in self._copied:
+            return self._copied[key]
+        if key in self._pending:
+            # Ciclo (p. ej. anotación ↔ ventana emergente): se fija el número antes de terminar
+            if self._pending[key] is None:
+                self._pending[key] = self._allocate()
+            return self._pending[key]
+
+        try:
+            obj = ref.get_object()
+        except Exception:
+            obj = None
+        if obj is None:
+            self._copied[key] = None
+            return None
+        if isinstance(obj, DictionaryObject):
+            obj_type = obj.get("/Type")
+            if obj_type == "/Pages":
+                self._copied[key] = _PAGES_NUM
+                return _PAGES_NUM
+            if obj_type in ("/Catalog", "/Page"):
+                self._copied[key] = None
+                return None
+
+        self._pending[key] = None
+        data = self._serialize(obj)
+        num = self._pending.pop(key)
+
+        unique = isinstance(obj, DictionaryObject) and (
+            obj.get("/Type") in _UNIQUE_TYPES or "/Rect" in obj
+        )
+        if num is None and not unique:
+            digest = hashlib.blake2b(data, digest_size=20).digest()
+            existing = self._by_digest.get(digest)
+            if existing is not None:
+                self.deduplicated += 1
+                self._copied[key] = existing
+                return existing
+            num = self._allocate()
+            self._by_digest[digest] = num
+        elif num is None:
+            num = self._allocate()
+
+        self._write_object(num, data, packable=not isinstance(obj, StreamObject))
+        self._copied[key] = num
+        return num
+
+    def _serialize(self, value: Any) -> bytes:
+        if isinstance(value, IndirectObject):
+            num = self._copy(value)
+            return b"null" if num is None else b"%d 0 R" % num
+        if isinstance(value, StreamObject):
+            raw = value._data
+            parts = [b"<<"]
+            for key, item in value.items():
+                if key == "/Length":
+                    continue
+                parts.append(self._name(key) + b" " + self._serialize(item))
+            # Los metadatos XMP se dejan legibles para herramientas que no entienden PDF
+            if (
+                self.compact and "/Filter" not in value and len(raw) >= FLATE_MIN_BYTES
+                and value.get("/Type") != "/Metadata"
+            ):
+                raw = zlib.compress(raw, FLATE_LEVEL)
+                parts.append(b"/Filter /FlateDecode")
+            parts.append(b"/Length %d>>" % len(raw))
+            return b" ".join(parts) + b"\nstream\n" + raw + b"\nendstream"
+        if isinstance(value, DictionaryObject):
+            parts = [b"<<"]
+            for key, item in value.items():
+                parts.append(self._name(key) + b" " + self._serialize(item))
+            parts.append(b">>")
+            return b" ".join(parts)
+        if isinstance(value, ArrayObject):
+            return b"[" + b" ".join(self._serialize(item) for item in value) + b"]"
+        if isinstance(value, NameObject):
+            return self._name(value)
+        buffer = BytesIO()
+        value.write_to_stream(buffer)
+        return buffer.getvalue()
+
+    def _name(self, name: str) -> bytes:
+        # Los árboles de estructura repiten unos pocos nombres miles de veces y pypdf los
+        # escapa carácter a carácter en cada escritura
+        encoded = self._names.get(name)
+        if encoded is None:
+            buffer = BytesIO()
+            NameObject(name).write_to_stream(buffer)
+            encoded = self._names[name] = buffer.getvalue()
+        return encoded
+
+    def finish(self, file_id: bytes) -> None:
+        pages = b"<</Type /Pages /Count %d /Kids [%s]>>" % (
+            len(self.kids),
+            b" ".join(b"%d 0 R" % num for num in self.kids),
+        )
+        self._write_object(_PAGES_NUM, pages, packable=True)
+        catalog = b"<</Type /Catalog /Pages %d 0 R" % _PAGES_NUM
+        if self.version > "1.7":
+            catalog += b" /Version /" + self.version.encode("ascii")
+        if self._catalog_entries:
+            catalog += b" " + self._catalog_entries
+        self._write_object(_CATALOG_NUM, catalog + b">>", packable=True)
+        self._flush_packed()
+
+        if self.compact:
+            self._write_xref_stream(file_id)
+            return
+
+        xref_offset = self.stream.tell()
+        self.stream.write(b"xref\n0 %d\n" % len(self.offsets))
+        self.stream.write(b"0000000000 65535 f \n")
+        for offset in self.offsets[1:]:
+            self.stream.write(b"%010d 00000 n \n" % offset)
+        self.stream.write(
+            b"trailer\n<</Size %d /Root %d 0 R%s /ID [<%s> <%s>]>>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self.offsets), _CATALOG_NUM, self._info_entry(), file_id, file_id, xref_offset)
+        )
+
+    def _info_entry(self) -> bytes:
+        return b" /Info %d 0 R" % self._info if self._info is not None else b""
+
+
+    def _write_xref_stream(self, file_id: bytes) -> None:
+        num = self._allocate()
+        xref_offset = self.stream.tell()
+        self.offsets[num] = xref_offset
+        width = max(1, (xref_offset.bit_length() + 7) // 8)
+        rows = [b"\x00" + bytes(width) + b"\xff\xff"]
+        for location in self.offsets[1:]:
+            if isinstance(location, tuple):
+                rows.append(b"\x02" + location[0].to_bytes(width, "big") + location[1].to_bytes(2, "big"))
+            else:
+                rows.append(b"\x01" + location.to_bytes(width, "big") + b"\x00\x00")
+        content = zlib.compress(b"".join(rows), FLATE_LEVEL)
+        self.stream.write(b"%d 0 obj\n" % num)
+        self.stream.write(
+            b"<</Type /XRef /Size %d /W [1 %d 2] /Root %d 0 R%s /ID [<%s> <%s>] /Filter /FlateDecode /Length %d>>\n"
+            % (len(self.offsets), width, _CATALOG_NUM, self._info_entry(), file_id, file_id, len(content))
+        )
+        self.stream.write(b"stream\n" + content + b"\nendstream\nendobj\n")
+        self.stream.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+
+
+class PDFOutputFile:
+    """
+    Salida de StreamingPDFWriter sobre un archivo temporal '.part' que solo se renombra
+    al nombre definitivo cuando se completa; si se descarta, no queda nada en disco.
+
+    Con linearize=True, al confirmar se reescribe linealizado (vista web rápida) antes de
+    renombrarlo; ver pdf_linearize.
+    """
+
+    def __init__(self, output_path: Path, compact: bool = True, linearize: bool = False):
+        self.output_path = Path(output_path)
+        self.temp_path = self.output_path.with_name(self.output_path.name + ".part")
+        self.linearize = linearize
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.temp_path, "w+b")
+        # La linealización reescribe todos los objetos sueltos: agruparlos antes no sirve de nada
+        # y así el tamaño que va acumulando el escritor se parece al de la salida final
+        self.writer = StreamingPDFWriter(self._file, compact=compact, object_streams=not linearize)
+
+    def commit(self, file_id: bytes, output_path: Optional[Path] = None) -> Path:
+        self.writer.finish(file_id)
+        self._file.close()
+        target = Path(output_path) if output_path else self.output_path
+        if self.linearize:
+            linear_path = self.temp_path.with_name(self.output_path.name + ".lin.part")
+            try:
+                linearize_pdf(self.temp_path, linear_path)
+            except BaseException:
+                linear_path.unlink(missing_ok=True)
+                self.discard()
+                raise
+            self.temp_path.unlink()
+            os.replace(linear_path, target)
+        else:
+            os.replace(self.temp_path, target)
+        if trace.io:
+            trace.io("Escrito %s (%d bytes, %d objetos)", target, target.stat().st_size, len(self.writer.offsets) - 1)
+        return target
+
+    def discard(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+def file_id_for(*parts: Any) -> bytes:
+    digest = hashlib.md5()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest().encode("ascii")
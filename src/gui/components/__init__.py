@@ -13,6 +13,8 @@ from .panels import (
     RepairPanel,
     MergePanel,
     SplitPanel,
+    CompressPanel,
+    ImagesPanel,
     SettingsPanel,
     NewDocumentPanel,
     AccountPanel,
@@ -35,6 +37,8 @@ __all__ = [
     'RepairPanel', 
     'MergePanel',
     'SplitPanel',
+    'CompressPanel',
+    'ImagesPanel',
     'SettingsPanel',
     'NewDocumentPanel',
     'AccountPanel',
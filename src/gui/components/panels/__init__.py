@@ -10,6 +10,8 @@ from .new_panel import NewPanel
 from .repair_panel import RepairPanel
 from .merge_panel import MergePanel
 from .split_panel import SplitPanel
+from .compress_panel import CompressPanel
+from .images_panel import ImagesPanel
 from .settings_panel import SettingsPanel
 from .new_document_panel import NewDocumentPanel
 from .account_panel import AccountPanel
@@ -23,6 +25,8 @@ __all__ = [
     'RepairPanel',
     'MergePanel',
     'SplitPanel',
+    'CompressPanel',
+    'ImagesPanel',
     'SettingsPanel',
     'NewDocumentPanel',
     'AccountPanel',
@@ -0,0 +1,230 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QComboBox, QProgressBar
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from typing import Optional
+from pathlib import Path
+
+from src.gui.themes.theme_manager import theme_manager
+from src.core.pdf_compress import COMPRESS_PRESETS, PDFCompressor
+from src.core.pdf_writer import CANCELLED_MESSAGE
+from src.gui.workers import TaskWorker
+from src.utils.app_settings import app_settings
+
+PRESET_LABELS = [
+    ("balanced", "Equilibrada (150 ppp)"),
+    ("high", "Alta calidad (200 ppp)"),
+    ("max", "Máxima compresión (96 ppp)"),
+]
+
+
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+class CompressPanel(QWidget):
+    """Panel para comprimir las imágenes de un archivo PDF."""
+    
+    compress_completed = pyqtSignal(bool, str)
+    
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.current_pdf_path = None
+        self._worker: Optional[TaskWorker] = None
+        self._output_path: Optional[Path] = None
+        self._setup_ui()
+        
+        theme_manager.theme_changed.connect(self._apply_style)
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(40, 30, 40, 30)
+        
+        title = QLabel("Comprimir PDF")
+        title.setObjectName("panelTitle")
+        layout.addWidget(title)
+        
+        layout.addSpacing(20)
+        
+        self.select_btn = QPushButton("Seleccionar archivo PDF")
+        self.select_btn.clicked.connect(self._select_pdf)
+        layout.addWidget(self.select_btn)
+        
+        self.selected_label = QLabel("")
+        self.selected_label.setObjectName("selectedFile")
+        layout.addWidget(self.selected_label)
+        
+        layout.addSpacing(20)
+        
+        self.preset_combo = QComboBox()
+        self.preset_combo.setObjectName("presetCombo")
+        for preset, label in PRESET_LABELS:
+            self.preset_combo.addItem(label, preset)
+        layout.addWidget(self.preset_combo)
+        
+        layout.addSpacing(10)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        self.compress_btn = QPushButton("Comprimir PDF")
+        self.compress_btn.setFixedSize(200, 45)
+        self.compress_btn.setEnabled(False)
+        self.compress_btn.clicked.connect(self._compress_pdf)
+        button_layout.addWidget(self.compress_btn)
+        
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setFixedSize(120, 45)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self._cancel_compress)
+        button_layout.addWidget(self.cancel_btn)
+        
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.status_label)
+
+    def _select_pdf(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Seleccionar archivo PDF",
+            "",
+            "PDF Files (*.pdf)"
+        )
+        
+        if file_path:
+            self.current_pdf_path = Path(file_path)
+            self.selected_label.setText(f"Archivo seleccionado: {self.current_pdf_path.name}")
+            self.compress_btn.setEnabled(self._worker is None)
+
+    def _compress_pdf(self):
+        if not self.current_pdf_path or self._worker is not None:
+            return
+        
+        self._output_path = self.current_pdf_path.parent / f"compressed_{self.current_pdf_path.name}"
+        target_dpi, quality = COMPRESS_PRESETS[self.preset_combo.currentData()]
+        
+        self.status_label.setText("Analizando imágenes...")
+        self.status_label.setStyleSheet("")
+        self.compress_btn.setEnabled(False)
+        self.select_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        
+        self._worker = TaskWorker(
+            PDFCompressor.compress,
+            self.current_pdf_path,
+            self._output_path,
+            target_dpi=target_dpi,
+            quality=quality,
+            linearize=app_settings.get("output.linearize", False),
+        )
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.result.connect(self._on_compress_result)
+        self._worker.signals.error.connect(lambda error: self._on_compress_result((False, error, None)))
+        self._worker.signals.cancelled.connect(self._on_compress_cancelled)
+        self._worker.start()
+
+    def _cancel_compress(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelando...")
+
+    def _on_progress(self, current: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+        if current >= total:
+            self.status_label.setText("Guardando archivo comprimido...")
+        else:
+            self.status_label.setText(f"Comprimiendo imagen {current} de {total}...")
+
+    def _on_compress_result(self, result):
+        self._reset_controls()
+        success, error, report = result
+        
+        colors = theme_manager.colors
+        if success:
+            if report.bytes_saved > 0:
+                self.status_label.setText(
+                    f"PDF comprimido: {self._output_path.name} — "
+                    f"{_format_size(report.input_size)} → {_format_size(report.output_size)} "
+                    f"({_format_size(report.bytes_saved)} menos)"
+                )
+            else:
+                self.status_label.setText(f"El PDF ya estaba optimizado: {self._output_path.name}")
+            self.status_label.setStyleSheet(f"color: {colors['success']};")
+            self.compress_completed.emit(True, str(self._output_path))
+        else:
+            self.status_label.setText(f"Error al comprimir: {error}")
+            self.status_label.setStyleSheet(f"color: {colors['error']};")
+            self.compress_completed.emit(False, error)
+
+    def _on_compress_cancelled(self):
+        self._reset_controls()
+        self.status_label.setText("Compresión cancelada")
+        self.status_label.setStyleSheet(f"color: {theme_manager.colors['fg_secondary']};")
+        self.compress_completed.emit(False, CANCELLED_MESSAGE)
+
+    def _reset_controls(self):
+        self._worker = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.select_btn.setEnabled(True)
+        self.compress_btn.setEnabled(self.current_pdf_path is not None)
+
+    def _apply_style(self):
+        colors = theme_manager.colors
+        self.setStyleSheet(f"""
+            QWidget {{
+                background-color: {colors['bg_primary']};
+            }}
+            QLabel#panelTitle {{
+                color: {colors['fg_primary']};
+                font-size: 24px;
+                font-weight: bold;
+            }}
+            QLabel#selectedFile {{
+                color: {colors['success']};
+                font-size: 14px;
+            }}
+            QComboBox#presetCombo {{
+                background-color: {colors['bg_tertiary']};
+                color: {colors['fg_primary']};
+                border: 1px solid {colors['border']};
+                border-radius: 6px;
+                padding: 8px;
+                font-size: 14px;
+            }}
+            QPushButton {{
+                background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {colors['accent']}, stop:1 {colors['accent_light']});
+                color: white;
+                border: none;
+                border-radius: 8px;
+                font-size: 14px;
+                font-weight: 600;
+                padding: 10px 20px;
+            }}
+            QPushButton:hover {{
+                background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {colors['accent_light']}, stop:1 {colors['accent']});
+            }}
+            QPushButton:pressed {{
+                background-color: {colors['accent_dark']};
+            }}
+            QPushButton:disabled {{
+                background-color: {colors['bg_tertiary']};
+                color: {colors['fg_disabled']};
+            }}
+            {theme_manager.progress_bar_style()}
+        """)
@@ -0,0 +1,207 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QCheckBox, QProgressBar
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from typing import Optional
+from pathlib import Path
+
+from src.gui.themes.theme_manager import theme_manager
+from src.core.pdf_compress import DEFAULT_QUALITY
+from src.core.pdf_images import IMAGE_EXTENSIONS, ImageToPDFConverter, list_images
+from src.core.pdf_writer import CANCELLED_MESSAGE
+from src.gui.workers import TaskWorker
+from src.utils.app_settings import app_settings
+
+
+class ImagesPanel(QWidget):
+    """Panel para convertir una carpeta de imágenes en un PDF."""
+    
+    images_completed = pyqtSignal(bool, str)
+    
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.current_folder = None
+        self._worker: Optional[TaskWorker] = None
+        self._output_path: Optional[Path] = None
+        self._setup_ui()
+        
+        theme_manager.theme_changed.connect(self._apply_style)
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(40, 30, 40, 30)
+        
+        title = QLabel("Imágenes a PDF")
+        title.setObjectName("panelTitle")
+        layout.addWidget(title)
+        
+        layout.addSpacing(20)
+        
+        self.select_btn = QPushButton("Seleccionar carpeta de imágenes")
+        self.select_btn.clicked.connect(self._select_folder)
+        layout.addWidget(self.select_btn)
+        
+        self.selected_label = QLabel("")
+        self.selected_label.setObjectName("selectedFile")
+        layout.addWidget(self.selected_label)
+        
+        layout.addSpacing(20)
+        
+        self.jpeg_check = QCheckBox("Guardar como JPEG las imágenes que no lo son (archivo más pequeño)")
+        layout.addWidget(self.jpeg_check)
+        
+        layout.addSpacing(10)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        self.convert_btn = QPushButton("Crear PDF")
+        self.convert_btn.setFixedSize(200, 45)
+        self.convert_btn.setEnabled(False)
+        self.convert_btn.clicked.connect(self._convert_images)
+        button_layout.addWidget(self.convert_btn)
+        
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setFixedSize(120, 45)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self._cancel_convert)
+        button_layout.addWidget(self.cancel_btn)
+        
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+    def _extensions(self):
+        return app_settings.get("supported_files.images_to_pdf", list(IMAGE_EXTENSIONS))
+
+    def _select_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta de imágenes", "")
+        
+        if folder:
+            self.current_folder = Path(folder)
+            count = len(list_images(self.current_folder, self._extensions()))
+            self.selected_label.setText(f"Carpeta seleccionada: {self.current_folder.name} ({count} imágenes)")
+            self.convert_btn.setEnabled(self._worker is None and count > 0)
+
+    def _convert_images(self):
+        if not self.current_folder or self._worker is not None:
+            return
+        
+        self._output_path = self.current_folder.parent / f"{self.current_folder.name}.pdf"
+        
+        self.status_label.setText("Leyendo imágenes...")
+        self.status_label.setStyleSheet("")
+        self.convert_btn.setEnabled(False)
+        self.select_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        
+        self._worker = TaskWorker(
+            ImageToPDFConverter.convert_folder,
+            self.current_folder,
+            self._output_path,
+            extensions=self._extensions(),
+            jpeg_quality=DEFAULT_QUALITY if self.jpeg_check.isChecked() else None,
+            linearize=app_settings.get("output.linearize", False),
+        )
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.result.connect(self._on_convert_result)
+        self._worker.signals.error.connect(lambda error: self._on_convert_result((False, error, None)))
+        self._worker.signals.cancelled.connect(self._on_convert_cancelled)
+        self._worker.start()
+
+    def _cancel_convert(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelando...")
+
+    def _on_progress(self, current: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+        if current >= total:
+            self.status_label.setText("Guardando PDF...")
+        else:
+            self.status_label.setText(f"Añadiendo página {current} de {total}...")
+
+    def _on_convert_result(self, result):
+        self._reset_controls()
+        success, error, report = result
+        
+        colors = theme_manager.colors
+        if success:
+            message = f"PDF creado: {self._output_path.name} — {report.pages} páginas"
+            if report.skipped:
+                message += f" ({len(report.skipped)} omitidas: {'; '.join(report.skipped[:3])})"
+            self.status_label.setText(message)
+            self.status_label.setStyleSheet(f"color: {colors['success']};")
+            self.images_completed.emit(True, str(self._output_path))
+        else:
+            self.status_label.setText(f"Error al convertir: {error}")
+            self.status_label.setStyleSheet(f"color: {colors['error']};")
+            self.images_completed.emit(False, error)
+
+    def _on_convert_cancelled(self):
+        self._reset_controls()
+        self.status_label.setText("Conversión cancelada")
+        self.status_label.setStyleSheet(f"color: {theme_manager.colors['fg_secondary']};")
+        self.images_completed.emit(False, CANCELLED_MESSAGE)
+
+    def _reset_controls(self):
+        self._worker = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.select_btn.setEnabled(True)
+        self.convert_btn.setEnabled(self.current_folder is not None)
+
+    def _apply_style(self):
+        colors = theme_manager.colors
+        self.setStyleSheet(f"""
+            QWidget {{
+                background-color: {colors['bg_primary']};
+            }}
+            QLabel#panelTitle {{
+                color: {colors['fg_primary']};
+                font-size: 24px;
+                font-weight: bold;
+            }}
+            QLabel#selectedFile {{
+                color: {colors['success']};
+                font-size: 14px;
+            }}
+            QCheckBox {{
+                color: {colors['fg_primary']};
+                font-size: 14px;
+            }}
+            QPushButton {{
+                background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {colors['accent']}, stop:1 {colors['accent_light']});
+                color: white;
+                border: none;
+                border-radius: 8px;
+                font-size: 14px;
+                font-weight: 600;
+                padding: 10px 20px;
+            }}
+            QPushButton:hover {{
+                background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {colors['accent_light']}, stop:1 {colors['accent']});
+            }}
+            QPushButton:pressed {{
+                background-color: {colors['accent_dark']};
+            }}
+            QPushButton:disabled {{
+                background-color: {colors['bg_tertiary']};
+                color: {colors['fg_disabled']};
+            }}
+            {theme_manager.progress_bar_style()}
+        """)
@@ -1,19 +1,26 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QFileDialog
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QFileDialog, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from typing import Optional
 from pathlib import Path
 
 from src.gui.themes.theme_manager import theme_manager
+from src.core.pdf_merge import CANCELLED_MESSAGE
+from src.gui.workers import JobTask
+from src.utils.app_settings import app_settings
 
 
 class MergePanel(QWidget):
     """Panel para fusionar múltiples archivos PDF."""
     
+    merge_completed = pyqtSignal(bool, str)
+    
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.pdf_files = []
+        self._worker: Optional[JobTask] = None
+        self._output_path: Optional[Path] = None
         self._setup_ui()
         
         theme_manager.theme_changed.connect(self._apply_style)
@@ -28,9 +35,9 @@ class MergePanel(QWidget):
         
         layout.addSpacing(20)
         
-        add_btn = QPushButton("Agregar archivos PDF")
-        add_btn.clicked.connect(self._add_files)
-        layout.addWidget(add_btn)
+        self.add_btn = QPushButton("Agregar archivos PDF")
+        self.add_btn.clicked.connect(self._add_files)
+        layout.addWidget(self.add_btn)
         
         self.file_list = QListWidget()
         layout.addWidget(self.file_list)
@@ -41,11 +48,23 @@ class MergePanel(QWidget):
         self.merge_btn = QPushButton("Unir PDFs")
         self.merge_btn.setFixedSize(200, 45)
         self.merge_btn.setEnabled(False)
+        self.merge_btn.clicked.connect(self._merge_pdfs)
         button_layout.addWidget(self.merge_btn)
         
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setFixedSize(120, 45)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self._cancel_merge)
+        button_layout.addWidget(self.cancel_btn)
+        
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
         self.status_label = QLabel("")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
@@ -63,6 +82,79 @@ class MergePanel(QWidget):
                 self.pdf_files.append(f)
                 self.file_list.addItem(Path(f).name)
         
+        self.merge_btn.setEnabled(len(self.pdf_files) > 1 and self._worker is None)
+
+    def _merge_pdfs(self):
+        if len(self.pdf_files) < 2 or self._worker is not None:
+            return
+        
+        first = Path(self.pdf_files[0])
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar PDF unido",
+            str(first.parent / f"{first.stem}_unido.pdf"),
+            "PDF Files (*.pdf)"
+        )
+        if not file_path:
+            return
+        
+        self._output_path = Path(file_path)
+        self.status_label.setText("Uniendo PDFs...")
+        self.status_label.setStyleSheet("")
+        self.merge_btn.setEnabled(False)
+        self.add_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        
+        self._worker = JobTask("merge", {
+            "input_paths": [str(f) for f in self.pdf_files],
+            "output_path": str(self._output_path),
+            "linearize": app_settings.get("output.linearize", False),
+        })
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.result.connect(lambda _result: self._on_merge_result((True, None)))
+        self._worker.signals.error.connect(lambda error: self._on_merge_result((False, error)))
+        self._worker.signals.cancelled.connect(self._on_merge_cancelled)
+        self._worker.start()
+
+    def _cancel_merge(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelando...")
+
+    def _on_progress(self, current: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+
+    def _on_merge_result(self, result):
+        self._reset_controls()
+        success, error = result
+        
+        colors = theme_manager.colors
+        if success:
+            self.status_label.setText(f"PDFs unidos exitosamente: {self._output_path.name}")
+            self.status_label.setStyleSheet(f"color: {colors['success']};")
+            self.merge_completed.emit(True, str(self._output_path))
+        else:
+            self.status_label.setText(f"Error al unir: {error}")
+            self.status_label.setStyleSheet(f"color: {colors['error']};")
+            self.merge_completed.emit(False, error)
+
+    def _on_merge_cancelled(self):
+        self._reset_controls()
+        self.status_label.setText("Unión cancelada")
+        self.status_label.setStyleSheet(f"color: {theme_manager.colors['fg_secondary']};")
+        self.merge_completed.emit(False, CANCELLED_MESSAGE)
+
+    def _reset_controls(self):
+        self._worker = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.add_btn.setEnabled(True)
         self.merge_btn.setEnabled(len(self.pdf_files) > 1)
 
     def _apply_style(self):
@@ -101,4 +193,5 @@ class MergePanel(QWidget):
                 background-color: {colors['bg_tertiary']};
                 color: {colors['fg_disabled']};
             }}
+            {theme_manager.progress_bar_style()}
         """)
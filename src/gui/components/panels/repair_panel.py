@@ -1,12 +1,14 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QFileDialog
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QFileDialog, QProgressBar
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from typing import Optional
 from pathlib import Path
 
 from src.gui.themes.theme_manager import theme_manager
-from src.core.pdf_repair import PDFRepairer
+from src.core.pdf_repair import CANCELLED_MESSAGE
+from src.gui.workers import JobTask
+from src.utils.app_settings import app_settings
 
 
 class RepairPanel(QWidget):
@@ -17,6 +19,8 @@ class RepairPanel(QWidget):
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.current_pdf_path = None
+        self._worker: Optional[JobTask] = None
+        self._output_path: Optional[Path] = None
         self._setup_ui()
         
         theme_manager.theme_changed.connect(self._apply_style)
@@ -72,9 +76,20 @@ class RepairPanel(QWidget):
         self.repair_btn.clicked.connect(self._repair_pdf)
         button_layout.addWidget(self.repair_btn)
         
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setFixedSize(120, 45)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self._cancel_repair)
+        button_layout.addWidget(self.cancel_btn)
+        
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
         self.status_label = QLabel("")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
@@ -95,19 +110,49 @@ class RepairPanel(QWidget):
             self.repair_btn.setEnabled(True)
 
     def _repair_pdf(self):
-        if not self.current_pdf_path:
+        if not self.current_pdf_path or self._worker is not None:
             return
         
-        output_path = self.current_pdf_path.parent / f"fixed_{self.current_pdf_path.name}"
+        self._output_path = self.current_pdf_path.parent / f"fixed_{self.current_pdf_path.name}"
         
         self.status_label.setText("Reparando PDF...")
+        self.status_label.setStyleSheet("")
         self.repair_btn.setEnabled(False)
-        
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(100, lambda: self._do_repair(output_path))
+        self.select_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        
+        self._worker = JobTask("repair", {
+            "input_path": str(self.current_pdf_path),
+            "output_path": str(self._output_path),
+            "linearize": app_settings.get("output.linearize", False),
+        })
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.result.connect(lambda _result: self._on_repair_result((True, None)))
+        self._worker.signals.error.connect(lambda error: self._on_repair_result((False, error)))
+        self._worker.signals.cancelled.connect(self._on_repair_cancelled)
+        self._worker.start()
 
-    def _do_repair(self, output_path: Path):
-        success, error = PDFRepairer.repair(self.current_pdf_path, output_path)
+    def _cancel_repair(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelando...")
+
+    def _on_progress(self, current: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+        if current >= total:
+            self.status_label.setText("Guardando archivo reparado...")
+        else:
+            self.status_label.setText("Reparando PDF...")
+
+    def _on_repair_result(self, result):
+        self._reset_controls()
+        success, error = result
+        output_path = self._output_path
         
         colors = theme_manager.colors
         if success:
@@ -118,8 +163,19 @@ class RepairPanel(QWidget):
             self.status_label.setText(f"Error al reparar: {error}")
             self.status_label.setStyleSheet(f"color: {colors['error']};")
             self.repair_completed.emit(False, error)
-        
-        self.repair_btn.setEnabled(True)
+
+    def _on_repair_cancelled(self):
+        self._reset_controls()
+        self.status_label.setText("Reparación cancelada")
+        self.status_label.setStyleSheet(f"color: {theme_manager.colors['fg_secondary']};")
+        self.repair_completed.emit(False, CANCELLED_MESSAGE)
+
+    def _reset_controls(self):
+        self._worker = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.select_btn.setEnabled(True)
+        self.repair_btn.setEnabled(self.current_pdf_path is not None)
 
     def _apply_style(self):
         colors = theme_manager.colors
@@ -172,4 +228,5 @@ class RepairPanel(QWidget):
                 background-color: {colors['bg_tertiary']};
                 color: {colors['fg_disabled']};
             }}
+            {theme_manager.progress_bar_style()}
         """)
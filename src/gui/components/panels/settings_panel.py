@@ -122,6 +122,14 @@ class SettingsPanel(QWidget):
         self.recent_files_spin.setValue(app_settings.get("recent_files.max_count", 20))
         self.recent_files_spin.valueChanged.connect(self._on_recent_count_changed)
         layout.addRow("Archivos recientes:", self.recent_files_spin)
+
+        self.linearize_check = QCheckBox("Optimizar para vista web rápida")
+        self.linearize_check.setToolTip(
+            "Escribe los PDFs linealizados: la primera página se muestra antes de descargar el archivo completo"
+        )
+        self.linearize_check.setChecked(app_settings.get("output.linearize", False))
+        self.linearize_check.toggled.connect(self._on_linearize_changed)
+        layout.addRow("Salida:", self.linearize_check)
         
         return group
     
@@ -171,6 +179,10 @@ class SettingsPanel(QWidget):
         app_settings.set("recent_files.max_count", value)
         self.settings_changed.emit()
 
+    def _on_linearize_changed(self, checked: bool):
+        app_settings.set("output.linearize", checked)
+        self.settings_changed.emit()
+
     def _apply_style(self):
         colors = theme_manager.colors
         self.setStyleSheet(f"""
@@ -87,15 +87,15 @@ class Sidebar(QFrame):
         layout.addWidget(self.account_btn)
     
     def _on_new_clicked(self):
-        logger.action(f"Clic en botón Nuevo")
+        logger.action("Clic en botón Nuevo")
         self.open_editor.emit()
     
     def _on_settings_clicked(self):
-        logger.action(f"Clic en botón Configuración")
+        logger.action("Clic en botón Configuración")
         self.open_settings.emit()
     
     def _on_account_clicked(self):
-        logger.action(f"Clic en botón Cuenta")
+        logger.action("Clic en botón Cuenta")
         self.open_account.emit()
     
     def _create_nav_button(self, icon: str, text: str) -> QPushButton:
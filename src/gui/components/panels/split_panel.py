@@ -1,19 +1,34 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QLineEdit
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QLineEdit,
+    QComboBox, QSpinBox, QDoubleSpinBox, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from typing import Optional
 from pathlib import Path
 
 from src.gui.themes.theme_manager import theme_manager
+from src.core.pdf_writer import CANCELLED_MESSAGE
+from src.gui.workers import JobTask
+from src.utils.app_settings import app_settings
+
+SPLIT_MODE_LABELS = [
+    ("ranges", "Por rangos de páginas"),
+    ("every", "Cada N páginas"),
+    ("bookmarks", "Por marcadores"),
+    ("size", "Por tamaño máximo"),
+]
 
 
 class SplitPanel(QWidget):
     """Panel para dividir un archivo PDF."""
     
+    split_completed = pyqtSignal(bool, str)
+    
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.current_pdf_path = None
+        self._worker: Optional[JobTask] = None
+        self._output_dir: Optional[Path] = None
         self._setup_ui()
         
         theme_manager.theme_changed.connect(self._apply_style)
@@ -28,9 +43,9 @@ class SplitPanel(QWidget):
         
         layout.addSpacing(20)
         
-        select_btn = QPushButton("Seleccionar archivo PDF")
-        select_btn.clicked.connect(self._select_pdf)
-        layout.addWidget(select_btn)
+        self.select_btn = QPushButton("Seleccionar archivo PDF")
+        self.select_btn.clicked.connect(self._select_pdf)
+        layout.addWidget(self.select_btn)
         
         self.selected_label = QLabel("")
         self.selected_label.setObjectName("selectedFile")
@@ -38,11 +53,36 @@ class SplitPanel(QWidget):
         
         layout.addSpacing(20)
         
+        self.mode_combo = QComboBox()
+        self.mode_combo.setObjectName("modeCombo")
+        for mode, label in SPLIT_MODE_LABELS:
+            self.mode_combo.addItem(label, mode)
+        self.mode_combo.currentIndexChanged.connect(self._on_mode_changed)
+        layout.addWidget(self.mode_combo)
+        
+        layout.addSpacing(10)
+        
         self.pages_input = QLineEdit()
         self.pages_input.setPlaceholderText("Ej: 1-3, 5, 7-10")
         self.pages_input.setObjectName("pagesInput")
         layout.addWidget(self.pages_input)
         
+        self.every_input = QSpinBox()
+        self.every_input.setObjectName("pagesInput")
+        self.every_input.setRange(1, 100000)
+        self.every_input.setValue(10)
+        self.every_input.setSuffix(" páginas por archivo")
+        layout.addWidget(self.every_input)
+        
+        self.size_input = QDoubleSpinBox()
+        self.size_input.setObjectName("pagesInput")
+        self.size_input.setRange(0.1, 100000)
+        self.size_input.setValue(10)
+        self.size_input.setSuffix(" MB por archivo")
+        layout.addWidget(self.size_input)
+        
+        self._on_mode_changed()
+        
         layout.addSpacing(10)
         
         button_layout = QHBoxLayout()
@@ -51,11 +91,23 @@ class SplitPanel(QWidget):
         self.split_btn = QPushButton("Dividir PDF")
         self.split_btn.setFixedSize(200, 45)
         self.split_btn.setEnabled(False)
+        self.split_btn.clicked.connect(self._split_pdf)
         button_layout.addWidget(self.split_btn)
         
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setFixedSize(120, 45)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self._cancel_split)
+        button_layout.addWidget(self.cancel_btn)
+        
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
         self.status_label = QLabel("")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
@@ -71,7 +123,83 @@ class SplitPanel(QWidget):
         if file_path:
             self.current_pdf_path = Path(file_path)
             self.selected_label.setText(f"Archivo seleccionado: {self.current_pdf_path.name}")
-            self.split_btn.setEnabled(True)
+            self.split_btn.setEnabled(self._worker is None)
+
+    def _on_mode_changed(self):
+        mode = self.mode_combo.currentData()
+        self.pages_input.setVisible(mode == "ranges")
+        self.every_input.setVisible(mode == "every")
+        self.size_input.setVisible(mode == "size")
+
+    def _split_pdf(self):
+        if not self.current_pdf_path or self._worker is not None:
+            return
+        
+        self._output_dir = self.current_pdf_path.parent / f"{self.current_pdf_path.stem}_split"
+        mode = self.mode_combo.currentData()
+        
+        self.status_label.setText("Dividiendo PDF...")
+        self.status_label.setStyleSheet("")
+        self.split_btn.setEnabled(False)
+        self.select_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        
+        self._worker = JobTask("split", {
+            "input_path": str(self.current_pdf_path),
+            "output_dir": str(self._output_dir),
+            "ranges": self.pages_input.text().strip() or None,
+            "mode": mode,
+            "every": self.every_input.value(),
+            "max_size_mb": self.size_input.value(),
+            "linearize": app_settings.get("output.linearize", False),
+        })
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.result.connect(
+            lambda result: self._on_split_result((True, None, result.get("output_paths", [])))
+        )
+        self._worker.signals.error.connect(lambda error: self._on_split_result((False, error, [])))
+        self._worker.signals.cancelled.connect(self._on_split_cancelled)
+        self._worker.start()
+
+    def _cancel_split(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.status_label.setText("Cancelando...")
+
+    def _on_progress(self, current: int, total: int):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(current)
+
+    def _on_split_result(self, result):
+        self._reset_controls()
+        success, error, outputs = result
+        
+        colors = theme_manager.colors
+        if success:
+            self.status_label.setText(f"PDF dividido en {len(outputs)} archivos: {self._output_dir.name}")
+            self.status_label.setStyleSheet(f"color: {colors['success']};")
+            self.split_completed.emit(True, str(self._output_dir))
+        else:
+            self.status_label.setText(f"Error al dividir: {error}")
+            self.status_label.setStyleSheet(f"color: {colors['error']};")
+            self.split_completed.emit(False, error)
+
+    def _on_split_cancelled(self):
+        self._reset_controls()
+        self.status_label.setText("División cancelada")
+        self.status_label.setStyleSheet(f"color: {theme_manager.colors['fg_secondary']};")
+        self.split_completed.emit(False, CANCELLED_MESSAGE)
+
+    def _reset_controls(self):
+        self._worker = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.select_btn.setEnabled(True)
+        self.split_btn.setEnabled(self.current_pdf_path is not None)
 
     def _apply_style(self):
         colors = theme_manager.colors
@@ -88,7 +216,7 @@ class SplitPanel(QWidget):
                 color: {colors['success']};
                 font-size: 14px;
             }}
-            QLineEdit#pagesInput {{
+            QLineEdit#pagesInput, QSpinBox#pagesInput, QDoubleSpinBox#pagesInput, QComboBox#modeCombo {{
                 background-color: {colors['bg_tertiary']};
                 color: {colors['fg_primary']};
                 border: 1px solid {colors['border']};
@@ -115,4 +243,5 @@ class SplitPanel(QWidget):
                 background-color: {colors['bg_tertiary']};
                 color: {colors['fg_disabled']};
             }}
+            {theme_manager.progress_bar_style()}
         """)
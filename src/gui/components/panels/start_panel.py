@@ -9,6 +9,7 @@ import fitz
 
 from src.gui.themes.theme_manager import theme_manager
 from src.gui.components.panels.document_card import RecentDocumentsWidget
+from src.utils.logger import logger
 from src.utils.recent_files import SystemRecentFiles
 
 
@@ -24,7 +25,7 @@ def generate_pdf_thumbnail(pdf_path: Path, width: int = 120, height: int = 100)
         pixmap.loadFromData(pix.tobytes("png"))
         return pixmap
     except Exception as e:
-        print(f"Error generating thumbnail: {e}")
+        logger.warning("No se pudo generar la miniatura de %s: %s", pdf_path.name, e)
         return None
 
 
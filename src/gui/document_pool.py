@@ -0,0 +1,214 @@
+"""
+Pool de documentos PDF abiertos, compartido por todos los editores y sus vistas.
+Abrir un archivo que ya está abierto (en otra ventana, en otro split o desde recientes)
+reutiliza el documento ya analizado en lugar de volver a cargarlo.
+"""
+
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QModelIndex, QObject, QSizeF
+from PyQt6.QtPdf import QPdfBookmarkModel, QPdfDocument
+
+from src.gui.render_cache import get_tile_cache
+from src.utils import trace
+from src.utils.app_settings import app_settings
+from src.utils.logger import logger
+
+DEFAULT_BUDGET_MB = 512
+
+DocumentKey = Tuple[str, int, int]  # ruta resuelta, mtime en ns, tamaño
+
+_LOAD_ERRORS = {
+    QPdfDocument.Error.FileNotFound: "El archivo no existe",
+    QPdfDocument.Error.InvalidFileFormat: "El archivo no es un PDF válido",
+    QPdfDocument.Error.IncorrectPassword: "El archivo está protegido con contraseña",
+    QPdfDocument.Error.UnsupportedSecurityScheme: "El esquema de seguridad del archivo no está soportado",
+    QPdfDocument.Error.DataNotYetAvailable: "El archivo aún no está disponible",
+}
+
+
+class PooledDocument:
+    """Documento cargado junto con los datos que todas las vistas consultan a menudo."""
+
+    def __init__(self, key: DocumentKey, document: QPdfDocument):
+        self.key = key
+        self.document = document
+        self.refs = 0
+        # Tabla de tamaños: consultar PDFium en cada repintado compite con el hilo de render
+        self.page_sizes: List[QSizeF] = [document.pagePointSize(page) for page in range(document.pageCount())]
+        self._outline: Optional[List[Tuple[int, str, int]]] = None
+
+    @property
+    def path(self) -> Path:
+        return Path(self.key[0])
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_sizes)
+
+    @property
+    def size_bytes(self) -> int:
+        # Aproximación: la memoria de PDFium crece con el tamaño del archivo
+        return self.key[2]
+
+    @property
+    def outline(self) -> List[Tuple[int, str, int]]:
+        """Marcadores como (nivel, título, página), leídos la primera vez que se piden."""
+        if self._outline is None:
+            model = QPdfBookmarkModel(None)
+            model.setDocument(self.document)
+            self._outline = []
+            self._read_outline(model, QModelIndex())
+        return self._outline
+
+    def _read_outline(self, model: QPdfBookmarkModel, parent: QModelIndex) -> None:
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            self._outline.append((
+                model.data(index, QPdfBookmarkModel.Role.Level.value),
+                model.data(index, QPdfBookmarkModel.Role.Title.value),
+                model.data(index, QPdfBookmarkModel.Role.Page.value),
+            ))
+            self._read_outline(model, index)
+
+
+class DocumentPool(QObject):
+    """
+    Documentos con contador de referencias. Los que ningún editor usa se conservan
+    mientras quepan en el presupuesto, por si se vuelven a abrir; al superarlo se
+    descartan los que llevan más tiempo sin usarse.
+    """
+
+    def __init__(self, budget_mb: Optional[float] = None):
+        super().__init__()
+        budget_mb = budget_mb or app_settings.get("document_pool.budget_mb", DEFAULT_BUDGET_MB)
+        self._budget = int(budget_mb * 1024 * 1024)
+        self._entries: Dict[DocumentKey, PooledDocument] = {}
+        self._by_document: Dict[int, PooledDocument] = {}
+        self._idle: "OrderedDict[DocumentKey, PooledDocument]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(path) -> DocumentKey:
+        path = Path(path).resolve()
+        stat = path.stat()
+        return str(path), stat.st_mtime_ns, stat.st_size
+
+    def acquire(self, path) -> PooledDocument:
+        """Devuelve el documento de path con una referencia más; lo carga si no está en el pool."""
+        try:
+            key = self.key_for(path)
+        except OSError:
+            raise ValueError(_LOAD_ERRORS[QPdfDocument.Error.FileNotFound])
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._idle.pop(key, None)
+        else:
+            self.misses += 1
+            self._discard_stale(key)
+            document = QPdfDocument(self)
+            started = time.perf_counter()
+            error = document.load(key[0])
+            trace.io("DocumentPool: %s cargado en %.1f ms", key[0], (time.perf_counter() - started) * 1000)
+            if error != QPdfDocument.Error.None_:
+                document.deleteLater()
+                raise ValueError(_LOAD_ERRORS.get(error, f"No se pudo abrir el PDF ({error.name})"))
+            entry = PooledDocument(key, document)
+            self._entries[key] = entry
+            self._by_document[id(document)] = entry
+            logger.file("[DocumentPool] Cargado %s (%d páginas)", Path(key[0]).name, entry.page_count)
+
+        entry.refs += 1
+        return entry
+
+    def release(self, entry: PooledDocument) -> None:
+        if entry.refs <= 0 or self._entries.get(entry.key) is not entry:
+            return
+        entry.refs -= 1
+        if entry.refs == 0:
+            self._idle[entry.key] = entry
+            self._evict()
+
+    def references(self, path) -> int:
+        """Cuántas vistas usan ahora alguna versión cargada de path."""
+        resolved = str(Path(path).resolve())
+        return sum(entry.refs for entry in self._entries.values() if entry.key[0] == resolved)
+
+    def close_path(self, path) -> None:
+        """
+        Cierra ya los documentos sin usar de path, sin esperar a que el presupuesto los
+        expulse: antes de reemplazar el archivo (en Windows no se puede sustituir uno abierto).
+        """
+        resolved = str(Path(path).resolve())
+        for entry in [entry for entry in self._idle.values() if entry.key[0] == resolved]:
+            self._drop(entry)
+
+    def entry_for(self, document: Optional[QPdfDocument]) -> Optional[PooledDocument]:
+        if document is None:
+            return None
+        return self._by_document.get(id(document))
+
+    def _discard_stale(self, key: DocumentKey) -> None:
+        # El archivo cambió en disco: las versiones anteriores sin usar ya no sirven
+        for stale in [entry for entry in self._idle.values() if entry.key[0] == key[0]]:
+            self._drop(stale)
+
+    def _evict(self) -> None:
+        while self._idle and self.size_bytes > self._budget:
+            _, entry = next(iter(self._idle.items()))
+            self._drop(entry)
+
+    def _drop(self, entry: PooledDocument) -> None:
+        self._idle.pop(entry.key, None)
+        self._entries.pop(entry.key, None)
+        self._by_document.pop(id(entry.document), None)
+        get_tile_cache().release_document(entry.document)
+        entry.document.close()
+        entry.document.deleteLater()
+        logger.debug("[DocumentPool] Descartado %s", entry.path.name)
+
+    # Presupuesto
+
+    @property
+    def budget_mb(self) -> float:
+        return self._budget / (1024 * 1024)
+
+    def set_budget_mb(self, budget_mb: float) -> None:
+        self._budget = int(budget_mb * 1024 * 1024)
+        self._evict()
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def clear(self) -> None:
+        """Descarta los documentos sin referencias."""
+        for entry in list(self._idle.values()):
+            self._drop(entry)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "documents": len(self._entries),
+            "idle": len(self._idle),
+            "size_mb": round(self.size_bytes / (1024 * 1024), 2),
+            "budget_mb": round(self.budget_mb, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_document_pool: Optional[DocumentPool] = None
+
+
+def get_document_pool() -> DocumentPool:
+    """Instancia compartida; se crea al primer uso, cuando ya existe QApplication."""
+    global _document_pool
+    if _document_pool is None:
+        _document_pool = DocumentPool()
+    return _document_pool
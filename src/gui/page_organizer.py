@@ -0,0 +1,411 @@
+"""
+Organizador de páginas del editor: cuadrícula de miniaturas de la lista de páginas pendiente.
+
+La vista es virtual: el modelo solo expone el historial de páginas (sin datos por página) y
+las miniaturas se piden a la caché de teselas compartida al pintar cada celda visible, de modo
+que la memoria queda acotada por el presupuesto de la caché sea cual sea el número de páginas.
+Las operaciones (arrastrar, girar, duplicar, eliminar, extraer) no tocan el modelo: se emiten como
+posiciones para que el editor las aplique sobre el historial y luego se refresca la vista.
+"""
+
+import json
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import (
+    QAbstractListModel, QMimeData, QModelIndex, QPoint, QRect, QRectF, QSize, Qt, QTimer, pyqtSignal,
+)
+from PyQt6.QtGui import QAction, QImage, QPainter, QPalette, QPen
+from PyQt6.QtPdf import QPdfDocument
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QMenu, QStyle, QStyledItemDelegate
+
+from src.core.page_history import PageHistory
+from src.gui.document_pool import get_document_pool
+from src.gui.render_cache import TILE_SIZE, TileKey, get_tile_cache, page_pixel_size, zoom_bucket
+
+THUMBNAIL_SIZE = 120
+_LABEL_HEIGHT = 18
+_MARGIN = 8
+_MIME_TYPE = "application/x-xebec-page-positions"
+_REFRESH_DELAY_MS = 40  # tras desplazar, repintado completo que cancela las peticiones obsoletas
+
+SOURCE_ROLE = Qt.ItemDataRole.UserRole
+ROTATION_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class PageListModel(QAbstractListModel):
+    """Modelo de solo lectura sobre PageHistory: una fila por página del documento resultante."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._history: Optional[PageHistory] = None
+
+    def set_history(self, history: Optional[PageHistory]) -> None:
+        self.beginResetModel()
+        self._history = history
+        self.endResetModel()
+
+    def refresh(self) -> None:
+        """Vuelve a leer el historial tras una operación (el número de filas puede cambiar)."""
+        self.beginResetModel()
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() or self._history is None:
+            return 0
+        return len(self._history)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self._history is None or index.row() >= len(self._history):
+            return None
+        source, rotation = self._history[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(index.row() + 1)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            tip = f"Página {source + 1} del archivo guardado"
+            return f"{tip}, girada {rotation}°" if rotation else tip
+        if role == SOURCE_ROLE:
+            return source
+        if role == ROTATION_ROLE:
+            return rotation
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+
+    def supportedDragActions(self) -> Qt.DropAction:
+        return Qt.DropAction.MoveAction
+
+    def supportedDropActions(self) -> Qt.DropAction:
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self) -> List[str]:
+        return [_MIME_TYPE]
+
+    def mimeData(self, indexes) -> QMimeData:
+        data = QMimeData()
+        data.setData(_MIME_TYPE, json.dumps(sorted({index.row() for index in indexes})).encode("ascii"))
+        return data
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Pinta cada celda: miniatura (o marcador mientras se renderiza) y número de página."""
+
+    def __init__(self, organizer: "PageOrganizer"):
+        super().__init__(organizer)
+        self.organizer = organizer
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(THUMBNAIL_SIZE + 2 * _MARGIN, THUMBNAIL_SIZE + _LABEL_HEIGHT + 2 * _MARGIN)
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        painter.save()
+        palette = option.palette
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, palette.brush(QPalette.ColorRole.Highlight))
+
+        source = index.data(SOURCE_ROLE)
+        rotation = index.data(ROTATION_ROLE)
+        box = QRect(
+            option.rect.x() + _MARGIN, option.rect.y() + _MARGIN, THUMBNAIL_SIZE, THUMBNAIL_SIZE,
+        )
+        page_rect = self.organizer.thumbnail_rect(source, rotation, box)
+        painter.fillRect(page_rect, Qt.GlobalColor.white)
+        image = self.organizer.thumbnail(source, rotation)
+        if image is not None:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawImage(QRectF(page_rect), image, QRectF(image.rect()))
+        painter.setPen(QPen(palette.color(QPalette.ColorRole.Mid)))
+        painter.drawRect(page_rect.adjusted(0, 0, -1, -1))
+
+        label = QRect(option.rect.x(), box.bottom() + 2, option.rect.width(), _LABEL_HEIGHT)
+        role = (
+            QPalette.ColorRole.HighlightedText
+            if option.state & QStyle.StateFlag.State_Selected else QPalette.ColorRole.Text
+        )
+        painter.setPen(palette.color(role))
+        painter.drawText(label, Qt.AlignmentFlag.AlignCenter, index.data(Qt.ItemDataRole.DisplayRole))
+        painter.restore()
+
+
+class PageOrganizer(QListView):
+    """
+    Cuadrícula de miniaturas con selección múltiple y reordenación por arrastre.
+    Emite las operaciones sobre las posiciones seleccionadas; el editor las valida, las
+    aplica al historial y llama a refresh.
+    """
+
+    page_activated = pyqtSignal(int)             # página del archivo guardado
+    move_requested = pyqtSignal(list, int)       # posiciones, destino sin ellas (PageHistory.move)
+    rotate_requested = pyqtSignal(list, int)     # posiciones, grados
+    duplicate_requested = pyqtSignal(list)
+    delete_requested = pyqtSignal(list)
+    extract_requested = pyqtSignal(list)
+    undo_requested = pyqtSignal()
+    redo_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._document: Optional[QPdfDocument] = None
+        self._cache = get_tile_cache()
+        self._cache.tile_ready.connect(self._on_tile_ready)
+        self._drop_position: Optional[int] = None
+
+        self._model = PageListModel(self)
+        self.setModel(self._model)
+        self.setItemDelegate(ThumbnailDelegate(self))
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        # Static: el arrastre pasa por dropEvent en vez de mover los iconos libremente
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(500)
+        self.setSpacing(2)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.DragDrop)
+        self.setDefaultDropAction(Qt.DropAction.MoveAction)
+        self.setDropIndicatorShown(False)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._show_context_menu)
+        self.clicked.connect(self._on_clicked)
+        self.activated.connect(self._on_clicked)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(_REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self.viewport().update)
+        self.verticalScrollBar().valueChanged.connect(self._refresh_timer.start)
+
+    # ===== Documento =====
+
+    def set_document(self, document: Optional[QPdfDocument], history: Optional[PageHistory]) -> None:
+        if self._document is not None:
+            self._cache.cancel(self)
+        self._document = document if history is not None else None
+        self._model.set_history(history if document is not None else None)
+
+    def refresh(self, select: Sequence[int] = ()) -> None:
+        """Relee el historial conservando el desplazamiento; select son las posiciones a seleccionar."""
+        scroll = self.verticalScrollBar().value()
+        self._model.refresh()
+        self.verticalScrollBar().setValue(scroll)
+        selection = self.selectionModel()
+        for position in select:
+            index = self._model.index(position)
+            if index.isValid():
+                selection.select(index, selection.SelectionFlag.Select)
+        if select:
+            current = self._model.index(select[0])
+            selection.setCurrentIndex(current, selection.SelectionFlag.NoUpdate)
+            self.scrollTo(current)
+
+    def selected_positions(self) -> List[int]:
+        return sorted(index.row() for index in self.selectionModel().selectedIndexes())
+
+    # ===== Miniaturas =====
+
+    def _point_size(self, source: int):
+        entry = get_document_pool().entry_for(self._document)
+        if entry is not None and 0 <= source < entry.page_count:
+            return entry.page_sizes[source]
+        return self._document.pagePointSize(source)
+
+    def thumbnail_rect(self, source: int, rotation: int, box: QRect) -> QRect:
+        """Rectángulo de la página dentro de box, conservando la proporción tras el giro."""
+        if self._document is None:
+            return box
+        point_size = self._point_size(source)
+        width, height = point_size.width(), point_size.height()
+        if rotation in (90, 270):
+            width, height = height, width
+        if width <= 0 or height <= 0:
+            return box
+        scale = min(box.width() / width, box.height() / height)
+        size = QSize(max(1, round(width * scale)), max(1, round(height * scale)))
+        return QRect(
+            box.x() + (box.width() - size.width()) // 2,
+            box.y() + (box.height() - size.height()) // 2,
+            size.width(), size.height(),
+        )
+
+    def _thumbnail_bucket(self, source: int) -> int:
+        point_size = self._point_size(source)
+        longest = max(point_size.width(), point_size.height(), 1e-3)
+        bucket = zoom_bucket(THUMBNAIL_SIZE * self.devicePixelRatioF() / longest)
+        # La miniatura tiene que caber en una sola tesela
+        return min(bucket, zoom_bucket(TILE_SIZE / longest) - 1)
+
+    def thumbnail(self, source: int, rotation: int) -> Optional[QImage]:
+        """Miniatura en caché o None; si falta se pide y, entretanto, sirve otro nivel de una tesela."""
+        document = self._document
+        if document is None or document.status() != QPdfDocument.Status.Ready:
+            return None
+        document_key = self._cache.document_key(document)
+        bucket = self._thumbnail_bucket(source)
+        key = TileKey(document_key, source, bucket, rotation, 0, 0)
+        image = self._cache.get(key)
+        if image is not None:
+            return image
+        # Prioridad 0: por debajo de lo visible en el visor, por encima de su precarga
+        self._cache.request(document, key, priority=0, tag=self)
+        for level in self._cache.levels(document_key, source, rotation):
+            point_size = self._point_size(source)
+            size = page_pixel_size(point_size.width(), point_size.height(), level, rotation)
+            if size.width() <= TILE_SIZE and size.height() <= TILE_SIZE:
+                fallback = self._cache.peek(TileKey(document_key, source, level, rotation, 0, 0))
+                if fallback is not None:
+                    return fallback
+        return None
+
+    def _on_tile_ready(self, document_key: int, page: int) -> None:
+        if self._document is None or not self.isVisible():
+            return
+        if self._cache.document_key(self._document) == document_key:
+            self.viewport().update()
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if event.rect().contains(self.viewport().rect()) and self._document is not None:
+            # Repintado completo: las celdas visibles acaban de renovar sus peticiones, así que
+            # todo lo demás que siga en cola es de celdas que ya no se ven
+            visible = self._visible_keys()
+            self._cache.cancel(self, keep=visible)
+        if self._drop_position is not None:
+            self._paint_drop_indicator()
+
+    def _visible_cells(self) -> Iterator[Tuple[QModelIndex, QRect]]:
+        """Celdas que se ven en el viewport, con su rectángulo; no recorre el resto de la lista."""
+        rect = self.viewport().rect()
+        first = self.indexAt(rect.topLeft() + QPoint(_MARGIN, _MARGIN))
+        row = max(0, first.row() - 1) if first.isValid() else 0
+        while row < self._model.rowCount():
+            index = self._model.index(row)
+            cell = self.visualRect(index)
+            if cell.top() > rect.bottom():
+                break
+            if cell.intersects(rect):
+                yield index, cell
+            row += 1
+
+    def _visible_keys(self) -> List[TileKey]:
+        document_key = self._cache.document_key(self._document)
+        keys = []
+        for index, _ in self._visible_cells():
+            source, rotation = index.data(SOURCE_ROLE), index.data(ROTATION_ROLE)
+            keys.append(TileKey(document_key, source, self._thumbnail_bucket(source), rotation, 0, 0))
+        return keys
+
+    # ===== Arrastrar y soltar =====
+
+    def _insertion_at(self, pos: QPoint) -> int:
+        """Posición de la lista ante la que se insertaría lo que se suelta en pos."""
+        # Los huecos entre celdas cuentan como parte de la celda más próxima
+        gap = self.spacing() + 1
+        for index, cell in self._visible_cells():
+            if cell.adjusted(-gap, -gap, gap, gap).contains(pos):
+                return index.row() + (1 if pos.x() > cell.center().x() else 0)
+        return self._model.rowCount()
+
+    def dragEnterEvent(self, event) -> None:
+        if event.source() is self and event.mimeData().hasFormat(_MIME_TYPE):
+            event.setDropAction(Qt.DropAction.MoveAction)
+            event.accept()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event) -> None:
+        if event.source() is not self:
+            event.ignore()
+            return
+        # La implementación base desplaza la vista cerca de los bordes
+        super().dragMoveEvent(event)
+        self._drop_position = self._insertion_at(event.position().toPoint())
+        event.setDropAction(Qt.DropAction.MoveAction)
+        event.accept()
+        self.viewport().update()
+
+    def dragLeaveEvent(self, event) -> None:
+        self._drop_position = None
+        self.viewport().update()
+        super().dragLeaveEvent(event)
+
+    def dropEvent(self, event) -> None:
+        self._drop_position = None
+        self.viewport().update()
+        if event.source() is not self or not event.mimeData().hasFormat(_MIME_TYPE):
+            event.ignore()
+            return
+        positions = json.loads(bytes(event.mimeData().data(_MIME_TYPE)).decode("ascii"))
+        insertion = self._insertion_at(event.position().toPoint())
+        target = insertion - sum(1 for position in positions if position < insertion)
+        # La acción se marca como copia para que la vista no intente quitar las filas de origen
+        event.setDropAction(Qt.DropAction.CopyAction)
+        event.accept()
+        if positions and positions != list(range(target, target + len(positions))):
+            self.move_requested.emit(positions, target)
+
+    def _paint_drop_indicator(self) -> None:
+        count = self._model.rowCount()
+        if count == 0:
+            return
+        if self._drop_position < count:
+            cell = self.visualRect(self._model.index(self._drop_position))
+            x = cell.left()
+        else:
+            cell = self.visualRect(self._model.index(count - 1))
+            x = cell.right()
+        painter = QPainter(self.viewport())
+        painter.setPen(QPen(self.palette().color(QPalette.ColorRole.Highlight), 3))
+        painter.drawLine(x, cell.top() + _MARGIN, x, cell.bottom() - _MARGIN)
+        painter.end()
+
+    # ===== Teclado y menú =====
+
+    def _on_clicked(self, index: QModelIndex) -> None:
+        if index.isValid():
+            self.page_activated.emit(index.data(SOURCE_ROLE))
+
+    def keyPressEvent(self, event) -> None:
+        key = event.key()
+        modifiers = event.modifiers()
+        control = Qt.KeyboardModifier.ControlModifier
+        positions = self.selected_positions()
+
+        if key == Qt.Key.Key_Delete and positions:
+            self.delete_requested.emit(positions)
+            return
+        if modifiers == control and key == Qt.Key.Key_D and positions:
+            self.duplicate_requested.emit(positions)
+            return
+        if modifiers == control and key == Qt.Key.Key_R and positions:
+            self.rotate_requested.emit(positions, 90)
+            return
+        if modifiers == (control | Qt.KeyboardModifier.ShiftModifier) and key == Qt.Key.Key_R and positions:
+            self.rotate_requested.emit(positions, -90)
+            return
+        if modifiers == control and key == Qt.Key.Key_Z:
+            self.undo_requested.emit()
+            return
+        if modifiers == control and key == Qt.Key.Key_Y:
+            self.redo_requested.emit()
+            return
+        super().keyPressEvent(event)
+
+    def _show_context_menu(self, pos: QPoint) -> None:
+        positions = self.selected_positions()
+        if not positions:
+            return
+        menu = QMenu(self)
+        for text, handler in (
+            ("Girar 90°", lambda: self.rotate_requested.emit(positions, 90)),
+            ("Girar -90°", lambda: self.rotate_requested.emit(positions, -90)),
+            ("Duplicar", lambda: self.duplicate_requested.emit(positions)),
+            ("Eliminar", lambda: self.delete_requested.emit(positions)),
+            ("Extraer a un PDF nuevo…", lambda: self.extract_requested.emit(positions)),
+        ):
+            action = QAction(text, menu)
+            action.triggered.connect(handler)
+            menu.addAction(action)
+        menu.exec(self.viewport().mapToGlobal(pos))
@@ -0,0 +1,164 @@
+"""
+Precarga de páginas para el visor PDF.
+Renderiza en segundo plano las páginas hacia las que avanza la navegación, con una ventana
+que se alarga con la velocidad de avance, y cancela lo que deja de ser útil.
+"""
+
+import math
+import time
+from typing import List, Tuple
+
+from PyQt6.QtCore import QObject, QRect, QTimer
+from PyQt6.QtPdf import QPdfDocument
+
+from src.gui.render_cache import TileKey, get_tile_cache, tile_grid, tile_rect
+from src.utils import trace
+from src.utils.app_settings import app_settings
+
+DEFAULT_LOOKAHEAD = 8
+
+_SMOOTHING = 0.5        # peso de la última medida en la media de velocidad
+_HORIZON = 0.75         # segundos de navegación que se intentan cubrir por delante
+_FAST = 4.0             # páginas/s a partir de las que solo se precargan vistas previas lejanas
+_IDLE_RESET = 1.5       # segundos sin navegar tras los que se olvida la inercia
+_JUMP = 3               # saltos mayores (Inicio, Fin, ir a página) no cuentan como avance
+_DELAY_MS = 30          # agrupa ráfagas de cambios de página en una sola planificación
+
+
+class PagePrefetcher(QObject):
+    """
+    Sigue el navegador de páginas de un PDFViewerWidget y pide a la caché de teselas las
+    páginas vecinas antes de que se muestren. Las peticiones se hacen con menor prioridad
+    que las visibles y se cancelan en cuanto la navegación cambia de rumbo.
+    """
+
+    def __init__(self, viewer, lookahead: int = 0):
+        super().__init__(viewer)
+        self.viewer = viewer
+        self.lookahead = lookahead or app_settings.get("render_cache.prefetch_pages", DEFAULT_LOOKAHEAD)
+        self._cache = get_tile_cache()
+        self._page = None
+        self._time = 0.0
+        self._direction = 1  # 1 adelante, -1 atrás, 0 sin dirección (tras un salto)
+        self._speed = 0.0    # páginas por segundo
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(_DELAY_MS)
+        self._timer.timeout.connect(self.prefetch)
+
+        viewer.pageNavigator().currentPageChanged.connect(self.note_navigation)
+        viewer.documentChanged.connect(self.reset)
+        viewer.zoomFactorChanged.connect(self._schedule)
+        viewer.zoomModeChanged.connect(self._schedule)
+
+    @property
+    def direction(self) -> int:
+        return self._direction
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    def reset(self, *args) -> None:
+        self._cache.cancel(self)
+        self._page = None
+        self._direction = 1
+        self._speed = 0.0
+
+    def note_navigation(self, page: int) -> None:
+        now = time.monotonic()
+        if self._page is not None and page != self._page:
+            delta = page - self._page
+            if abs(delta) > _JUMP:
+                # Salto: no indica hacia dónde seguirá la lectura, se cubren ambos lados
+                self._direction = 0
+                self._speed = 0.0
+            else:
+                elapsed = max(now - self._time, 1e-3)
+                rate = abs(delta) / elapsed if elapsed < _IDLE_RESET else 0.0
+                direction = 1 if delta > 0 else -1
+                if direction != self._direction:
+                    self._speed = rate
+                else:
+                    self._speed = _SMOOTHING * rate + (1 - _SMOOTHING) * self._speed
+                self._direction = direction
+        self._page = page
+        self._time = now
+        self._schedule()
+
+    def _schedule(self, *args) -> None:
+        self._timer.start()
+
+    def plan(self) -> List[Tuple[int, bool]]:
+        """Páginas a precargar por orden de urgencia, indicando si se quieren nítidas o solo en vista previa."""
+        document = self.viewer.document()
+        if self._page is None or document is None:
+            return []
+        page_count = document.pageCount()
+        if time.monotonic() - self._time > _IDLE_RESET:
+            self._speed = 0.0
+
+        # Leyendo despacio bastan las páginas contiguas nítidas; pasando páginas deprisa
+        # la ventana se alarga con vistas previas, que son las que llegan a verse
+        reach = min(self.lookahead, 2 + math.ceil(self._speed * _HORIZON))
+        sharp = 1 if self._speed >= _FAST else 2
+        if self._direction == 0:
+            forward = backward = max(1, reach // 2)
+            sharp_forward = sharp_backward = 1
+        else:
+            forward, backward = reach, 1
+            sharp_forward, sharp_backward = sharp, (1 if self._speed < _FAST else 0)
+            if self._direction < 0:
+                forward, backward = backward, forward
+                sharp_forward, sharp_backward = sharp_backward, sharp_forward
+
+        plan = []
+        for distance in range(1, max(forward, backward) + 1):
+            for page, limit, sharp_limit in (
+                (self._page + distance, forward, sharp_forward),
+                (self._page - distance, backward, sharp_backward),
+            ):
+                if distance <= limit and 0 <= page < page_count:
+                    plan.append((page, distance <= sharp_limit))
+        return plan
+
+    def prefetch(self) -> None:
+        viewer = self.viewer
+        document = viewer.document()
+        if document is None or document.status() != QPdfDocument.Status.Ready or not viewer.isVisible():
+            return
+        document_key = self._cache.document_key(document)
+        visible = set(viewer.visible_pages())
+        # La precarga nunca ocupa más de un cuarto de la caché, para no expulsar lo visible
+        allowance = self._cache.budget_mb * 1024 * 1024 / 4
+
+        requests = []
+        for distance, (page, sharp) in enumerate(self.plan(), start=1):
+            if page in visible:
+                continue
+            bucket, page_size = viewer.page_level(page)
+            preview = viewer.preview_key(document_key, page, bucket)
+            requests.append((preview, -2 * distance))
+            if not sharp or preview.bucket == bucket:
+                continue
+            # Al saltar a una página se muestra su parte superior: basta con una pantalla de alto
+            display = viewer.page_display_size(page)
+            height = math.ceil(viewer.viewport().height() * page_size.height() / max(1, display.height()))
+            for column, row in tile_grid(page_size, QRect(0, 0, page_size.width(), height)):
+                key = TileKey(document_key, page, bucket, viewer.rotation, column, row)
+                cost = self._tile_bytes(page_size, column, row)
+                if cost > allowance:
+                    break
+                allowance -= cost
+                requests.append((key, -2 * distance - 1))
+
+        cancelled = self._cache.cancel(self, keep=[key for key, _ in requests])
+        trace.render("Precarga: %d teselas pedidas, %d canceladas", len(requests), cancelled)
+        for key, priority in requests:
+            self._cache.request(document, key, priority, tag=self)
+
+    @staticmethod
+    def _tile_bytes(page_size, column: int, row: int) -> int:
+        rect = tile_rect(page_size, column, row)
+        return rect.width() * rect.height() * 4
@@ -14,15 +14,10 @@ import fitz
 from src.gui.pyqt6.theme_manager import theme_manager
 from src.core.pdf_repair import PDFRepairer
 from src.gui.components.document_card import RecentDocumentsManager
+from src.utils.logger import logger
 from src.utils.recent_files import SystemRecentFiles
 
 
-import sys
-
-def log(msg):
-    pass
-
-
 def generate_pdf_thumbnail(pdf_path: Path, width: int = 120, height: int = 100) -> Optional[QPixmap]:
     """Genera una miniatura de la primera página de un PDF usando PyMuPDF."""
     try:
@@ -35,7 +30,7 @@ def generate_pdf_thumbnail(pdf_path: Path, width: int = 120, height: int = 100)
         pixmap.loadFromData(pix.tobytes("png"))
         return pixmap
     except Exception as e:
-        print(f"Error generating thumbnail: {e}")
+        logger.warning("No se pudo generar la miniatura de %s: %s", pdf_path.name, e)
         return None
 
 
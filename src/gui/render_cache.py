@@ -0,0 +1,337 @@
+"""
+Caché de renderizado compartida por todos los visores PDF.
+Las páginas se rasterizan en teselas por documento, página, nivel de zoom y rotación,
+con un presupuesto LRU en MB común a toda la aplicación.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import QObject, QRect, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage
+from PyQt6.QtPdf import QPdfDocument, QPdfDocumentRenderOptions
+
+from src.utils import trace
+from src.utils.app_settings import app_settings
+
+TILE_SIZE = 512
+BUCKETS_PER_OCTAVE = 8
+DEFAULT_BUDGET_MB = 256
+
+_ROTATIONS = {
+    0: QPdfDocumentRenderOptions.Rotation.None_,
+    90: QPdfDocumentRenderOptions.Rotation.Clockwise90,
+    180: QPdfDocumentRenderOptions.Rotation.Clockwise180,
+    270: QPdfDocumentRenderOptions.Rotation.Clockwise270,
+}
+
+
+@dataclass(frozen=True)
+class TileKey:
+    document: int
+    page: int
+    bucket: int
+    rotation: int
+    column: int
+    row: int
+
+
+def zoom_bucket(pixels_per_point: float) -> int:
+    """Nivel de zoom discreto; se redondea hacia arriba para no perder nitidez."""
+    return math.ceil(math.log2(max(pixels_per_point, 1e-3)) * BUCKETS_PER_OCTAVE - 1e-6)
+
+
+def bucket_scale(bucket: int) -> float:
+    return 2.0 ** (bucket / BUCKETS_PER_OCTAVE)
+
+
+def page_pixel_size(point_width: float, point_height: float, bucket: int, rotation: int) -> QSize:
+    scale = bucket_scale(bucket)
+    width, height = max(1, round(point_width * scale)), max(1, round(point_height * scale))
+    if rotation in (90, 270):
+        width, height = height, width
+    return QSize(width, height)
+
+
+def tile_rect(page_size: QSize, column: int, row: int) -> QRect:
+    x, y = column * TILE_SIZE, row * TILE_SIZE
+    return QRect(x, y, min(TILE_SIZE, page_size.width() - x), min(TILE_SIZE, page_size.height() - y))
+
+
+def tile_grid(page_size: QSize, region: Optional[QRect] = None) -> Iterator[Tuple[int, int]]:
+    """Teselas (columna, fila) que cubren region (en píxeles del nivel), o la página entera."""
+    bounds = QRect(0, 0, page_size.width(), page_size.height())
+    region = bounds if region is None else region.intersected(bounds)
+    if region.isEmpty():
+        return
+    for row in range(region.top() // TILE_SIZE, region.bottom() // TILE_SIZE + 1):
+        for column in range(region.left() // TILE_SIZE, region.right() // TILE_SIZE + 1):
+            yield column, row
+
+
+class _RenderSignals(QObject):
+    done = pyqtSignal(object, object)
+
+
+class _TileRender(QRunnable):
+    def __init__(self, cache: "PageTileCache", document: QPdfDocument, key: TileKey):
+        super().__init__()
+        self.cache = cache
+        self.document = document
+        self.key = key
+
+    def run(self) -> None:
+        key = self.key
+        with self.cache._render_lock:
+            # La petición pudo quedar obsoleta mientras esperaba (documento recargado o cerrado,
+            # precarga cancelada) o haberla tomado ya otra copia adelantada
+            with self.cache._claim_lock:
+                if key not in self.cache._pending or key in self.cache._claimed:
+                    return
+                self.cache._claimed.add(key)
+            started = time.perf_counter()
+            point_size = self.document.pagePointSize(key.page)
+            page_size = page_pixel_size(point_size.width(), point_size.height(), key.bucket, key.rotation)
+            rect = tile_rect(page_size, key.column, key.row)
+            options = QPdfDocumentRenderOptions()
+            options.setRotation(_ROTATIONS.get(key.rotation, QPdfDocumentRenderOptions.Rotation.None_))
+            options.setScaledSize(page_size)
+            options.setScaledClipRect(rect)
+            image = self.document.render(key.page, rect.size(), options)
+        trace.render("Tesela %s renderizada en %.1f ms", key, (time.perf_counter() - started) * 1000)
+        self.cache._signals.done.emit(key, image)
+
+
+class PageTileCache(QObject):
+    """
+    Caché LRU de teselas renderizadas. Cualquier visor que muestre la misma página al mismo
+    nivel de zoom reutiliza las mismas imágenes; a otros niveles sirve como respaldo escalado
+    mientras se renderiza la versión nítida.
+    """
+
+    tile_ready = pyqtSignal(int, int)  # documento, página
+
+    def __init__(self, budget_mb: Optional[float] = None):
+        super().__init__()
+        budget_mb = budget_mb or app_settings.get("render_cache.budget_mb", DEFAULT_BUDGET_MB)
+        self._budget = int(budget_mb * 1024 * 1024)
+        self._tiles: "OrderedDict[TileKey, QImage]" = OrderedDict()
+        self._bytes = 0
+        # (documento, página, rotación) -> {nivel: teselas en caché}
+        self._levels: Dict[Tuple[int, int, int], Dict[int, int]] = {}
+        self._pending: Set[TileKey] = set()
+        # Teselas que ya tiene un hilo; evita renderizar dos veces una petición adelantada
+        self._claimed: Set[TileKey] = set()
+        # Peticiones especulativas (precarga): tesela -> propietario; se pueden cancelar en bloque
+        self._tags: Dict[TileKey, object] = {}
+        self._documents: Dict[int, int] = {}
+        self._status_slots: Dict[int, object] = {}
+        self._ids = count(1)
+        self._render_lock = threading.Lock()
+        self._claim_lock = threading.Lock()
+        self._pool = QThreadPool(self)
+        # PDFium serializa el renderizado internamente: un hilo basta y evita contención
+        self._pool.setMaxThreadCount(1)
+        self._signals = _RenderSignals()
+        self._signals.done.connect(self._on_rendered)
+        self.hits = 0
+        self.misses = 0
+
+    # Documentos
+
+    def document_key(self, document: QPdfDocument) -> int:
+        """Identificador del contenido actual del documento; cambia cada vez que se recarga."""
+        key = self._documents.get(id(document))
+        if key is None:
+            key = next(self._ids)
+            self._documents[id(document)] = key
+            slot = lambda _status, doc=document: self._reset_document(doc)
+            self._status_slots[id(document)] = slot
+            document.statusChanged.connect(slot)
+        return key
+
+    def _reset_document(self, document: QPdfDocument) -> None:
+        old_key = self._documents.get(id(document))
+        if old_key is None:
+            return
+        self._documents[id(document)] = next(self._ids)
+        self._drop_document(old_key)
+
+    def release_document(self, document: QPdfDocument) -> None:
+        """
+        Descarta las teselas del documento y espera a que termine su render en curso.
+        Debe llamarse antes de destruir un QPdfDocument que haya pasado por la caché.
+        """
+        key = self._documents.pop(id(document), None)
+        if key is None:
+            return
+        slot = self._status_slots.pop(id(document), None)
+        if slot is not None:
+            try:
+                document.statusChanged.disconnect(slot)
+            except TypeError:
+                pass
+        self._drop_document(key)
+        with self._render_lock:
+            pass
+
+    def _drop_document(self, key: int) -> None:
+        for tile in [tile for tile in self._pending if tile.document == key]:
+            self._forget_request(tile)
+        for tile in [tile for tile in self._tiles if tile.document == key]:
+            self._bytes -= self._tiles.pop(tile).sizeInBytes()
+        self._levels = {level: buckets for level, buckets in self._levels.items() if level[0] != key}
+
+    # Consulta
+
+    def get(self, key: TileKey) -> Optional[QImage]:
+        image = self._tiles.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._tiles.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def peek(self, key: TileKey) -> Optional[QImage]:
+        return self._tiles.get(key)
+
+    def levels(self, document: int, page: int, rotation: int) -> List[int]:
+        return sorted(self._levels.get((document, page, rotation), ()))
+
+    def fallback_level(self, document: int, page: int, rotation: int, bucket: int) -> Optional[int]:
+        """El nivel en caché más cercano a bucket, prefiriendo los más nítidos."""
+        candidates = [level for level in self.levels(document, page, rotation) if level != bucket]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda level: (abs(level - bucket), level < bucket))
+
+    def is_pending(self, key: TileKey) -> bool:
+        return key in self._pending
+
+    def request(self, document: QPdfDocument, key: TileKey, priority: int = 0, tag: object = None) -> None:
+        """
+        Encola el render de una tesela. Las peticiones con tag son especulativas: cancel(tag)
+        las descarta si siguen en cola. Una petición sin tag sobre una tesela ya encolada por
+        la precarga la adelanta a la nueva prioridad y la hace definitiva.
+        """
+        if key in self._tiles:
+            return
+        if key in self._pending:
+            if tag is None and key in self._tags:
+                del self._tags[key]
+                self._pool.start(_TileRender(self, document, key), priority)
+            return
+        if self._documents.get(id(document)) != key.document:
+            return
+        self._pending.add(key)
+        if tag is not None:
+            self._tags[key] = tag
+        self._pool.start(_TileRender(self, document, key), priority)
+
+    def cancel(self, tag: object, keep: Iterable[TileKey] = ()) -> int:
+        """
+        Descarta las peticiones de tag que no estén en keep; devuelve cuántas.
+        Las que siguen en la cola del pool terminan sin renderizar al no estar ya pendientes.
+        """
+        keep = set(keep)
+        stale = [key for key, owner in self._tags.items() if owner is tag and key not in keep]
+        for key in stale:
+            self._forget_request(key)
+        return len(stale)
+
+    def _forget_request(self, key: TileKey) -> None:
+        self._pending.discard(key)
+        self._tags.pop(key, None)
+        with self._claim_lock:
+            self._claimed.discard(key)
+
+    def _on_rendered(self, key: TileKey, image: QImage) -> None:
+        if key not in self._pending:
+            return
+        self._forget_request(key)
+        if image.isNull():
+            return
+        self._store(key, image)
+        self.tile_ready.emit(key.document, key.page)
+
+    # Presupuesto
+
+    @property
+    def budget_mb(self) -> float:
+        return self._budget / (1024 * 1024)
+
+    def set_budget_mb(self, budget_mb: float) -> None:
+        self._budget = int(budget_mb * 1024 * 1024)
+        self._evict()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _store(self, key: TileKey, image: QImage) -> None:
+        previous = self._tiles.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.sizeInBytes()
+            self._unindex(key)
+        self._tiles[key] = image
+        self._bytes += image.sizeInBytes()
+        buckets = self._levels.setdefault((key.document, key.page, key.rotation), {})
+        buckets[key.bucket] = buckets.get(key.bucket, 0) + 1
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self._budget and len(self._tiles) > 1:
+            key, image = self._tiles.popitem(last=False)
+            self._bytes -= image.sizeInBytes()
+            self._unindex(key)
+
+    def _unindex(self, key: TileKey) -> None:
+        level = (key.document, key.page, key.rotation)
+        buckets = self._levels.get(level)
+        if buckets is None or key.bucket not in buckets:
+            return
+        buckets[key.bucket] -= 1
+        if buckets[key.bucket] <= 0:
+            del buckets[key.bucket]
+            if not buckets:
+                del self._levels[level]
+
+    def clear(self) -> None:
+        self._pool.clear()
+        self._pending.clear()
+        self._tags.clear()
+        with self._claim_lock:
+            self._claimed.clear()
+        with self._render_lock:
+            pass
+        self._tiles.clear()
+        self._levels.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "tiles": len(self._tiles),
+            "size_mb": round(self._bytes / (1024 * 1024), 2),
+            "budget_mb": round(self.budget_mb, 2),
+            "pending": len(self._pending),
+            "prefetching": len(self._tags),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_tile_cache: Optional[PageTileCache] = None
+
+
+def get_tile_cache() -> PageTileCache:
+    """Instancia compartida; se crea al primer uso, cuando ya existe QApplication."""
+    global _tile_cache
+    if _tile_cache is None:
+        _tile_cache = PageTileCache()
+    return _tile_cache
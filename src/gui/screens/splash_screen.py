@@ -63,8 +63,7 @@ class AnimatedSplash(QSplashScreen):
         """Animación de pulso."""
         self._pulse += 0.1
         self._draw_content(self.pixmap())
-        self.repaint()
-        QApplication.processEvents()
+        self.update()
     
     def _draw_content(self, pixmap: QPixmap):
         """Dibuja el contenido del splash con gradientes y efectos."""
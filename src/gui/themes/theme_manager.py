@@ -286,6 +286,24 @@ class ThemeManager:
             }}
         """
 
+    def progress_bar_style(self) -> str:
+        """Reglas de QProgressBar con los colores del tema, para las hojas de estilo de los paneles."""
+        colors = self.colors
+        return f"""
+            QProgressBar {{
+                background-color: {colors['bg_tertiary']};
+                border: 1px solid {colors['border']};
+                border-radius: 6px;
+                color: {colors['fg_primary']};
+                text-align: center;
+                height: 18px;
+            }}
+            QProgressBar::chunk {{
+                background-color: {colors['accent']};
+                border-radius: 6px;
+            }}
+        """
+
     def get_palette(self):
         from PyQt6.QtGui import QPalette
         palette = QPalette()
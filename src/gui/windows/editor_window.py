@@ -2,16 +2,45 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFrame, QFileDialog, QSplitter, QLineEdit,
     QToolBar, QToolButton, QStatusBar, QDialog, QListWidget, QListWidgetItem,
-    QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect, QApplication, QCheckBox, QComboBox, QGridLayout
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QEvent, QMargins, QPoint, QRect
-from PyQt6.QtGui import QAction, QIcon, QKeySequence, QShortcut, QKeyEvent, QColor, QPainter, QPen, QBrush
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QEvent, QMargins, QPoint, QPointF, QRect, QRectF, QSize, QSizeF
+from PyQt6.QtGui import QAction, QIcon, QKeySequence, QShortcut, QKeyEvent, QColor, QPainter, QPen, QBrush, QPalette
 from PyQt6.QtPdf import QPdfDocument
 from PyQt6.QtPdfWidgets import QPdfView
 from pathlib import Path
 from typing import Optional, Dict, List, Callable
+import math
 
+from src.core.page_history import DEFAULT_HISTORY_MB, PageHistory
+from src.core.pdf_edit import SAVE_INCREMENTAL, PDFPageEditor
+from src.core.pdf_encrypt import (
+    ALL_PERMISSIONS,
+    OPERATION_DECRYPT,
+    OPERATION_ENCRYPT,
+    PDFEncryptor,
+    available_algorithms,
+    default_output_path,
+)
+from src.core.pdf_extract import PDFPageExtractor
+from src.core.pdf_images import IMAGE_EXTENSIONS, ImageToPDFConverter
+from src.core.pdf_text import PDFTextExtractor
 from src.gui.themes.theme_manager import theme_manager
+from src.gui.document_pool import get_document_pool
+from src.gui.page_organizer import PageOrganizer
+from src.gui.page_prefetcher import PagePrefetcher
+from src.gui.render_cache import (
+    TILE_SIZE,
+    TileKey,
+    get_tile_cache,
+    page_pixel_size,
+    tile_grid,
+    tile_rect,
+    zoom_bucket,
+)
+from src.gui.workers import TaskWorker
+from src.utils import trace
+from src.utils.app_settings import app_settings
 
 
 class WhichKeyPopup(QDialog):
@@ -136,24 +165,13 @@ class WhichKeyPopup(QDialog):
                 "Ctrl + Z": "Deshacer (Undo)",
                 "Ctrl + Y": "Rehacer (Redo)",
                 "Ctrl + S": "Guardar",
+                "Ctrl + Shift + S": "Guardar Optimizado (reescribe el archivo)",
+                "Ctrl + R": "Girar Página 90°",
+                "Ctrl + Shift + R": "Girar Página -90°",
                 "Ctrl + C": "Copiar",
                 "Ctrl + V": "Pegar",
                 "Ctrl + X": "Cortar",
-                "Delete": "Eliminar Selección",
-                "Ctrl + A": "Seleccionar Todo",
-                "Ctrl + D": "Duplicar Selección",
-                "Escape": "Salir del Modo Edición",
-                "Ctrl + E": "Modo Vista",
-            }
-        else:  # modo edición
-            shortcuts = {
-                "Ctrl + Z": "Deshacer (Undo)",
-                "Ctrl + Y": "Rehacer (Redo)",
-                "Ctrl + S": "Guardar",
-                "Ctrl + C": "Copiar",
-                "Ctrl + V": "Pegar",
-                "Ctrl + X": "Cortar",
-                "Delete": "Eliminar Selección",
+                "Delete": "Eliminar Página",
                 "Ctrl + A": "Seleccionar Todo",
                 "Ctrl + D": "Duplicar Selección",
                 "Escape": "Salir del Modo Edición",
@@ -241,12 +259,206 @@ class PDFViewerWidget(QPdfView):
     cut_requested = pyqtSignal()
     select_all_requested = pyqtSignal()
     delete_requested = pyqtSignal()
+    duplicate_requested = pyqtSignal()
     save_requested = pyqtSignal()
+    save_optimized_requested = pyqtSignal()
     switch_to_view_mode_requested = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self._rotation = 0
+        self._tile_cache = get_tile_cache()
+        self._tile_cache.tile_ready.connect(self._on_tile_ready)
+        self.prefetcher = PagePrefetcher(self)
+    
+    # ===== RENDER CON CACHÉ COMPARTIDA =====
+    # QPdfView mantiene el layout y las barras de desplazamiento; el pintado se hace aquí
+    # con teselas de la caché de la aplicación, compartidas entre todas las vistas.
+    
+    def _document_ready(self) -> bool:
+        document = self.document()
+        return document is not None and document.status() == QPdfDocument.Status.Ready and document.pageCount() > 0
+    
+    def page_geometries(self) -> Dict[int, QRect]:
+        """Geometría de cada página en coordenadas del documento (mismo cálculo que QPdfView)."""
+        if not self._document_ready():
+            return {}
+        margins = self.documentMargins()
+        spacing = self.pageSpacing()
+        viewport_size = self.viewport().size()
+        
+        if self.pageMode() == QPdfView.PageMode.SinglePage:
+            pages = [self.pageNavigator().currentPage()]
+        else:
+            pages = range(self.document().pageCount())
+        
+        sizes = {page: self.page_display_size(page) for page in pages}
+        total_width = max(size.width() for size in sizes.values()) + margins.left() + margins.right()
+        geometries = {}
+        y = margins.top()
+        for page, size in sizes.items():
+            x = (max(total_width, viewport_size.width()) - size.width()) // 2
+            geometries[page] = QRect(QPoint(x, y), size)
+            y += size.height() + spacing
+        return geometries
+    
+    def page_display_size(self, page: int) -> QSize:
+        """Tamaño en pantalla de una página con el modo de zoom actual."""
+        margins = self.documentMargins()
+        viewport_size = self.viewport().size()
+        resolution = self.screen().logicalDotsPerInch() / 72.0 if self.screen() else 96.0 / 72.0
+        base = (self.point_size(page) * resolution).toSize()
+        if self.zoomMode() == QPdfView.ZoomMode.FitToWidth:
+            factor = (viewport_size.width() - margins.left() - margins.right()) / max(1, base.width())
+            return base * factor
+        if self.zoomMode() == QPdfView.ZoomMode.FitInView:
+            available = QSize(
+                viewport_size.width() - margins.left() - margins.right(),
+                viewport_size.height() - self.pageSpacing(),
+            )
+            return base.scaled(available, Qt.AspectRatioMode.KeepAspectRatio)
+        return base * self.zoomFactor()
+    
+    def point_size(self, page: int) -> QSizeF:
+        """Tamaño de la página en puntos, de la tabla del pool si el documento viene de él."""
+        entry = get_document_pool().entry_for(self.document())
+        if entry is not None and 0 <= page < entry.page_count:
+            return entry.page_sizes[page]
+        return self.document().pagePointSize(page)
+    
+    def page_level(self, page: int, display_width: Optional[int] = None):
+        """Nivel de zoom de la caché y tamaño en píxeles de la página a ese nivel."""
+        point_size = self.point_size(page)
+        point_width = point_size.height() if self._rotation in (90, 270) else point_size.width()
+        if display_width is None:
+            display_width = self.page_display_size(page).width()
+        bucket = zoom_bucket(display_width / max(point_width, 1e-3) * self.viewport().devicePixelRatioF())
+        return bucket, page_pixel_size(point_size.width(), point_size.height(), bucket, self._rotation)
+    
+    @property
+    def rotation(self) -> int:
+        return self._rotation
+    
+    def visible_pages(self) -> List[int]:
+        visible = self._visible_rect()
+        return [page for page, geometry in self.page_geometries().items() if geometry.intersects(visible)]
+    
+    def _visible_rect(self) -> QRect:
+        return QRect(
+            self.horizontalScrollBar().value(),
+            self.verticalScrollBar().value(),
+            self.viewport().width(),
+            self.viewport().height(),
+        )
+    
+    def set_rotation(self, rotation: int):
+        self._rotation = rotation % 360
+        self.viewport().update()
+    
+    def paintEvent(self, event):
+        if not self._document_ready():
+            super().paintEvent(event)
+            return
+        
+        document = self.document()
+        document_key = self._tile_cache.document_key(document)
+        visible = self._visible_rect()
+        
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().brush(QPalette.ColorRole.Dark))
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.translate(-visible.x(), -visible.y())
+        
+        for page, geometry in self.page_geometries().items():
+            if not geometry.intersects(visible):
+                continue
+            painter.fillRect(geometry, Qt.GlobalColor.white)
+            self._paint_page(painter, document, document_key, page, geometry, visible)
+        painter.end()
+    
+    def _paint_page(self, painter: QPainter, document, document_key: int, page: int,
+                    geometry: QRect, visible: QRect):
+        point_size = self.point_size(page)
+        if point_size.isEmpty():
+            return
+        bucket, page_size = self.page_level(page, geometry.width())
+        scale = page_size.width() / geometry.width()
+        
+        region = geometry.intersected(visible).translated(-geometry.topLeft())
+        level_region = QRect(
+            int(region.x() * scale),
+            int(region.y() * scale),
+            math.ceil(region.width() * scale) + 1,
+            math.ceil(region.height() * scale) + 1,
+        )
+        
+        tiles = []
+        missing = []
+        for column, row in tile_grid(page_size, level_region):
+            key = TileKey(document_key, page, bucket, self._rotation, column, row)
+            image = self._tile_cache.get(key)
+            if image is None:
+                missing.append(key)
+            else:
+                tiles.append((key, image))
+        
+        if missing:
+            fallback = self._tile_cache.fallback_level(document_key, page, self._rotation, bucket)
+            if fallback is not None:
+                # Versión escalada de otro nivel mientras llega la nítida
+                self._paint_level(painter, document_key, page, fallback, point_size, geometry, region)
+            else:
+                self._tile_cache.request(document, self.preview_key(document_key, page, bucket), priority=2)
+            for key in missing:
+                self._tile_cache.request(document, key, priority=1)
+        
+        for key, image in tiles:
+            self._draw_tile(painter, key, image, page_size, geometry)
+    
+    def preview_key(self, document_key: int, page: int, bucket: int) -> TileKey:
+        """Tesela única de baja resolución que sirve de respaldo inmediato para la página."""
+        point_size = self.point_size(page)
+        # Un nivel por debajo del que cubre TILE_SIZE, para que la página quepa en una tesela
+        preview = min(bucket, zoom_bucket(TILE_SIZE / max(point_size.width(), point_size.height(), 1e-3)) - 1)
+        return TileKey(document_key, page, preview, self._rotation, 0, 0)
+    
+    def _paint_level(self, painter: QPainter, document_key: int, page: int, bucket: int,
+                     point_size, geometry: QRect, region: QRect):
+        page_size = page_pixel_size(point_size.width(), point_size.height(), bucket, self._rotation)
+        scale = page_size.width() / geometry.width()
+        level_region = QRect(
+            int(region.x() * scale),
+            int(region.y() * scale),
+            math.ceil(region.width() * scale) + 1,
+            math.ceil(region.height() * scale) + 1,
+        )
+        for column, row in tile_grid(page_size, level_region):
+            image = self._tile_cache.peek(TileKey(document_key, page, bucket, self._rotation, column, row))
+            if image is not None:
+                self._draw_tile(painter, None, image, page_size, geometry, column, row)
+    
+    def _draw_tile(self, painter: QPainter, key: Optional[TileKey], image, page_size: QSize,
+                   geometry: QRect, column: int = 0, row: int = 0):
+        if key is not None:
+            column, row = key.column, key.row
+        rect = tile_rect(page_size, column, row)
+        sx = geometry.width() / page_size.width()
+        sy = geometry.height() / page_size.height()
+        target = QRectF(
+            geometry.x() + rect.x() * sx,
+            geometry.y() + rect.y() * sy,
+            rect.width() * sx,
+            rect.height() * sy,
+        )
+        painter.drawImage(target, image, QRectF(image.rect()))
+    
+    def _on_tile_ready(self, document_key: int, page: int):
+        document = self.document()
+        if document is None or not self.isVisible():
+            return
+        if self._tile_cache.document_key(document) == document_key:
+            self.viewport().update()
     
     def keyPressEvent(self, event):
         """Handle key press events for zoom and navigation shortcuts."""
@@ -298,9 +510,9 @@ class PDFViewerWidget(QPdfView):
             self.search_requested.emit()
             return
         
-        # Ctrl + R (Rotate clockwise)
-        if modifiers == Qt.KeyboardModifier.ControlModifier and key == Qt.Key.Key_R:
-            if modifiers == Qt.KeyboardModifier.ShiftModifier:
+        # Ctrl + R (Rotate clockwise) / Ctrl + Shift + R (counter-clockwise)
+        if modifiers & Qt.KeyboardModifier.ControlModifier and key == Qt.Key.Key_R:
+            if modifiers & Qt.KeyboardModifier.ShiftModifier:
                 self.rotate_ccw_requested.emit()
             else:
                 self.rotate_cw_requested.emit()
@@ -385,11 +597,21 @@ class PDFViewerWidget(QPdfView):
             self.delete_requested.emit()
             return
         
+        # Ctrl + D (Duplicate)
+        if modifiers == Qt.KeyboardModifier.ControlModifier and key == Qt.Key.Key_D:
+            self.duplicate_requested.emit()
+            return
+        
         # Ctrl + S (Save)
         if modifiers == Qt.KeyboardModifier.ControlModifier and key == Qt.Key.Key_S:
             self.save_requested.emit()
             return
         
+        # Ctrl + Shift + S (Optimized save: full rewrite)
+        if modifiers == (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier) and key == Qt.Key.Key_S:
+            self.save_optimized_requested.emit()
+            return
+        
         # Ctrl + E (Switch to view mode)
         if modifiers == Qt.KeyboardModifier.ControlModifier and key == Qt.Key.Key_E:
             self.switch_to_view_mode_requested.emit()
@@ -458,9 +680,14 @@ class EditorWindow(QFrame):
         self._current_mode = self.MODE_READ  # Modo lectura por defecto
         self._current_page = 0
         self._zoom_level = 1.0
-        self._pdf_document = None  # QPdfDocument
+        self._pdf_document = None  # QPdfDocument compartido del pool
+        self._document_handle = None
         self._total_pages = 0
         
+        # Ediciones pendientes (páginas del documento tal como quedará al guardar) y su historial
+        self._history: Optional[PageHistory] = None
+        self._save_worker: Optional[TaskWorker] = None
+        
         # Cursor timer para restaurar cursor
         self._cursor_timer = QTimer()
         self._cursor_timer.timeout.connect(self._restore_cursor)
@@ -646,7 +873,7 @@ class EditorWindow(QFrame):
         dialog = QDialog(self)
         dialog.setObjectName("searchDialog")
         dialog.setWindowTitle("Buscar en Documento")
-        dialog.setFixedSize(400, 100)
+        dialog.setFixedSize(400, 320)
         
         layout = QVBoxLayout(dialog)
         
@@ -654,14 +881,64 @@ class EditorWindow(QFrame):
         search_input.setPlaceholderText("Buscar texto...")
         layout.addWidget(search_input)
         
+        # Las páginas con resultados se añaden según llegan, empezando por la actual
+        results_list = QListWidget()
+        layout.addWidget(results_list, 1)
+        
         buttons_layout = QHBoxLayout()
         search_btn = QPushButton("Buscar")
         close_btn = QPushButton("Cerrar")
         
+        search = {"worker": None}
+        
+        def on_match(match):
+            page, count = match
+            item = QListWidgetItem(f"Página {page + 1} — {count} coincidencia{'s' if count != 1 else ''}")
+            item.setData(Qt.ItemDataRole.UserRole, page)
+            results_list.addItem(item)
+            if results_list.count() == 1:
+                self._jump_to_page(page)
+        
+        def on_result(result):
+            success, error, matches = result
+            if not success:
+                self.status_label.setText(f"Error al buscar: {error}")
+            elif not matches:
+                self.status_label.setText(f"'{search_input.text()}' no aparece en el documento")
+            else:
+                total = sum(count for _, count in matches)
+                self.status_label.setText(f"{total} coincidencias en {len(matches)} páginas")
+        
         def search_text():
-            # QPdfView doesn't have built-in search, so we'll show a message
-            self.status_label.setText(f"Búsqueda: '{search_input.text()}' - Funcionalidad en desarrollo")
+            query = search_input.text().strip()
+            if not query or not self.current_file_path or self._pdf_document is None:
+                return
+            if search["worker"] is not None:
+                search["worker"].cancel()
+            results_list.clear()
+            self.status_label.setText(f"Buscando '{query}'...")
+            worker = TaskWorker(
+                PDFTextExtractor.find_text,
+                Path(self.current_file_path),
+                query,
+                start_page=self.pdf_view.pageNavigator().currentPage(),
+                partial_kwarg="match_callback",
+            )
+            worker.signals.partial.connect(on_match)
+            worker.signals.progress.connect(
+                lambda done, total: self.status_label.setText(f"Buscando '{query}'... {done}/{total} páginas")
+            )
+            worker.signals.result.connect(on_result)
+            search["worker"] = worker
+            worker.start()
         
+        def stop_search():
+            if search["worker"] is not None:
+                search["worker"].cancel()
+        
+        results_list.itemActivated.connect(lambda item: self._jump_to_page(item.data(Qt.ItemDataRole.UserRole)))
+        results_list.itemClicked.connect(lambda item: self._jump_to_page(item.data(Qt.ItemDataRole.UserRole)))
+        dialog.finished.connect(stop_search)
         search_btn.clicked.connect(search_text)
         close_btn.clicked.connect(dialog.close)
         
@@ -695,11 +972,146 @@ class EditorWindow(QFrame):
     
     def _on_rotate_cw(self):
         """Rotar página 90° clockwise."""
-        self.status_label.setText("Rotar 90° - Funcionalidad en desarrollo")
+        self._rotate_current_page(90)
     
     def _on_rotate_ccw(self):
         """Rotar página -90° counter-clockwise."""
-        self.status_label.setText("Rotar -90° - Funcionalidad en desarrollo")
+        self._rotate_current_page(-90)
+    
+    # ===== EDICIÓN DE PÁGINAS =====
+    # Las ediciones se acumulan en self._history y se aplican al guardar; hasta entonces la
+    # vista sigue mostrando el archivo guardado, así que las páginas se identifican por su
+    # índice en ese archivo.
+    
+    def _can_edit(self) -> bool:
+        if not self.current_file_path or self._history is None:
+            self.status_label.setText("Abra un PDF para editarlo")
+            return False
+        if self._current_mode != self.MODE_EDIT:
+            self.status_label.setText("Cambie al modo edición para modificar el documento")
+            return False
+        if self._save_worker is not None:
+            self.status_label.setText("Espere a que termine el guardado")
+            return False
+        return True
+    
+    def _history_changed(self, select: List[int] = ()):
+        """Actualiza el estado de cambios y el organizador tras operar sobre el historial."""
+        if self._history.modified:
+            self.mark_as_modified()
+        else:
+            self.mark_as_saved()
+        self.page_organizer.refresh(select)
+    
+    def _rotate_current_page(self, degrees: int):
+        if not self._can_edit():
+            return
+        page = self.pdf_view.pageNavigator().currentPage()
+        position = self._history.position_of(page)
+        if position is None:
+            self.status_label.setText(f"La página {page + 1} está marcada para eliminar")
+            return
+        self._history.rotate([position], degrees)
+        self._history_changed()
+        self.status_label.setText(f"Página {page + 1} girada {degrees}° (sin guardar)")
+    
+    def _on_duplicate(self):
+        """Duplicar la página actual a continuación de sí misma."""
+        if not self._can_edit():
+            return
+        page = self.pdf_view.pageNavigator().currentPage()
+        position = self._history.position_of(page)
+        if position is None:
+            self.status_label.setText(f"La página {page + 1} está marcada para eliminar")
+            return
+        self._history.duplicate([position])
+        self._history_changed()
+        self.status_label.setText(f"Página {page + 1} duplicada (sin guardar)")
+    
+    # Operaciones del organizador: llegan como posiciones en la lista pendiente
+    
+    def _on_organizer_move(self, positions: List[int], target: int):
+        if not self._can_edit():
+            return
+        self._history.move(positions, target)
+        self._history_changed(list(range(target, target + len(positions))))
+        self.status_label.setText(f"{self._pages_text(len(positions), 'movida')} (sin guardar)")
+    
+    def _on_organizer_rotate(self, positions: List[int], degrees: int):
+        if not self._can_edit():
+            return
+        self._history.rotate(positions, degrees)
+        self._history_changed(positions)
+        self.status_label.setText(f"{self._pages_text(len(positions), 'girada')} {degrees}° (sin guardar)")
+    
+    def _on_organizer_duplicate(self, positions: List[int]):
+        if not self._can_edit():
+            return
+        operation = self._history.duplicate(positions)
+        self._history_changed(list(range(operation.position, operation.position + len(positions))))
+        self.status_label.setText(f"{self._pages_text(len(positions), 'duplicada')} (sin guardar)")
+    
+    def _on_organizer_delete(self, positions: List[int]):
+        if not self._can_edit():
+            return
+        try:
+            self._history.delete(positions)
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        self._history_changed([min(positions[0], len(self._history) - 1)])
+        self.status_label.setText(f"{self._pages_text(len(positions), 'eliminada')} (sin guardar)")
+    
+    def _on_organizer_extract(self, positions: List[int]):
+        """Guarda las páginas seleccionadas del archivo en un PDF nuevo, sin tocar el documento."""
+        if not app_settings.get("modules.extract", True):
+            self.status_label.setText("El módulo de extracción está desactivado en Configuración")
+            return
+        if not self.current_file_path or self._history is None:
+            return
+        if self._has_unsaved_changes:
+            self.status_label.setText("Guarde los cambios antes de extraer páginas")
+            return
+        input_path = Path(self.current_file_path)
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Extraer páginas", str(input_path.with_suffix(".extracted.pdf")), "PDF Files (*.pdf)"
+        )
+        if not output_path:
+            return
+        if Path(output_path).resolve() == input_path.resolve():
+            self.status_label.setText("Elija un archivo distinto del original")
+            return
+        pages = ", ".join(str(self._history[position][0] + 1) for position in positions)
+        worker = TaskWorker(PDFPageExtractor.extract, input_path, Path(output_path), pages)
+        worker.signals.result.connect(lambda result: self._on_extract_result(result, output_path))
+        worker.signals.error.connect(lambda error: self._on_extract_result((False, error, None), output_path))
+        self.status_label.setText(f"Extrayendo {self._pages_text(len(positions))}...")
+        worker.start()
+    
+    def _on_extract_result(self, result, output_path: str):
+        success, error, report = result
+        if success:
+            self.status_label.setText(
+                f"{self._pages_text(report.pages, 'extraída')} en {Path(output_path).name} "
+                f"({report.output_size // 1024} KB)"
+            )
+        else:
+            self.status_label.setText(f"Error: {error}")
+    
+    def _on_organizer_page(self, source: int):
+        """Muestra en el visor la página del archivo guardado que corresponde a la miniatura."""
+        self._jump_to_page(source)
+    
+    def _jump_to_page(self, page: int):
+        if self._pdf_document is not None and 0 <= page < self._total_pages:
+            self.pdf_view.pageNavigator().jump(page, QPointF(), self.pdf_view.zoomFactor())
+    
+    @staticmethod
+    def _pages_text(count: int, participle: str = "") -> str:
+        """'1 página movida', '3 páginas movidas': participle en femenino singular."""
+        if count == 1:
+            return f"1 página {participle}".rstrip()
+        return f"{count} páginas {participle}s" if participle else f"{count} páginas"
     
     def _on_toggle_fullscreen(self):
         """Alternar pantalla completa."""
@@ -742,16 +1154,50 @@ class EditorWindow(QFrame):
     
     # Edit mode handlers
     def _on_undo(self):
-        """Deshacer."""
-        self.status_label.setText("Deshacer - Funcionalidad en desarrollo")
+        """Deshacer la última edición de páginas."""
+        if not self._can_edit():
+            return
+        operation = self._history.undo()
+        if operation is None:
+            self.status_label.setText("No hay nada que deshacer")
+            return
+        self._history_changed()
+        self.status_label.setText(f"Deshecho: {operation.description}")
     
     def _on_redo(self):
-        """Rehacer."""
-        self.status_label.setText("Rehacer - Funcionalidad en desarrollo")
+        """Rehacer la última edición deshecha."""
+        if not self._can_edit():
+            return
+        operation = self._history.redo()
+        if operation is None:
+            self.status_label.setText("No hay nada que rehacer")
+            return
+        self._history_changed()
+        self.status_label.setText(f"Rehecho: {operation.description}")
     
     def _on_copy(self):
-        """Copiar."""
-        self.status_label.setText("Copiar - Funcionalidad en desarrollo")
+        """Copiar al portapapeles el texto de la página actual."""
+        if not self.current_file_path or self._pdf_document is None:
+            self.status_label.setText("Abra un PDF para copiar su texto")
+            return
+        page = self.pdf_view.pageNavigator().currentPage()
+        # Solo se extrae esta página (o se lee de la caché), sin esperar a las anteriores
+        worker = TaskWorker(PDFTextExtractor.extract, Path(self.current_file_path), pages=[page])
+        worker.signals.result.connect(lambda result: self._on_copy_result(page, result))
+        self.status_label.setText(f"Copiando el texto de la página {page + 1}...")
+        worker.start()
+    
+    def _on_copy_result(self, page: int, result):
+        success, error, texts = result
+        if not success:
+            self.status_label.setText(f"Error al copiar: {error}")
+            return
+        text = texts.get(page, "")
+        if not text.strip():
+            self.status_label.setText(f"La página {page + 1} no tiene texto que copiar")
+            return
+        QApplication.clipboard().setText(text)
+        self.status_label.setText(f"Texto de la página {page + 1} copiado ({len(text)} caracteres)")
     
     def _on_paste(self):
         """Pegar."""
@@ -766,8 +1212,21 @@ class EditorWindow(QFrame):
         self.status_label.setText("Seleccionar todo - Funcionalidad en desarrollo")
     
     def _on_delete(self):
-        """Eliminar."""
-        self.status_label.setText("Eliminar - Funcionalidad en desarrollo")
+        """Eliminar la página actual."""
+        if not self._can_edit():
+            return
+        page = self.pdf_view.pageNavigator().currentPage()
+        position = self._history.position_of(page)
+        if position is None:
+            self.status_label.setText(f"La página {page + 1} ya está marcada para eliminar")
+            return
+        try:
+            self._history.delete([position])
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        self._history_changed()
+        self.status_label.setText(f"Página {page + 1} eliminada (sin guardar)")
     
     # ===== SPLIT METHODS =====
     def _on_split_horizontal(self):
@@ -994,8 +1453,7 @@ class EditorWindow(QFrame):
             key = event.key()
             modifiers = event.modifiers()
             
-            # Debug: print key press
-            print(f"[EditorWindow eventFilter] Key: {key}, Modifiers: {modifiers}")
+            trace.keyboard("EditorWindow eventFilter: tecla %s, modificadores %s", key, modifiers)
             
             # Ctrl + = o Ctrl + + (acercar)
             if modifiers == Qt.KeyboardModifier.ControlModifier and (key == Qt.Key.Key_Equal or key == Qt.Key.Key_Plus):
@@ -1053,13 +1511,19 @@ class EditorWindow(QFrame):
         try:
             self.current_file_path = file_path
             
-            # Cargar el PDF en el documento
-            self._pdf_document.load(file_path)
+            # Tomar el documento del pool (ya analizado si otro editor lo tiene abierto)
+            self._set_document(get_document_pool().acquire(file_path))
             
             # Verificar que se cargó correctamente
             if self._pdf_document.status() == QPdfDocument.Status.Ready:
-                self._total_pages = self._pdf_document.pageCount()
+                self._total_pages = self._document_handle.page_count
                 self._current_page = 0
+                self._history = PageHistory(
+                    self._total_pages,
+                    budget_mb=app_settings.get("editor.history_mb", DEFAULT_HISTORY_MB),
+                )
+                self.page_organizer.set_document(self._pdf_document, self._history)
+                self.mark_as_saved()
                 
                 # Ocultar label de info, mostrar visor PDF
                 self.info_label.setVisible(False)
@@ -1149,6 +1613,9 @@ class EditorWindow(QFrame):
         self.left_panel = self._create_left_panel()
         content_splitter.addWidget(self.left_panel)
         
+        self.page_organizer = self._create_page_organizer()
+        content_splitter.addWidget(self.page_organizer)
+        
         center_container = QWidget()
         self.center_layout = QVBoxLayout(center_container)
         self.center_layout.setContentsMargins(0, 0, 0, 0)
@@ -1158,17 +1625,30 @@ class EditorWindow(QFrame):
         self.center_layout.addWidget(self.center_panel, 8)
         
         self.bottom_panel = self._create_bottom_panel()
-        center_layout.addWidget(self.bottom_panel, 1)
+        self.center_layout.addWidget(self.bottom_panel, 1)
         
         content_splitter.addWidget(center_container)
         
         self.right_panel = self._create_right_panel()
         content_splitter.addWidget(self.right_panel)
         
-        content_splitter.setSizes([60, 800, 60])
+        content_splitter.setSizes([60, 280, 800, 60])
         
         main_layout.addWidget(content_splitter, 1)
     
+    def _create_page_organizer(self):
+        organizer = PageOrganizer()
+        organizer.setVisible(False)
+        organizer.page_activated.connect(self._on_organizer_page)
+        organizer.move_requested.connect(self._on_organizer_move)
+        organizer.rotate_requested.connect(self._on_organizer_rotate)
+        organizer.duplicate_requested.connect(self._on_organizer_duplicate)
+        organizer.delete_requested.connect(self._on_organizer_delete)
+        organizer.extract_requested.connect(self._on_organizer_extract)
+        organizer.undo_requested.connect(self._on_undo)
+        organizer.redo_requested.connect(self._on_redo)
+        return organizer
+    
     def _create_left_panel(self):
         panel = QFrame()
         panel.setFixedWidth(60)
@@ -1271,7 +1751,9 @@ class EditorWindow(QFrame):
         file_section = self._create_ribbon_section("Archivo", [
             ("⊞", "Nuevo", self._new_document),
             ("📂", "Abrir", self._open_pdf),
+            ("🖼", "Desde imágenes", self._images_to_pdf),
             ("💾", "Guardar", self._save_pdf),
+            ("🗜", "Guardar optimizado", self._save_pdf_optimized),
             ("⤓", "Exportar", self._export_pdf),
         ])
         ribbon_layout.addWidget(file_section)
@@ -1383,7 +1865,9 @@ class EditorWindow(QFrame):
         self.pdf_view.cut_requested.connect(self._on_cut)
         self.pdf_view.select_all_requested.connect(self._on_select_all)
         self.pdf_view.delete_requested.connect(self._on_delete)
+        self.pdf_view.duplicate_requested.connect(self._on_duplicate)
         self.pdf_view.save_requested.connect(self._save_pdf)
+        self.pdf_view.save_optimized_requested.connect(self._save_pdf_optimized)
         self.pdf_view.switch_to_view_mode_requested.connect(self.set_mode_read)
         
         # Split/Window signals
@@ -1397,13 +1881,6 @@ class EditorWindow(QFrame):
         self._splits: List[PDFViewerWidget] = []
         self._current_split_index = 0
         
-        # Crear documento PDF
-        self._pdf_document = QPdfDocument(self.pdf_view)
-        self.pdf_view.setDocument(self._pdf_document)
-        
-        # Conectar señales de navegación
-        self._pdf_document.statusChanged.connect(self._on_pdf_loaded)
-        
         # Ocultar info label inicialmente
         self.info_label = QLabel("Seleccione un archivo PDF para comenzar a trabajar")
         self.info_label.setObjectName("editorInfo")
@@ -1417,12 +1894,21 @@ class EditorWindow(QFrame):
         
         return panel
     
-    def _on_pdf_loaded(self):
-        """Se ejecuta cuando el PDF se carga correctamente."""
-        if self._pdf_document.status() == QPdfDocument.Status.Ready:
-            self._total_pages = self._pdf_document.pageCount()
-            self.page_info_label.setText(f"Páginas: {self._total_pages}")
-            self.status_label.setText(f"PDF cargado: {self._total_pages} páginas")
+    def _set_document(self, handle):
+        """Muestra en todas las vistas el documento del pool y suelta el anterior."""
+        previous = self._document_handle
+        self._document_handle = handle
+        self._pdf_document = handle.document if handle is not None else None
+        for viewer in [self.pdf_view] + self._splits:
+            viewer.setDocument(self._pdf_document)
+        if self._pdf_document is None:
+            self.page_organizer.set_document(None, None)
+        if previous is not None:
+            get_document_pool().release(previous)
+    
+    def release_resources(self):
+        """Devuelve el documento al pool antes de cerrar."""
+        self._set_document(None)
     
     def _create_bottom_panel(self):
         panel = QFrame()
@@ -1474,6 +1960,7 @@ class EditorWindow(QFrame):
         btn_rotate.setFixedSize(50, 40)
         btn_rotate.setToolTip("Rotar")
         btn_rotate.setStyleSheet("font-size: 18px;")
+        btn_rotate.clicked.connect(self._on_rotate_cw)
         
         btn_tools = QPushButton("⚙")
         btn_tools.setFixedSize(50, 40)
@@ -1500,6 +1987,36 @@ class EditorWindow(QFrame):
         if file_path:
             self.load_pdf(file_path)
     
+    def _images_to_pdf(self):
+        """Crea un PDF con las imágenes de una carpeta y lo abre."""
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta de imágenes", "")
+        if not folder:
+            return
+        self.status_label.setText("Creando PDF desde imágenes...")
+        worker = TaskWorker(
+            ImageToPDFConverter.convert_folder,
+            Path(folder),
+            extensions=app_settings.get("supported_files.images_to_pdf", list(IMAGE_EXTENSIONS)),
+            linearize=app_settings.get("output.linearize", False),
+        )
+        worker.signals.progress.connect(
+            lambda current, total: self.status_label.setText(f"Creando PDF desde imágenes: {current} de {total}...")
+        )
+        worker.signals.result.connect(lambda result: self._on_images_result(Path(folder), result))
+        worker.signals.error.connect(lambda error: self._on_images_result(Path(folder), (False, error, None)))
+        worker.start()
+    
+    def _on_images_result(self, folder: Path, result):
+        success, error, report = result
+        if not success:
+            self.status_label.setText(f"Error al crear el PDF: {error}")
+            return
+        self.load_pdf(str(folder.parent / f"{folder.name}.pdf"))
+        message = f"PDF creado con {report.pages} páginas"
+        if report.skipped:
+            message += f" ({len(report.skipped)} imágenes omitidas)"
+        self.status_label.setText(message)
+    
     def load_file(self, file_path: str):
         """Carga un archivo PDF desde una ruta."""
         self.document_type = "file"
@@ -1516,7 +2033,68 @@ class EditorWindow(QFrame):
         self.mark_as_modified()
     
     def _save_pdf(self):
-        self.status_label.setText("Guardando...")
+        """Guarda las ediciones como actualización incremental: solo se añade lo que cambia."""
+        self._start_save(optimize=False)
+    
+    def _save_pdf_optimized(self):
+        """Reescribe el archivo completo, sin las versiones anteriores de los objetos."""
+        self._start_save(optimize=True)
+    
+    def _start_save(self, optimize: bool):
+        if not self.current_file_path or self._history is None:
+            self.status_label.setText("No hay ningún PDF abierto para guardar")
+            return
+        if self._save_worker is not None:
+            return
+        if not optimize and not self._has_unsaved_changes:
+            self.status_label.setText("No hay cambios que guardar")
+            return
+        
+        pool = get_document_pool()
+        if optimize and pool.references(self.current_file_path) > 1:
+            self.status_label.setText("El archivo está abierto en otra ventana: ciérrela para guardar optimizado")
+            return
+        
+        self._saved_mode = self._current_mode
+        self._saved_page = self.pdf_view.pageNavigator().currentPage()
+        if optimize:
+            # El archivo se sustituye: ni las vistas ni el pool pueden seguir teniéndolo abierto
+            self._set_document(None)
+            pool.close_path(self.current_file_path)
+        self.status_label.setText("Guardando (optimizado)..." if optimize else "Guardando...")
+        self._save_worker = TaskWorker(
+            PDFPageEditor.save,
+            Path(self.current_file_path),
+            list(self._history.pages),
+            optimize=optimize,
+            linearize=optimize and app_settings.get("output.linearize", False),
+        )
+        self._save_worker.signals.result.connect(self._on_save_result)
+        self._save_worker.signals.error.connect(lambda error: self._on_save_result((False, error, None)))
+        self._save_worker.start()
+    
+    def _on_save_result(self, result):
+        success, error, report = result
+        self._save_worker = None
+        pending = self._history
+        # Se recarga el archivo guardado (o el que había, si el guardado falló)
+        self.load_pdf(self.current_file_path)
+        self.mode = self._saved_mode
+        if not success:
+            # El archivo no cambió: se conservan las ediciones y su historial
+            self._history = pending
+            self.page_organizer.set_document(self._pdf_document, self._history)
+            self._history_changed()
+            self.status_label.setText(f"Error al guardar: {error}")
+            return
+        
+        page = min(self._saved_page, self._total_pages - 1)
+        if page > 0:
+            self.pdf_view.pageNavigator().jump(page, QPointF(), self.pdf_view.zoomFactor())
+        if report.mode == SAVE_INCREMENTAL:
+            self.status_label.setText(f"Guardado: {report.bytes_written / 1024:.1f} KB añadidos")
+        else:
+            self.status_label.setText(f"Guardado optimizado: {report.file_size / (1024 * 1024):.1f} MB")
     
     def _export_pdf(self):
         self.status_label.setText("Exportando...")
@@ -1525,16 +2103,16 @@ class EditorWindow(QFrame):
         self.status_label.setText("Cortando...")
     
     def _copy(self):
-        self.status_label.setText("Copiando...")
+        self._on_copy()
     
     def _paste(self):
         self.status_label.setText("Pegando...")
     
     def _undo(self):
-        self.status_label.setText("Deshacer")
+        self._on_undo()
     
     def _redo(self):
-        self.status_label.setText("Rehacer")
+        self._on_redo()
     
     def _zoom_in(self):
         self.status_label.setText("Acercar")
@@ -1552,10 +2130,148 @@ class EditorWindow(QFrame):
         self.status_label.setText("Reparando PDF...")
     
     def _organize(self):
-        self.status_label.setText("Organizar páginas")
+        """Muestra u oculta el organizador de páginas; organizar implica pasar al modo edición."""
+        visible = not self.page_organizer.isVisible()
+        self.page_organizer.setVisible(visible)
+        if not visible:
+            self.status_label.setText("Organizador de páginas oculto")
+            return
+        if self._current_mode != self.MODE_EDIT:
+            self.set_mode_edit()
+        self.page_organizer.setFocus()
+        self.status_label.setText(
+            "Organizar páginas: arrastre para mover, Supr elimina, Ctrl+D duplica, Ctrl+R gira"
+        )
     
     def _protect(self):
-        self.status_label.setText("Proteger PDF")
+        if not app_settings.get("modules.encrypt", True):
+            self.status_label.setText("El módulo de cifrado está desactivado en Configuración")
+            return
+        if not self.current_file_path:
+            self.status_label.setText("No hay ningún PDF abierto para proteger")
+            return
+        if self._has_unsaved_changes:
+            self.status_label.setText("Guarde los cambios antes de proteger el documento")
+            return
+        self._show_protect_dialog()
+    
+    def _show_protect_dialog(self):
+        """Cifrar el documento, cambiar sus permisos o quitarle la protección; el resultado se guarda aparte."""
+        dialog = QDialog(self)
+        dialog.setObjectName("protectDialog")
+        dialog.setWindowTitle("Proteger PDF")
+        dialog.setFixedWidth(420)
+        
+        layout = QVBoxLayout(dialog)
+        
+        def password_input(placeholder: str) -> QLineEdit:
+            field = QLineEdit()
+            field.setEchoMode(QLineEdit.EchoMode.Password)
+            field.setPlaceholderText(placeholder)
+            layout.addWidget(field)
+            return field
+        
+        user_input = password_input("Contraseña para abrir (opcional)")
+        owner_input = password_input("Contraseña de propietario (sin restricciones)")
+        current_input = password_input("Contraseña actual, si el archivo ya está protegido")
+        
+        algorithm_combo = QComboBox()
+        for algorithm in available_algorithms():
+            algorithm_combo.addItem(algorithm)
+        layout.addWidget(algorithm_combo)
+        
+        permission_labels = {
+            "print": "Imprimir",
+            "modify": "Modificar",
+            "copy": "Copiar texto e imágenes",
+            "annotate": "Comentar",
+            "forms": "Rellenar formularios",
+            "assemble": "Organizar páginas",
+        }
+        grid = QGridLayout()
+        checks = {}
+        for index, name in enumerate(ALL_PERMISSIONS):
+            checks[name] = QCheckBox(permission_labels[name])
+            checks[name].setChecked(True)
+            grid.addWidget(checks[name], index // 2, index % 2)
+        layout.addLayout(grid)
+        
+        buttons_layout = QHBoxLayout()
+        protect_btn = QPushButton("Proteger")
+        unlock_btn = QPushButton("Quitar protección")
+        close_btn = QPushButton("Cancelar")
+        
+        def run(operation: str):
+            input_path = Path(self.current_file_path)
+            if operation == OPERATION_ENCRYPT and not (user_input.text() or owner_input.text()):
+                self.status_label.setText("Indique al menos una contraseña")
+                return
+            output_path, _ = QFileDialog.getSaveFileName(
+                self, "Guardar PDF", str(default_output_path(input_path, operation)), "PDF Files (*.pdf)"
+            )
+            if not output_path:
+                return
+            if Path(output_path).resolve() == input_path.resolve():
+                self.status_label.setText("Elija un archivo distinto del original")
+                return
+            if operation == OPERATION_ENCRYPT:
+                worker = TaskWorker(
+                    PDFEncryptor.encrypt,
+                    input_path,
+                    Path(output_path),
+                    user_password=user_input.text(),
+                    owner_password=owner_input.text() or None,
+                    permissions=[name for name, check in checks.items() if check.isChecked()],
+                    algorithm=algorithm_combo.currentText(),
+                    password=current_input.text(),
+                )
+                self.status_label.setText("Cifrando...")
+            else:
+                worker = TaskWorker(PDFEncryptor.decrypt, input_path, Path(output_path), password=current_input.text())
+                self.status_label.setText("Quitando la protección...")
+            worker.signals.result.connect(self._on_protect_result)
+            worker.signals.error.connect(lambda error: self._on_protect_result((False, error, None)))
+            worker.start()
+            dialog.accept()
+        
+        protect_btn.clicked.connect(lambda: run(OPERATION_ENCRYPT))
+        unlock_btn.clicked.connect(lambda: run(OPERATION_DECRYPT))
+        close_btn.clicked.connect(dialog.close)
+        
+        buttons_layout.addWidget(protect_btn)
+        buttons_layout.addWidget(unlock_btn)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+        
+        colors = theme_manager.colors
+        dialog.setStyleSheet(f"""
+            QDialog {{ background-color: {colors['bg_primary']}; }}
+            QCheckBox {{ color: {colors['fg_primary']}; }}
+            QLineEdit, QComboBox {{ 
+                background-color: {colors['bg_secondary']}; 
+                color: {colors['fg_primary']};
+                border: 1px solid {colors['border']};
+                padding: 8px;
+                border-radius: 4px;
+            }}
+            QPushButton {{ 
+                background-color: {colors['accent']}; 
+                color: white; 
+                border: none; 
+                padding: 8px 16px; 
+                border-radius: 4px;
+            }}
+        """)
+        dialog.exec()
+    
+    def _on_protect_result(self, result):
+        success, error, report = result
+        if not success:
+            self.status_label.setText(f"Error: {error}")
+        elif report.operation == OPERATION_ENCRYPT:
+            self.status_label.setText(f"PDF protegido ({report.algorithm}): {Path(report.output_path).name}")
+        else:
+            self.status_label.setText(f"Protección quitada: {Path(report.output_path).name}")
     
     def _apply_style(self):
         colors = theme_manager.colors
@@ -1918,11 +2634,14 @@ class EditorWindowContainer(QDialog):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
+                self.editor.release_resources()
                 event.accept()
                 self.close_requested.emit()
             else:
                 event.ignore()
         else:
+            if self.editor:
+                self.editor.release_resources()
             event.accept()
             self.close_requested.emit()
     
@@ -81,16 +81,16 @@ class MainWindow(QMainWindow):
         self.sidebar.open_account.connect(self._show_account)
     
     def _open_editor_window(self, document_type: str = "blank"):
-        logger.action(f"Solicitando abrir editor - tipo: {document_type}")
+        logger.action("Solicitando abrir editor - tipo: %s", document_type)
         window_manager.push_window("main")
         window_manager.show_editor(document_type=document_type)
     
     def _show_settings(self):
-        logger.nav(f"Mostrando panel de Configuración")
+        logger.nav("Mostrando panel de Configuración")
         self.content_stack.setCurrentWidget(self.settings_panel)
     
     def _show_account(self):
-        logger.nav(f"Mostrando panel de Cuenta")
+        logger.nav("Mostrando panel de Cuenta")
         self.content_stack.setCurrentWidget(self.account_panel)
 
     def _create_title_bar(self):
@@ -158,12 +158,12 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(content_container)
     
     def _open_file_in_editor(self, file_path: str):
-        logger.file(f"Abriendo archivo en editor: {file_path}")
+        logger.file("Abriendo archivo en editor: %s", file_path)
         window_manager.push_window("main")
         window_manager.show_editor(document_type="file", file_path=file_path)
     
     def _open_template_in_editor(self, template_name: str):
-        logger.file(f"Abriendo plantilla en editor: {template_name}")
+        logger.file("Abriendo plantilla en editor: %s", template_name)
         window_manager.push_window("main")
         window_manager.show_editor(document_type="blank")
 
@@ -86,7 +86,7 @@ class WindowManager(QObject):
         from src.gui.windows.main_window import MainWindow
         from src.gui.themes.theme_manager import theme_manager
         
-        logger.nav(f"Creando splash screen ({duration_ms}ms)")
+        logger.nav("Creando splash screen (%sms)", duration_ms)
         
         splash = SplashScreen()
         splash.show()
@@ -94,13 +94,13 @@ class WindowManager(QObject):
         if self._app:
             self._app.processEvents()
         
-        logger.nav(f"Creando MainWindow en background")
+        logger.nav("Creando MainWindow en background")
         self._main_window = MainWindow()
         
         def finish_splash():
             splash.finish(self._main_window)
             self._main_window.showMaximized()
-            logger.nav(f"Splash terminado, mostrando MainWindow")
+            logger.nav("Splash terminado, mostrando MainWindow")
             self.window_changed.emit("main")
             self.window_opened.emit("main", {})
         
@@ -116,11 +116,11 @@ class WindowManager(QObject):
         from src.gui.windows.main_window import MainWindow
         from src.gui.themes.theme_manager import theme_manager
         
-        logger.nav(f"Mostrando MainWindow")
+        logger.nav("Mostrando MainWindow")
         
         if self._main_window is not None:
             if hasattr(self._main_window, 'close'):
-                logger.nav(f"Cerrando MainWindow anterior")
+                logger.nav("Cerrando MainWindow anterior")
                 self._main_window.close()
         
         self._main_window = MainWindow(**kwargs)
@@ -143,12 +143,12 @@ class WindowManager(QObject):
         from src.gui.themes.theme_manager import theme_manager
         
         if file_path:
-            logger.nav(f"Abriendo EditorWindowContainer - tipo: {document_type}, archivo: {file_path}")
+            logger.nav("Abriendo EditorWindowContainer - tipo: %s, archivo: %s", document_type, file_path)
         else:
-            logger.nav(f"Abriendo EditorWindowContainer - tipo: {document_type}")
+            logger.nav("Abriendo EditorWindowContainer - tipo: %s", document_type)
         
         if self._main_window and self._main_window.isVisible():
-            logger.nav(f"Ocultando MainWindow")
+            logger.nav("Ocultando MainWindow")
             self._main_window.hide()
         
         self._editor_window = EditorWindowContainer(
@@ -161,7 +161,7 @@ class WindowManager(QObject):
         self._editor_window.close_requested.connect(self._on_editor_close_requested)
         self._editor_window.showMaximized()
         
-        logger.nav(f"EditorWindowContainer mostrado")
+        logger.nav("EditorWindowContainer mostrado")
         
         theme_manager.emit_change()
         
@@ -179,7 +179,7 @@ class WindowManager(QObject):
         Args:
             create_new_main: Si True, crea una nueva instancia de MainWindow
         """
-        logger.nav(f"Cerrando EditorWindowContainer")
+        logger.nav("Cerrando EditorWindowContainer")
         
         if self._editor_window is not None:
             self._editor_window.close()
@@ -189,7 +189,7 @@ class WindowManager(QObject):
             self.window_closed.emit("editor")
         
         if create_new_main:
-            logger.nav(f"Creando nueva MainWindow")
+            logger.nav("Creando nueva MainWindow")
             self.show_main()
         elif self._main_window:
             self._main_window.showMaximized()
@@ -203,7 +203,7 @@ class WindowManager(QObject):
             window_type: Tipo de ventana ("main", "editor", "splash")
             **kwargs: Argumentos para la ventana
         """
-        logger.nav(f"Navegando a: {window_type}")
+        logger.nav("Navegando a: %s", window_type)
         
         if window_type == "main":
             self.show_main(**kwargs)
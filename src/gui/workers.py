@@ -0,0 +1,159 @@
+"""
+Ejecución de tareas largas fuera del hilo de la interfaz.
+TaskWorker envuelve una función de src.core y publica progreso, resultado y errores por señales Qt.
+JobTask hace lo mismo con un trabajo de la cola persistente (JobAgent).
+Una tarea iniciada se mantiene viva hasta que termina, aunque quien la lanzó ya la haya soltado.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.orchestration import Action, AgentType, Message, orchestrator
+
+
+class WorkerSignals(QObject):
+    """Señales de un TaskWorker; se entregan en el hilo de la interfaz."""
+
+    progress = pyqtSignal(int, int)
+    partial = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class TaskWorker(QRunnable):
+    """
+    Ejecuta fn(*args, progress_callback=..., cancel_event=..., **kwargs) en el QThreadPool global.
+    La función debe consultar cancel_event para detenerse de forma cooperativa. Si se indica
+    partial_kwarg, fn recibe con ese nombre un callback que publica resultados parciales por
+    signals.partial según los va produciendo.
+    """
+
+    # El QThreadPool no guarda referencia al objeto Python: sin esto, un runnable soltado
+    # (panel cerrado, tarea reemplazada) podría destruirse mientras run() sigue en marcha
+    _running: Set["TaskWorker"] = set()
+
+    def __init__(self, fn: Callable[..., Any], *args, partial_kwarg: Optional[str] = None, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        if partial_kwarg:
+            self.kwargs[partial_kwarg] = self._report_partial
+        self.signals = WorkerSignals()
+        self.cancel_event = threading.Event()
+        self.setAutoDelete(False)
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def _report_progress(self, current: int, total: int) -> None:
+        self.signals.progress.emit(current, total)
+
+    def _report_partial(self, item: Any) -> None:
+        self.signals.partial.emit(item)
+
+    def run(self) -> None:
+        try:
+            result = self.fn(
+                *self.args,
+                progress_callback=self._report_progress,
+                cancel_event=self.cancel_event,
+                **self.kwargs,
+            )
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            if self.cancel_event.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+    def start(self, pool: Optional[QThreadPool] = None) -> "TaskWorker":
+        TaskWorker._running.add(self)
+        self.signals.finished.connect(lambda: TaskWorker._running.discard(self))
+        (pool or QThreadPool.globalInstance()).start(self)
+        return self
+
+
+class JobTask(QObject):
+    """
+    Envía un trabajo a la cola (Action.JOB_SUBMIT) y traduce sus eventos a las mismas señales
+    que TaskWorker: job:progress a signals.progress (en centésimas), el resultado del trabajo
+    a signals.result y su error a signals.error. El trabajo corre en los hilos de la cola,
+    queda registrado en el almacén y sobrevive a un cierre de la aplicación.
+    """
+
+    _EVENTS = (Action.JOB_PROGRESS, Action.JOB_COMPLETED, Action.JOB_FAILED, Action.JOB_CANCELLED)
+    _running: Set["JobTask"] = set()
+
+    def __init__(self, kind: str, payload: Dict[str, Any]):
+        super().__init__()
+        self.kind = kind
+        self.payload = payload
+        self.job_id: Optional[str] = None
+        self.signals = WorkerSignals()
+        self._lock = threading.Lock()
+        self._early: List[Message] = []
+        self._done = False
+
+    def start(self) -> "JobTask":
+        JobTask._running.add(self)
+        # Antes de enviar: la cola puede empezar el trabajo antes de que vuelva la respuesta
+        for action in self._EVENTS:
+            orchestrator.add_event_listener(action, self._on_event)
+        response = orchestrator.request(
+            AgentType.UI, AgentType.JOBS, Action.JOB_SUBMIT, {"kind": self.kind, "payload": self.payload},
+        )
+        if not response.success:
+            self.signals.error.emit(response.error or "No se pudo encolar el trabajo")
+            self._finish()
+            return self
+        with self._lock:
+            self.job_id = response.data["job_id"]
+            early, self._early = self._early, []
+        for message in early:
+            self._on_event(message)
+        return self
+
+    def cancel(self) -> None:
+        if self.job_id is not None:
+            orchestrator.request(AgentType.UI, AgentType.JOBS, Action.JOB_CANCEL, {"job_id": self.job_id})
+
+    def _on_event(self, message: Message) -> None:
+        with self._lock:
+            if self.job_id is None:
+                self._early.append(message)
+                return
+            if self._done or message.payload.get("id") != self.job_id:
+                return
+        job = message.payload
+        if message.action == Action.JOB_PROGRESS:
+            self.signals.progress.emit(round(job.get("progress", 0.0) * 100), 100)
+            return
+        if message.action == Action.JOB_COMPLETED:
+            self.signals.result.emit(job.get("result") or {})
+        elif message.action == Action.JOB_FAILED:
+            self.signals.error.emit(job.get("error") or "Error desconocido")
+        else:
+            self.signals.cancelled.emit()
+        self._finish()
+
+    def _finish(self) -> None:
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+        for action in self._EVENTS:
+            orchestrator.remove_event_listener(action, self._on_event)
+        self.signals.finished.emit()
+        JobTask._running.discard(self)
@@ -31,17 +31,48 @@ from PyQt6.QtGui import QIcon
 from src.gui.windows.window_manager import window_manager
 from src.gui.themes.theme_manager import theme_manager
 from src.config import APP_NAME, APP_VERSION
+from src.orchestration import JobAgent, ProcessLogicAgent, UIAgent, orchestrator
+from src.orchestration.worker_pool import DEFAULT_MEMORY_LIMIT_MB
+from src.utils.app_settings import app_settings
 from src.utils.logger import logger
 
 
+def start_agents(app: QApplication) -> None:
+    """Registra los agentes en el orquestador y arranca la cola de trabajos en segundo plano."""
+    workers = int(app_settings.get("jobs.workers", 2))
+    agents = [
+        UIAgent(orchestrator, theme_manager=theme_manager, window_manager=window_manager),
+        # Las operaciones de la cola corren en subprocesos: un PDF que agote la memoria no cierra la GUI
+        ProcessLogicAgent(
+            orchestrator,
+            size=workers,
+            memory_limit_mb=app_settings.get("jobs.memory_limit_mb", DEFAULT_MEMORY_LIMIT_MB) or None,
+        ),
+        JobAgent(orchestrator, workers=workers),
+    ]
+    for agent in agents:
+        agent.register()
+    resumed = orchestrator.job_agent.start()
+    if resumed:
+        logger.app("Reanudados %d trabajos interrumpidos", resumed)
+
+    def stop_agents() -> None:
+        # Sin esperar: un trabajo a medias vuelve a la cola en el próximo arranque
+        orchestrator.job_agent.stop(wait=False)
+        for agent in reversed(agents):
+            agent.unregister()
+
+    app.aboutToQuit.connect(stop_agents)
+
+
 def main():
     log_dir = Path.cwd() / "logs"
     logger.setup(log_dir=log_dir)
     log = logger.get_logger()
     
-    logger.app(f"Iniciando {APP_NAME} v{APP_VERSION}")
-    logger.config(f"Cargando configuración desde ~/.xebec-pdf-fixer")
-    logger.ui(f"Aplicando tema: {theme_manager.theme}")
+    logger.app("Iniciando %s v%s", APP_NAME, APP_VERSION)
+    logger.config("Cargando configuración desde ~/.xebec-pdf-fixer")
+    logger.ui("Aplicando tema: %s", theme_manager.theme)
 
     app = QApplication(sys.argv)
     app.setApplicationName(APP_NAME)
@@ -57,10 +88,11 @@ def main():
     app.setStyleSheet(theme_manager.get_stylesheet())
     
     window_manager.set_app(app)
-    logger.nav(f"Mostrando splash screen")
+    start_agents(app)
+    logger.nav("Mostrando splash screen")
     window_manager.show_splash(duration_ms=1500)
     
-    logger.app(f"Aplicación iniciada correctamente")
+    logger.app("Aplicación iniciada correctamente")
     
     sys.exit(app.exec())
 
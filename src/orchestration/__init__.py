@@ -1,13 +1,22 @@
 from src.orchestration.agents.base_agent import BaseAgent
+from src.orchestration.agents.job_agent import JobAgent
 from src.orchestration.agents.logic_agent import LogicAgent
+from src.orchestration.agents.process_logic_agent import ProcessLogicAgent
 from src.orchestration.agents.ui_agent import UIAgent
+from src.orchestration.job_queue import JobQueue
 from src.orchestration.messages import Action, AgentType, Message, MessageResponse, MessageType
+from src.orchestration.metrics import OrchestrationMetrics, metrics
 from src.orchestration.orchestrator import Orchestrator, orchestrator
+from src.orchestration.worker_pool import LogicWorkerPool
 
 __all__ = [
     "BaseAgent",
     "UIAgent",
     "LogicAgent",
+    "ProcessLogicAgent",
+    "LogicWorkerPool",
+    "JobAgent",
+    "JobQueue",
     "Orchestrator",
     "orchestrator",
     "Message",
@@ -15,4 +24,6 @@ __all__ = [
     "MessageType",
     "AgentType",
     "Action",
+    "OrchestrationMetrics",
+    "metrics",
 ]
@@ -1,5 +1,7 @@
 from src.orchestration.agents.base_agent import BaseAgent
+from src.orchestration.agents.job_agent import JobAgent
 from src.orchestration.agents.logic_agent import LogicAgent
+from src.orchestration.agents.process_logic_agent import ProcessLogicAgent
 from src.orchestration.agents.ui_agent import UIAgent
 
-__all__ = ["BaseAgent", "UIAgent", "LogicAgent"]
+__all__ = ["BaseAgent", "UIAgent", "LogicAgent", "ProcessLogicAgent", "JobAgent"]
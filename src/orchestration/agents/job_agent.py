@@ -0,0 +1,141 @@
+from typing import Any, Dict, Optional
+
+from src.core.job_store import JobStore
+from src.orchestration.agents.base_agent import BaseAgent
+from src.orchestration.job_queue import JobQueue
+from src.orchestration.messages import (
+    Action,
+    AgentType,
+    Message,
+    MessageResponse,
+)
+
+
+class JobAgent(BaseAgent):
+    def __init__(
+        self,
+        orchestrator: Optional["Orchestrator"] = None,
+        store: Optional[JobStore] = None,
+        workers: int = 2,
+    ):
+        super().__init__(AgentType.JOBS, orchestrator)
+        self._queue = JobQueue(
+            store=store,
+            workers=workers,
+            orchestrator=orchestrator,
+            on_event=self.emit_event,
+        )
+
+    def _register_handlers(self) -> None:
+        self._handlers = {
+            Action.JOB_SUBMIT: self._handle_submit,
+            Action.JOB_STATUS: self._handle_status,
+            Action.JOB_LIST: self._handle_list,
+            Action.JOB_CANCEL: self._handle_cancel,
+        }
+
+    def handle(self, message: Message) -> MessageResponse:
+        handler = self._handlers.get(message.action)
+        if handler:
+            return handler(message)
+        return MessageResponse(
+            success=False,
+            error=f"Unknown action: {message.action}",
+            correlation_id=message.correlation_id,
+        )
+
+    def _handle_submit(self, message: Message) -> MessageResponse:
+        kind = message.payload.get("kind")
+        job_payload = message.payload.get("payload")
+        if not kind or not isinstance(job_payload, dict):
+            return MessageResponse(
+                success=False,
+                error="kind and payload are required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            job = self._queue.submit(kind, job_payload)
+            return MessageResponse(
+                success=True,
+                data={"job_id": job.id, "status": job.status},
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_status(self, message: Message) -> MessageResponse:
+        job_id = message.payload.get("job_id")
+        if not job_id:
+            return MessageResponse(
+                success=True,
+                data=self._queue.get_status(),
+                correlation_id=message.correlation_id,
+            )
+        job = self._queue.store.get(job_id)
+        if job is None:
+            return MessageResponse(
+                success=False,
+                error=f"Job {job_id} not found",
+                correlation_id=message.correlation_id,
+            )
+        return MessageResponse(
+            success=True,
+            data=job.to_dict(),
+            correlation_id=message.correlation_id,
+        )
+
+    def _handle_list(self, message: Message) -> MessageResponse:
+        status = message.payload.get("status")
+        limit = message.payload.get("limit", 100)
+        jobs = self._queue.store.list(status=status, limit=limit)
+        return MessageResponse(
+            success=True,
+            data={"jobs": [job.to_dict() for job in jobs]},
+            correlation_id=message.correlation_id,
+        )
+
+    def _handle_cancel(self, message: Message) -> MessageResponse:
+        job_id = message.payload.get("job_id")
+        if not job_id:
+            return MessageResponse(
+                success=False,
+                error="job_id is required",
+                correlation_id=message.correlation_id,
+            )
+        status = self._queue.cancel(job_id)
+        if status is None:
+            return MessageResponse(
+                success=False,
+                error=f"Job {job_id} not found",
+                correlation_id=message.correlation_id,
+            )
+        return MessageResponse(
+            success=True,
+            data={"job_id": job_id, "status": status},
+            correlation_id=message.correlation_id,
+        )
+
+    def register(self) -> None:
+        super().register()
+        self._queue.orchestrator = self.orchestrator
+
+    def start(self) -> int:
+        return self._queue.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._queue.stop(wait=wait)
+
+    def unregister(self) -> None:
+        self._queue.stop()
+        super().unregister()
+
+    @property
+    def queue(self) -> JobQueue:
+        return self._queue
+
+    def get_status(self) -> Dict[str, Any]:
+        return self._queue.get_status()
@@ -1,7 +1,24 @@
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
+from src.core.pdf_compress import DEFAULT_DPI, DEFAULT_QUALITY, PDFCompressor
+from src.core.pdf_encrypt import (
+    ALL_PERMISSIONS,
+    DEFAULT_ALGORITHM,
+    OPERATION_DECRYPT,
+    OPERATION_ENCRYPT,
+    PDFEncryptor,
+    default_output_path,
+)
+from src.core.pdf_extract import PDFPageExtractor
+from src.core.pdf_images import DEFAULT_IMAGE_DPI, IMAGE_EXTENSIONS, ImageToPDFConverter
+from src.core.pdf_merge import PDFMerger
+from src.core.pdf_probe import probe_pdf
 from src.core.pdf_repair import PDFRepairer
+from src.core.pdf_split import PDFSplitter
+from src.core.pdf_validate import PDFValidator
 from src.orchestration.agents.base_agent import BaseAgent
 from src.orchestration.messages import (
     Action,
@@ -10,6 +27,41 @@ from src.orchestration.messages import (
     MessageResponse,
     MessageType,
 )
+from src.orchestration.metrics import metrics
+
+ProgressCallback = Callable[[int, int], None]
+
+_task = threading.local()
+
+
+@contextmanager
+def reporting_progress(callback: Optional[ProgressCallback]) -> Iterator[None]:
+    """Las acciones atendidas en este hilo dentro del bloque informan su avance a callback."""
+    previous = getattr(_task, "callback", None)
+    _task.callback = callback
+    try:
+        yield
+    finally:
+        _task.callback = previous
+
+
+def current_progress() -> Optional[ProgressCallback]:
+    return getattr(_task, "callback", None)
+
+
+@contextmanager
+def cancelling(event: Optional[Any]) -> Iterator[None]:
+    """Las acciones atendidas en este hilo dentro del bloque se detienen cuando event se activa."""
+    previous = getattr(_task, "cancel_event", None)
+    _task.cancel_event = event
+    try:
+        yield
+    finally:
+        _task.cancel_event = previous
+
+
+def current_cancel_event() -> Optional[Any]:
+    return getattr(_task, "cancel_event", None)
 
 
 class LogicAgent(BaseAgent):
@@ -25,14 +77,23 @@ class LogicAgent(BaseAgent):
         self._handlers = {
             Action.LOGIC_REPAIR_PDF: self._handle_repair_pdf,
             Action.LOGIC_VALIDATE_PDF: self._handle_validate_pdf,
+            Action.LOGIC_DEEP_VALIDATE_PDF: self._handle_deep_validate_pdf,
             Action.LOGIC_LOAD_FILE: self._handle_load_file,
             Action.LOGIC_SAVE_FILE: self._handle_save_file,
+            Action.LOGIC_MERGE_PDF: self._handle_merge_pdf,
+            Action.LOGIC_SPLIT_PDF: self._handle_split_pdf,
+            Action.LOGIC_COMPRESS_PDF: self._handle_compress_pdf,
+            Action.LOGIC_IMAGES_TO_PDF: self._handle_images_to_pdf,
+            Action.LOGIC_ENCRYPT_PDF: self._handle_encrypt_pdf,
+            Action.LOGIC_DECRYPT_PDF: self._handle_decrypt_pdf,
+            Action.LOGIC_EXTRACT_PAGES: self._handle_extract_pages,
         }
 
     def handle(self, message: Message) -> MessageResponse:
         handler = self._handlers.get(message.action)
         if handler:
-            return handler(message)
+            with metrics.track("handler", self.agent_type.name, message) as span:
+                return span.record(handler(message))
         return MessageResponse(
             success=False,
             error=f"Unknown action: {message.action}",
@@ -51,7 +112,13 @@ class LogicAgent(BaseAgent):
         try:
             input_path = Path(input_path)
             output_path = Path(output_path) if output_path else input_path.with_suffix(".fixed.pdf")
-            success, error = self._pdf_repairer.repair(input_path, output_path)
+            success, error = self._pdf_repairer.repair(
+                input_path,
+                output_path,
+                linearize=bool(message.payload.get("linearize")),
+                progress_callback=current_progress(),
+                cancel_event=current_cancel_event(),
+            )
             if success:
                 return MessageResponse(
                     success=True,
@@ -82,7 +149,6 @@ class LogicAgent(BaseAgent):
                 correlation_id=message.correlation_id,
             )
         try:
-            from pypdf import PdfReader
             path = Path(file_path)
             if not path.exists():
                 return MessageResponse(
@@ -90,17 +156,50 @@ class LogicAgent(BaseAgent):
                     error="File does not exist",
                     correlation_id=message.correlation_id,
                 )
-            reader = PdfReader(str(path))
-            page_count = len(reader.pages)
-            is_encrypted = reader.is_encrypted
+            info = probe_pdf(path)
             return MessageResponse(
                 success=True,
-                data={
-                    "valid": True,
-                    "page_count": page_count,
-                    "is_encrypted": is_encrypted,
-                    "file_size": path.stat().st_size,
-                },
+                data={"valid": True, **info.to_dict()},
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_deep_validate_pdf(self, message: Message) -> MessageResponse:
+        file_path = message.payload.get("file_path")
+        if not file_path:
+            return MessageResponse(
+                success=False,
+                error="file_path is required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            path = Path(file_path)
+            if not path.exists():
+                return MessageResponse(
+                    success=False,
+                    error="File does not exist",
+                    correlation_id=message.correlation_id,
+                )
+            success, error, report = PDFValidator.validate_deep(
+                path,
+                workers=message.payload.get("workers"),
+                progress_callback=current_progress(),
+                cancel_event=current_cancel_event(),
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data=report.to_dict(),
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Validation failed",
                 correlation_id=message.correlation_id,
             )
         except Exception as e:
@@ -174,5 +273,308 @@ class LogicAgent(BaseAgent):
                 correlation_id=message.correlation_id,
             )
 
+    def _handle_merge_pdf(self, message: Message) -> MessageResponse:
+        input_paths = message.payload.get("input_paths")
+        output_path = message.payload.get("output_path")
+        if not input_paths or not output_path:
+            return MessageResponse(
+                success=False,
+                error="input_paths and output_path are required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            output_path = Path(output_path)
+            success, error = PDFMerger.merge(
+                [Path(p) for p in input_paths],
+                output_path,
+                linearize=bool(message.payload.get("linearize")),
+                progress_callback=current_progress(),
+                cancel_event=current_cancel_event(),
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={
+                        "merged": True,
+                        "input_count": len(input_paths),
+                        "output_path": str(output_path),
+                    },
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Merge failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_split_pdf(self, message: Message) -> MessageResponse:
+        input_path = message.payload.get("input_path")
+        output_dir = message.payload.get("output_dir")
+        ranges = message.payload.get("ranges")
+        if not input_path:
+            return MessageResponse(
+                success=False,
+                error="input_path is required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            input_path = Path(input_path)
+            output_dir = Path(output_dir) if output_dir else input_path.parent / f"{input_path.stem}_split"
+            success, error, outputs = PDFSplitter.split(
+                input_path,
+                output_dir,
+                ranges,
+                mode=message.payload.get("mode", "ranges"),
+                every=int(message.payload.get("every") or 1),
+                max_size_mb=message.payload.get("max_size_mb"),
+                linearize=bool(message.payload.get("linearize")),
+                progress_callback=current_progress(),
+                cancel_event=current_cancel_event(),
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={
+                        "split": True,
+                        "output_paths": [str(p) for p in outputs],
+                    },
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Split failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_compress_pdf(self, message: Message) -> MessageResponse:
+        input_path = message.payload.get("input_path")
+        output_path = message.payload.get("output_path")
+        if not input_path:
+            return MessageResponse(
+                success=False,
+                error="input_path is required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            input_path = Path(input_path)
+            output_path = Path(output_path) if output_path else input_path.with_suffix(".compressed.pdf")
+            success, error, report = PDFCompressor.compress(
+                input_path,
+                output_path,
+                target_dpi=int(message.payload.get("target_dpi") or DEFAULT_DPI),
+                quality=int(message.payload.get("quality") or DEFAULT_QUALITY),
+                workers=message.payload.get("workers"),
+                linearize=bool(message.payload.get("linearize")),
+                progress_callback=current_progress(),
+                cancel_event=current_cancel_event(),
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={
+                        "compressed": True,
+                        "output_path": str(output_path),
+                        **report.to_dict(),
+                    },
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Compression failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_images_to_pdf(self, message: Message) -> MessageResponse:
+        input_dir = message.payload.get("input_dir")
+        input_paths = message.payload.get("input_paths")
+        output_path = message.payload.get("output_path")
+        if not input_dir and not (input_paths and output_path):
+            return MessageResponse(
+                success=False,
+                error="input_dir or input_paths and output_path are required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            options = {
+                "default_dpi": float(message.payload.get("default_dpi") or DEFAULT_IMAGE_DPI),
+                "jpeg_quality": message.payload.get("jpeg_quality"),
+                "workers": message.payload.get("workers"),
+                "linearize": bool(message.payload.get("linearize")),
+                "progress_callback": current_progress(),
+                "cancel_event": current_cancel_event(),
+            }
+            if input_dir:
+                input_dir = Path(input_dir)
+                output_path = Path(output_path) if output_path else input_dir.parent / f"{input_dir.name}.pdf"
+                success, error, report = ImageToPDFConverter.convert_folder(
+                    input_dir,
+                    output_path,
+                    extensions=message.payload.get("extensions") or IMAGE_EXTENSIONS,
+                    **options,
+                )
+            else:
+                output_path = Path(output_path)
+                success, error, report = ImageToPDFConverter.convert(
+                    [Path(p) for p in input_paths], output_path, **options
+                )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={
+                        "converted": True,
+                        "output_path": str(output_path),
+                        **report.to_dict(),
+                    },
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Image conversion failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_encrypt_pdf(self, message: Message) -> MessageResponse:
+        input_path = message.payload.get("input_path")
+        if not input_path:
+            return MessageResponse(
+                success=False,
+                error="input_path is required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            input_path = Path(input_path)
+            output_path = message.payload.get("output_path")
+            output_path = Path(output_path) if output_path else default_output_path(input_path, OPERATION_ENCRYPT)
+            permissions = message.payload.get("permissions")
+            success, error, report = PDFEncryptor.encrypt(
+                input_path,
+                output_path,
+                user_password=message.payload.get("user_password") or "",
+                owner_password=message.payload.get("owner_password"),
+                permissions=ALL_PERMISSIONS if permissions is None else permissions,
+                algorithm=message.payload.get("algorithm") or DEFAULT_ALGORITHM,
+                password=message.payload.get("password") or "",
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={"encrypted": True, **report.to_dict()},
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Encryption failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_decrypt_pdf(self, message: Message) -> MessageResponse:
+        input_path = message.payload.get("input_path")
+        if not input_path:
+            return MessageResponse(
+                success=False,
+                error="input_path is required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            input_path = Path(input_path)
+            output_path = message.payload.get("output_path")
+            output_path = Path(output_path) if output_path else default_output_path(input_path, OPERATION_DECRYPT)
+            success, error, report = PDFEncryptor.decrypt(
+                input_path,
+                output_path,
+                password=message.payload.get("password") or "",
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={"decrypted": True, **report.to_dict()},
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Decryption failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
+    def _handle_extract_pages(self, message: Message) -> MessageResponse:
+        input_path = message.payload.get("input_path")
+        pages = message.payload.get("pages")
+        if not input_path or not pages:
+            return MessageResponse(
+                success=False,
+                error="input_path and pages are required",
+                correlation_id=message.correlation_id,
+            )
+        try:
+            input_path = Path(input_path)
+            output_path = message.payload.get("output_path")
+            output_path = Path(output_path) if output_path else input_path.with_suffix(".extracted.pdf")
+            success, error, report = PDFPageExtractor.extract(
+                input_path,
+                output_path,
+                str(pages),
+                prune=message.payload.get("prune", True),
+                linearize=bool(message.payload.get("linearize")),
+                progress_callback=current_progress(),
+                cancel_event=current_cancel_event(),
+            )
+            if success:
+                return MessageResponse(
+                    success=True,
+                    data={
+                        "extracted": True,
+                        "output_path": str(output_path),
+                        **report.to_dict(),
+                    },
+                    correlation_id=message.correlation_id,
+                )
+            return MessageResponse(
+                success=False,
+                error=error or "Extraction failed",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            return MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+
     def set_pdf_repairer(self, pdf_repairer: PDFRepairer) -> None:
         self._pdf_repairer = pdf_repairer
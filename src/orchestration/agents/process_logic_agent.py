@@ -0,0 +1,50 @@
+from typing import Any, Dict, Optional
+
+from src.orchestration.agents.logic_agent import LogicAgent, current_cancel_event, current_progress
+from src.orchestration.messages import Message, MessageResponse
+from src.orchestration.metrics import metrics
+from src.orchestration.worker_pool import LogicWorkerPool
+
+
+class ProcessLogicAgent(LogicAgent):
+    """LogicAgent que delega cada acción en un pool de subprocesos."""
+
+    def __init__(
+        self,
+        orchestrator: Optional["Orchestrator"] = None,
+        pool: Optional[LogicWorkerPool] = None,
+        **pool_options: Any,
+    ):
+        super().__init__(orchestrator)
+        self._pool = pool or LogicWorkerPool(**pool_options)
+
+    def handle(self, message: Message) -> MessageResponse:
+        if message.action not in self._handlers:
+            return super().handle(message)
+        timeout = message.payload.get("timeout")
+        with metrics.track("handler", self.agent_type.name, message) as span:
+            return span.record(
+                self._pool.submit(
+                    message,
+                    timeout=timeout,
+                    progress_callback=current_progress(),
+                    cancel_event=current_cancel_event(),
+                )
+            )
+
+    def start(self) -> None:
+        self._pool.start()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    def unregister(self) -> None:
+        super().unregister()
+        self._pool.shutdown()
+
+    @property
+    def pool(self) -> LogicWorkerPool:
+        return self._pool
+
+    def get_pool_status(self) -> Dict[str, Any]:
+        return self._pool.get_status()
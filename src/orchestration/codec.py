@@ -0,0 +1,78 @@
+import pickle
+from datetime import datetime
+from typing import Tuple, Union
+from uuid import UUID
+
+from src.orchestration.messages import AgentType, Message, MessageResponse, MessageType
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def encode_message(message: Message) -> bytes:
+    return pickle.dumps(
+        (
+            message.msg_type.value,
+            message.sender.value,
+            message.receiver.value,
+            message.action,
+            message.payload,
+            message.correlation_id.bytes,
+            message.timestamp.timestamp(),
+            message.reply_to.bytes if message.reply_to else None,
+        ),
+        protocol=PROTOCOL,
+    )
+
+
+def decode_message(data: bytes) -> Message:
+    msg_type, sender, receiver, action, payload, correlation_id, timestamp, reply_to = pickle.loads(data)
+    return Message(
+        msg_type=MessageType(msg_type),
+        sender=AgentType(sender),
+        receiver=AgentType(receiver),
+        action=action,
+        payload=payload,
+        correlation_id=UUID(bytes=correlation_id),
+        timestamp=datetime.fromtimestamp(timestamp),
+        reply_to=UUID(bytes=reply_to) if reply_to else None,
+    )
+
+
+def encode_response(response: MessageResponse) -> bytes:
+    return pickle.dumps(
+        (
+            response.success,
+            response.data,
+            response.error,
+            response.correlation_id.bytes,
+            response.timestamp.timestamp(),
+        ),
+        protocol=PROTOCOL,
+    )
+
+
+def decode_response(data: bytes) -> MessageResponse:
+    return _response(pickle.loads(data))
+
+
+def encode_progress(done: int, total: int) -> bytes:
+    return pickle.dumps((done, total), protocol=PROTOCOL)
+
+
+def decode_frame(data: bytes) -> Union[MessageResponse, Tuple[int, int]]:
+    """Lo que llega de un worker: un avance (done, total) o la respuesta final."""
+    frame = pickle.loads(data)
+    if len(frame) == 2:
+        return frame
+    return _response(frame)
+
+
+def _response(frame: tuple) -> MessageResponse:
+    success, payload, error, correlation_id, timestamp = frame
+    return MessageResponse(
+        success=success,
+        data=payload,
+        error=error,
+        correlation_id=UUID(bytes=correlation_id),
+        timestamp=datetime.fromtimestamp(timestamp),
+    )
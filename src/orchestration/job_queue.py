@@ -0,0 +1,248 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.job_store import (
+    HEARTBEAT_INTERVAL,
+    STATUS_CANCELLED,
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    Job,
+    JobStore,
+)
+from src.orchestration.agents.logic_agent import cancelling, reporting_progress
+from src.orchestration.messages import Action, AgentType, Message, MessageResponse, MessageType
+from src.utils import trace
+
+JOB_KIND_ACTIONS = {
+    "repair": Action.LOGIC_REPAIR_PDF,
+    "validate": Action.LOGIC_VALIDATE_PDF,
+    "validate_deep": Action.LOGIC_DEEP_VALIDATE_PDF,
+    "merge": Action.LOGIC_MERGE_PDF,
+    "split": Action.LOGIC_SPLIT_PDF,
+    "compress": Action.LOGIC_COMPRESS_PDF,
+    "images": Action.LOGIC_IMAGES_TO_PDF,
+    "extract": Action.LOGIC_EXTRACT_PAGES,
+}
+
+EventCallback = Callable[[str, Dict[str, Any]], None]
+
+# Avances más finos que esto no se escriben en el almacén ni se notifican
+PROGRESS_STEP = 0.01
+
+
+class JobQueue:
+    """Cola local de trabajos persistida en JobStore y atendida por un pool de hilos."""
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        workers: int = 2,
+        orchestrator: Optional["Orchestrator"] = None,
+        on_event: Optional[EventCallback] = None,
+        poll_interval: float = 1.0,
+    ):
+        self.store = store or JobStore()
+        self.workers = max(1, workers)
+        self.orchestrator = orchestrator
+        self.on_event = on_event
+        self.poll_interval = poll_interval
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._local_agent = None
+        self._agent_lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._cancel_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> int:
+        if self.running:
+            return 0
+        resumed = self.store.requeue_interrupted()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._start_heartbeat()
+        return resumed
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+        self._stop_heartbeat()
+
+    def _start_heartbeat(self) -> None:
+        if self._heartbeat is not None and self._heartbeat.is_alive():
+            return
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _stop_heartbeat(self) -> None:
+        self._heartbeat_stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        self._heartbeat = None
+
+    def _heartbeat_loop(self) -> None:
+        # Otros procesos que comparten el almacén distinguen así los trabajos vivos de los huérfanos
+        while not self._heartbeat_stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.store.heartbeat()
+                self._poll_cancellations()
+            except Exception:
+                pass
+
+    def _poll_cancellations(self) -> None:
+        """Cancelaciones pedidas desde otro proceso que comparte el almacén."""
+        with self._cancel_lock:
+            running = list(self._cancel_events.items())
+        for job_id, event in running:
+            job = self.store.get(job_id)
+            if job is not None and job.cancel_requested:
+                event.set()
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Job:
+        if kind not in JOB_KIND_ACTIONS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.store.add(kind, payload)
+        self._emit(Action.JOB_QUEUED, job)
+        self._wake.set()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancela un trabajo en cola; uno en ejecución recibe la petición y se detiene en cuanto puede."""
+        status = self.store.cancel(job_id)
+        if status == STATUS_CANCELLED:
+            job = self.store.get(job_id)
+            if job:
+                self._emit(Action.JOB_CANCELLED, job)
+        elif status == STATUS_RUNNING:
+            with self._cancel_lock:
+                event = self._cancel_events.get(job_id)
+            if event is not None:
+                event.set()
+        return status
+
+    def run_until_empty(self) -> None:
+        """Atiende la cola en el hilo actual hasta vaciarla (uso por lotes)."""
+        self.store.requeue_interrupted()
+        self._start_heartbeat()
+        try:
+            while self._run_next():
+                pass
+        finally:
+            self._stop_heartbeat()
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            if not self._run_next():
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _run_next(self) -> bool:
+        job = self.store.claim_next()
+        if job is None:
+            return False
+        self._emit(Action.JOB_STARTED, job)
+        cancel_event = threading.Event()
+        with self._cancel_lock:
+            self._cancel_events[job.id] = cancel_event
+        try:
+            with reporting_progress(self._progress_reporter(job)), cancelling(cancel_event):
+                response = self._execute(job)
+        finally:
+            with self._cancel_lock:
+                self._cancel_events.pop(job.id, None)
+
+        current = self.store.get(job.id)
+        # Si la operación terminó antes de ver la cancelación, su resultado vale
+        if current is not None and current.cancel_requested and not response.success:
+            self.store.finish(job.id, STATUS_CANCELLED, error=response.error)
+            event = Action.JOB_CANCELLED
+        elif response.success:
+            self.store.finish(job.id, STATUS_COMPLETED, result=response.data)
+            event = Action.JOB_COMPLETED
+        else:
+            self.store.finish(job.id, STATUS_FAILED, error=response.error)
+            event = Action.JOB_FAILED
+        finished = self.store.get(job.id)
+        if finished:
+            self._emit(event, finished)
+        return True
+
+    def _execute(self, job: Job) -> MessageResponse:
+        action = JOB_KIND_ACTIONS.get(job.kind)
+        if action is None:
+            return MessageResponse(success=False, error=f"Unknown job kind: {job.kind}")
+        try:
+            if self.orchestrator is not None and self.orchestrator.logic_agent is not None:
+                return self.orchestrator.request(AgentType.JOBS, AgentType.LOGIC, action, job.payload)
+            message = Message(
+                msg_type=MessageType.REQUEST,
+                sender=AgentType.JOBS,
+                receiver=AgentType.LOGIC,
+                action=action,
+                payload=job.payload,
+            )
+            return self._get_local_agent().handle(message)
+        except Exception as e:
+            return MessageResponse(success=False, error=str(e))
+
+    def _progress_reporter(self, job: Job) -> Callable[[int, int], None]:
+        last = [0.0]
+
+        def report(done: int, total: int) -> None:
+            if not total:
+                return
+            progress = min(1.0, done / total)
+            if progress - last[0] < PROGRESS_STEP and progress < 1.0:
+                return
+            last[0] = progress
+            try:
+                self.store.update_progress(job.id, progress)
+            except Exception:
+                return
+            job.progress = progress
+            self._emit(Action.JOB_PROGRESS, job)
+
+        return report
+
+    def _get_local_agent(self):
+        with self._agent_lock:
+            if self._local_agent is None:
+                from src.orchestration.agents.logic_agent import LogicAgent
+                self._local_agent = LogicAgent()
+            return self._local_agent
+
+    def _emit(self, action: str, job: Job) -> None:
+        trace.orchestration("Trabajo %s (%s): %s", job.id, job.kind, action)
+        if self.on_event is None:
+            return
+        payload = job.to_dict()
+        payload["queue"] = self.store.counts()
+        try:
+            self.on_event(action, payload)
+        except Exception:
+            pass
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "store": str(self.store.path),
+            "counts": self.store.counts(),
+        }
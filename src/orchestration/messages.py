@@ -16,6 +16,7 @@ class AgentType(Enum):
     ORCHESTRATOR = auto()
     UI = auto()
     LOGIC = auto()
+    JOBS = auto()
 
 
 @dataclass
@@ -51,9 +52,29 @@ class Action:
 
     LOGIC_REPAIR_PDF = "logic:repair_pdf"
     LOGIC_VALIDATE_PDF = "logic:validate_pdf"
+    LOGIC_DEEP_VALIDATE_PDF = "logic:deep_validate_pdf"
     LOGIC_LOAD_FILE = "logic:load_file"
     LOGIC_SAVE_FILE = "logic:save_file"
+    LOGIC_MERGE_PDF = "logic:merge_pdf"
+    LOGIC_SPLIT_PDF = "logic:split_pdf"
+    LOGIC_COMPRESS_PDF = "logic:compress_pdf"
+    LOGIC_IMAGES_TO_PDF = "logic:images_to_pdf"
+    LOGIC_ENCRYPT_PDF = "logic:encrypt_pdf"
+    LOGIC_DECRYPT_PDF = "logic:decrypt_pdf"
+    LOGIC_EXTRACT_PAGES = "logic:extract_pages"
+
+    JOB_SUBMIT = "job:submit"
+    JOB_STATUS = "job:status"
+    JOB_LIST = "job:list"
+    JOB_CANCEL = "job:cancel"
+    JOB_QUEUED = "job:queued"
+    JOB_STARTED = "job:started"
+    JOB_COMPLETED = "job:completed"
+    JOB_FAILED = "job:failed"
+    JOB_CANCELLED = "job:cancelled"
+    JOB_PROGRESS = "job:progress"
 
     ORCH_REGISTER_AGENT = "orch:register_agent"
     ORCH_UNREGISTER_AGENT = "orch:unregister_agent"
     ORCH_GET_STATUS = "orch:get_status"
+    ORCH_DUMP_METRICS = "orch:dump_metrics"
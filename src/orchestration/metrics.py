@@ -0,0 +1,225 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.orchestration.messages import Message, MessageResponse
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+MetricKey = Tuple[str, str, str]
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                str(bound): count
+                for bound, count in zip([*self.buckets, "+Inf"], self.cumulative())
+            },
+        }
+
+    def cumulative(self) -> List[int]:
+        result = []
+        running = 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            result.append(running)
+        return result
+
+
+@dataclass
+class Span:
+    key: MetricKey
+    started: float = field(default_factory=time.perf_counter)
+    success: bool = True
+
+    def record(self, response: MessageResponse) -> MessageResponse:
+        self.success = response.success
+        return response
+
+
+class OrchestrationMetrics:
+    """Histogramas de latencia, espera en cola, errores y peticiones en curso por acción."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._latency: Dict[MetricKey, LatencyHistogram] = {}
+        self._queue_wait: Dict[MetricKey, LatencyHistogram] = {}
+        self._requests: Dict[MetricKey, int] = {}
+        self._errors: Dict[MetricKey, int] = {}
+        self._in_flight: Dict[MetricKey, int] = {}
+        self._started_at = datetime.now()
+        self.enabled = True
+
+    @contextmanager
+    def track(self, stage: str, agent: str, message: Message) -> Iterator[Span]:
+        if not self.enabled:
+            yield Span((stage, agent, message.action))
+            return
+        key = (stage, agent, message.action)
+        wait = max(0.0, (datetime.now() - message.timestamp).total_seconds())
+        with self._lock:
+            self._histogram(self._queue_wait, key).observe(wait)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        span = Span(key)
+        try:
+            yield span
+        except Exception:
+            span.success = False
+            raise
+        finally:
+            elapsed = time.perf_counter() - span.started
+            with self._lock:
+                self._histogram(self._latency, key).observe(elapsed)
+                self._requests[key] = self._requests.get(key, 0) + 1
+                self._in_flight[key] -= 1
+                if not span.success:
+                    self._errors[key] = self._errors.get(key, 0) + 1
+
+    def _histogram(self, table: Dict[MetricKey, LatencyHistogram], key: MetricKey) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = LatencyHistogram(self._buckets)
+        return histogram
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latency.clear()
+            self._queue_wait.clear()
+            self._requests.clear()
+            self._errors.clear()
+            self._in_flight = {k: v for k, v in self._in_flight.items() if v}
+            self._started_at = datetime.now()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = sorted(set(self._latency) | set(self._in_flight))
+            actions = []
+            for key in keys:
+                stage, agent, action = key
+                latency = self._latency.get(key)
+                queue_wait = self._queue_wait.get(key)
+                actions.append({
+                    "stage": stage,
+                    "agent": agent,
+                    "action": action,
+                    "requests": self._requests.get(key, 0),
+                    "errors": self._errors.get(key, 0),
+                    "in_flight": self._in_flight.get(key, 0),
+                    "latency": latency.to_dict() if latency else None,
+                    "queue_wait": queue_wait.to_dict() if queue_wait else None,
+                })
+            return {
+                "since": self._started_at.isoformat(),
+                "actions": actions,
+            }
+
+    def to_prometheus(self, prefix: str = "xebec_orch") -> str:
+        lines: List[str] = []
+        with self._lock:
+            self._prometheus_histograms(lines, f"{prefix}_latency_seconds", self._latency,
+                                        "Tiempo de atención por acción")
+            self._prometheus_histograms(lines, f"{prefix}_queue_wait_seconds", self._queue_wait,
+                                        "Tiempo entre la creación del mensaje y su atención")
+            self._prometheus_counters(lines, f"{prefix}_requests_total", self._requests,
+                                      "counter", "Peticiones atendidas")
+            self._prometheus_counters(lines, f"{prefix}_errors_total", self._errors,
+                                      "counter", "Peticiones con error")
+            self._prometheus_counters(lines, f"{prefix}_in_flight", self._in_flight,
+                                      "gauge", "Peticiones en curso")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(key: MetricKey, extra: Optional[str] = None) -> str:
+        stage, agent, action = key
+        labels = f'stage="{stage}",agent="{agent}",action="{action}"'
+        if extra:
+            labels += f",{extra}"
+        return "{" + labels + "}"
+
+    def _prometheus_histograms(
+        self,
+        lines: List[str],
+        name: str,
+        table: Dict[MetricKey, LatencyHistogram],
+        help_text: str,
+    ) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key in sorted(table):
+            histogram = table[key]
+            bounds = [repr(b) for b in histogram.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.cumulative()):
+                le = 'le="' + bound + '"'
+                lines.append(f"{name}_bucket{self._labels(key, le)} {count}")
+            lines.append(f"{name}_sum{self._labels(key)} {histogram.total}")
+            lines.append(f"{name}_count{self._labels(key)} {histogram.count}")
+
+    def _prometheus_counters(
+        self,
+        lines: List[str],
+        name: str,
+        table: Dict[MetricKey, int],
+        metric_type: str,
+        help_text: str,
+    ) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for key in sorted(table):
+            lines.append(f"{name}{self._labels(key)} {table[key]}")
+
+    def dump(self, path: Union[str, Path], fmt: str = "json") -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "json":
+            path.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        elif fmt == "prometheus":
+            path.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        return path
+
+
+metrics = OrchestrationMetrics()
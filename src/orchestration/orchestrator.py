@@ -1,6 +1,7 @@
 from typing import Any, Callable, Optional, cast
 
 from src.orchestration.agents.base_agent import BaseAgent
+from src.orchestration.agents.job_agent import JobAgent
 from src.orchestration.agents.logic_agent import LogicAgent
 from src.orchestration.agents.ui_agent import UIAgent
 from src.orchestration.messages import (
@@ -10,6 +11,8 @@ from src.orchestration.messages import (
     MessageResponse,
     MessageType,
 )
+from src.orchestration.metrics import OrchestrationMetrics, metrics
+from src.utils import trace
 
 
 class Orchestrator:
@@ -26,6 +29,7 @@ class Orchestrator:
             return
         self._agents: dict[AgentType, BaseAgent] = {}
         self._event_listeners: dict[str, list[Callable[[Message], None]]] = {}
+        self.metrics: OrchestrationMetrics = metrics
         self._initialized = True
 
     def register_agent(self, agent: BaseAgent) -> MessageResponse:
@@ -59,20 +63,27 @@ class Orchestrator:
     def logic_agent(self) -> Optional[LogicAgent]:
         return cast(Optional[LogicAgent], self._agents.get(AgentType.LOGIC))
 
+    @property
+    def job_agent(self) -> Optional[JobAgent]:
+        return cast(Optional[JobAgent], self._agents.get(AgentType.JOBS))
+
     def route_message(self, message: Message) -> MessageResponse:
-        if message.receiver == AgentType.ORCHESTRATOR:
-            return self._handle_orchestrator_message(message)
-        target_agent = self._agents.get(message.receiver)
-        if target_agent is None:
-            return MessageResponse(
-                success=False,
-                error=f"Agent {message.receiver.name} not found",
-                correlation_id=message.correlation_id,
-            )
-        return target_agent.handle(message)
+        trace.orchestration("%s -> %s: %s", message.sender.name, message.receiver.name, message.action)
+        with self.metrics.track("route", message.receiver.name, message) as span:
+            if message.receiver == AgentType.ORCHESTRATOR:
+                return span.record(self._handle_orchestrator_message(message))
+            target_agent = self._agents.get(message.receiver)
+            if target_agent is None:
+                return span.record(MessageResponse(
+                    success=False,
+                    error=f"Agent {message.receiver.name} not found",
+                    correlation_id=message.correlation_id,
+                ))
+            return span.record(target_agent.handle(message))
 
     def broadcast_event(self, message: Message) -> None:
-        listeners = self._event_listeners.get(message.action, [])
+        # Copia: un oyente puede darse de baja mientras se le notifica
+        listeners = list(self._event_listeners.get(message.action, []))
         for listener in listeners:
             try:
                 listener(message)
@@ -95,6 +106,7 @@ class Orchestrator:
             prefix_to_agent = {
                 "ui": AgentType.UI,
                 "logic": AgentType.LOGIC,
+                "job": AgentType.JOBS,
             }
             target_agent_type = prefix_to_agent.get(action_prefix)
             if target_agent_type and target_agent_type in self._agents:
@@ -129,9 +141,32 @@ class Orchestrator:
                 data={
                     "agents": [a.name for a in self._agents.keys()],
                     "event_listeners": list(self._event_listeners.keys()),
+                    "metrics": self.metrics.snapshot(),
                 },
                 correlation_id=message.correlation_id,
             )
+        elif message.action == Action.ORCH_DUMP_METRICS:
+            path = message.payload.get("path")
+            fmt = message.payload.get("format", "json")
+            if not path:
+                return MessageResponse(
+                    success=False,
+                    error="path is required",
+                    correlation_id=message.correlation_id,
+                )
+            try:
+                written = self.metrics.dump(path, fmt)
+                return MessageResponse(
+                    success=True,
+                    data={"path": str(written), "format": fmt},
+                    correlation_id=message.correlation_id,
+                )
+            except Exception as e:
+                return MessageResponse(
+                    success=False,
+                    error=str(e),
+                    correlation_id=message.correlation_id,
+                )
         return MessageResponse(
             success=False,
             error=f"Unknown orchestrator action: {message.action}",
@@ -165,6 +200,7 @@ class Orchestrator:
         return {
             "agents": {k.name: v.is_registered for k, v in self._agents.items()},
             "event_listeners": list(self._event_listeners.keys()),
+            "metrics": self.metrics.snapshot(),
         }
 
 
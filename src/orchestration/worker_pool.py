@@ -0,0 +1,319 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional
+
+from src.orchestration.codec import (
+    decode_frame,
+    decode_message,
+    encode_message,
+    encode_progress,
+    encode_response,
+)
+from src.orchestration.messages import Message, MessageResponse
+
+DEFAULT_TASK_TIMEOUT = 300.0
+DEFAULT_MEMORY_LIMIT_MB = 2048
+CANCEL_POLL_INTERVAL = 0.25
+
+
+def _limit_memory(limit_mb: Optional[int]) -> None:
+    if not limit_mb:
+        return
+    limit = int(limit_mb) * 1024 * 1024
+    if sys.platform == "win32":
+        _limit_memory_windows(limit)
+        return
+    try:
+        import resource
+        # RLIMIT_AS contaría también los archivos mapeados y las reservas de las bibliotecas
+        # nativas: una entrada grande fallaría con ENOMEM sin llegar a usar esa memoria
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+    except (ImportError, ValueError, OSError, AttributeError):
+        pass
+
+
+def _limit_memory_windows(limit: int) -> None:
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class BasicLimits(ctypes.Structure):
+            _fields_ = [
+                ("PerProcessUserTimeLimit", ctypes.c_int64),
+                ("PerJobUserTimeLimit", ctypes.c_int64),
+                ("LimitFlags", wintypes.DWORD),
+                ("MinimumWorkingSetSize", ctypes.c_size_t),
+                ("MaximumWorkingSetSize", ctypes.c_size_t),
+                ("ActiveProcessLimit", wintypes.DWORD),
+                ("Affinity", ctypes.c_size_t),
+                ("PriorityClass", wintypes.DWORD),
+                ("SchedulingClass", wintypes.DWORD),
+            ]
+
+        class IoCounters(ctypes.Structure):
+            _fields_ = [(name, ctypes.c_uint64) for name in (
+                "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+                "ReadTransferCount", "WriteTransferCount", "OtherTransferCount",
+            )]
+
+        class ExtendedLimits(ctypes.Structure):
+            _fields_ = [
+                ("BasicLimitInformation", BasicLimits),
+                ("IoInfo", IoCounters),
+                ("ProcessMemoryLimit", ctypes.c_size_t),
+                ("JobMemoryLimit", ctypes.c_size_t),
+                ("PeakProcessMemoryUsed", ctypes.c_size_t),
+                ("PeakJobMemoryUsed", ctypes.c_size_t),
+            ]
+
+        job_object_extended_limit_information = 9
+        job_object_limit_process_memory = 0x100
+
+        kernel32 = ctypes.windll.kernel32
+        job = kernel32.CreateJobObjectW(None, None)
+        info = ExtendedLimits()
+        info.BasicLimitInformation.LimitFlags = job_object_limit_process_memory
+        info.ProcessMemoryLimit = limit
+        kernel32.SetInformationJobObject(
+            job,
+            job_object_extended_limit_information,
+            ctypes.byref(info),
+            ctypes.sizeof(info),
+        )
+        kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess())
+    except Exception:
+        pass
+
+
+def _worker_main(conn: Connection, memory_limit_mb: Optional[int], cancel_event: Any = None) -> None:
+    if hasattr(os, "setpgid"):
+        # Grupo propio: al detener el worker se detienen también los procesos que haya lanzado
+        os.setpgid(0, 0)
+    _limit_memory(memory_limit_mb)
+
+    from src.orchestration.agents.logic_agent import LogicAgent, cancelling, reporting_progress
+    from src.orchestration.metrics import metrics
+
+    metrics.enabled = False
+    agent = LogicAgent()
+
+    def send_progress(done: int, total: int) -> None:
+        conn.send_bytes(encode_progress(done, total))
+
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            break
+        message = decode_message(data)
+        try:
+            with reporting_progress(send_progress if message.payload.get("_progress") else None), \
+                    cancelling(cancel_event):
+                response = agent.handle(message)
+        except MemoryError:
+            response = MessageResponse(
+                success=False,
+                error="Memory limit exceeded",
+                correlation_id=message.correlation_id,
+            )
+        except Exception as e:
+            response = MessageResponse(
+                success=False,
+                error=str(e),
+                correlation_id=message.correlation_id,
+            )
+        conn.send_bytes(encode_response(response))
+
+
+@dataclass
+class _Worker:
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+    cancel: Any
+    tasks: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+
+class LogicWorkerPool:
+    """
+    Pool de subprocesos que ejecutan LogicAgent aislados del proceso de la GUI.
+
+    memory_limit_mb limita la memoria privada de cada worker (RLIMIT_DATA en POSIX, memoria
+    comprometida en Windows); los archivos mapeados no cuentan. Una operación que necesite
+    más recibe MemoryError y se responde como fallo sin tumbar la aplicación; con None no
+    hay límite.
+
+    Los workers no son daemon para que las operaciones puedan repartir su trabajo en un
+    ProcessPoolExecutor propio; shutdown (también al salir del intérprete) los detiene.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        task_timeout: Optional[float] = DEFAULT_TASK_TIMEOUT,
+        memory_limit_mb: Optional[int] = DEFAULT_MEMORY_LIMIT_MB,
+        max_tasks_per_worker: Optional[int] = None,
+    ):
+        self.size = size or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.task_timeout = task_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._restarts = 0
+        self._timeouts = 0
+        self._crashes = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+            self._started = True
+        # multiprocessing espera a los hijos no daemon al salir: sin esto un worker ocioso
+        # bloquearía el cierre de la aplicación
+        atexit.register(self.shutdown)
+
+    def shutdown(self) -> None:
+        atexit.unregister(self.shutdown)
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._started = False
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for worker in workers:
+            self._stop(worker)
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        cancel = self._context.Event()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit_mb, cancel),
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process=process, conn=parent_conn, cancel=cancel)
+        self._workers.append(worker)
+        return worker
+
+    def _stop(self, worker: _Worker) -> None:
+        try:
+            worker.conn.close()
+        except OSError:
+            pass
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(timeout=5)
+        if hasattr(os, "killpg") and worker.process.pid:
+            # Procesos que el worker dejó en marcha (un ProcessPoolExecutor interrumpido)
+            try:
+                os.killpg(worker.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        self._stop(worker)
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self._restarts += 1
+            return self._spawn()
+
+    def submit(
+        self,
+        message: Message,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> MessageResponse:
+        """
+        Ejecuta message en un worker libre. Si cancel_event se activa mientras tanto, el
+        worker recibe la petición y la operación se detiene por sí sola como en proceso.
+        """
+        self.start()
+        timeout = timeout if timeout is not None else self.task_timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        if progress_callback is not None:
+            # El worker solo envía avances si alguien los escucha
+            message.payload = {**message.payload, "_progress": True}
+        worker = self._idle.get()
+        try:
+            if not worker.alive:
+                worker = self._replace(worker)
+            worker.cancel.clear()
+            worker.conn.send_bytes(encode_message(message))
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    worker.cancel.set()
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                wait = remaining
+                if cancel_event is not None and not worker.cancel.is_set():
+                    # Despierta de vez en cuando para reenviar una cancelación al worker
+                    wait = CANCEL_POLL_INTERVAL if remaining is None else min(remaining, CANCEL_POLL_INTERVAL)
+                if not worker.conn.poll(wait):
+                    if wait != remaining:
+                        continue
+                    self._timeouts += 1
+                    worker = self._replace(worker)
+                    return MessageResponse(
+                        success=False,
+                        error=f"Task timed out after {timeout:g}s",
+                        correlation_id=message.correlation_id,
+                    )
+                frame = decode_frame(worker.conn.recv_bytes())
+                if isinstance(frame, MessageResponse):
+                    response = frame
+                    break
+                if progress_callback is not None:
+                    progress_callback(*frame)
+            worker.tasks += 1
+            if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+                worker = self._replace(worker)
+            return response
+        except (EOFError, OSError):
+            exit_code = worker.process.exitcode
+            self._crashes += 1
+            worker = self._replace(worker)
+            return MessageResponse(
+                success=False,
+                error=f"Worker crashed (exit code {exit_code})",
+                correlation_id=message.correlation_id,
+            )
+        finally:
+            self._idle.put(worker)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            alive = sum(1 for worker in self._workers if worker.alive)
+        return {
+            "size": self.size,
+            "alive": alive,
+            "idle": self._idle.qsize(),
+            "restarts": self._restarts,
+            "timeouts": self._timeouts,
+            "crashes": self._crashes,
+            "task_timeout": self.task_timeout,
+            "memory_limit_mb": self.memory_limit_mb,
+        }
@@ -31,13 +31,13 @@ class AppSettings:
             try:
                 with open(self._config_path, 'r', encoding='utf-8') as f:
                     self._data = json.load(f)
-                logger.config(f"Configuración cargada desde {self._config_path}")
+                logger.config("Configuración cargada desde %s", self._config_path)
             except Exception as e:
-                logger.warning(f"Error cargando configuración: {e}")
+                logger.warning("Error cargando configuración: %s", e)
                 self._data = self._default_settings()
         else:
             self._data = self._default_settings()
-            logger.config(f"Usando configuración por defecto")
+            logger.config("Usando configuración por defecto")
     
     def _default_settings(self) -> Dict[str, Any]:
         """Retorna la configuración por defecto."""
@@ -59,6 +59,23 @@ class AppSettings:
                 "compress": True,
                 "encrypt": True,
             },
+            "jobs": {
+                "workers": 2,
+                "memory_limit_mb": 2048,
+            },
+            "render_cache": {
+                "budget_mb": 256,
+                "prefetch_pages": 8,
+            },
+            "document_pool": {
+                "budget_mb": 512,
+            },
+            "output": {
+                "linearize": False,
+            },
+            "editor": {
+                "history_mb": 4,
+            },
             "supported_files": {
                 "pdf": True,
                 "images_to_pdf": ["jpg", "jpeg", "png", "bmp", "gif", "tiff"],
@@ -87,9 +104,9 @@ class AppSettings:
         try:
             with open(self._config_path, 'w', encoding='utf-8') as f:
                 json.dump(self._data, f, indent=4, ensure_ascii=False)
-            logger.config(f"Configuración guardada")
+            logger.config("Configuración guardada")
         except Exception as e:
-            logger.error(f"Error guardando configuración: {e}")
+            logger.error("Error guardando configuración: %s", e)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Obtiene un valor de configuración."""
@@ -153,20 +170,20 @@ class AppSettings:
         return self.get("user.username", "")
     
     def login(self, username: str, email: str = "") -> None:
-        logger.user(f"Iniciando sesión: {username}")
+        logger.user("Iniciando sesión: %s", username)
         self.set("user.logged_in", True)
         self.set("user.username", username)
         self.set("user.email", email)
         self.set("user.last_login", datetime.now().isoformat())
-        logger.user(f"Usuario logueado: {username}")
+        logger.user("Usuario logueado: %s", username)
     
     def logout(self) -> None:
         username = self.username
-        logger.user(f"Cerrando sesión: {username}")
+        logger.user("Cerrando sesión: %s", username)
         self.set("user.logged_in", False)
         self.set("user.username", "")
         self.set("user.email", "")
-        logger.user(f"Sesión cerrada")
+        logger.user("Sesión cerrada")
     
     def get_user_info(self) -> Dict[str, Any]:
         return {
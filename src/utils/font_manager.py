@@ -4,6 +4,8 @@ import zipfile
 from pathlib import Path
 import shutil
 
+from src.utils.logger import logger
+
 
 class FontManager:
     FONTS_URL = "https://github.com/ryanoasis/nerd-fonts/releases/download/v3.0.2/JetBrainsMono.zip"
@@ -22,10 +24,10 @@ class FontManager:
         bold_file = fonts_dir / "JetBrainsMono-Bold.ttf"
         
         if font_file.exists() and bold_file.exists():
-            print("Fuentes ya descargadas")
+            logger.file("Fuentes ya descargadas")
             return True
             
-        print("Descargando fuentes JetBrains Mono...")
+        logger.file("Descargando fuentes JetBrains Mono...")
         
         try:
             zip_path = fonts_dir / "fonts.zip"
@@ -52,11 +54,11 @@ class FontManager:
                 if item.is_dir():
                     shutil.rmtree(item)
                     
-            print(f"Fuentes descargadas en: {fonts_dir}")
+            logger.file("Fuentes descargadas en: %s", fonts_dir)
             return True
             
         except Exception as e:
-            print(f"Error descargando fuentes: {e}")
+            logger.error("Error descargando fuentes: %s", e)
             return False
     
     @staticmethod
@@ -69,6 +71,6 @@ class FontManager:
                 root.tk.call("font", "create", font_name, "-family", str(font_file))
                 return font_name
             except Exception as e:
-                print(f"Error cargando fuente: {e}")
+                logger.error("Error cargando fuente: %s", e)
                 return None
         return None
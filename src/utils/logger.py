@@ -1,77 +1,219 @@
+"""
+Registro de la aplicación.
+
+Los métodos por categoría (app, nav, ui...) aceptan argumentos al estilo de logging
+(`logger.file("Cargado %s (%d páginas)", nombre, total)`): el mensaje solo se compone si
+el nivel está activo. Los registros se encolan y un hilo en segundo plano los formatea y
+escribe en consola y en el archivo rotativo, así que registrar mucho no frena la interfaz
+ni los lotes. Con structured=True (o XEBEC_LOG_FORMAT=json) el archivo es JSON-lines.
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
-from pathlib import Path
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+ROTATION_SIZE = "size"
+ROTATION_TIME = "time"
+ROTATION_MODES = (ROTATION_SIZE, ROTATION_TIME)
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+LOG_FORMAT_ENV = "XEBEC_LOG_FORMAT"
+
+_ICONS = {
+    "APP": "🚀",
+    "NAV": "🧭",
+    "ACTION": "👆",
+    "UI": "🎨",
+    "CONFIG": "⚙️",
+    "USER": "👤",
+    "FILE": "📄",
+    "WARNING": "⚠️",
+    "ERROR": "❌",
+    "DEBUG": "🔍",
+    "TRACE": "🔬",
+}
+
+
+class _TextFormatter(logging.Formatter):
+    """El formato de siempre: icono y categoría delante del mensaje."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        category = getattr(record, "category", None)
+        if category in _ICONS:
+            return f"{_ICONS[category]} [{category}] : {message}"
+        return message
+
+
+class _JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro, para filtrar y agregar los logs con herramientas."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "category": getattr(record, "category", None),
+            "message": record.getMessage(),
+            "logger": record.name,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Encola el registro sin formatearlo; el formato y la escritura quedan para el listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Los argumentos pueden cambiar tras la llamada: el mensaje se resuelve ahora
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 class Logger:
     _instance = None
     _logger = None
+    _listener = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def setup(self, name: str = "XebecPDF", log_dir: Path = None, level: int = logging.INFO):
+    def setup(
+        self,
+        name: str = "XebecPDF",
+        log_dir: Path = None,
+        level: int = logging.INFO,
+        structured: Optional[bool] = None,
+        rotation: str = ROTATION_SIZE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        console: bool = True,
+    ):
+        """
+        Configura el logger una sola vez. rotation="size" rota al llegar a max_bytes y
+        rotation="time" cada medianoche; en ambos casos se conservan backup_count archivos.
+        """
         if self._logger is not None:
             return self._logger
+        if rotation not in ROTATION_MODES:
+            raise ValueError(f"Rotación no válida: {rotation}")
+        if structured is None:
+            structured = os.environ.get(LOG_FORMAT_ENV, "").lower() == "json"
 
         self._logger = logging.getLogger(name)
         self._logger.setLevel(level)
 
-        formatter = logging.Formatter(
-            "%(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        self._logger.addHandler(console_handler)
+        handlers = []
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(_TextFormatter("%(message)s"))
+            handlers.append(console_handler)
 
         if log_dir:
+            log_dir = Path(log_dir)
             log_dir.mkdir(parents=True, exist_ok=True)
-            log_file = log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_file, encoding="utf-8")
-            file_handler.setFormatter(formatter)
-            self._logger.addHandler(file_handler)
+            log_file = log_dir / f"{name}.{'jsonl' if structured else 'log'}"
+            if rotation == ROTATION_TIME:
+                file_handler = TimedRotatingFileHandler(
+                    log_file, when="midnight", backupCount=backup_count, encoding="utf-8", delay=True
+                )
+            else:
+                file_handler = RotatingFileHandler(
+                    log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+                )
+            file_handler.setFormatter(_JsonFormatter() if structured else _TextFormatter("%(message)s"))
+            handlers.append(file_handler)
+
+        if handlers:
+            records = queue.SimpleQueue()
+            self._logger.addHandler(_DeferredQueueHandler(records))
+            self._listener = QueueListener(records, *handlers, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self.shutdown)
+        else:
+            # Sin salidas: que los avisos no caigan en el manejador de último recurso de logging
+            self._logger.addHandler(logging.NullHandler())
 
         return self._logger
 
+    def shutdown(self):
+        """
+        Escribe lo pendiente y detiene el hilo de escritura. Los registros posteriores
+        (p. ej. de otros manejadores atexit) se escriben directamente.
+        """
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        listener.stop()
+        for handler in list(self._logger.handlers):
+            if isinstance(handler, _DeferredQueueHandler):
+                self._logger.removeHandler(handler)
+        for handler in listener.handlers:
+            self._logger.addHandler(handler)
+
     def get_logger(self):
         if self._logger is None:
             return self.setup()
         return self._logger
 
-    def app(self, message: str):
-        self._logger.info(f"🚀 [APP] : {message}")
+    def _log(self, level: int, category: str, message: str, args: Tuple[Any, ...]):
+        log = self.get_logger()
+        if log.isEnabledFor(level):
+            # Sin findCaller (recorrer la pila es lo más caro de cada llamada): ningún formato usa archivo ni línea
+            log.handle(log.makeRecord(log.name, level, "", 0, message, args, None, extra={"category": category}))
+
+    def trace(self, channel: str, message: str, *args: Any):
+        """Para src.utils.trace: la categoría ya se activó a propósito, así que no se filtra por nivel."""
+        log = self.get_logger()
+        log.handle(log.makeRecord(
+            log.name, logging.DEBUG, "", 0, f"[{channel}] {message}", args, None, extra={"category": "TRACE"}
+        ))
+
+    def app(self, message: str, *args: Any):
+        self._log(logging.INFO, "APP", message, args)
 
-    def nav(self, message: str):
-        self._logger.info(f"🧭 [NAV] : {message}")
+    def nav(self, message: str, *args: Any):
+        self._log(logging.INFO, "NAV", message, args)
 
-    def action(self, message: str):
-        self._logger.info(f"👆 [ACTION] : {message}")
+    def action(self, message: str, *args: Any):
+        self._log(logging.INFO, "ACTION", message, args)
 
-    def ui(self, message: str):
-        self._logger.info(f"🎨 [UI] : {message}")
+    def ui(self, message: str, *args: Any):
+        self._log(logging.INFO, "UI", message, args)
 
-    def config(self, message: str):
-        self._logger.info(f"⚙️ [CONFIG] : {message}")
+    def config(self, message: str, *args: Any):
+        self._log(logging.INFO, "CONFIG", message, args)
 
-    def user(self, message: str):
-        self._logger.info(f"👤 [USER] : {message}")
+    def user(self, message: str, *args: Any):
+        self._log(logging.INFO, "USER", message, args)
 
-    def file(self, message: str):
-        self._logger.info(f"📄 [FILE] : {message}")
+    def file(self, message: str, *args: Any):
+        self._log(logging.INFO, "FILE", message, args)
 
-    def warning(self, message: str):
-        self._logger.warning(f"⚠️ [WARNING] : {message}")
+    def warning(self, message: str, *args: Any):
+        self._log(logging.WARNING, "WARNING", message, args)
 
-    def error(self, message: str):
-        self._logger.error(f"❌ [ERROR] : {message}")
+    def error(self, message: str, *args: Any):
+        self._log(logging.ERROR, "ERROR", message, args)
 
-    def debug(self, message: str):
-        self._logger.debug(f"🔍 [DEBUG] : {message}")
+    def debug(self, message: str, *args: Any):
+        self._log(logging.DEBUG, "DEBUG", message, args)
 
 
 logger = Logger()
@@ -0,0 +1,85 @@
+"""
+Trazas de depuración por categoría: teclado, render, E/S y orquestación.
+
+Cada categoría se activa por separado con XEBEC_TRACE (p. ej. "keyboard,render" o "all")
+o con enable(). Desactivada, una traza solo comprueba un atributo: el mensaje no se compone
+ni se escribe, así que pueden quedarse en las rutas calientes (eventos de teclado, render
+de teselas). Si preparar los argumentos cuesta, se comprueba antes la categoría:
+
+    if trace.render:
+        trace.render("Precarga: %d teselas", len(plan()))
+
+Las trazas activas salen por el logger de la aplicación (categoría TRACE), que escribe
+desde su propio hilo.
+"""
+
+import os
+from typing import Any, List
+
+from src.utils.logger import logger
+
+KEYBOARD = "keyboard"
+RENDER = "render"
+IO = "io"
+ORCHESTRATION = "orchestration"
+CATEGORIES = (KEYBOARD, RENDER, IO, ORCHESTRATION)
+TRACE_ENV = "XEBEC_TRACE"
+
+
+class TraceChannel:
+    __slots__ = ("name", "enabled")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.enabled = False
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    def __call__(self, message: str, *args: Any) -> None:
+        if self.enabled:
+            logger.trace(self.name, message, *args)
+
+
+keyboard = TraceChannel(KEYBOARD)
+render = TraceChannel(RENDER)
+io = TraceChannel(IO)
+orchestration = TraceChannel(ORCHESTRATION)
+
+_CHANNELS = {channel.name: channel for channel in (keyboard, render, io, orchestration)}
+
+
+def _channels(names) -> List[TraceChannel]:
+    if not names or "all" in names:
+        return list(_CHANNELS.values())
+    unknown = [name for name in names if name not in _CHANNELS]
+    if unknown:
+        raise ValueError(f"Categorías de traza desconocidas: {', '.join(unknown)}")
+    return [_CHANNELS[name] for name in names]
+
+
+def enable(*names: str) -> None:
+    """Activa las categorías indicadas (todas si no se indica ninguna)."""
+    for channel in _channels(names):
+        channel.enabled = True
+
+
+def disable(*names: str) -> None:
+    """Desactiva las categorías indicadas (todas si no se indica ninguna)."""
+    for channel in _channels(names):
+        channel.enabled = False
+
+
+def enabled() -> List[str]:
+    return [name for name, channel in _CHANNELS.items() if channel.enabled]
+
+
+def _from_environment() -> None:
+    # Al importar aún no se ha configurado el logger: los nombres desconocidos se ignoran sin avisar
+    names = [name.strip().lower() for name in os.environ.get(TRACE_ENV, "").split(",") if name.strip()]
+    known = [name for name in names if name == "all" or name in _CHANNELS]
+    if known:
+        enable(*known)
+
+
+_from_environment()
@@ -0,0 +1,38 @@
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from src.core.pdf_writer import PDFOutputFile, file_id_for
+
+
+def page_widths(path: Path):
+    """Cada página de prueba se distingue por su anchura: 100 + índice original."""
+    return [int(page.mediabox.width) for page in PdfReader(str(path)).pages]
+
+
+@pytest.fixture
+def make_pdf(tmp_path) -> Callable[..., Path]:
+    """
+    Crea un PDF de page_count páginas vacías. Con xref_stream=False lo escribe pypdf (tabla
+    de referencias clásica); con True pasa por StreamingPDFWriter (stream de referencias y
+    streams de objetos). Con linearize=True la salida se linealiza.
+    """
+
+    def make(page_count: int, name: str = "doc.pdf", xref_stream: bool = False, linearize: bool = False) -> Path:
+        path = tmp_path / name
+        writer = PdfWriter()
+        for index in range(page_count):
+            writer.add_blank_page(100 + index, 200)
+        if not xref_stream and not linearize:
+            writer.write(str(path))
+            return path
+        source = tmp_path / f"source_{name}"
+        writer.write(str(source))
+        output = PDFOutputFile(path, linearize=linearize)
+        output.writer.add_document(PdfReader(str(source)))
+        output.commit(file_id_for(name, page_count))
+        return path
+
+    return make
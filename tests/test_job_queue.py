@@ -0,0 +1,43 @@
+from src.core.job_store import STATUS_CANCELLED, STATUS_COMPLETED, JobStore
+from src.orchestration.job_queue import JobQueue
+from src.orchestration.messages import Action
+
+
+def _queue(tmp_path, on_event=None):
+    return JobQueue(store=JobStore(tmp_path / "jobs.db"), workers=1, on_event=on_event)
+
+
+def test_cancel_stops_running_job(tmp_path, make_pdf):
+    source = make_pdf(40)
+    queue = None
+
+    def on_event(action, job):
+        # Primer avance: el trabajo ya está en marcha
+        if action == Action.JOB_PROGRESS:
+            queue.cancel(job["id"])
+
+    queue = _queue(tmp_path, on_event)
+    job = queue.submit("split", {
+        "input_path": str(source), "output_dir": str(tmp_path / "out"), "mode": "every", "every": 1,
+    })
+    queue.run_until_empty()
+    finished = queue.store.get(job.id)
+    assert finished.status == STATUS_CANCELLED
+    assert len(list((tmp_path / "out").glob("*.pdf"))) < 40
+
+
+def test_job_that_finishes_despite_cancel_is_completed(tmp_path, make_pdf):
+    source = make_pdf(2)
+    queue = None
+
+    def on_event(action, job):
+        # Al 100 % la operación ya no comprueba la cancelación
+        if action == Action.JOB_PROGRESS and job["progress"] >= 1.0:
+            queue.cancel(job["id"])
+
+    queue = _queue(tmp_path, on_event)
+    job = queue.submit("merge", {"input_paths": [str(source), str(source)], "output_path": str(tmp_path / "m.pdf")})
+    queue.run_until_empty()
+    finished = queue.store.get(job.id)
+    assert finished.status == STATUS_COMPLETED
+    assert finished.result["merged"]
@@ -0,0 +1,125 @@
+import pytest
+
+from src.core.page_history import DeletePages, PageHistory, PageOperation, RotatePages
+
+
+def test_initial_state():
+    history = PageHistory(4)
+    assert history.pages == ((0, 0), (1, 0), (2, 0), (3, 0))
+    assert not history.modified
+    assert not history.can_undo
+    assert not history.can_redo
+    assert history.undo() is None
+    assert history.redo() is None
+
+
+def test_each_operation_undoes_and_redoes():
+    history = PageHistory(5)
+    snapshots = [history.pages]
+    history.rotate([1, 3], 90)
+    snapshots.append(history.pages)
+    history.delete([0])
+    snapshots.append(history.pages)
+    history.move([3], 0)
+    snapshots.append(history.pages)
+    history.insert(2, [(4, 180)])
+    snapshots.append(history.pages)
+    history.duplicate([0, 1])
+    snapshots.append(history.pages)
+
+    assert snapshots[1] == ((0, 0), (1, 90), (2, 0), (3, 90), (4, 0))
+    assert snapshots[2] == ((1, 90), (2, 0), (3, 90), (4, 0))
+    assert snapshots[3] == ((4, 0), (1, 90), (2, 0), (3, 90))
+    assert snapshots[4] == ((4, 0), (1, 90), (4, 180), (2, 0), (3, 90))
+    assert snapshots[5] == ((4, 0), (1, 90), (4, 0), (1, 90), (4, 180), (2, 0), (3, 90))
+
+    for expected in reversed(snapshots[:-1]):
+        assert history.undo() is not None
+        assert history.pages == expected
+    assert not history.can_undo
+    assert not history.modified
+
+    for expected in snapshots[1:]:
+        assert history.redo() is not None
+        assert history.pages == expected
+    assert not history.can_redo
+
+
+def test_new_operation_clears_redo():
+    history = PageHistory(3)
+    history.rotate([0], 90)
+    history.undo()
+    assert history.can_redo
+    history.delete([2])
+    assert not history.can_redo
+    assert history.pages == ((0, 0), (1, 0))
+
+
+def test_rotation_back_to_start_is_not_modified():
+    history = PageHistory(2)
+    for _ in range(4):
+        history.rotate([0], 90)
+    assert history.pages == ((0, 0), (1, 0))
+    assert not history.modified
+    assert history.can_undo
+
+
+def test_invalid_operations_leave_history_untouched():
+    history = PageHistory(3)
+    with pytest.raises(ValueError):
+        history.rotate([0], 45)
+    with pytest.raises(ValueError):
+        history.delete([0, 1, 2])
+    with pytest.raises(ValueError):
+        history.move([0], 3)
+    with pytest.raises(ValueError):
+        history.insert(0, [(7, 0)])
+    with pytest.raises(ValueError):
+        history.delete([])
+    assert not history.can_undo
+    assert history.pages == ((0, 0), (1, 0), (2, 0))
+
+
+def test_budget_drops_oldest_operations():
+    history = PageHistory(1000, budget_mb=0.001)
+    for _ in range(20):
+        history.rotate(range(10), 90)
+    assert history.dropped > 0
+    assert history.memory_bytes <= int(0.001 * 1024 * 1024)
+    undone = 0
+    while history.undo() is not None:
+        undone += 1
+    assert undone == 20 - history.dropped
+    # Lo descartado ya no se puede deshacer: el giro acumulado se queda
+    assert history[0] == (0, (90 * history.dropped) % 360)
+
+
+def test_oversized_operation_is_kept():
+    history = PageHistory(100000, budget_mb=0.001)
+    history.rotate(range(100000), 90)
+    assert history.can_undo
+    history.undo()
+    assert history.pages[0] == (0, 0)
+
+
+def test_position_of():
+    history = PageHistory(4)
+    history.move([0], 3)
+    assert history.position_of(0) == 3
+    history.delete([3])
+    assert history.position_of(0) is None
+
+
+def test_operations_report_size_and_description():
+    history = PageHistory(4)
+    rotate = history.rotate([0, 1], 90)
+    delete = history.delete([2])
+    assert isinstance(rotate, RotatePages) and isinstance(delete, DeletePages)
+    assert rotate.size_bytes > 0 and delete.size_bytes > 0
+    assert rotate.description and delete.description
+    assert history.memory_bytes == rotate.size_bytes + delete.size_bytes
+
+
+def test_page_operation_is_abstract():
+    with pytest.raises(TypeError):
+        PageOperation()
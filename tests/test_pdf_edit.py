@@ -0,0 +1,94 @@
+import pytest
+from pypdf import PdfReader
+
+from src.core.pdf_edit import SAVE_INCREMENTAL, IncrementalUpdate, PDFPageEditor, identity_pages
+from src.core.pdf_io import map_file, mapped_reader
+from src.core.pdf_probe import XrefReader, clear_probe_cache, probe_pdf
+from src.core.pdf_writer import file_id_for
+
+from tests.conftest import page_widths
+
+
+def _xref(path):
+    data = map_file(path)
+    try:
+        return XrefReader(data)
+    finally:
+        data.close()
+
+
+def _rotations(path):
+    return [page.get("/Rotate", 0) % 360 for page in PdfReader(str(path)).pages]
+
+
+@pytest.fixture(params=[False, True], ids=["classic", "xref_stream"])
+def document(request, make_pdf):
+    return make_pdf(5, xref_stream=request.param)
+
+
+def test_incremental_save_appends_to_original(document):
+    original = document.read_bytes()
+    pages = [(4, 0), (0, 90), (2, 0)]
+    success, error, report = PDFPageEditor.save(document, pages)
+    assert success, error
+    assert report.mode == SAVE_INCREMENTAL
+    assert report.objects_written > 0
+    data = document.read_bytes()
+    # Los bytes originales no se tocan: la actualización va detrás
+    assert data.startswith(original)
+    assert len(data) == len(original) + report.bytes_written
+    assert page_widths(document) == [104, 100, 102]
+    assert _rotations(document) == [0, 90, 0]
+
+
+def test_incremental_update_keeps_xref_kind(document):
+    was_stream = _xref(document).sections[0].rows is not None
+    success, error, _ = PDFPageEditor.save(document, [(1, 180), (3, 0)])
+    assert success, error
+    xref = _xref(document)
+    assert (xref.sections[0].rows is not None) == was_stream
+    # La sección nueva enlaza con la anterior por /Prev
+    assert len(xref.sections) >= 2
+    assert isinstance(xref.trailer.get("/Prev"), int)
+
+
+def test_incremental_updates_stack(document):
+    assert PDFPageEditor.save(document, [(0, 90), (1, 0), (2, 0), (3, 0), (4, 0)])[0]
+    assert PDFPageEditor.save(document, [(4, 0), (3, 0), (2, 0), (1, 0), (0, 0)])[0]
+    assert page_widths(document) == [104, 103, 102, 101, 100]
+    assert _rotations(document) == [0, 0, 0, 0, 90]
+    clear_probe_cache()
+    assert probe_pdf(document).page_count == 5
+
+
+def test_incremental_save_without_changes_writes_nothing(document):
+    original = document.read_bytes()
+    success, error, report = PDFPageEditor.save(document, identity_pages(5))
+    assert success, error
+    assert report.bytes_written == 0
+    assert document.read_bytes() == original
+
+
+def test_incremental_update_allocates_after_size(document):
+    xref = _xref(document)
+    with mapped_reader(document) as reader:
+        update = IncrementalUpdate(document, reader, xref)
+        size = int(xref.trailer["/Size"])
+        assert update.allocate() == size
+        assert update.allocate() == size + 1
+
+
+def test_incremental_update_failure_leaves_file_intact(document):
+    original = document.read_bytes()
+    xref = _xref(document)
+    with mapped_reader(document) as reader:
+        update = IncrementalUpdate(document, reader, xref)
+        with pytest.raises(Exception):
+            update.write({(1, 0): object()}, file_id_for("fail"))
+    assert document.read_bytes() == original
+
+
+def test_incremental_save_rejects_pages_outside_document(document):
+    success, error, _ = PDFPageEditor.save(document, [(0, 0), (9, 0)])
+    assert not success
+    assert error
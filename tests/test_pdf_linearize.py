@@ -0,0 +1,107 @@
+import pytest
+from pypdf import PdfReader
+
+from src.core.pdf_linearize import (
+    HintTables,
+    PageHint,
+    _BitReader,
+    _BitWriter,
+    linearize_pdf,
+    verify_linearized,
+)
+from src.core.pdf_probe import StructureError
+
+from tests.conftest import page_widths
+
+
+def _tables(pages, shared_lengths=(), shared_first_page=0):
+    return HintTables(
+        first_page_offset=1234,
+        pages=pages,
+        first_shared_num=17,
+        first_shared_offset=5678,
+        shared_first_page=shared_first_page,
+        shared_lengths=list(shared_lengths),
+    )
+
+
+def _round_trip(tables: HintTables) -> HintTables:
+    data, shared_offset = tables.encode()
+    return HintTables.decode(data, shared_offset, len(tables.pages))
+
+
+def test_bit_writer_reader_round_trip():
+    values = [(1, 1), (0, 3), (5, 3), (1023, 10), (0, 0), (65535, 16), (7, 32)]
+    writer = _BitWriter()
+    for value, bits in values:
+        writer.write(value, bits)
+    writer.flush()
+    reader = _BitReader(bytes(writer.data))
+    assert [reader.read(bits) for _, bits in values] == [value for value, _ in values]
+
+
+def test_hint_tables_single_page_round_trip():
+    tables = _tables([PageHint(objects=4, length=812, content_offset=20, content_length=90)])
+    assert _round_trip(tables) == tables
+
+
+def test_hint_tables_multi_page_round_trip():
+    pages = [
+        PageHint(objects=4, length=812, shared=[0, 2], content_offset=20, content_length=90),
+        PageHint(objects=9, length=3100, shared=[], content_offset=35, content_length=2400),
+        PageHint(objects=1, length=140, shared=[1], content_offset=12, content_length=40),
+        PageHint(objects=2, length=70000, shared=[0, 1, 2], content_offset=16, content_length=69000),
+    ]
+    tables = _tables(pages, shared_lengths=[300, 45, 12000], shared_first_page=1)
+    assert _round_trip(tables) == tables
+
+
+def test_hint_tables_identical_pages_use_zero_bit_columns():
+    pages = [PageHint(objects=3, length=500, content_offset=10, content_length=200) for _ in range(5)]
+    tables = _tables(pages)
+    data, _ = tables.encode()
+    decoded = _round_trip(tables)
+    assert decoded == tables
+    # Sin diferencias entre páginas las columnas ocupan cero bits: solo quedan las cabeceras
+    assert len(data) < 80
+
+
+def test_hint_tables_truncated_data_raises():
+    tables = _tables([PageHint(objects=4, length=812, content_offset=20, content_length=90)] * 3,
+                     shared_lengths=[10, 20])
+    data, shared_offset = tables.encode()
+    with pytest.raises(StructureError):
+        HintTables.decode(data[:shared_offset + 4], shared_offset, 3)
+
+
+@pytest.mark.parametrize("page_count", [1, 7])
+def test_verify_linearized_output(make_pdf, page_count):
+    path = make_pdf(page_count, linearize=True)
+    check = verify_linearized(path)
+    assert check.linearized
+    assert check.errors == []
+    assert check.valid
+    assert 0 < check.first_page_end <= check.file_size
+    assert page_widths(path) == [100 + index for index in range(page_count)]
+
+
+def test_linearize_pdf_from_xref_stream_input(make_pdf, tmp_path):
+    source = make_pdf(4, xref_stream=True)
+    output = tmp_path / "linear.pdf"
+    linearize_pdf(source, output)
+    assert verify_linearized(output).valid
+    assert len(PdfReader(str(output)).pages) == 4
+
+
+def test_verify_linearized_plain_file(make_pdf):
+    check = verify_linearized(make_pdf(3))
+    assert not check.linearized
+    assert not check.valid
+
+
+def test_verify_linearized_after_appended_update(make_pdf):
+    path = make_pdf(3, linearize=True)
+    with open(path, "ab") as f:
+        f.write(b"\n% update\n")
+    # /L ya no coincide con el tamaño: los visores lo tratan como no linealizado
+    assert not verify_linearized(path).linearized
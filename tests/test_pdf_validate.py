@@ -0,0 +1,40 @@
+from pypdf import PdfWriter
+
+from src.core.pdf_probe import ObjectParser
+from src.core.pdf_validate import PDFValidator
+
+_ESCAPED = rb"/Title (Informe \050final\051 2024)"
+
+
+def _with_title(tmp_path, title: bytes):
+    """PDF de una página cuyo /Title se sustituye en bruto (pypdf escapa los paréntesis)."""
+    path = tmp_path / "titulo.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(100, 200)
+    writer.add_metadata({"/Title": "Informe (final) 2024"})
+    writer.write(str(path))
+    data = path.read_bytes()
+    assert _ESCAPED in data and len(title) <= len(_ESCAPED)
+    # Mismo tamaño para no mover los desplazamientos de la tabla de referencias
+    path.write_bytes(data.replace(_ESCAPED, title.ljust(len(_ESCAPED))))
+    return path
+
+
+def test_parser_reads_nested_parentheses():
+    assert ObjectParser(rb"(a (b) \) (c)) /X").value(0) == (rb"(a (b) \) (c))", 14)
+
+
+def test_validate_deep_accepts_balanced_parentheses(tmp_path):
+    path = _with_title(tmp_path, rb"/Title (Informe (final) 2024)")
+    success, error, report = PDFValidator.validate_deep(path)
+    assert success, error
+    assert report.valid
+    assert report.defects == []
+
+
+def test_validate_deep_reports_unreadable_object(tmp_path):
+    path = _with_title(tmp_path, rb"/Title (Informe (final 2024)")
+    success, error, report = PDFValidator.validate_deep(path)
+    assert success, error
+    assert not report.valid
+    assert [defect.code for defect in report.defects] == ["object_syntax"]
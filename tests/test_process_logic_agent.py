@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from src.core.pdf_validate import PARALLEL_MIN_PAGES
+from src.core.pdf_writer import CANCELLED_MESSAGE
+from src.orchestration.agents.logic_agent import cancelling, reporting_progress
+from src.orchestration.agents.process_logic_agent import ProcessLogicAgent
+from src.orchestration.messages import Action, AgentType, Message, MessageType
+
+
+@pytest.fixture
+def agent():
+    agent = ProcessLogicAgent(size=1, memory_limit_mb=None, task_timeout=120)
+    yield agent
+    agent.shutdown()
+
+
+def _request(action: str, **payload) -> Message:
+    return Message(MessageType.REQUEST, AgentType.JOBS, AgentType.LOGIC, action, payload)
+
+
+def test_parallel_action_runs_inside_pool_worker(agent, make_pdf):
+    # Con workers > 1 la validación abre su propio ProcessPoolExecutor dentro del worker
+    path = make_pdf(PARALLEL_MIN_PAGES)
+    progress = []
+    with reporting_progress(lambda done, total: progress.append((done, total))):
+        response = agent.handle(_request(Action.LOGIC_DEEP_VALIDATE_PDF, file_path=str(path), workers=2))
+    assert response.success, response.error
+    assert response.data["checked_pages"] == PARALLEL_MIN_PAGES
+    assert progress and progress[-1][0] == progress[-1][1]
+
+
+def test_cancel_event_reaches_pool_worker(agent, make_pdf, tmp_path):
+    path = make_pdf(20)
+    event = threading.Event()
+    event.set()
+    with cancelling(event):
+        response = agent.handle(_request(
+            Action.LOGIC_SPLIT_PDF, input_path=str(path), output_dir=str(tmp_path / "out"), mode="every",
+        ))
+    assert not response.success
+    assert response.error == CANCELLED_MESSAGE
+
+
+def test_shutdown_stops_workers(agent):
+    agent.start()
+    processes = [worker.process for worker in agent.pool._workers]
+    assert processes and all(not process.daemon for process in processes)
+    agent.shutdown()
+    assert all(not process.is_alive() for process in processes)